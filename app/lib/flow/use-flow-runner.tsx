@@ -252,7 +252,14 @@ export function FlowRunnerProvider({ children, agentId }: { children: ReactNode;
         selectedTriggerId
       );
       const nodesToRun = plan.nodesToRun;
-      const cachedOutputs = buildCachedOutputs(executionByNode, plan.cachedNodeIds);
+      // Only pinned outputs travel with the request. nodeIds and cachedNodeIds
+      // just scope the run: the backend diffs the graph against its last run,
+      // serves clean nodes from it (reporting their results) and re-runs the rest.
+      const pinnedCachedIds = new Set(
+        [...plan.cachedNodeIds].filter((id) => pinnedSet.has(id))
+      );
+      const cachedOutputs = buildCachedOutputs(executionByNode, pinnedCachedIds);
+      const cachedNodeIds = [...plan.cachedNodeIds].filter((id) => !pinnedSet.has(id));
       const nodeIds = Array.from(nodesToRun);
 
       const downstreamToClear =
@@ -277,6 +284,7 @@ export function FlowRunnerProvider({ children, agentId }: { children: ReactNode;
           cachedOutputs,
           promptInput: input,
           nodeIds,
+          cachedNodeIds,
         });
         streamAbortRef.current = abort;
         if (!response.ok) {
@@ -1314,7 +1314,8 @@ export const StreamFlowRunRequest = Schema.Struct({
   targetNodeId: Schema.propertySignature(Schema.String).pipe(Schema.fromKey("target_node_id")),
   cachedOutputs: Schema.optionalWith(Schema.UndefinedOr(Schema.Record({ key: Schema.String, value: Schema.Record({ key: Schema.String, value: Schema.Unknown }) })), { nullable: true }).pipe(Schema.fromKey("cached_outputs")),
   promptInput: Schema.optionalWith(Schema.UndefinedOr(FlowRunPromptInput), { nullable: true }).pipe(Schema.fromKey("prompt_input")),
-  nodeIds: Schema.optionalWith(Schema.UndefinedOr(Schema.Array(Schema.String)), { nullable: true }).pipe(Schema.fromKey("node_ids"))
+  nodeIds: Schema.optionalWith(Schema.UndefinedOr(Schema.Array(Schema.String)), { nullable: true }).pipe(Schema.fromKey("node_ids")),
+  cachedNodeIds: Schema.optionalWith(Schema.UndefinedOr(Schema.Array(Schema.String)), { nullable: true }).pipe(Schema.fromKey("cached_node_ids"))
 })
 
 export type StreamFlowRunRequest = Schema.Schema.Type<typeof StreamFlowRunRequest>
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import types
 import uuid
 from collections.abc import Callable
@@ -12,6 +13,10 @@ from nodes._types import NodeEvent
 
 from ...models.chat import ChatEvent
 
+from ...services.flows.flow_run_state import (
+    compute_node_signatures,
+    resolve_incremental_run,
+)
 from ...services.streaming.runtime_events import (
     EVENT_FLOW_NODE_COMPLETED,
     EVENT_FLOW_NODE_ERROR,
@@ -43,6 +48,7 @@ class StreamFlowRunInput:
     cached_outputs: dict[str, dict[str, dict[str, Any]]] | None = None
     prompt_input: FlowRunPromptInput | None = None
     node_ids: list[str] | None = None
+    cached_node_ids: list[str] | None = None
 
 
 class FlowRunCancelHandle:
@@ -83,6 +89,7 @@ class StreamFlowRunDependencies:
     run_flow: Callable[..., Any]
     emit_run_error: Callable[[Channel, str], None]
     logger: Any
+    flow_run_state: Any | None = None
 
 
 async def execute_stream_flow_run(
@@ -105,17 +112,48 @@ async def execute_stream_flow_run(
         attachments,
     )
 
+    graph_data = agent_data["graph_data"]
+    node_ids = input_data.node_ids
+    cached_outputs = input_data.cached_outputs or {}
+    run_state = deps.flow_run_state
+    signatures: dict[str, str] = {}
+    reused: list[str] = []
+    if run_state is not None:
+        signatures = compute_node_signatures(
+            graph_data,
+            trigger_payload=trigger_payload,
+            pinned_outputs=cached_outputs,
+        )
+        if node_ids is not None:
+            # The editor sends the run's scope; the snapshot decides what is dirty.
+            # Only the target runs unconditionally, or everything downstream of
+            # it when running from a node.
+            incremental = resolve_incremental_run(
+                graph_data,
+                await asyncio.to_thread(run_state.get, input_data.agent_id),
+                signatures,
+                node_ids=node_ids,
+                cached_node_ids=input_data.cached_node_ids or [],
+                required=set(node_ids)
+                if input_data.mode == "runFrom"
+                else {input_data.target_node_id},
+                explicit_outputs=cached_outputs,
+            )
+            node_ids = incremental.node_ids
+            cached_outputs = incremental.cached_outputs
+            reused = sorted(incremental.reused)
+
     run_id = str(uuid.uuid4())
     scope_payload: dict[str, Any] = {
         "mode": input_data.mode,
         "target_node_ids": [input_data.target_node_id],
     }
-    if input_data.node_ids is not None:
-        scope_payload["node_ids"] = input_data.node_ids
+    if node_ids is not None:
+        scope_payload["node_ids"] = node_ids
 
     execution_ctx = types.SimpleNamespace(
         scope=scope_payload,
-        cached_outputs=input_data.cached_outputs or {},
+        cached_outputs=cached_outputs,
         stop_run=False,
     )
 
@@ -149,7 +187,19 @@ async def execute_stream_flow_run(
             emit_chat_event(input_data.channel, EVENT_RUN_CANCELLED)
             return
 
-        async for item in deps.run_flow(agent_data["graph_data"], context):
+        # The editor cleared these expecting them to run; show the snapshot's outputs.
+        if reused:
+            node_types = {node.get("id"): node.get("type") for node in graph_data.get("nodes", [])}
+            for node_id in reused:
+                emit_chat_event(
+                    input_data.channel,
+                    EVENT_FLOW_NODE_RESULT,
+                    nodeId=node_id,
+                    nodeType=node_types.get(node_id),
+                    outputs=cached_outputs[node_id],
+                )
+
+        async for item in deps.run_flow(graph_data, context):
             if not isinstance(item, NodeEvent):
                 continue
 
@@ -193,16 +243,37 @@ async def execute_stream_flow_run(
                 continue
 
             if item.event_type == "result":
+                outputs = (item.data or {}).get("outputs", {})
+                signature = signatures.get(item.node_id)
+                if run_state is not None and signature is not None:
+                    run_state.record(input_data.agent_id, item.node_id, signature, outputs)
                 emit_chat_event(
                     input_data.channel,
                     EVENT_FLOW_NODE_RESULT,
                     nodeId=item.node_id,
                     nodeType=item.node_type,
-                    outputs=(item.data or {}).get("outputs", {}),
+                    outputs=outputs,
                 )
+                # Reroutes collapsed at compile time report the value they forward.
+                for alias_id, handle in ((item.data or {}).get("aliases") or {}).items():
+                    alias_outputs = {"output": outputs.get(handle)}
+                    alias_signature = signatures.get(alias_id)
+                    if run_state is not None and alias_signature is not None:
+                        run_state.record(
+                            input_data.agent_id, alias_id, alias_signature, alias_outputs
+                        )
+                    emit_chat_event(
+                        input_data.channel,
+                        EVENT_FLOW_NODE_RESULT,
+                        nodeId=alias_id,
+                        nodeType="reroute",
+                        outputs=alias_outputs,
+                    )
                 continue
 
             if item.event_type == "error":
+                if run_state is not None:
+                    run_state.forget(input_data.agent_id, item.node_id)
                 emit_chat_event(
                     input_data.channel,
                     EVENT_FLOW_NODE_ERROR,
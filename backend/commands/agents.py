@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import logging
+import uuid
+from dataclasses import asdict
+from pathlib import Path
 from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict
-from zynk import StaticFile, UploadFile, command, static, upload
+from zynk import Channel, StaticFile, UploadFile, command, static, upload
 
 from ..services.flows.agent_manager import get_agent_manager
+from ..services.flows.flow_batch import BatchRunHandle, BatchSummary, run_flow_batch
+from ..services.flows.flow_executor import run_flow
+from ..services.streaming import run_control
+from ..services.tools.tool_registry import get_tool_registry
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +100,40 @@ class SaveAgentGraphRequest(BaseModel):
     edges: list[GraphEdge]
 
 
+class RunAgentBatchRequest(BaseModel):
+    id: str
+    input_path: str
+    output_path: str
+    concurrency: int = 4
+    resume: bool = True
+    entry_node_id: str | None = None
+
+
+class AgentBatchEvent(BaseModel):
+    """Streamed by `run_agent_batch`, one model per event.
+
+    BatchStarted, then BatchProgress after each row, then BatchCompleted,
+    BatchCancelled or BatchError. Cancel with `cancel_flow_run` and the batch id.
+    """
+
+    event: str
+    batch_id: str = ""
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    output_path: str = ""
+    index: int | None = None
+    status: str | None = None
+    error: str | None = None
+
+
+def _batch_event(event: str, summary: BatchSummary, **extra: Any) -> AgentBatchEvent:
+    fields = asdict(summary)
+    fields.pop("cancelled", None)
+    return AgentBatchEvent(event=event, **fields, **extra)
+
+
 class UploadAgentImageRequest(BaseModel):
     agent_id: str
 
@@ -240,6 +281,71 @@ async def upload_agent_preview(file: UploadFile, agent_id: str) -> dict[str, boo
     return {"success": True}
 
 
+@command
+async def run_agent_batch(channel: Channel[AgentBatchEvent], body: RunAgentBatchRequest) -> None:
+    batch_id = str(uuid.uuid4())
+    manager = get_agent_manager()
+    agent = manager.get_agent(body.id)
+    input_path = Path(body.input_path).expanduser()
+    if agent is None:
+        error = f"Agent '{body.id}' not found"
+    elif not input_path.is_file():
+        error = f"Batch input not found: {body.input_path}"
+    else:
+        error = None
+    if error is not None:
+        channel.send_model(AgentBatchEvent(event="BatchError", batch_id=batch_id, error=error))
+        return
+
+    handle = BatchRunHandle()
+    run_control.register_active_run(batch_id, handle)
+    channel.send_model(
+        AgentBatchEvent(event="BatchStarted", batch_id=batch_id, output_path=body.output_path)
+    )
+    try:
+        summary = await run_flow_batch(
+            agent["graph_data"],
+            input_path,
+            Path(body.output_path).expanduser(),
+            run_flow=run_flow,
+            concurrency=body.concurrency,
+            resume=body.resume,
+            entry_node_id=body.entry_node_id,
+            tool_registry=get_tool_registry(),
+            batch_id=batch_id,
+            handle=handle,
+            on_progress=lambda summary, record: channel.send_model(
+                _batch_event(
+                    "BatchProgress",
+                    summary,
+                    index=record["index"],
+                    status=record["status"],
+                    error=record.get("error"),
+                )
+            ),
+        )
+    except Exception as exc:
+        logger.exception("[agents] Batch %s for agent %s failed", batch_id, body.id)
+        channel.send_model(AgentBatchEvent(event="BatchError", batch_id=batch_id, error=str(exc)))
+        return
+    finally:
+        run_control.remove_active_run(batch_id)
+        run_control.clear_early_cancel(batch_id)
+
+    logger.info(
+        "[agents] Batch %s for agent %s: %d completed, %d failed, %d skipped%s",
+        summary.batch_id,
+        body.id,
+        summary.completed,
+        summary.failed,
+        summary.skipped,
+        " (cancelled)" if summary.cancelled else "",
+    )
+    channel.send_model(
+        _batch_event("BatchCancelled" if summary.cancelled else "BatchCompleted", summary)
+    )
+
+
 @static
 async def agent_file(
     agent_id: str, file_type: Literal["icon", "preview"]
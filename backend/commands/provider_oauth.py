@@ -5,6 +5,8 @@ from typing import Literal
 from pydantic import BaseModel
 from zynk import command
 
+from ..providers import invalidate_model_pool
+from ..services.flows.link_artifact_cache import invalidate_link_artifacts
 from ..services.models.provider_oauth_manager import get_provider_oauth_manager
 
 
@@ -80,6 +82,9 @@ async def submit_provider_oauth_code(
     body: ProviderOAuthCodeInput,
 ) -> ProviderOAuthCodeResult:
     ok = get_provider_oauth_manager().submit_oauth_code(body.provider, body.code)
+    if ok:
+        invalidate_model_pool()
+        invalidate_link_artifacts("providers")
     return ProviderOAuthCodeResult(
         success=ok,
         error=None if ok else "No pending OAuth flow found for this provider",
@@ -95,6 +100,8 @@ class RevokeProviderOAuthResult(BaseModel):
 async def revoke_provider_oauth(body: ProviderOAuthId) -> RevokeProviderOAuthResult:
     try:
         await get_provider_oauth_manager().revoke_oauth(body.provider)
+        invalidate_model_pool()
+        invalidate_link_artifacts("providers")
         return RevokeProviderOAuthResult(success=True)
     except Exception as e:
         return RevokeProviderOAuthResult(success=False, error=str(e))
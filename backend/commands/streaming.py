@@ -51,6 +51,7 @@ from ..services.chat.conversation_store import (
 )
 from ..services.flows.agent_manager import get_agent_manager
 from ..services.flows.flow_executor import run_flow
+from ..services.flows.flow_run_state import get_flow_run_state_store
 from ..services.streaming import run_control
 from ..services.streaming import stream_broadcaster as broadcaster
 from ..services.streaming.chat_stream import FlowRunHandle, run_graph_chat_runtime
@@ -323,6 +324,7 @@ class StreamFlowRunRequest(BaseModel):
     cached_outputs: dict[str, dict[str, Any]] | None = None
     prompt_input: FlowRunPromptInput | None = None
     node_ids: list[str] | None = None
+    cached_node_ids: list[str] | None = None
 
 
 class CancelFlowRunRequest(BaseModel):
@@ -387,6 +389,7 @@ def _build_stream_flow_run_dependencies() -> StreamFlowRunDependencies:
         run_flow=run_flow,
         emit_run_error=lambda channel, content: emit_chat_event(channel, EVENT_RUN_ERROR, content=content),
         logger=logger,
+        flow_run_state=get_flow_run_state_store(),
     )
 
 
@@ -411,6 +414,7 @@ async def stream_flow_run(
             if body.prompt_input
             else None,
             node_ids=body.node_ids,
+            cached_node_ids=body.cached_node_ids,
         ),
         _build_stream_flow_run_dependencies(),
     )
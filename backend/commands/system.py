@@ -39,7 +39,8 @@ from ..models.chat import (
     SystemPromptSettings,
     ThinkingTagPromptInfo,
 )
-from ..providers import test_provider_connection
+from ..providers import invalidate_model_pool, test_provider_connection
+from ..services.flows.link_artifact_cache import invalidate_link_artifacts
 from ..services.models.model_factory import (
     get_enabled_providers as get_enabled_providers_from_factory,
 )
@@ -239,6 +240,8 @@ async def save_provider_settings(body: SaveProviderConfigInput) -> None:
             base_url=body.baseUrl,
             extra=body.extra,
         )
+    invalidate_model_pool()
+    invalidate_link_artifacts("providers")
 
 
 def _safe_parse_json(value: str | None):
@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from zynk import UploadFile, command, upload
 
 from ..models import normalize_override_tool_id, validate_renderer_override
+from ..services.flows.link_artifact_cache import invalidate_link_artifacts
 from ..services.flows.node_plugin_catalog import list_node_plugins as list_node_plugin_records
 from ..services.tools.mcp_manager import get_mcp_manager
 from ..services.tools.toolset_executor import get_toolset_executor
@@ -183,6 +184,7 @@ async def import_toolset(file: UploadFile) -> ImportToolsetResult:
         logger.info(f"Started {len(new_servers)} MCP server(s) from toolset")
     logger.info(f"Imported toolset '{toolset_id}' from {file.filename}")
     get_toolset_executor().clear_cache()
+    invalidate_link_artifacts("tools")
 
     return ImportToolsetResult(
         id=toolset["id"],
@@ -216,6 +218,7 @@ async def import_toolset_from_path(
         logger.info(f"Started {len(new_servers)} MCP server(s) from toolset")
     logger.info(f"Imported toolset '{toolset_id}' from directory {directory}")
     get_toolset_executor().clear_cache()
+    invalidate_link_artifacts("tools")
 
     return ImportToolsetResult(
         id=toolset["id"],
@@ -250,6 +253,7 @@ async def enable_toolset(body: EnableToolsetRequest) -> dict[str, Any]:
         await mcp_manager.disconnect_toolset_servers(body.id)
 
     get_toolset_executor().clear_cache()
+    invalidate_link_artifacts("tools")
     return {"success": True, "enabled": body.enabled}
 
 
@@ -260,6 +264,7 @@ async def uninstall_toolset(body: ToolsetIdRequest) -> dict[str, bool]:
     if not get_toolset_manager().uninstall(body.id):
         raise ValueError(f"Toolset '{body.id}' not found")
     get_toolset_executor().clear_cache()
+    invalidate_link_artifacts("tools")
     return {"success": True}
 
 
@@ -477,6 +482,7 @@ async def set_tool_override(body: SetToolOverrideRequest) -> ToolOverrideRespons
         sess.refresh(override)
 
         get_toolset_executor().clear_cache()
+        invalidate_link_artifacts("tools")
 
         return ToolOverrideResponse(
             toolset_id=override.toolset_id,
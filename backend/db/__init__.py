@@ -40,6 +40,13 @@ from .executions import (
     get_latest_node_run_id_for_message,
     update_execution_run,
 )
+from .model_catalog import (
+    delete_model_catalog_entries,
+    get_model_catalog_entries,
+    get_model_option_schemas,
+    put_model_catalog_entry,
+    put_model_option_schemas,
+)
 from .model_ops import (
     get_all_model_settings,
     get_model_settings,
@@ -54,11 +61,22 @@ from .models import (
     ExecutionRun,
     Message,
     Model,
+    ModelCatalogEntry,
+    ModelOptionSchemaEntry,
+    NodeOutputCacheEntry,
     ProviderSettings,
     ToolOverride,
     ToolsetMcpServer,
     UserSettings,
 )
+from .node_output_cache import (
+    clear_node_output_cache,
+    evict_node_output_cache,
+    get_node_output_cache_entry,
+    get_node_output_cache_size,
+    put_node_output_cache_entry,
+    touch_node_output_cache_entries,
+)
 from .providers import (
     get_all_provider_settings,
     get_provider_settings,
@@ -101,6 +119,9 @@ __all__ = [
     "ExecutionRun",
     "ExecutionEvent",
     "Model",
+    "ModelCatalogEntry",
+    "ModelOptionSchemaEntry",
+    "NodeOutputCacheEntry",
     "ProviderSettings",
     "ToolOverride",
     "ToolsetMcpServer",
@@ -164,4 +185,15 @@ __all__ = [
     "get_latest_node_event_payload_for_message",
     "get_latest_node_run_id_for_message",
     "get_execution_events",
+    "get_node_output_cache_entry",
+    "put_node_output_cache_entry",
+    "touch_node_output_cache_entries",
+    "get_node_output_cache_size",
+    "evict_node_output_cache",
+    "clear_node_output_cache",
+    "get_model_catalog_entries",
+    "put_model_catalog_entry",
+    "delete_model_catalog_entries",
+    "get_model_option_schemas",
+    "put_model_option_schemas",
 ]
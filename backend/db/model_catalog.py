@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from .models import ModelCatalogEntry, ModelOptionSchemaEntry
+
+
+def get_model_catalog_entries(sess: Session) -> dict[str, dict[str, Any]]:
+    return {
+        row.provider: {
+            "provider": row.provider,
+            "credentials_fingerprint": row.credentials_fingerprint,
+            "models_json": row.models_json,
+            "fetched_at": row.fetched_at,
+        }
+        for row in sess.scalars(select(ModelCatalogEntry))
+    }
+
+
+def put_model_catalog_entry(
+    sess: Session,
+    *,
+    provider: str,
+    credentials_fingerprint: str,
+    models_json: str,
+    fetched_at: str,
+) -> None:
+    entry = sess.get(ModelCatalogEntry, provider)
+    if entry is None:
+        sess.add(
+            ModelCatalogEntry(
+                provider=provider,
+                credentials_fingerprint=credentials_fingerprint,
+                models_json=models_json,
+                fetched_at=fetched_at,
+            )
+        )
+    else:
+        entry.credentials_fingerprint = credentials_fingerprint
+        entry.models_json = models_json
+        entry.fetched_at = fetched_at
+    sess.commit()
+
+
+def delete_model_catalog_entries(sess: Session, provider: str | None = None) -> None:
+    for model in (ModelCatalogEntry, ModelOptionSchemaEntry):
+        stmt = delete(model)
+        if provider is not None:
+            stmt = stmt.where(model.provider == provider)
+        sess.execute(stmt)
+    sess.commit()
+
+
+def get_model_option_schemas(sess: Session) -> dict[str, dict[str, tuple[str, str]]]:
+    """Persisted option schemas as `{provider: {model_id: (schema_version, options_json)}}`."""
+    result: dict[str, dict[str, tuple[str, str]]] = {}
+    for row in sess.scalars(select(ModelOptionSchemaEntry)):
+        result.setdefault(row.provider, {})[row.model_id] = (row.schema_version, row.options_json)
+    return result
+
+
+def put_model_option_schemas(
+    sess: Session,
+    *,
+    provider: str,
+    schemas: dict[str, tuple[str, str]],
+) -> None:
+    for model_id, (schema_version, options_json) in schemas.items():
+        entry = sess.get(ModelOptionSchemaEntry, (provider, model_id))
+        if entry is None:
+            sess.add(
+                ModelOptionSchemaEntry(
+                    provider=provider,
+                    model_id=model_id,
+                    schema_version=schema_version,
+                    options_json=options_json,
+                )
+            )
+        else:
+            entry.schema_version = schema_version
+            entry.options_json = options_json
+    sess.commit()
@@ -133,6 +133,39 @@ class ExecutionEvent(Base):
     )
 
 
+class NodeOutputCacheEntry(Base):
+    __tablename__ = "node_output_cache"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    node_type: Mapped[str] = mapped_column(String, nullable=False)
+    outputs_json: Mapped[str] = mapped_column(Text, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[str] = mapped_column(String, nullable=False)
+    last_used_at: Mapped[str] = mapped_column(String, nullable=False)
+
+    __table_args__ = (
+        Index("ix_node_output_cache_last_used", "last_used_at"),
+    )
+
+
+class ModelCatalogEntry(Base):
+    __tablename__ = "model_catalog"
+
+    provider: Mapped[str] = mapped_column(String, primary_key=True)
+    credentials_fingerprint: Mapped[str] = mapped_column(String, nullable=False)
+    models_json: Mapped[str] = mapped_column(Text, nullable=False)
+    fetched_at: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class ModelOptionSchemaEntry(Base):
+    __tablename__ = "model_option_schemas"
+
+    provider: Mapped[str] = mapped_column(String, primary_key=True)
+    model_id: Mapped[str] = mapped_column(String, primary_key=True)
+    schema_version: Mapped[str] = mapped_column(String, nullable=False)
+    options_json: Mapped[str] = mapped_column(Text, nullable=False)
+
+
 class ToolsetMcpServer(Base):
     __tablename__ = "toolset_mcp_servers"
 
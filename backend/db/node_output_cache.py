@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from .models import NodeOutputCacheEntry
+
+
+def get_node_output_cache_entry(sess: Session, *, key: str) -> str | None:
+    return sess.scalar(
+        select(NodeOutputCacheEntry.outputs_json).where(NodeOutputCacheEntry.key == key)
+    )
+
+
+def touch_node_output_cache_entries(sess: Session, *, last_used: dict[str, str]) -> None:
+    """Record when each key was last read."""
+    if not last_used:
+        return
+    sess.execute(
+        update(NodeOutputCacheEntry),
+        [{"key": key, "last_used_at": used_at} for key, used_at in last_used.items()],
+    )
+    sess.commit()
+
+
+def get_node_output_cache_size(sess: Session) -> int:
+    return sess.scalar(select(func.coalesce(func.sum(NodeOutputCacheEntry.size), 0))) or 0
+
+
+def put_node_output_cache_entry(
+    sess: Session,
+    *,
+    key: str,
+    node_type: str,
+    outputs_json: str,
+) -> int:
+    """Insert or replace an entry; returns the change in total cache size."""
+    now = datetime.now(UTC).isoformat()
+    size = len(outputs_json.encode("utf-8"))
+    entry = sess.get(NodeOutputCacheEntry, key)
+    previous_size = entry.size if entry is not None else 0
+    if entry is None:
+        sess.add(
+            NodeOutputCacheEntry(
+                key=key,
+                node_type=node_type,
+                outputs_json=outputs_json,
+                size=size,
+                created_at=now,
+                last_used_at=now,
+            )
+        )
+    else:
+        entry.outputs_json = outputs_json
+        entry.size = size
+        entry.last_used_at = now
+    sess.commit()
+    return size - previous_size
+
+
+def evict_node_output_cache(sess: Session, *, max_bytes: int) -> int:
+    """Delete least-recently-used entries until the total size fits max_bytes."""
+    total = get_node_output_cache_size(sess)
+    if total <= max_bytes:
+        return 0
+
+    evicted: list[str] = []
+    rows = sess.execute(
+        select(NodeOutputCacheEntry.key, NodeOutputCacheEntry.size).order_by(
+            NodeOutputCacheEntry.last_used_at.asc()
+        )
+    )
+    for key, size in rows:
+        if total <= max_bytes:
+            break
+        evicted.append(key)
+        total -= size
+
+    if evicted:
+        sess.execute(delete(NodeOutputCacheEntry).where(NodeOutputCacheEntry.key.in_(evicted)))
+        sess.commit()
+    return len(evicted)
+
+
+def clear_node_output_cache(sess: Session) -> None:
+    sess.execute(delete(NodeOutputCacheEntry))
+    sess.commit()
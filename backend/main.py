@@ -9,13 +9,18 @@ from zynk.codegen import generate_client
 import zynk.generators.effect  # noqa: F401  registers the "effect" generator
 
 import nodes
+from nodes.data.code.sandbox import shutdown_code_sandbox
 from backend.services.plugins.plugin_registry import _DEFAULT_PLUGIN_REGISTRY
 
 nodes.init(_DEFAULT_PLUGIN_REGISTRY)
 
 from . import commands  # noqa: F401
 from .db import init_database
+from .services.flows.flow_run_state import shutdown_flow_run_state
+from .services.flows.flow_worker_pool import shutdown_flow_workers
 from .services.flows.http_routes import register_http_routes
+from .services.http_clients import shutdown_http_clients
+from .services.models.model_selection import start_default_provider_preload
 from .services.node_providers.node_provider_registry import reload_node_provider_registry
 from .services.node_providers.node_route_index import rebuild_node_route_index
 from .services.renderers.registry import register_builtin_renderers
@@ -46,6 +51,7 @@ def main() -> int:
     register_builtin_loaders()
     register_builtin_renderers()
     _ensure_e2e_toolset()
+    start_default_provider_preload()
 
     repo_root = Path(__file__).parent.parent
     output_dir = repo_root / "app" / "python"
@@ -82,6 +88,10 @@ def main() -> int:
     app = Bridge(**bridge_kwargs)
     register_http_routes(app.app)
     app.on_shutdown(shutdown_mcp)
+    app.on_shutdown(shutdown_flow_run_state)
+    app.on_shutdown(shutdown_flow_workers)
+    app.on_shutdown(shutdown_code_sandbox)
+    app.on_shutdown(shutdown_http_clients)
 
     app.run(dev=dev_mode)
     return 0
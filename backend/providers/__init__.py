@@ -1,25 +1,27 @@
 from __future__ import annotations
 
+import ast
 import contextvars
+import hashlib
 import importlib
+import importlib.util
 import inspect
 import json
 import pkgutil
 import sys
 import types
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
-import litellm
-
 from .. import db
 from ..services.plugins.provider_plugin_manager import get_provider_plugin_manager
+from ._litellm import preload_litellm
 from ._manifest import MANIFEST_PROVIDERS
+from ._model_pool import get_model_pool, invalidate_model_pool, options_fingerprint
 from .adapters import ADAPTER_REGISTRY
 from .options import resolve_common_options
 
-litellm.drop_params = True
-
 PROVIDERS: dict[str, dict[str, Any]] = {}
 ALIASES: dict[str, str] = {}
 _MANIFEST_PROVIDER_IDS = {
@@ -32,6 +34,10 @@ _PLUGIN_STORE_PROVIDER_IDS = {
     "google_gemini_cli",
 }
 
+class ProviderUnavailableError(RuntimeError):
+    """A registered provider whose module cannot be imported in this install."""
+
+
 _credential_override: contextvars.ContextVar[
     tuple[str | None, str | None] | None
 ] = contextvars.ContextVar("credential_override", default=None)
@@ -56,15 +62,37 @@ def _normalize_provider_key(value: str) -> str:
     return value.lower().strip().replace("-", "_")
 
 
+def _source_version(*parts: Any) -> str:
+    """Short digest identifying the code and config a provider entry was built from."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, Path):
+            try:
+                part = part.read_bytes()
+            except OSError:
+                part = str(part)
+        digest.update(part if isinstance(part, bytes) else repr(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _callable_source(function: Any) -> Path | str:
+    module = sys.modules.get(getattr(function, "__module__", "") or "")
+    filename = getattr(module, "__file__", None)
+    return Path(filename) if filename else repr(function)
+
+
 def _register_provider(
     provider_id: str,
     entry: dict[str, Any],
     *,
     aliases: list[str] | None = None,
+    version: str = "",
 ) -> None:
     normalized_provider = _normalize_provider_key(provider_id)
     entry.setdefault("get_model_options", _default_get_model_options)
     entry.setdefault("resolve_options", _default_resolve_options)
+    entry.setdefault("version", version)
     PROVIDERS[normalized_provider] = entry
     for alias in aliases or []:
         normalized_alias = _normalize_provider_key(alias)
@@ -72,6 +100,14 @@ def _register_provider(
             ALIASES[normalized_alias] = normalized_provider
 
 
+def _unregister_provider(provider_id: str) -> None:
+    normalized_provider = _normalize_provider_key(provider_id)
+    PROVIDERS.pop(normalized_provider, None)
+    for alias, target in list(ALIASES.items()):
+        if target == normalized_provider:
+            ALIASES.pop(alias, None)
+
+
 def get_credentials(
     provider_name: str | None = None,
 ) -> tuple[str | None, str | None]:
@@ -129,6 +165,131 @@ def _get_caller_provider() -> str:
     raise RuntimeError("Could not detect provider name from caller")
 
 
+_DECLARED_SETTINGS = {"ALIASES", "POOL_MODELS"}
+
+
+def _read_module_declarations(name: str) -> tuple[set[str], dict[str, Any]] | None:
+    """Top-level names and settings of a provider module, read without importing it.
+
+    Returns None when the module has no readable source or its settings are
+    not literals, in which case it has to be imported to be registered.
+    Settings also carry `requires`, the top-level packages it imports.
+    """
+    path = Path(__path__[0]) / f"{name}.py"
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    names: set[str] = set()
+    requires: set[str] = set()
+    settings: dict[str, Any] = {"requires": requires}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update(alias.asname or alias.name.split(".")[0] for alias in node.names)
+            if isinstance(node, ast.Import):
+                requires.update(alias.name.split(".")[0] for alias in node.names)
+            elif node.level == 0 and node.module:
+                requires.add(node.module.split(".")[0])
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                names.add(target.id)
+                if target.id in _DECLARED_SETTINGS:
+                    try:
+                        settings[target.id] = ast.literal_eval(node.value)
+                    except ValueError:
+                        return None
+    return names, settings
+
+
+def _missing_packages(packages: set[str]) -> list[str]:
+    """Top-level packages that are not installed; checking them imports nothing."""
+    return sorted(
+        package
+        for package in packages
+        if package not in sys.modules and importlib.util.find_spec(package) is None
+    )
+
+
+class _LazyProviderModule:
+    """A provider module that is imported the first time one of its functions is called.
+
+    Provider modules pull in litellm and vendor SDKs, which dominate backend
+    start-up; deferring the import means only providers that are actually
+    used pay for it. Modules whose packages are missing are not registered
+    at all; one that still fails to import (a missing submodule, an
+    incompatible SDK version) is unregistered and raises
+    `ProviderUnavailableError`, as the eager loader used to skip it.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._module: types.ModuleType | None = None
+        self._error: Exception | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> types.ModuleType:
+        module = self._module
+        if module is not None:
+            return module
+        if self._error is None:
+            try:
+                module = self._module = importlib.import_module(f".{self.name}", __package__)
+                return module
+            except Exception as exc:
+                print(f"✗ {self.name}: {exc}")
+                _unregister_provider(self.name)
+                self._error = exc
+        raise ProviderUnavailableError(
+            f"Provider '{self.name}' is unavailable: {self._error}"
+        ) from self._error
+
+    def function(self, attr: str) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return getattr(self.load(), attr)(*args, **kwargs)
+
+        call.__name__ = call.__qualname__ = attr
+        call.__module__ = f"{__package__}.{self.name}"
+        return call
+
+    def preload(self) -> None:
+        module = self.load()
+        if "litellm_model" in vars(module):
+            preload_litellm()
+
+
+def _module_provider_entry(
+    name: str,
+    names: set[str],
+    settings: dict[str, Any],
+    resolve: Callable[[str], Callable[..., Any]],
+    preload: Callable[[], None] | None,
+) -> dict[str, Any] | None:
+    get_name = f"get_{name}_model"
+    if get_name not in names or "fetch_models" not in names:
+        return None
+    return {
+        "get_model": resolve(get_name),
+        "fetch_models": resolve("fetch_models"),
+        "test_connection": resolve("test_connection") if "test_connection" in names else None,
+        "get_model_options": resolve("get_model_options")
+        if "get_model_options" in names
+        else _default_get_model_options,
+        "resolve_options": resolve("resolve_options")
+        if "resolve_options" in names
+        else _default_resolve_options,
+        "pool_models": settings.get("POOL_MODELS", True),
+        "preload": preload,
+    }
+
+
 def _load_python_module_providers() -> None:
     for _, name, _ in pkgutil.iter_modules(__path__):
         if name.startswith("_") or name == "adapters":
@@ -141,29 +302,32 @@ def _load_python_module_providers() -> None:
         ):
             continue
         try:
-            module = importlib.import_module(f".{name}", __package__)
-            get_func = getattr(module, f"get_{name}_model", None)
-            fetch_func = getattr(module, "fetch_models", None)
-            test_func = getattr(module, "test_connection", None)
-            model_options_func = getattr(module, "get_model_options", None)
-            resolve_options_func = getattr(module, "resolve_options", None)
-
-            if not get_func or not fetch_func:
+            declarations = _read_module_declarations(name)
+            source = Path(__path__[0]) / f"{name}.py"
+            if declarations is not None:
+                names, settings = declarations
+                if _missing_packages(settings["requires"]):
+                    continue
+                lazy = _LazyProviderModule(name)
+                entry = _module_provider_entry(name, names, settings, lazy.function, lazy.preload)
+            else:
+                module = importlib.import_module(f".{name}", __package__)
+                source = Path(getattr(module, "__file__", None) or source)
+                names = set(vars(module))
+                settings = {key: getattr(module, key) for key in _DECLARED_SETTINGS & names}
+                entry = _module_provider_entry(
+                    name, names, settings, lambda attr: getattr(module, attr), None
+                )
+
+            if entry is None:
                 print(f"⚠ {name} missing required functions")
                 continue
 
             _register_provider(
                 name,
-                {
-                    "get_model": get_func,
-                    "fetch_models": fetch_func,
-                    "test_connection": test_func,
-                    "get_model_options": model_options_func
-                    or _default_get_model_options,
-                    "resolve_options": resolve_options_func
-                    or _default_resolve_options,
-                },
-                aliases=list(getattr(module, "ALIASES", []) or []),
+                entry,
+                aliases=list(settings.get("ALIASES", []) or []),
+                version=_source_version(source),
             )
         except Exception:
             continue
@@ -189,7 +353,12 @@ def _load_manifest_providers() -> None:
 
         try:
             entry = create(provider_id=normalized_provider, **cfg_dict)
-            _register_provider(normalized_provider, entry, aliases=list(aliases or []))
+            _register_provider(
+                normalized_provider,
+                entry,
+                aliases=list(aliases or []),
+                version=_source_version(cfg, _callable_source(create)),
+            )
             print(f"✓ {provider_id}")
         except Exception as e:
             print(f"✗ {provider_id}: {e}")
@@ -285,10 +454,12 @@ def _load_plugin_providers() -> None:
 
         try:
             entry = _load_plugin_entry(manifest)
+            entry.setdefault("pool_models", False)
             _register_provider(
                 normalized_provider,
                 entry,
                 aliases=list(manifest.aliases or []),
+                version=f"{manifest.id}@{manifest.version}",
             )
             print(f"✓ plugin:{manifest.id}")
         except Exception as e:
@@ -301,6 +472,15 @@ def reload_provider_registry() -> None:
     _load_python_module_providers()
     _load_manifest_providers()
     _load_plugin_providers()
+    invalidate_model_pool()
+
+    from backend.services.flows.link_artifact_cache import invalidate_link_artifacts  # noqa: PLC0415
+
+    invalidate_link_artifacts("providers")
+    # The schema memo imports this module, so it only holds entries once loaded.
+    schema_cache = sys.modules.get("backend.services.models.model_schema_cache")
+    if schema_cache is not None:
+        schema_cache.clear_option_schemas()
 
 
 reload_provider_registry()
@@ -331,12 +511,23 @@ def get_model(
             f"Unknown provider '{provider}'. Available: {', '.join(PROVIDERS.keys())}"
         )
     options = provider_options or {}
-    token = _instance_credential_context(provider, normalized)
-    try:
-        return PROVIDERS[normalized]["get_model"](model_id, provider_options=options)
-    finally:
-        if token is not None:
-            _credential_override.reset(token)
+
+    def build() -> Any:
+        token = _instance_credential_context(provider, normalized)
+        try:
+            return PROVIDERS[normalized]["get_model"](model_id, provider_options=dict(options))
+        finally:
+            if token is not None:
+                _credential_override.reset(token)
+
+    fingerprint = options_fingerprint(options)
+    if (
+        fingerprint is None
+        or not PROVIDERS[normalized].get("pool_models", True)
+        or _credential_override.get() is not None
+    ):
+        return build()
+    return get_model_pool().get((_normalize_provider_key(provider), model_id, fingerprint), build)
 
 
 async def fetch_provider_models(provider: str) -> list[dict[str, Any]]:
@@ -362,6 +553,12 @@ def get_provider_model_options(
     return PROVIDERS[provider]["get_model_options"](model_id, model_metadata)
 
 
+def get_provider_version(provider: str) -> str:
+    """Identifies the provider code and config behind `provider`'s option hooks."""
+    entry = PROVIDERS.get(_normalize(provider))
+    return str(entry.get("version") or "") if entry else ""
+
+
 def resolve_provider_options(
     provider: str,
     model_id: str,
@@ -374,6 +571,25 @@ def resolve_provider_options(
     return PROVIDERS[provider]["resolve_options"](model_id, model_options, node_params)
 
 
+def preload_provider(provider: str) -> bool:
+    """Import `provider`'s module and SDKs ahead of its first use.
+
+    Returns False for unknown providers, for providers with nothing to
+    preload and for providers whose module turns out not to import.
+    """
+    normalized = _normalize(provider)
+    if normalized not in PROVIDERS:
+        return False
+    preload = PROVIDERS[normalized].get("preload")
+    if not callable(preload):
+        return False
+    try:
+        preload()
+    except ProviderUnavailableError:
+        return False
+    return True
+
+
 def list_providers() -> list[str]:
     return list(PROVIDERS.keys())
 
@@ -422,9 +638,13 @@ __all__ = [
     "test_provider_connection",
     "list_providers",
     "resolve_provider_options",
+    "get_provider_version",
+    "preload_provider",
+    "ProviderUnavailableError",
     "get_credentials",
     "get_api_key",
     "get_base_url",
     "get_extra_config",
     "reload_provider_registry",
+    "invalidate_model_pool",
 ]
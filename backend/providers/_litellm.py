@@ -0,0 +1,32 @@
+"""Deferred litellm import.
+
+litellm takes several seconds to import, so provider modules build their
+models through `litellm_model()` instead of importing agno's `LiteLLM` at
+module level. The first call imports litellm and applies the process-wide
+litellm settings; `preload_litellm()` does the same ahead of time.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
+
+
+@functools.cache
+def litellm_model_class() -> type[LiteLLM]:
+    import litellm  # noqa: PLC0415
+    from agno.models.litellm import LiteLLM  # noqa: PLC0415
+
+    litellm.drop_params = True
+    return LiteLLM
+
+
+def litellm_model(**kwargs: Any) -> LiteLLM:
+    return litellm_model_class()(**kwargs)
+
+
+def preload_litellm() -> None:
+    litellm_model_class()
@@ -0,0 +1,123 @@
+"""Process-wide pool of constructed provider models.
+
+`get_model` used to build a new agno model on every run: a credentials
+lookup, adapter setup and, once the first request goes out, a fresh SDK
+client. Pooled models are reused across runs instead, keyed by the provider
+(including instance IDs), the model ID, the credentials generation and a
+fingerprint of the resolved provider options. Agno models keep per-request
+state on the call stack rather than on the instance, so one pooled model can
+serve concurrent runs.
+
+The SDK async client a model creates on first use is bound to that event
+loop, so models are also keyed by the running loop (as `http_clients` keys
+its clients). A model pooled from a one-off `asyncio.run()` loop is never
+handed to the app's main loop, and entries of closed loops are dropped on
+the next miss.
+
+`invalidate_model_pool()` bumps the credentials generation and drops every
+entry; it is called whenever provider settings, OAuth credentials or the
+provider registry change. Providers whose models embed short-lived tokens
+opt out with `POOL_MODELS = False` on their module (or `"pool_models": False`
+on their entry); plugin providers have to opt in.
+
+`COVALT_MODEL_POOL_SIZE` caps the number of pooled models (default 64, `0`
+disables pooling).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import orjson
+
+MODEL_POOL_SIZE_ENV = "COVALT_MODEL_POOL_SIZE"
+DEFAULT_MAX_SIZE = 64
+
+
+def _max_size() -> int:
+    try:
+        return max(0, int(os.getenv(MODEL_POOL_SIZE_ENV, DEFAULT_MAX_SIZE)))
+    except ValueError:
+        return DEFAULT_MAX_SIZE
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def options_fingerprint(options: dict[str, Any]) -> bytes | None:
+    """Stable key material for resolved provider options, or None if they are not plain data."""
+    try:
+        return orjson.dumps(options, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return None
+
+
+class ModelPool:
+    def __init__(self, max_size: int | None = None) -> None:
+        self.max_size = _max_size() if max_size is None else max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Hashable, ...], Any] = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[Hashable, ...], build: Callable[[], Any]) -> Any:
+        """The pooled model for `key`, built with `build()` on a miss."""
+        loop = _running_loop()
+        with self._lock:
+            generation = self._generation
+            pooled_key = (generation, loop, *key)
+            model = self._entries.get(pooled_key)
+            if model is not None:
+                self._entries.move_to_end(pooled_key)
+                self.hits += 1
+                return model
+            self.misses += 1
+            self._drop_closed_loops()
+
+        model = build()
+        if self.max_size <= 0:
+            return model
+
+        with self._lock:
+            if generation != self._generation:
+                return model
+            model = self._entries.setdefault(pooled_key, model)
+            self._entries.move_to_end(pooled_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return model
+
+    def _drop_closed_loops(self) -> None:
+        closed = [key for key in self._entries if key[1] is not None and key[1].is_closed()]
+        for key in closed:
+            del self._entries[key]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_model_pool = ModelPool()
+
+
+def get_model_pool() -> ModelPool:
+    return _model_pool
+
+
+def invalidate_model_pool() -> None:
+    _model_pool.invalidate()
@@ -0,0 +1,198 @@
+"""Incremental server-sent events decoder for streaming providers.
+
+Providers that talk SSE directly (rather than through a vendor SDK) used to
+read `aiter_lines()`, which decodes every chunk to text and allocates a string
+per line before the `data:` prefix check and a `json.loads` per payload.
+`SSEDecoder` works on the raw byte chunks instead: it scans for line breaks
+in place, skips comments without slicing them, keeps the `data` bytes of
+single-line events as-is and only joins multi-line events.
+Payloads are decoded with orjson straight from bytes.
+
+Line handling follows the WHATWG event stream format (`\\n`, `\\r\\n` and `\\r`
+line endings, comments, `event`/`id`/`retry` fields, multi-line `data`), with
+one leniency: a pending event is still dispatched when the stream ends
+without a trailing blank line, as the line-based readers did.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+
+_LF = 0x0A
+_CR = 0x0D
+_COLON = 0x3A
+_DONE = b"[DONE]"
+_MAX_EVENT_NAMES = 256
+
+_event_names: dict[bytes, str] = {}
+
+
+def _event_name(value: bytes) -> str:
+    name = _event_names.get(value)
+    if name is None:
+        name = value.decode("utf-8", errors="replace") or "message"
+        if len(_event_names) < _MAX_EVENT_NAMES:
+            _event_names[value] = name
+    return name
+
+
+@dataclass(slots=True)
+class SSEEvent:
+    data: bytes
+    event: str = "message"
+    id: str | None = None
+    retry: int | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.data.strip() == _DONE
+
+    def json(self) -> Any:
+        """The decoded JSON payload, or None for `[DONE]`, empty or malformed data."""
+        try:
+            return orjson.loads(self.data)
+        except orjson.JSONDecodeError:
+            return None
+
+
+class SSEDecoder:
+    __slots__ = ("_buffer", "_cr", "_data", "_event", "_retry", "last_event_id")
+
+    def __init__(self) -> None:
+        self._buffer = b""
+        self._cr = False
+        self._data: list[bytes] = []
+        self._event: str | None = None
+        self._retry: int | None = None
+        self.last_event_id: str | None = None
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        """Events completed by `chunk`; an unfinished event is kept for the next call."""
+        if self._cr:
+            chunk = b"\r" + chunk
+            self._cr = False
+        if _CR in chunk:
+            if chunk.endswith(b"\r"):
+                # The matching "\n" may arrive with the next chunk.
+                chunk = chunk[:-1]
+                self._cr = True
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+        pending = self._buffer
+        buffer = pending + chunk if pending else chunk
+        if pending and buffer.find(b"\n\n", len(pending) - 1) < 0:
+            self._buffer = buffer
+            return []
+
+        # Events end at a blank line, so splitting on "\n\n" yields whole events
+        # and leaves the unfinished one in the last block.
+        blocks = buffer.split(b"\n\n")
+        self._buffer = blocks.pop()
+        events: list[SSEEvent] = []
+        append = events.append
+        last_event_id = self.last_event_id
+        for block in blocks:
+            if block.startswith(b"data:"):
+                if _LF not in block:
+                    append(SSEEvent(block[6:] if block[5:6] == b" " else block[5:], "message", last_event_id))
+                    continue
+            elif block.startswith(b"event:"):
+                # "event: <name>" followed by a single data line.
+                name, _, rest = block.partition(b"\n")
+                if rest.startswith(b"data:") and _LF not in rest:
+                    append(
+                        SSEEvent(
+                            rest[6:] if rest[5:6] == b" " else rest[5:],
+                            _event_name(name[7:] if name[6:7] == b" " else name[6:]),
+                            last_event_id,
+                        )
+                    )
+                    continue
+            if block:
+                self._block(block, events)
+                last_event_id = self.last_event_id
+        return events
+
+    def flush(self) -> list[SSEEvent]:
+        """Events still pending once the stream has ended."""
+        buffer, self._buffer, self._cr = self._buffer, b"", False
+        events: list[SSEEvent] = []
+        if buffer:
+            self._block(buffer, events)
+        return events
+
+    def _block(self, block: bytes, events: list[SSEEvent]) -> None:
+        for line in block.split(b"\n"):
+            if not line:
+                self._dispatch(events)
+            elif line[:5] == b"data:":
+                self._data.append(line[6:] if line[5:6] == b" " else line[5:])
+            elif line[0] != _COLON:
+                self._field(line)
+        self._dispatch(events)
+
+    def _field(self, line: bytes) -> None:
+        name, colon, value = line.partition(b":")
+        if colon and value[:1] == b" ":
+            value = value[1:]
+
+        if name == b"data":
+            self._data.append(value)
+        elif name == b"event":
+            self._event = _event_name(value)
+        elif name == b"id":
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8", errors="replace")
+        elif name == b"retry":
+            if value.isdigit():
+                self._retry = int(value)
+
+    def _dispatch(self, events: list[SSEEvent]) -> None:
+        data = self._data
+        if data:
+            events.append(
+                SSEEvent(
+                    data=data[0] if len(data) == 1 else b"\n".join(data),
+                    event=self._event or "message",
+                    id=self.last_event_id,
+                    retry=self._retry,
+                )
+            )
+            self._data = []
+        self._event = None
+        self._retry = None
+
+
+def iter_sse_events(chunks: Iterable[bytes]) -> Iterator[SSEEvent]:
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.flush()
+
+
+async def aiter_sse_events(chunks: AsyncIterable[bytes]) -> AsyncIterator[SSEEvent]:
+    decoder = SSEDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+    for event in decoder.flush():
+        yield event
+
+
+def iter_sse_json(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """JSON payloads of a byte stream's events, skipping `[DONE]` and malformed data."""
+    for event in iter_sse_events(chunks):
+        payload = event.json()
+        if payload is not None:
+            yield payload
+
+
+async def aiter_sse_json(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    async for event in aiter_sse_events(chunks):
+        payload = event.json()
+        if payload is not None:
+            yield payload
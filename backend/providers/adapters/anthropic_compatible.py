@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import Any
-
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ...services.http_clients import get_async_client
 from .. import get_credentials
+from .._litellm import litellm_model, preload_litellm
 from . import register_adapter
 
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
+
 
 def _models_url(base_url: str) -> str:
     base = base_url.rstrip("/")
@@ -34,7 +36,7 @@ def create_provider(
         if resolved:
             options.setdefault("api_base", resolved)
 
-        return LiteLLM(
+        return litellm_model(
             id=f"anthropic/{model_id}",
             api_key=api_key,
             **options,
@@ -45,26 +47,27 @@ def create_provider(
         if not api_key or not resolved:
             return []
 
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(
-                _models_url(resolved),
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": anthropic_version,
-                },
-            )
-            if not response.is_success:
-                return []
-
-            models = response.json().get("data", [])
-            return [
-                {
-                    "id": model.get("id"),
-                    "name": model.get("display_name") or model.get("id"),
-                }
-                for model in models
-                if model.get("id")
-            ]
+        client = get_async_client(resolved)
+        response = await client.get(
+            _models_url(resolved),
+            headers={
+                "x-api-key": api_key,
+                "anthropic-version": anthropic_version,
+            },
+            timeout=5,
+        )
+        if not response.is_success:
+            return []
+
+        models = response.json().get("data", [])
+        return [
+            {
+                "id": model.get("id"),
+                "name": model.get("display_name") or model.get("id"),
+            }
+            for model in models
+            if model.get("id")
+        ]
 
     async def test_connection() -> tuple[bool, str | None]:
         api_key, _, resolved = _resolve_credentials()
@@ -73,28 +76,30 @@ def create_provider(
         if not resolved:
             return False, "Base URL not configured"
 
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(
-                _models_url(resolved),
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": anthropic_version,
-                },
-            )
+        client = get_async_client(resolved)
+        response = await client.get(
+            _models_url(resolved),
+            headers={
+                "x-api-key": api_key,
+                "anthropic-version": anthropic_version,
+            },
+            timeout=5,
+        )
 
-            if response.is_success or response.status_code == 400:
-                return True, None
-            if response.status_code == 401:
-                return False, "Invalid API key"
-            if response.status_code == 403:
-                return False, "Access forbidden - check API key permissions"
+        if response.is_success or response.status_code == 400:
+            return True, None
+        if response.status_code == 401:
+            return False, "Invalid API key"
+        if response.status_code == 403:
+            return False, "Access forbidden - check API key permissions"
 
-            return False, f"API returned status {response.status_code}"
+        return False, f"API returned status {response.status_code}"
 
     return {
         "get_model": get_model,
         "fetch_models": fetch_models,
         "test_connection": test_connection,
+        "preload": preload_litellm,
     }
 
 
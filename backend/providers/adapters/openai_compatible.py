@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from typing import Any
-
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ...services.http_clients import get_async_client
 from .. import get_credentials
+from .._litellm import litellm_model, preload_litellm
 from ..openai_like import _fetch_from_openai_endpoint
 from . import register_adapter
 
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
+
 
 def create_provider(
     provider_id: str,
@@ -20,7 +22,7 @@ def create_provider(
         resolved = custom_base_url or base_url
         if not resolved:
             raise RuntimeError("Base URL not configured in Settings.")
-        return LiteLLM(
+        return litellm_model(
             id=f"openai/{model_id}",
             api_key=api_key or "custom",
             api_base=resolved,
@@ -44,17 +46,17 @@ def create_provider(
         base = resolved.rstrip("/")
         url = f"{base}/models" if base.endswith("/v1") else f"{base}/v1/models"
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.get(
-                    url, headers={"Authorization": f"Bearer {api_key}"}
-                )
-                if response.is_success:
-                    return True, None
-                if response.status_code == 401:
-                    return False, "Invalid API key"
-                if response.status_code == 403:
-                    return False, "Access forbidden - check API key permissions"
-                return False, f"API returned status {response.status_code}"
+            client = get_async_client(url)
+            response = await client.get(
+                url, headers={"Authorization": f"Bearer {api_key}"}, timeout=5
+            )
+            if response.is_success:
+                return True, None
+            if response.status_code == 401:
+                return False, "Invalid API key"
+            if response.status_code == 403:
+                return False, "Access forbidden - check API key permissions"
+            return False, f"API returned status {response.status_code}"
         except Exception as e:
             return False, f"Connection failed: {str(e)[:100]}"
 
@@ -62,6 +64,7 @@ def create_provider(
         "get_model": get_model,
         "fetch_models": fetch_models,
         "test_connection": test_connection,
+        "preload": preload_litellm,
     }
 
 
@@ -1,12 +1,17 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_api_key
+from ._litellm import litellm_model
 from .options import resolve_common_options
 
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
+
 ALIASES = ["claude"]
+ANTHROPIC_MODELS_URL = "https://api.anthropic.com/v1/models"
 
 
 def resolve_options(
@@ -40,7 +45,7 @@ def get_anthropic_model(
     if not api_key:
         raise RuntimeError("Anthropic API key not configured in Settings.")
 
-    return LiteLLM(id=f"anthropic/{model_id}", api_key=api_key, **provider_options)
+    return litellm_model(id=f"anthropic/{model_id}", api_key=api_key, **provider_options)
 
 
 async def fetch_models() -> list[dict[str, Any]]:
@@ -48,25 +53,26 @@ async def fetch_models() -> list[dict[str, Any]]:
     if not api_key:
         return []
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(
-            "https://api.anthropic.com/v1/models",
-            headers={"x-api-key": api_key, "anthropic-version": "2023-06-01"},
-        )
-
-        if response.is_success:
-            models = response.json().get("data", [])
-            return [
-                {
-                    "id": m["id"],
-                    "name": m.get("display_name", m["id"]),
-                    "supports_thinking": _supports_thinking(m["id"]),
-                    "max_output_tokens": _coerce_positive_int(
-                        m.get("max_output_tokens"), default=8192
-                    ),
-                }
-                for m in models
-            ]
+    client = get_async_client(ANTHROPIC_MODELS_URL)
+    response = await client.get(
+        ANTHROPIC_MODELS_URL,
+        headers={"x-api-key": api_key, "anthropic-version": "2023-06-01"},
+        timeout=5,
+    )
+
+    if response.is_success:
+        models = response.json().get("data", [])
+        return [
+            {
+                "id": m["id"],
+                "name": m.get("display_name", m["id"]),
+                "supports_thinking": _supports_thinking(m["id"]),
+                "max_output_tokens": _coerce_positive_int(
+                    m.get("max_output_tokens"), default=8192
+                ),
+            }
+            for m in models
+        ]
 
     return []
 
@@ -138,20 +144,21 @@ async def test_connection() -> tuple[bool, str | None]:
     if not api_key:
         return False, "API key not configured"
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(
-            "https://api.anthropic.com/v1/models",
-            headers={"x-api-key": api_key, "anthropic-version": "2023-06-01"},
-        )
+    client = get_async_client(ANTHROPIC_MODELS_URL)
+    response = await client.get(
+        ANTHROPIC_MODELS_URL,
+        headers={"x-api-key": api_key, "anthropic-version": "2023-06-01"},
+        timeout=5,
+    )
 
-        if response.is_success or response.status_code == 400:
-            return True, None
-        if response.status_code == 401:
-            return False, "Invalid API key"
-        if response.status_code == 403:
-            return False, "Access forbidden - check API key permissions"
+    if response.is_success or response.status_code == 400:
+        return True, None
+    if response.status_code == 401:
+        return False, "Invalid API key"
+    if response.status_code == 403:
+        return False, "Access forbidden - check API key permissions"
 
-        return False, f"API returned status {response.status_code}"
+    return False, f"API returned status {response.status_code}"
 
 
 def _supports_thinking(model_id: str) -> bool:
@@ -1,9 +1,13 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_credentials
+from ._litellm import litellm_model
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
 
 DEFAULT_PAGE_SIZE = 1000
 MAX_PAGE_COUNT = 5
@@ -35,7 +39,7 @@ def get_cohere_model(model_id: str, provider_options: dict[str, Any]) -> LiteLLM
     if _should_pass_api_base(base_url):
         options["api_base"] = _normalize_base_url(base_url)
 
-    return LiteLLM(
+    return litellm_model(
         id=f"cohere_chat/{model_id}",
         api_key=api_key or "custom",
         **options,
@@ -59,46 +63,46 @@ async def fetch_models() -> list[dict[str, Any]]:
     next_page_token: str | None = None
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            for _ in range(MAX_PAGE_COUNT):
-                params: dict[str, Any] = {"page_size": DEFAULT_PAGE_SIZE}
-                if next_page_token:
-                    params["page_token"] = next_page_token
-
-                response = await client.get(url, headers=headers, params=params)
-                if not response.is_success:
-                    return []
-
-                payload = response.json()
-                batch = payload.get("models") or payload.get("data") or []
-                if not isinstance(batch, list):
-                    break
-
-                for model in batch:
-                    if not isinstance(model, dict):
-                        continue
-                    model_id = str(model.get("id") or model.get("name") or "").strip()
-                    if not model_id:
-                        continue
-                    endpoints = model.get("endpoints")
-                    if isinstance(endpoints, list) and endpoints and "chat" not in endpoints:
-                        continue
-                    features = model.get("features")
-                    supports_tools: bool | None = None
-                    if isinstance(features, list):
-                        supports_tools = "tools" in features
-                    models.append(
-                        {
-                            "id": model_id,
-                            "name": str(model.get("name") or model_id),
-                            **({"supports_tools": supports_tools} if supports_tools is not None else {}),
-                            **{k: v for k, v in model.items() if k not in {"id", "name"}},
-                        }
-                    )
-
-                next_page_token = payload.get("next_page_token")
-                if not next_page_token:
-                    break
+        client = get_async_client(url)
+        for _ in range(MAX_PAGE_COUNT):
+            params: dict[str, Any] = {"page_size": DEFAULT_PAGE_SIZE}
+            if next_page_token:
+                params["page_token"] = next_page_token
+
+            response = await client.get(url, headers=headers, params=params, timeout=5)
+            if not response.is_success:
+                return []
+
+            payload = response.json()
+            batch = payload.get("models") or payload.get("data") or []
+            if not isinstance(batch, list):
+                break
+
+            for model in batch:
+                if not isinstance(model, dict):
+                    continue
+                model_id = str(model.get("id") or model.get("name") or "").strip()
+                if not model_id:
+                    continue
+                endpoints = model.get("endpoints")
+                if isinstance(endpoints, list) and endpoints and "chat" not in endpoints:
+                    continue
+                features = model.get("features")
+                supports_tools: bool | None = None
+                if isinstance(features, list):
+                    supports_tools = "tools" in features
+                models.append(
+                    {
+                        "id": model_id,
+                        "name": str(model.get("name") or model_id),
+                        **({"supports_tools": supports_tools} if supports_tools is not None else {}),
+                        **{k: v for k, v in model.items() if k not in {"id", "name"}},
+                    }
+                )
+
+            next_page_token = payload.get("next_page_token")
+            if not next_page_token:
+                break
     except Exception as e:
         print(f"[cohere] Failed to fetch models: {e}")
         return []
@@ -146,17 +150,17 @@ async def test_connection() -> tuple[bool, str | None]:
         url = f"{base}/v2/models"
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(
-                url, headers={"Authorization": f"Bearer {api_key}"}
-            )
-
-            if response.is_success:
-                return True, None
-            if response.status_code == 401:
-                return False, "Invalid API key"
-            if response.status_code == 403:
-                return False, "Access forbidden - check API key permissions"
-            return False, f"API returned status {response.status_code}"
+        client = get_async_client(url)
+        response = await client.get(
+            url, headers={"Authorization": f"Bearer {api_key}"}, timeout=5
+        )
+
+        if response.is_success:
+            return True, None
+        if response.status_code == 401:
+            return False, "Invalid API key"
+        if response.status_code == 403:
+            return False, "Access forbidden - check API key permissions"
+        return False, f"API returned status {response.status_code}"
     except Exception as e:
         return False, f"Connection failed: {str(e)[:100]}"
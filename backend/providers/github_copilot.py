@@ -5,7 +5,6 @@ from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass
 from typing import Any
 
-import httpx
 from agno.exceptions import ModelProviderError
 from agno.models.base import Model
 from agno.models.litellm import LiteLLM
@@ -15,9 +14,14 @@ from agno.models.openai.responses import OpenAIResponses
 from agno.models.response import ModelResponse
 from openai.types.responses import ResponseReasoningItem
 
+from ..services.http_clients import get_async_client, get_client
 from ..services.models.models_dev import fetch_models_dev_provider
 from ..services.models.provider_oauth_manager import get_provider_oauth_manager
 from ..services.tools.tool_name_sanitizer import ToolNameSanitizer
+from ._sse import aiter_sse_json, iter_sse_json
+
+# Models carry a short-lived OAuth access token, so they are rebuilt per run.
+POOL_MODELS = False
 
 COPILOT_HEADERS = {
     "User-Agent": "GitHubCopilotChat/0.35.0",
@@ -515,30 +519,20 @@ class CopilotAnthropicModel(Model):
         url = self._build_messages_url()
         tool_state: dict[int, dict[str, Any]] = {}
 
-        with httpx.Client(timeout=60.0) as client:
-            with client.stream(
-                "POST", url, json=request_body, headers=headers
-            ) as response:
-                if response.status_code != 200:
-                    error_text = response.read().decode("utf-8", errors="replace")
-                    raise ModelProviderError(
-                        message=error_text,
-                        status_code=response.status_code,
-                        model_name=self.name,
-                        model_id=self.id,
-                    )
-                for line in response.iter_lines():
-                    if not line or not line.startswith("data:"):
-                        continue
-                    payload = line[5:].strip()
-                    if not payload or payload == "[DONE]":
-                        continue
-                    try:
-                        data = json.loads(payload)
-                    except Exception:
-                        continue
-                    for delta in self._parse_stream_event(data, tool_state):
-                        yield delta
+        with get_client(url).stream(
+            "POST", url, json=request_body, headers=headers, timeout=60.0
+        ) as response:
+            if response.status_code != 200:
+                error_text = response.read().decode("utf-8", errors="replace")
+                raise ModelProviderError(
+                    message=error_text,
+                    status_code=response.status_code,
+                    model_name=self.name,
+                    model_id=self.id,
+                )
+            for data in iter_sse_json(response.iter_bytes()):
+                if isinstance(data, dict):
+                    yield from self._parse_stream_event(data, tool_state)
 
     async def _invoke_stream_async(
         self,
@@ -552,32 +546,24 @@ class CopilotAnthropicModel(Model):
         url = self._build_messages_url()
         tool_state: dict[int, dict[str, Any]] = {}
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            async with client.stream(
-                "POST", url, json=request_body, headers=headers
-            ) as response:
-                if response.status_code != 200:
-                    error_text = (await response.aread()).decode(
-                        "utf-8", errors="replace"
-                    )
-                    raise ModelProviderError(
-                        message=error_text,
-                        status_code=response.status_code,
-                        model_name=self.name,
-                        model_id=self.id,
-                    )
-                async for line in response.aiter_lines():
-                    if not line or not line.startswith("data:"):
-                        continue
-                    payload = line[5:].strip()
-                    if not payload or payload == "[DONE]":
-                        continue
-                    try:
-                        data = json.loads(payload)
-                    except Exception:
-                        continue
-                    for delta in self._parse_stream_event(data, tool_state):
-                        yield delta
+        async with get_async_client(url).stream(
+            "POST", url, json=request_body, headers=headers, timeout=60.0
+        ) as response:
+            if response.status_code != 200:
+                error_text = (await response.aread()).decode(
+                    "utf-8", errors="replace"
+                )
+                raise ModelProviderError(
+                    message=error_text,
+                    status_code=response.status_code,
+                    model_name=self.name,
+                    model_id=self.id,
+                )
+            async for data in aiter_sse_json(response.aiter_bytes()):
+                if not isinstance(data, dict):
+                    continue
+                for delta in self._parse_stream_event(data, tool_state):
+                    yield delta
 
     def _parse_stream_event(
         self, event: dict[str, Any], tool_state: dict[int, dict[str, Any]]
@@ -702,11 +688,10 @@ async def _fetch_copilot_models_from_api(
 
     for url in urls:
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url, headers=headers)
-                if not response.is_success:
-                    continue
-                payload = response.json()
+            response = await get_async_client(url).get(url, headers=headers, timeout=10)
+            if not response.is_success:
+                continue
+            payload = response.json()
         except Exception:
             continue
 
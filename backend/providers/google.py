@@ -1,15 +1,20 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
 from .. import db
+from ..services.http_clients import get_async_client
 from . import get_api_key, get_extra_config
+from ._litellm import litellm_model
 from .options import resolve_common_options
 
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
+
 ALIASES = ["gemini", "google_ai_studio"]
 GOOGLE_THINKING_BUDGET_MAX = 32768
 VERTEX_THINKING_BUDGET_MAX = 24576
+GOOGLE_API_BASE = "https://generativelanguage.googleapis.com"
 
 
 def get_google_model(
@@ -45,7 +50,7 @@ def get_google_model(
     if request_params:
         options["request_params"] = request_params
 
-    return LiteLLM(id=f"gemini/{model_id}", api_key=api_key, **options)
+    return litellm_model(id=f"gemini/{model_id}", api_key=api_key, **options)
 
 
 def resolve_options(
@@ -76,37 +81,37 @@ async def fetch_models() -> list[dict[str, Any]]:
         return []
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(
-                f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
-            )
+        client = get_async_client(GOOGLE_API_BASE)
+        response = await client.get(
+            f"{GOOGLE_API_BASE}/v1beta/models?key={api_key}", timeout=5
+        )
 
-            if not response.is_success:
-                return []
+        if not response.is_success:
+            return []
 
-            models = []
-            for m in response.json().get("models", []):
-                model_id = m.get("name", "").split("/")[-1] or m.get("baseModelId", "")
+        models = []
+        for m in response.json().get("models", []):
+            model_id = m.get("name", "").split("/")[-1] or m.get("baseModelId", "")
 
-                if not model_id:
-                    continue
+            if not model_id:
+                continue
 
-                max_output_tokens = _coerce_positive_int(
-                    m.get("outputTokenLimit"),
-                    default=8192,
-                )
-                model_info = {
-                    "id": model_id,
-                    "name": m.get("displayName", model_id),
-                    "supports_reasoning": m.get("thinking", False),
-                    "max_output_tokens": max_output_tokens,
-                }
-                models.append(model_info)
+            max_output_tokens = _coerce_positive_int(
+                m.get("outputTokenLimit"),
+                default=8192,
+            )
+            model_info = {
+                "id": model_id,
+                "name": m.get("displayName", model_id),
+                "supports_reasoning": m.get("thinking", False),
+                "max_output_tokens": max_output_tokens,
+            }
+            models.append(model_info)
 
-                if model_info["supports_reasoning"]:
-                    _save_reasoning_metadata(model_id)
+            if model_info["supports_reasoning"]:
+                _save_reasoning_metadata(model_id)
 
-            return models
+        return models
 
     except Exception as e:
         print(f"[google] Failed to fetch models: {e}")
@@ -168,17 +173,17 @@ async def test_connection() -> tuple[bool, str | None]:
     if not api_key:
         return False, "API key not configured"
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(
-            f"https://generativelanguage.googleapis.com/v1/models?key={api_key}"
-        )
+    client = get_async_client(GOOGLE_API_BASE)
+    response = await client.get(
+        f"{GOOGLE_API_BASE}/v1/models?key={api_key}", timeout=5
+    )
 
-        if response.is_success:
-            return True, None
-        if response.status_code in (401, 403):
-            return False, "Invalid API key"
+    if response.is_success:
+        return True, None
+    if response.status_code in (401, 403):
+        return False, "Invalid API key"
 
-        return False, f"API returned status {response.status_code}"
+    return False, f"API returned status {response.status_code}"
 
 
 def _save_reasoning_metadata(model_id: str):
@@ -7,13 +7,15 @@ from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass
 from typing import Any
 
-import httpx
 from agno.exceptions import ModelProviderError
 from agno.models.base import Model
 from agno.models.message import Message
 from agno.models.metrics import Metrics
 from agno.models.response import ModelResponse
 
+from ..services.http_clients import get_async_client, get_client
+from ._sse import aiter_sse_json, iter_sse_json
+
 DEFAULT_ENDPOINT = "https://cloudcode-pa.googleapis.com"
 ANTIGRAVITY_ENDPOINT_FALLBACKS = (
     "https://daily-cloudcode-pa.sandbox.googleapis.com",
@@ -311,39 +313,27 @@ class CloudCodeAssistModel(Model):
         headers = self._build_headers()
         last_error: ModelProviderError | None = None
 
-        with httpx.Client(timeout=60.0) as client:
-            for endpoint in self._get_endpoints():
-                url = f"{endpoint}/v1internal:streamGenerateContent?alt=sse"
-                with client.stream(
-                    "POST", url, json=request_body, headers=headers
-                ) as response:
-                    if response.status_code != 200:
-                        error_text = response.read().decode("utf-8", errors="replace")
-                        error = ModelProviderError(
-                            message=error_text,
-                            status_code=response.status_code,
-                            model_name=self.name,
-                            model_id=self.id,
-                        )
-                        last_error = error
-                        if self.is_antigravity and response.status_code == 404:
-                            continue
-                        raise error
-                    for line in response.iter_lines():
-                        if not line:
-                            continue
-                        if not line.startswith("data:"):
-                            continue
-                        payload = line[5:].strip()
-                        if not payload or payload == "[DONE]":
-                            continue
-                        try:
-                            data = json.loads(payload)
-                        except Exception:
-                            continue
-                        for delta in self._parse_stream_chunk(data):
-                            yield delta
-                    return
+        for endpoint in self._get_endpoints():
+            url = f"{endpoint}/v1internal:streamGenerateContent?alt=sse"
+            with get_client(url).stream(
+                "POST", url, json=request_body, headers=headers, timeout=60.0
+            ) as response:
+                if response.status_code != 200:
+                    error_text = response.read().decode("utf-8", errors="replace")
+                    error = ModelProviderError(
+                        message=error_text,
+                        status_code=response.status_code,
+                        model_name=self.name,
+                        model_id=self.id,
+                    )
+                    last_error = error
+                    if self.is_antigravity and response.status_code == 404:
+                        continue
+                    raise error
+                for data in iter_sse_json(response.iter_bytes()):
+                    if isinstance(data, dict):
+                        yield from self._parse_stream_chunk(data)
+                return
 
         if last_error is not None:
             raise last_error
@@ -359,41 +349,31 @@ class CloudCodeAssistModel(Model):
         headers = self._build_headers()
         last_error: ModelProviderError | None = None
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            for endpoint in self._get_endpoints():
-                url = f"{endpoint}/v1internal:streamGenerateContent?alt=sse"
-                async with client.stream(
-                    "POST", url, json=request_body, headers=headers
-                ) as response:
-                    if response.status_code != 200:
-                        error_text = (await response.aread()).decode(
-                            "utf-8", errors="replace"
-                        )
-                        error = ModelProviderError(
-                            message=error_text,
-                            status_code=response.status_code,
-                            model_name=self.name,
-                            model_id=self.id,
-                        )
-                        last_error = error
-                        if self.is_antigravity and response.status_code == 404:
-                            continue
-                        raise error
-                    async for line in response.aiter_lines():
-                        if not line:
-                            continue
-                        if not line.startswith("data:"):
-                            continue
-                        payload = line[5:].strip()
-                        if not payload or payload == "[DONE]":
-                            continue
-                        try:
-                            data = json.loads(payload)
-                        except Exception:
-                            continue
-                        for delta in self._parse_stream_chunk(data):
-                            yield delta
-                    return
+        for endpoint in self._get_endpoints():
+            url = f"{endpoint}/v1internal:streamGenerateContent?alt=sse"
+            async with get_async_client(url).stream(
+                "POST", url, json=request_body, headers=headers, timeout=60.0
+            ) as response:
+                if response.status_code != 200:
+                    error_text = (await response.aread()).decode(
+                        "utf-8", errors="replace"
+                    )
+                    error = ModelProviderError(
+                        message=error_text,
+                        status_code=response.status_code,
+                        model_name=self.name,
+                        model_id=self.id,
+                    )
+                    last_error = error
+                    if self.is_antigravity and response.status_code == 404:
+                        continue
+                    raise error
+                async for data in aiter_sse_json(response.aiter_bytes()):
+                    if not isinstance(data, dict):
+                        continue
+                    for delta in self._parse_stream_chunk(data):
+                        yield delta
+                return
 
         if last_error is not None:
             raise last_error
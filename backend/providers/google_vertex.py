@@ -1,9 +1,15 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_api_key
+from ._litellm import litellm_model
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
+
+GOOGLE_API_BASE = "https://generativelanguage.googleapis.com"
 
 
 def get_google_vertex_model(model_id: str, provider_options: dict[str, Any]) -> LiteLLM:
@@ -11,7 +17,7 @@ def get_google_vertex_model(model_id: str, provider_options: dict[str, Any]) ->
     if not api_key:
         raise RuntimeError("Google API key not configured in Settings.")
 
-    return LiteLLM(id=f"gemini/{model_id}", api_key=api_key, **provider_options)
+    return litellm_model(id=f"gemini/{model_id}", api_key=api_key, **provider_options)
 
 
 async def fetch_models() -> list[dict[str, Any]]:
@@ -19,20 +25,20 @@ async def fetch_models() -> list[dict[str, Any]]:
     if not api_key:
         return []
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(
-            f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
-        )
+    client = get_async_client(GOOGLE_API_BASE)
+    response = await client.get(
+        f"{GOOGLE_API_BASE}/v1beta/models?key={api_key}", timeout=5
+    )
 
-        if not response.is_success:
-            return []
+    if not response.is_success:
+        return []
 
-        models = []
-        for m in response.json().get("models", []):
-            model_id = m.get("name", "").split("/")[-1] or m.get("baseModelId", "")
-            if model_id:
-                models.append({"id": model_id, "name": m.get("displayName", model_id)})
-        return models
+    models = []
+    for m in response.json().get("models", []):
+        model_id = m.get("name", "").split("/")[-1] or m.get("baseModelId", "")
+        if model_id:
+            models.append({"id": model_id, "name": m.get("displayName", model_id)})
+    return models
 
 
 async def test_connection() -> tuple[bool, str | None]:
@@ -40,14 +46,14 @@ async def test_connection() -> tuple[bool, str | None]:
     if not api_key:
         return False, "API key not configured"
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(
-            f"https://generativelanguage.googleapis.com/v1/models?key={api_key}"
-        )
+    client = get_async_client(GOOGLE_API_BASE)
+    response = await client.get(
+        f"{GOOGLE_API_BASE}/v1/models?key={api_key}", timeout=5
+    )
 
-        if response.is_success:
-            return True, None
-        if response.status_code in (401, 403):
-            return False, "Invalid API key"
+    if response.is_success:
+        return True, None
+    if response.status_code in (401, 403):
+        return False, "Invalid API key"
 
-        return False, f"API returned status {response.status_code}"
+    return False, f"API returned status {response.status_code}"
@@ -1,9 +1,15 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_api_key
+from ._litellm import litellm_model
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
+
+GROQ_MODELS_URL = "https://api.groq.com/openai/v1/models"
 
 
 def get_groq_model(
@@ -15,7 +21,7 @@ def get_groq_model(
     if not api_key:
         raise RuntimeError("Groq API key not configured in Settings.")
 
-    return LiteLLM(id=f"groq/{model_id}", api_key=api_key, **provider_options)
+    return litellm_model(id=f"groq/{model_id}", api_key=api_key, **provider_options)
 
 
 async def fetch_models() -> list[dict[str, str]]:
@@ -23,15 +29,16 @@ async def fetch_models() -> list[dict[str, str]]:
     if not api_key:
         return []
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(
-            "https://api.groq.com/openai/v1/models",
-            headers={"Authorization": f"Bearer {api_key}"},
-        )
+    client = get_async_client(GROQ_MODELS_URL)
+    response = await client.get(
+        GROQ_MODELS_URL,
+        headers={"Authorization": f"Bearer {api_key}"},
+        timeout=5,
+    )
 
-        if response.is_success:
-            models = response.json().get("data", [])
-            return [{"id": m["id"], "name": m["id"]} for m in models]
+    if response.is_success:
+        models = response.json().get("data", [])
+        return [{"id": m["id"], "name": m["id"]} for m in models]
 
     return []
 
@@ -41,17 +48,18 @@ async def test_connection() -> tuple[bool, str | None]:
     if not api_key:
         return False, "API key not configured"
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(
-            "https://api.groq.com/openai/v1/models",
-            headers={"Authorization": f"Bearer {api_key}"},
-        )
-
-        if response.is_success:
-            return True, None
-        if response.status_code == 401:
-            return False, "Invalid API key"
-        if response.status_code == 403:
-            return False, "Access forbidden - check API key permissions"
-
-        return False, f"API returned status {response.status_code}"
+    client = get_async_client(GROQ_MODELS_URL)
+    response = await client.get(
+        GROQ_MODELS_URL,
+        headers={"Authorization": f"Bearer {api_key}"},
+        timeout=5,
+    )
+
+    if response.is_success:
+        return True, None
+    if response.status_code == 401:
+        return False, "Invalid API key"
+    if response.status_code == 403:
+        return False, "Access forbidden - check API key permissions"
+
+    return False, f"API returned status {response.status_code}"
@@ -1,9 +1,13 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_base_url, get_credentials
+from ._litellm import litellm_model
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
 
 
 def get_lmstudio_model(
@@ -15,7 +19,7 @@ def get_lmstudio_model(
     if not base_url:
         raise RuntimeError("LM Studio base URL not configured in Settings.")
 
-    return LiteLLM(
+    return litellm_model(
         id=f"openai/{model_id}",
         api_key=api_key or "lm-studio",
         api_base=base_url,
@@ -39,12 +43,12 @@ async def _fetch_from_openai_endpoint(
 
     headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(url, headers=headers)
+    client = get_async_client(url)
+    response = await client.get(url, headers=headers, timeout=5)
 
-        if response.is_success:
-            models = response.json().get("data", [])
-            return [{"id": m["id"], "name": m["id"]} for m in models]
+    if response.is_success:
+        models = response.json().get("data", [])
+        return [{"id": m["id"], "name": m["id"]} for m in models]
 
     return []
 
@@ -57,10 +61,10 @@ async def test_connection() -> tuple[bool, str | None]:
     base = base_url.rstrip("/")
     url = f"{base}/models" if base.endswith("/v1") else f"{base}/v1/models"
 
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.get(url)
+    client = get_async_client(url)
+    response = await client.get(url, timeout=5)
 
-        if response.is_success or response.status_code == 404:
-            return True, None
+    if response.is_success or response.status_code == 404:
+        return True, None
 
-        return False, f"Server returned status {response.status_code}"
+    return False, f"Server returned status {response.status_code}"
@@ -1,9 +1,13 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_base_url
+from ._litellm import litellm_model
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
 
 
 def get_ollama_model(
@@ -14,7 +18,7 @@ def get_ollama_model(
     if not host:
         raise RuntimeError("Ollama host not configured in Settings.")
 
-    return LiteLLM(id=f"ollama/{model_id}", api_base=host, **provider_options)
+    return litellm_model(id=f"ollama/{model_id}", api_base=host, **provider_options)
 
 
 async def fetch_models() -> list[dict[str, str]]:
@@ -23,16 +27,16 @@ async def fetch_models() -> list[dict[str, str]]:
         return []
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(f"{host}/api/tags")
-            if not response.is_success:
-                return []
-
-            return [
-                {"id": m["name"], "name": m["name"].split(":")[0].title()}
-                for m in response.json().get("models", [])
-                if m.get("name")
-            ]
+        client = get_async_client(host)
+        response = await client.get(f"{host}/api/tags", timeout=5)
+        if not response.is_success:
+            return []
+
+        return [
+            {"id": m["name"], "name": m["name"].split(":")[0].title()}
+            for m in response.json().get("models", [])
+            if m.get("name")
+        ]
     except Exception as e:
         print(f"[ollama] Failed to fetch models: {e}")
         return []
@@ -43,12 +47,12 @@ async def test_connection() -> tuple[bool, str | None]:
         return False, "Host URL not configured"
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(f"{host}/api/tags")
-            return (
-                (True, None)
-                if response.is_success
-                else (False, f"Server returned status {response.status_code}")
-            )
+        client = get_async_client(host)
+        response = await client.get(f"{host}/api/tags", timeout=5)
+        return (
+            (True, None)
+            if response.is_success
+            else (False, f"Server returned status {response.status_code}")
+        )
     except Exception as e:
         return False, f"Connection failed: {str(e)[:100]}"
@@ -1,9 +1,13 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_credentials
+from ._litellm import litellm_model
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
 
 
 def get_openai_model(
@@ -14,7 +18,7 @@ def get_openai_model(
     if not api_key:
         raise RuntimeError("OpenAI API key not configured in Settings.")
 
-    return LiteLLM(
+    return litellm_model(
         id=f"openai/{model_id}",
         api_key=api_key,
         api_base=base_url,
@@ -31,17 +35,17 @@ async def fetch_models() -> list[dict[str, str]]:
     url = f"{base}/models" if base.endswith("/v1") else f"{base}/v1/models"
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(
-                url, headers={"Authorization": f"Bearer {api_key}"}
-            )
-            if not response.is_success:
-                return []
-
-            return [
-                {"id": m["id"], "name": m["id"]}
-                for m in response.json().get("data", [])
-            ]
+        client = get_async_client(url)
+        response = await client.get(
+            url, headers={"Authorization": f"Bearer {api_key}"}, timeout=5
+        )
+        if not response.is_success:
+            return []
+
+        return [
+            {"id": m["id"], "name": m["id"]}
+            for m in response.json().get("data", [])
+        ]
     except Exception as e:
         print(f"[openai] Failed to fetch models: {e}")
         return []
@@ -94,17 +98,17 @@ async def test_connection() -> tuple[bool, str | None]:
     url = f"{base}/models" if base.endswith("/v1") else f"{base}/v1/models"
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(
-                url, headers={"Authorization": f"Bearer {api_key}"}
-            )
-
-            if response.is_success:
-                return True, None
-            if response.status_code == 401:
-                return False, "Invalid API key"
-            if response.status_code == 403:
-                return False, "Access forbidden - check API key permissions"
-            return False, f"API returned status {response.status_code}"
+        client = get_async_client(url)
+        response = await client.get(
+            url, headers={"Authorization": f"Bearer {api_key}"}, timeout=5
+        )
+
+        if response.is_success:
+            return True, None
+        if response.status_code == 401:
+            return False, "Invalid API key"
+        if response.status_code == 403:
+            return False, "Access forbidden - check API key permissions"
+        return False, f"API returned status {response.status_code}"
     except Exception as e:
         return False, f"Connection failed: {str(e)[:100]}"
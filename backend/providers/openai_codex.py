@@ -6,11 +6,11 @@ from datetime import date
 from pathlib import Path
 from typing import Any
 
-import httpx
 from agno.models.message import Message
 from agno.models.openai.responses import OpenAIResponses
 from openai.types.responses import ResponseReasoningItem
 
+from ..services.http_clients import get_async_client
 from ..services.models.provider_oauth_manager import get_provider_oauth_manager
 from .options import resolve_common_options
 
@@ -41,6 +41,9 @@ def _extract_system_instructions(messages: list[Message] | None) -> str:
     return ""
 
 
+# Models carry a short-lived OAuth access token, so they are rebuilt per run.
+POOL_MODELS = False
+
 TOOL_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
 CLIENT_VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d+$")
 
@@ -323,11 +326,10 @@ async def _fetch_codex_models_from_chatgpt(
     url = f"{CODEX_MODELS_URL}?client_version={client_version}"
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, headers=headers)
-            if not response.is_success:
-                return []
-            payload = response.json()
+        response = await get_async_client(url).get(url, headers=headers, timeout=10)
+        if not response.is_success:
+            return []
+        payload = response.json()
     except Exception as exc:
         print(f"[openai_codex] Failed to fetch models: {exc}")
         return []
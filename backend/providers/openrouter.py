@@ -1,9 +1,15 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_api_key
+from ._litellm import litellm_model
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
+
+OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
 
 
 def get_openrouter_model(
@@ -14,7 +20,7 @@ def get_openrouter_model(
     if not api_key:
         raise RuntimeError("OpenRouter API key not configured in Settings.")
 
-    return LiteLLM(
+    return litellm_model(
         id=f"openrouter/{model_id}",
         api_key=api_key,
         api_base="https://openrouter.ai/api/v1",
@@ -28,38 +34,40 @@ async def fetch_models() -> list[dict[str, str]]:
         return []
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(
-                "https://openrouter.ai/api/v1/models",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "HTTP-Referer": "https://github.com/sethburkart123/Covalt",
-                },
-            )
-            if not response.is_success:
-                return []
-
-            return [
-                {"id": m["id"], "name": m.get("name", m["id"])}
-                for m in response.json().get("data", [])
-            ]
+        client = get_async_client(OPENROUTER_MODELS_URL)
+        response = await client.get(
+            OPENROUTER_MODELS_URL,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "HTTP-Referer": "https://github.com/sethburkart123/Covalt",
+            },
+            timeout=10,
+        )
+        if not response.is_success:
+            return []
+
+        return [
+            {"id": m["id"], "name": m.get("name", m["id"])}
+            for m in response.json().get("data", [])
+        ]
     except Exception as e:
         print(f"[openrouter] Failed to fetch models: {e}")
         return []
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(
-                "https://openrouter.ai/api/v1/models",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "HTTP-Referer": "https://github.com/sethburkart123/Covalt",
-                },
-            )
-
-            if response.is_success:
-                models = response.json().get("data", [])
-                return [{"id": m["id"], "name": m.get("name", m["id"])} for m in models]
+        client = get_async_client(OPENROUTER_MODELS_URL)
+        response = await client.get(
+            OPENROUTER_MODELS_URL,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "HTTP-Referer": "https://github.com/sethburkart123/Covalt",
+            },
+            timeout=10,
+        )
+
+        if response.is_success:
+            models = response.json().get("data", [])
+            return [{"id": m["id"], "name": m.get("name", m["id"])} for m in models]
 
     except Exception as e:
         print(f"[openrouter] Failed to fetch models: {e}")
@@ -73,21 +81,22 @@ async def test_connection() -> tuple[bool, str | None]:
         return False, "API key not configured"
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(
-                "https://openrouter.ai/api/v1/models",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "HTTP-Referer": "https://github.com/sethburkart123/Covalt",
-                },
-            )
-
-            if response.is_success:
-                return True, None
-            if response.status_code == 401:
-                return False, "Invalid API key"
-            if response.status_code == 403:
-                return False, "Access forbidden - check API key permissions"
-            return False, f"API returned status {response.status_code}"
+        client = get_async_client(OPENROUTER_MODELS_URL)
+        response = await client.get(
+            OPENROUTER_MODELS_URL,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "HTTP-Referer": "https://github.com/sethburkart123/Covalt",
+            },
+            timeout=5,
+        )
+
+        if response.is_success:
+            return True, None
+        if response.status_code == 401:
+            return False, "Invalid API key"
+        if response.status_code == 403:
+            return False, "Access forbidden - check API key permissions"
+        return False, f"API returned status {response.status_code}"
     except Exception as e:
         return False, f"Connection failed: {str(e)[:100]}"
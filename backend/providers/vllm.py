@@ -1,9 +1,13 @@
-from typing import Any
+from __future__ import annotations
 
-import httpx
-from agno.models.litellm import LiteLLM
+from typing import TYPE_CHECKING, Any
 
+from ..services.http_clients import get_async_client
 from . import get_base_url, get_credentials
+from ._litellm import litellm_model
+
+if TYPE_CHECKING:
+    from agno.models.litellm import LiteLLM
 
 
 def get_vllm_model(
@@ -14,7 +18,7 @@ def get_vllm_model(
     if not base_url:
         raise RuntimeError("vLLM base URL not configured in Settings.")
 
-    return LiteLLM(
+    return litellm_model(
         id=f"openai/{model_id}",
         api_key=api_key or "dummy",
         api_base=base_url,
@@ -38,15 +42,15 @@ async def _fetch_from_openai_endpoint(
     headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(url, headers=headers)
-            if not response.is_success:
-                return []
-
-            return [
-                {"id": m["id"], "name": m["id"]}
-                for m in response.json().get("data", [])
-            ]
+        client = get_async_client(url)
+        response = await client.get(url, headers=headers, timeout=5)
+        if not response.is_success:
+            return []
+
+        return [
+            {"id": m["id"], "name": m["id"]}
+            for m in response.json().get("data", [])
+        ]
     except Exception as e:
         print(f"[vllm] Failed to fetch models: {e}")
         return []
@@ -61,12 +65,12 @@ async def test_connection() -> tuple[bool, str | None]:
     url = f"{base}/models" if base.endswith("/v1") else f"{base}/v1/models"
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.get(url)
-            return (
-                (True, None)
-                if response.is_success or response.status_code == 404
-                else (False, f"Server returned status {response.status_code}")
-            )
+        client = get_async_client(url)
+        response = await client.get(url, timeout=5)
+        return (
+            (True, None)
+            if response.is_success or response.status_code == 404
+            else (False, f"Server returned status {response.status_code}")
+        )
     except Exception as e:
         return False, f"Connection failed: {str(e)[:100]}"
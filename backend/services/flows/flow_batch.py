@@ -0,0 +1,298 @@
+"""Batch (map) execution of one flow over an NDJSON or CSV dataset.
+
+Each input row runs the flow once, with the row exposed like a webhook body
+(`$trigger.body`, webhook-trigger output) and as the chat message for
+chat-start flows. Rows run with bounded concurrency and share the compiled
+plan and a batch-wide cache of materialized link artifacts (tools, models).
+
+Results stream to an NDJSON file, one line per row:
+
+    {"index": 3, "status": "completed", "outputs": {...}}
+    {"index": 4, "status": "error", "error": "..."}
+
+The output file doubles as the checkpoint: on resume, rows whose index is
+already present are skipped and a torn trailing line is dropped. A small
+`<output>.checkpoint.json` sidecar tracks progress for monitoring, and
+`on_progress` is called after every row that is written.
+
+A `BatchRunHandle` stops the batch the way `stop_run` stops a single flow:
+no new rows start and every running row's execution gets `stop_run` set.
+Rows cut short are not written, so resuming the batch runs them again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import logging
+import types
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from nodes._types import NodeEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_CONCURRENCY = 4
+CHECKPOINT_EVERY = 50
+
+
+class InvalidBatchItem(ValueError):
+    """An input line that could not be parsed; recorded as a failed row."""
+
+
+@dataclass
+class BatchSummary:
+    batch_id: str
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    output_path: str = ""
+    cancelled: bool = False
+
+
+class BatchRunHandle:
+    """Run-control bridge for a batch; registered like a flow run handle."""
+
+    def __init__(self) -> None:
+        self._cancel_requested = False
+        self._executions: dict[int, Any] = {}
+
+    def track(self, execution: Any) -> None:
+        self._executions[id(execution)] = execution
+        if self._cancel_requested:
+            execution.stop_run = True
+
+    def untrack(self, execution: Any) -> None:
+        self._executions.pop(id(execution), None)
+
+    def request_cancel(self) -> None:
+        self._cancel_requested = True
+        for execution in list(self._executions.values()):
+            execution.stop_run = True
+
+    def cancel(self, run_id: str | None = None) -> None:
+        self.request_cancel()
+
+    def is_cancel_requested(self) -> bool:
+        return self._cancel_requested
+
+
+def read_batch_items(path: Path) -> Iterator[tuple[int, Any]]:
+    """Yield `(index, item)` for each NDJSON line or CSV row.
+
+    Unparseable NDJSON lines yield an `InvalidBatchItem` instead of raising, so
+    one bad row does not abort the batch.
+    """
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as handle:
+            for index, row in enumerate(csv.DictReader(handle)):
+                yield index, dict(row)
+        return
+
+    with path.open("rb") as handle:
+        index = 0
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                yield index, orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                yield index, InvalidBatchItem(f"Invalid JSON on input line {index + 1}: {exc}")
+            index += 1
+
+
+def load_completed_indexes(output_path: Path) -> set[int]:
+    """Indexes already written to a previous run's output, truncating a torn tail."""
+    if not output_path.exists():
+        return set()
+
+    completed: set[int] = set()
+    valid_bytes = 0
+    with output_path.open("rb") as handle:
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                break
+            if isinstance(record, dict) and isinstance(record.get("index"), int):
+                completed.add(record["index"])
+            valid_bytes += len(line)
+
+    if valid_bytes < output_path.stat().st_size:
+        with output_path.open("r+b") as handle:
+            handle.truncate(valid_bytes)
+    return completed
+
+
+def _item_message(item: Any) -> str:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        for key in ("message", "prompt", "input", "text"):
+            value = item.get(key)
+            if isinstance(value, str):
+                return value
+    return orjson.dumps(item, default=str).decode()
+
+
+def _sink_node_ids(graph_data: dict[str, Any]) -> set[str]:
+    sources = {
+        edge.get("source")
+        for edge in graph_data.get("edges", [])
+        if (edge.get("data") or {}).get("channel") == "flow"
+    }
+    return {
+        node["id"]
+        for node in graph_data.get("nodes", [])
+        if node.get("id") and node["id"] not in sources
+    }
+
+
+async def run_flow_batch(
+    graph_data: dict[str, Any],
+    input_path: Path,
+    output_path: Path,
+    *,
+    run_flow: Callable[..., Any],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    resume: bool = True,
+    entry_node_id: str | None = None,
+    tool_registry: Any = None,
+    batch_id: str | None = None,
+    handle: BatchRunHandle | None = None,
+    on_progress: Callable[[BatchSummary, dict[str, Any]], None] | None = None,
+) -> BatchSummary:
+    batch_id = batch_id or str(uuid.uuid4())
+    handle = handle or BatchRunHandle()
+    summary = BatchSummary(batch_id=batch_id, output_path=str(output_path))
+    completed_before = load_completed_indexes(output_path) if resume else set()
+    if not resume and output_path.exists():
+        output_path.unlink()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    sinks = _sink_node_ids(graph_data)
+    link_cache: dict[str, dict[str, Any]] = {}
+    items = read_batch_items(input_path)
+    write_lock = asyncio.Lock()
+    checkpoint_path = output_path.with_name(output_path.name + ".checkpoint.json")
+
+    def _write_checkpoint() -> None:
+        payload = {
+            **asdict(summary),
+            "input_path": str(input_path),
+            "updated_at": datetime.now(UTC).isoformat(),
+        }
+        try:
+            checkpoint_path.write_bytes(orjson.dumps(payload))
+        except OSError as exc:
+            logger.warning("[flow_batch] Failed to write checkpoint: %s", exc)
+
+    async def _run_item(index: int, item: Any) -> dict[str, Any] | None:
+        """The row's output record, or None when the batch was stopped mid-row."""
+        if isinstance(item, InvalidBatchItem):
+            return {"index": index, "status": "error", "error": str(item)}
+        trigger_payload = {
+            "body": item,
+            "batch": {"id": batch_id, "index": index},
+        }
+        execution = types.SimpleNamespace(stop_run=False, link_cache=link_cache)
+        if entry_node_id:
+            execution.entry_node_ids = [entry_node_id]
+        message = _item_message(item)
+        services = types.SimpleNamespace(
+            run_handle=None,
+            extra_tool_ids=[],
+            tool_registry=tool_registry,
+            chat_input=types.SimpleNamespace(
+                last_user_message=message,
+                runtime_messages=[],
+                last_user_attachments=[],
+            ),
+            webhook=trigger_payload,
+            expression_context={"trigger": trigger_payload},
+            execution=execution,
+        )
+        context = types.SimpleNamespace(
+            run_id=f"{batch_id}:{index}",
+            chat_id=None,
+            state=types.SimpleNamespace(user_message=message),
+            services=services,
+        )
+
+        outputs: dict[str, Any] = {}
+        failure: dict[str, Any] | None = None
+        handle.track(execution)
+        try:
+            async for event in run_flow(graph_data, context):
+                if not isinstance(event, NodeEvent):
+                    continue
+                if event.event_type == "cancelled":
+                    return None
+                if event.event_type == "result" and event.node_id in sinks:
+                    node_outputs = (event.data or {}).get("outputs", {})
+                    primary = node_outputs.get("output")
+                    outputs[event.node_id] = (
+                        primary.get("value") if isinstance(primary, dict) else node_outputs
+                    )
+                elif (
+                    event.event_type == "error"
+                    and failure is None
+                    and (event.data or {}).get("on_error") != "continue"
+                ):
+                    failure = {
+                        "node_id": event.node_id,
+                        "error": (event.data or {}).get("error", "Unknown node error"),
+                    }
+        except Exception as exc:
+            return {"index": index, "status": "error", "error": str(exc)}
+        finally:
+            handle.untrack(execution)
+        if handle.is_cancel_requested():
+            return None
+        if failure is not None:
+            return {"index": index, "status": "error", **failure}
+        return {"index": index, "status": "completed", "outputs": outputs}
+
+    async def _worker(output: Any) -> None:
+        while not handle.is_cancel_requested():
+            try:
+                index, item = next(items)
+            except StopIteration:
+                return
+            summary.total += 1
+            if index in completed_before:
+                summary.skipped += 1
+                continue
+
+            record = await _run_item(index, item)
+            if record is None:
+                summary.total -= 1
+                return
+            async with write_lock:
+                output.write(orjson.dumps(record, default=str) + b"\n")
+                output.flush()
+                if record["status"] == "completed":
+                    summary.completed += 1
+                else:
+                    summary.failed += 1
+                if (summary.completed + summary.failed) % CHECKPOINT_EVERY == 0:
+                    _write_checkpoint()
+                if on_progress is not None:
+                    on_progress(summary, record)
+
+    with output_path.open("ab") as output:
+        await asyncio.gather(*(_worker(output) for _ in range(max(1, concurrency))))
+
+    summary.cancelled = handle.is_cancel_requested()
+    _write_checkpoint()
+    return summary
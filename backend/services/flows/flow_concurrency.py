@@ -0,0 +1,118 @@
+"""Concurrency limits and priority ordering for flow node scheduling.
+
+Limits come from three places, most specific first:
+  1. Node data (`max_concurrency`) — caps concurrent nodes of that node's type
+  2. `services.execution.concurrency_limits` — per-type caps for one run
+  3. Executor attribute `max_concurrency` — the node type's default cap
+
+`services.execution.max_concurrency` caps the total number of running nodes.
+Missing or non-positive limits mean "unlimited".
+"""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_MAX_CONCURRENCY_ENV = "COVALT_FLOW_MAX_CONCURRENCY"
+
+
+def _positive_int(value: Any) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed > 0 else None
+
+
+@dataclass
+class FlowConcurrencyLimits:
+    max_concurrency: int | None = None
+    per_type: dict[str, int] = field(default_factory=dict)
+
+
+def resolve_concurrency_limits(services: Any) -> FlowConcurrencyLimits:
+    execution = getattr(services, "execution", None)
+
+    max_concurrency = _positive_int(getattr(execution, "max_concurrency", None))
+    if max_concurrency is None:
+        max_concurrency = _positive_int(os.getenv(DEFAULT_MAX_CONCURRENCY_ENV))
+
+    per_type: dict[str, int] = {}
+    raw_limits = getattr(execution, "concurrency_limits", None)
+    if isinstance(raw_limits, dict):
+        for node_type, raw_limit in raw_limits.items():
+            limit = _positive_int(raw_limit)
+            if isinstance(node_type, str) and node_type and limit is not None:
+                per_type[node_type] = limit
+
+    return FlowConcurrencyLimits(max_concurrency=max_concurrency, per_type=per_type)
+
+
+def node_type_limit(
+    limits: FlowConcurrencyLimits,
+    node_type: str,
+    executor: Any,
+    data: dict[str, Any] | None,
+) -> int | None:
+    if isinstance(data, dict):
+        node_limit = _positive_int(data.get("max_concurrency"))
+        if node_limit is not None:
+            return node_limit
+
+    run_limit = limits.per_type.get(node_type)
+    if run_limit is not None:
+        return run_limit
+
+    return _positive_int(getattr(executor, "max_concurrency", None))
+
+
+def node_priority(data: dict[str, Any] | None) -> int:
+    if not isinstance(data, dict):
+        return 0
+    raw = data.get("priority")
+    if isinstance(raw, bool):
+        return 0
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return 0
+
+
+class FlowConcurrencyGate:
+    """Tracks running nodes per type and decides whether another may start."""
+
+    def __init__(self, limits: FlowConcurrencyLimits) -> None:
+        self._limits = limits
+        self._running_by_type: Counter[str] = Counter()
+        self._running_total = 0
+
+    @property
+    def running_total(self) -> int:
+        return self._running_total
+
+    def can_start(self, node_type: str, type_limit: int | None) -> bool:
+        max_concurrency = self._limits.max_concurrency
+        if max_concurrency is not None and self._running_total >= max_concurrency:
+            return False
+        if type_limit is not None and self._running_by_type[node_type] >= type_limit:
+            return False
+        return True
+
+    def acquire(self, node_type: str) -> None:
+        self._running_by_type[node_type] += 1
+        self._running_total += 1
+
+    def release(self, node_type: str) -> None:
+        if self._running_by_type[node_type] <= 0:
+            return
+        self._running_by_type[node_type] -= 1
+        self._running_total -= 1
@@ -0,0 +1,134 @@
+"""Bounded node-event queue with token coalescing for run_flow.
+
+Node tasks publish `("item", ...)` and `("done", ...)` messages; the run_flow
+generator consumes them. The queue applies backpressure so a fast producer
+cannot run arbitrarily far ahead of a slow consumer:
+
+  - Data events block the producer while the queue is full.
+  - While the queue is full, a token-only `progress` event that follows a
+    queued token from the same node is merged into that entry instead of
+    waiting for a slot.
+  - Control messages (node lifecycle events, results, `done`) are never
+    dropped and never wait for space.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from typing import Any
+
+from nodes._types import ExecutionResult, NodeEvent
+
+DEFAULT_EVENT_QUEUE_SIZE = 256
+EVENT_QUEUE_SIZE_ENV = "COVALT_FLOW_EVENT_QUEUE_SIZE"
+CONTROL_EVENT_TYPES = frozenset({"started", "completed", "error", "cancelled", "result"})
+
+
+def resolve_event_queue_size(services: Any) -> int:
+    execution = getattr(services, "execution", None)
+    for raw in (
+        getattr(execution, "event_queue_size", None),
+        os.getenv(EVENT_QUEUE_SIZE_ENV),
+    ):
+        if raw is None or isinstance(raw, bool):
+            continue
+        try:
+            size = int(raw)
+        except (TypeError, ValueError):
+            continue
+        if size > 0:
+            return size
+    return DEFAULT_EVENT_QUEUE_SIZE
+
+
+def _is_control(message: tuple) -> bool:
+    if message[0] != "item":
+        return True
+    item = message[3]
+    if isinstance(item, ExecutionResult):
+        return True
+    return isinstance(item, NodeEvent) and item.event_type in CONTROL_EVENT_TYPES
+
+
+def _token_of(message: tuple) -> str | None:
+    if message[0] != "item":
+        return None
+    item = message[3]
+    if not isinstance(item, NodeEvent) or item.event_type != "progress":
+        return None
+    data = item.data
+    if not isinstance(data, dict) or data.keys() != {"token"}:
+        return None
+    token = data["token"]
+    return token if isinstance(token, str) else None
+
+
+class FlowEventQueue:
+    def __init__(self, maxsize: int = DEFAULT_EVENT_QUEUE_SIZE) -> None:
+        self._maxsize = max(1, maxsize)
+        self._items: deque[tuple] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.max_depth = 0
+        self.coalesced = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    async def put(self, message: tuple) -> None:
+        if not _is_control(message):
+            while len(self._items) >= self._maxsize:
+                if self._try_coalesce(message):
+                    return
+                self._not_full.clear()
+                await self._not_full.wait()
+
+        self._items.append(message)
+        self.max_depth = max(self.max_depth, len(self._items))
+        self._not_empty.set()
+
+    async def get(self) -> tuple:
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        message = self._items.popleft()
+        if len(self._items) < self._maxsize:
+            self._not_full.set()
+        return message
+
+    def _try_coalesce(self, message: tuple) -> bool:
+        if not self._items:
+            return False
+        token = _token_of(message)
+        if token is None:
+            return False
+
+        tail = self._items[-1]
+        tail_token = _token_of(tail)
+        if tail_token is None or tail[1] != message[1]:
+            return False
+
+        tail_event: NodeEvent = tail[3]
+        self._items[-1] = (
+            "item",
+            tail[1],
+            tail[2],
+            NodeEvent(
+                node_id=tail_event.node_id,
+                node_type=tail_event.node_type,
+                event_type=tail_event.event_type,
+                run_id=tail_event.run_id,
+                data={"token": tail_token + token},
+                timestamp=tail_event.timestamp,
+            ),
+        )
+        self.coalesced += 1
+        return True
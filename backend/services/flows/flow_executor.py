@@ -9,9 +9,28 @@ The algorithm:
   1. Find flow-capable nodes (executors with an execute() method)
   2. Filter to flow edges (non-structural) for data routing
   3. Topologically sort flow nodes by flow edges
+     (steps 1-3 are compiled into a CompiledFlowPlan, cached by graph fingerprint,
+     optionally after constant folding and reroute collapse; see flow_folding)
   4. For each node: gather inputs (with type coercion), execute, store outputs
+     (cacheable executors may be served from the persistent node output cache)
   5. Skip nodes whose required inputs aren't satisfied (dead branches)
   6. Forward NodeEvents to the caller (which routes them to the chat UI)
+     (optionally timing each phase with the opt-in FlowProfiler)
+
+Streaming edges (opt-in per edge with `edge.data.stream`, or per run with
+`services.execution.stream_edges` / `COVALT_FLOW_STREAM_EDGES=1`): an executor
+declaring `stream_output_handle` publishes its progress tokens on a ValueStream
+as it runs. Downstream executors declaring `accepts_streams = True` (and
+without `{{ }}` expressions) are started as soon as the producer starts and
+receive `DataValue("stream", ValueStream)` on that edge instead of waiting for
+the settled output. Chunks a consumer re-emits with `forwarded: True` feed its
+own stream but are not surfaced again, since the producer already did.
+
+Speculation: with the opt-in speculative mode, pure children of a routing
+node (conditional) start while the router runs; see flow_speculation.
+
+Worker processes: executors declaring `cpu_bound = True` run in a process
+pool when one is configured, keeping the loop free; see flow_worker_pool.
 
 Node partitioning is based on executor capabilities, NOT socket types:
   - Has execute()  → flow (Phase 2)
@@ -25,20 +44,92 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import time
 import types
 import uuid
 from collections import deque
 from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import replace
 from typing import Any
 
-from backend.services.flows.graph_runtime import GraphRuntime
+import orjson
+
+from backend.services.flows.flow_concurrency import (
+    FlowConcurrencyGate,
+    node_priority,
+    node_type_limit,
+    resolve_concurrency_limits,
+)
+from backend.services.flows.flow_event_queue import FlowEventQueue, resolve_event_queue_size
+from backend.services.flows.flow_folding import flow_folding_enabled, fold_flow_graph
+from backend.services.flows.flow_migration import migrate_node_type
+from backend.services.flows.flow_plan import (
+    CompiledFlowPlan,
+    contains_expression,
+    get_flow_plan_cache,
+    plan_fingerprint,
+    serialize_graph,
+)
+from backend.services.flows.flow_profiler import (
+    FlowProfiler,
+    finish_flow_profiler,
+    flow_profiling_enabled,
+    profile_span,
+)
+from backend.services.flows.flow_speculation import (
+    SpeculationReport,
+    SpeculativeBranch,
+    SpeculativeSink,
+    is_pure_branch,
+    routed_input_handle,
+    speculation_enabled,
+)
+from backend.services.flows.flow_worker_pool import (
+    WorkerExecutor,
+    get_flow_worker_pool,
+    is_cpu_bound,
+)
+from backend.services.flows.graph_runtime import GraphRuntime, build_graph_index
+from backend.services.flows.link_artifact_cache import (
+    get_link_artifact_cache,
+    link_artifact_cache_enabled,
+)
+from backend.services.flows.node_output_cache import (
+    cached_stream_text,
+    executor_is_cacheable,
+    get_node_output_cache,
+    node_output_cache_enabled,
+)
 from nodes._coerce import coerce
-from nodes._expressions import resolve_expressions
-from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from nodes._expressions import analyze_expressions, resolve_expressions
+from nodes._types import (
+    STREAM_SOCKET_TYPE,
+    DataValue,
+    ExecutionResult,
+    FlowContext,
+    NodeEvent,
+    ValueStream,
+)
 
 logger = logging.getLogger(__name__)
 
 FLOW_EDGE_CHANNEL = "flow"
+STREAM_EDGES_ENV = "COVALT_FLOW_STREAM_EDGES"
+
+
+def stream_edges_enabled(services: Any) -> bool:
+    execution = getattr(services, "execution", None)
+    flag = getattr(execution, "stream_edges", None)
+    if isinstance(flag, bool):
+        return flag
+    return os.getenv(STREAM_EDGES_ENV) == "1"
+
+
+def _edge_streams(edge: dict[str, Any], default: bool) -> bool:
+    flag = (edge.get("data") or {}).get("stream")
+    return flag if isinstance(flag, bool) else default
 
 
 
@@ -183,12 +274,24 @@ def _gather_inputs(
     node_id: str,
     runtime: GraphRuntime,
     port_values: dict[str, dict[str, DataValue]],
+    streams: dict[str, tuple[str, ValueStream]] | None = None,
 ) -> dict[str, DataValue]:
-    """Pull DataValues from upstream output ports, applying type coercion."""
+    """Pull DataValues from upstream output ports, applying type coercion.
+
+    Edges from a producer that is still streaming yield the live ValueStream.
+    """
     inputs: dict[str, DataValue] = {}
     for edge in runtime.incoming_edges(node_id, channel=FLOW_EDGE_CHANNEL):
-        source_outputs = port_values.get(edge["source"], {})
-        value = source_outputs.get(edge.get("sourceHandle", "output"))
+        source_handle = edge.get("sourceHandle", "output")
+        source_outputs = port_values.get(edge["source"])
+        if source_outputs is None and streams and edge["source"] in streams:
+            stream_handle, stream = streams[edge["source"]]
+            if source_handle == stream_handle:
+                inputs[edge.get("targetHandle", "input")] = DataValue(
+                    type=STREAM_SOCKET_TYPE, value=stream
+                )
+            continue
+        value = (source_outputs or {}).get(source_handle)
         if value is None:
             continue
 
@@ -413,32 +516,52 @@ def _get_node_label(node: dict) -> str:
     )
 
 
-async def run_flow(
+def _plan_scope_key(services: Any) -> tuple[Any, ...]:
+    entry_node_ids = _execution_entry_node_ids(services)
+    scope_mode, scope_targets, explicit_scope_nodes = _execution_scope(services)
+    return (
+        tuple(sorted(entry_node_ids)) if entry_node_ids is not None else None,
+        scope_mode,
+        tuple(sorted(scope_targets)),
+        tuple(sorted(explicit_scope_nodes)) if explicit_scope_nodes is not None else None,
+    )
+
+
+def _empty_plan(graph_data: dict[str, Any], fingerprint: str | None) -> CompiledFlowPlan:
+    return CompiledFlowPlan(
+        fingerprint=fingerprint,
+        graph_data=graph_data,
+        graph_index=build_graph_index(graph_data),
+        nodes=(),
+        nodes_by_id={},
+        flow_edges=(),
+        order=(),
+        order_index={},
+        upstream_by_node={},
+        downstream_by_node={},
+        executors_by_node={},
+        has_expressions={},
+    )
+
+
+def compile_flow_plan(
     graph_data: dict[str, Any],
-    context: Any,
+    services: Any,
     executors: dict[str, Any] | None = None,
-) -> AsyncIterator[NodeEvent | ExecutionResult]:
-    """Execute flow nodes in topological order, yielding events and results.
-
-    Args:
-        graph_data: The full graph JSON (nodes + edges).
-        context: Outer context with run_id, state (user_message), etc.
-        executors: Optional executor map for testing (bypasses auto-discovery).
+    *,
+    fingerprint: str | None = None,
+) -> CompiledFlowPlan:
+    """Derive the static execution plan for a graph under the run's scope.
 
-    Yields:
-        NodeEvent for UI updates, ExecutionResult for node outputs.
+    Raises ValueError for invalid edge channels, unknown node types in the
+    flow path (registry executors only) and cycles.
     """
     nodes_list = graph_data.get("nodes", [])
     edges = graph_data.get("edges", [])
 
-    run_id = getattr(context, "run_id", str(uuid.uuid4()))
-    chat_id = getattr(context, "chat_id", None)
-    state = getattr(context, "state", None)
-    services = getattr(context, "services", None) or types.SimpleNamespace()
-
     flow_nodes = find_flow_nodes(nodes_list, executors)
     if not flow_nodes:
-        return
+        return _empty_plan(graph_data, fingerprint)
 
     flow_edge_list = _flow_edges(edges)
     scoped_entry_node_ids = _execution_entry_node_ids(services)
@@ -449,7 +572,7 @@ async def run_flow(
             scoped_entry_node_ids,
         )
         if not flow_nodes:
-            return
+            return _empty_plan(graph_data, fingerprint)
 
     scope_mode, scope_targets, explicit_scope_nodes = _execution_scope(services)
     if explicit_scope_nodes is not None:
@@ -459,7 +582,7 @@ async def run_flow(
             explicit_scope_nodes,
         )
         if not flow_nodes:
-            return
+            return _empty_plan(graph_data, fingerprint)
     elif scope_mode is not None:
         flow_nodes, flow_edge_list = _apply_execution_scope(
             flow_nodes,
@@ -468,15 +591,7 @@ async def run_flow(
             scope_targets,
         )
         if not flow_nodes:
-            return
-
-    execution_ctx = getattr(services, "execution", None)
-    cached_raw = None
-    if execution_ctx is not None:
-        cached_raw = getattr(execution_ctx, "cached_outputs", None)
-        if cached_raw is None:
-            cached_raw = getattr(execution_ctx, "cachedOutputs", None)
-    cached_outputs = _normalize_cached_outputs(cached_raw)
+            return _empty_plan(graph_data, fingerprint)
 
     if executors is None:
         unresolved_types = _collect_unresolved_node_types(
@@ -493,20 +608,221 @@ async def run_flow(
 
     order = topological_sort(flow_nodes, flow_edge_list)
 
+    nodes_by_id = {n["id"]: n for n in flow_nodes}
+    node_ids = set(nodes_by_id.keys())
+    upstream_by_node: dict[str, set[str]] = {node_id: set() for node_id in node_ids}
+    downstream_by_node: dict[str, set[str]] = {node_id: set() for node_id in node_ids}
+    for edge in flow_edge_list:
+        source = edge.get("source")
+        target = edge.get("target")
+        if source in node_ids and target in node_ids:
+            upstream_by_node[target].add(source)
+            downstream_by_node[source].add(target)
+
+    has_expressions = {
+        node_id: contains_expression(node.get("data", {}))
+        for node_id, node in nodes_by_id.items()
+    }
+    return CompiledFlowPlan(
+        fingerprint=fingerprint,
+        graph_data=graph_data,
+        graph_index=build_graph_index(graph_data),
+        nodes=tuple(flow_nodes),
+        nodes_by_id=nodes_by_id,
+        flow_edges=tuple(flow_edge_list),
+        order=tuple(order),
+        order_index={node_id: index for index, node_id in enumerate(order)},
+        upstream_by_node={k: frozenset(v) for k, v in upstream_by_node.items()},
+        downstream_by_node={k: frozenset(v) for k, v in downstream_by_node.items()},
+        executors_by_node={
+            node_id: _get_executor(node.get("type", ""), executors)
+            for node_id, node in nodes_by_id.items()
+        },
+        has_expressions=has_expressions,
+        expression_refs={
+            node_id: analyze_expressions(nodes_by_id[node_id].get("data", {}))
+            for node_id, flagged in has_expressions.items()
+            if flagged
+        },
+    )
+
+
+def get_flow_plan(
+    graph_data: dict[str, Any],
+    services: Any,
+    executors: dict[str, Any] | None = None,
+) -> CompiledFlowPlan:
+    """Return the compiled plan for a graph, reusing a cached one when warm.
+
+    Only registry-resolved runs are cached; an explicit executor map always
+    compiles fresh because the map may change between calls.
+    """
+    if executors is not None:
+        return compile_flow_plan(graph_data, services, executors)
+
+    serialized = serialize_graph(graph_data)
+    if serialized is None:
+        return compile_flow_plan(graph_data, services)
+
+    from nodes import registry_revision
+
+    cache = get_flow_plan_cache()
+    fingerprint = plan_fingerprint(
+        serialized, (*_plan_scope_key(services), registry_revision())
+    )
+    plan = cache.get(fingerprint)
+    if plan is not None:
+        return plan
+
+    plan = compile_flow_plan(
+        orjson.loads(serialized),
+        services,
+        fingerprint=fingerprint,
+    )
+    cache.put(plan)
+    return plan
+
+
+async def get_folded_flow_plan(
+    plan: CompiledFlowPlan,
+    services: Any,
+    executors: dict[str, Any] | None = None,
+) -> CompiledFlowPlan:
+    """Return `plan` after the compile-time folding pass, cached when warm.
+
+    The run's entry and target nodes are kept so scoped runs still report them.
+    """
+    cache = get_flow_plan_cache()
+    fingerprint = f"{plan.fingerprint}:folded" if plan.fingerprint else None
+    if fingerprint is not None:
+        cached = cache.get(fingerprint)
+        if cached is not None:
+            return cached
+
+    _scope_mode, scope_targets, _explicit = _execution_scope(services)
+    keep = (_execution_entry_node_ids(services) or set()) | scope_targets
+    folding = await fold_flow_graph(
+        plan.graph_data,
+        lambda node_type: _get_executor(node_type, executors),
+        keep=keep,
+    )
+    folded = plan
+    if folding.changed:
+        folded = compile_flow_plan(folding.graph_data, services, executors)
+    folded = replace(
+        folded,
+        fingerprint=fingerprint,
+        folded_outputs=folding.folded_outputs,
+        origins=folding.origins,
+    )
+    cache.put(folded)
+    return folded
+
+
+async def run_flow(
+    graph_data: dict[str, Any],
+    context: Any,
+    executors: dict[str, Any] | None = None,
+) -> AsyncIterator[NodeEvent | ExecutionResult]:
+    """Execute flow nodes in topological order, yielding events and results.
+
+    Args:
+        graph_data: The full graph JSON (nodes + edges).
+        context: Outer context with run_id, state (user_message), etc.
+        executors: Optional executor map for testing (bypasses auto-discovery).
+
+    Yields:
+        NodeEvent for UI updates, ExecutionResult for node outputs.
+    """
+    run_id = getattr(context, "run_id", str(uuid.uuid4()))
+    services = getattr(context, "services", None) or types.SimpleNamespace()
+    if not flow_profiling_enabled(services):
+        async with aclosing(_execute_flow(graph_data, context, executors, run_id, None)) as events:
+            async for item in events:
+                yield item
+        return
+
+    profiler = FlowProfiler(run_id)
+    try:
+        setattr(services, "flow_profiler", profiler)
+    except Exception:
+        pass
+    try:
+        async with aclosing(_execute_flow(graph_data, context, executors, run_id, profiler)) as events:
+            async for item in events:
+                yield item
+    finally:
+        finish_flow_profiler(profiler)
+
+
+async def _execute_flow(
+    graph_data: dict[str, Any],
+    context: Any,
+    executors: dict[str, Any] | None,
+    run_id: str,
+    profiler: FlowProfiler | None,
+) -> AsyncIterator[NodeEvent | ExecutionResult]:
+    chat_id = getattr(context, "chat_id", None)
+    state = getattr(context, "state", None)
+    services = getattr(context, "services", None) or types.SimpleNamespace()
+
+    plan = get_flow_plan(graph_data, services, executors)
+    if plan.is_empty:
+        return
+    if flow_folding_enabled(services):
+        plan = await get_folded_flow_plan(plan, services, executors)
+        if plan.origins:
+            yield NodeEvent(
+                node_id="",
+                node_type="flow",
+                event_type="folded",
+                run_id=run_id,
+                data={
+                    "origins": plan.origins,
+                    "outputs": {
+                        node_id: {
+                            handle: {"type": value.type, "value": value.value}
+                            for handle, value in outputs.items()
+                        }
+                        for node_id, outputs in plan.folded_outputs.items()
+                    },
+                },
+            )
+
+    execution_ctx = getattr(services, "execution", None)
+    cached_raw = None
+    if execution_ctx is not None:
+        cached_raw = getattr(execution_ctx, "cached_outputs", None)
+        if cached_raw is None:
+            cached_raw = getattr(execution_ctx, "cachedOutputs", None)
+    cached_outputs = {**plan.folded_outputs, **_normalize_cached_outputs(cached_raw)}
+    aliases_by_node: dict[str, dict[str, str]] = {}
+    for origin_id, origin in plan.origins.items():
+        if origin["kind"] == "collapsed":
+            aliases_by_node.setdefault(origin["into"], {})[origin_id] = origin["handle"]
+
     runtime = GraphRuntime(
-        graph_data,
+        plan.graph_data,
         run_id=run_id,
         chat_id=chat_id,
         state=state,
         services=services,
         executors=executors,
+        index=plan.graph_index,
+        profiler=profiler,
+        link_cache=getattr(execution_ctx, "link_cache", None),
+        artifact_cache=(
+            get_link_artifact_cache()
+            if executors is None and link_artifact_cache_enabled(services)
+            else None
+        ),
     )
 
     port_values: dict[str, dict[str, DataValue]] = {}
     upstream_outputs: dict[str, Any] = {}
     label_sources: dict[str, str] = {}
-    nodes_by_id = {n["id"]: n for n in flow_nodes}
-    nodes_by_id_all = {n.get("id"): n for n in nodes_list if isinstance(n, dict)}
+    nodes_by_id = plan.nodes_by_id
+    nodes_by_id_all = plan.graph_index.nodes_by_id
     if services is not None:
         try:
             setattr(services, "upstream_outputs", upstream_outputs)
@@ -539,27 +855,42 @@ async def run_flow(
                 label_sources[label] = cached_node_id
                 upstream_outputs[label] = data_output.value
 
-    order_index = {node_id: index for index, node_id in enumerate(order)}
-
+    order_index = plan.order_index
     node_ids = set(nodes_by_id.keys())
-    upstream_by_node: dict[str, set[str]] = {node_id: set() for node_id in node_ids}
-    downstream_by_node: dict[str, set[str]] = {node_id: set() for node_id in node_ids}
-    for edge in flow_edge_list:
-        source = edge.get("source")
-        target = edge.get("target")
-        if source in node_ids and target in node_ids:
-            upstream_by_node[target].add(source)
-            downstream_by_node[source].add(target)
-
+    downstream_by_node = plan.downstream_by_node
     remaining_deps: dict[str, int] = {
-        node_id: len(upstream_by_node[node_id]) for node_id in node_ids
+        node_id: len(plan.upstream_by_node[node_id]) for node_id in plan.order
     }
 
-    event_queue: asyncio.Queue[tuple] = asyncio.Queue()
+    event_queue = FlowEventQueue(resolve_event_queue_size(services))
+    output_cache = get_node_output_cache() if node_output_cache_enabled(services) else None
     running_tasks: dict[str, asyncio.Task[None]] = {}
+    running_types: dict[str, str] = {}
     completed_nodes: set[str] = set()
     ready: list[str] = []
     ready_set: set[str] = set()
+    ready_since: dict[str, float] = {}
+    streams: dict[str, tuple[str, ValueStream]] = {}
+    early_released: set[tuple[str, str]] = set()
+    stream_edges_default = stream_edges_enabled(services)
+    speculative: dict[str, SpeculativeBranch] = {}
+    pending_messages: deque[tuple] = deque()
+    speculation: SpeculationReport | None = None
+    if speculation_enabled(services):
+        speculation = SpeculationReport()
+        try:
+            setattr(services, "flow_speculation", speculation)
+        except Exception:
+            pass
+    worker_pool = get_flow_worker_pool(services)
+    concurrency_limits = resolve_concurrency_limits(services)
+    concurrency_gate = FlowConcurrencyGate(concurrency_limits)
+    priority_by_node = {
+        node_id: node_priority(node.get("data")) for node_id, node in nodes_by_id.items()
+    }
+
+    def _ready_sort_key(node_id: str) -> tuple[int, int]:
+        return (-priority_by_node.get(node_id, 0), order_index.get(node_id, 0))
 
     def _should_stop() -> bool:
         execution_ctx = getattr(services, "execution", None)
@@ -571,23 +902,81 @@ async def run_flow(
             return
         ready_set.add(node_id)
         ready.append(node_id)
+        ready_since.setdefault(node_id, time.monotonic())
 
     def _mark_done(node_id: str) -> None:
         if node_id in completed_nodes:
             return
         completed_nodes.add(node_id)
         for downstream_id in downstream_by_node.get(node_id, set()):
+            if (node_id, downstream_id) in early_released:
+                continue
             remaining_deps[downstream_id] -= 1
             if remaining_deps[downstream_id] == 0:
                 _enqueue_ready(downstream_id)
 
+    def _stream_consumers(node_id: str, executor: Any) -> tuple[str | None, list[str]]:
+        handle = getattr(executor, "stream_output_handle", None)
+        if not isinstance(handle, str) or not handle:
+            return None, []
+        # A consumer is only released early when every edge it has from the
+        # producer's stream handle opted in to streaming.
+        streaming_targets: dict[str, bool] = {}
+        for edge in runtime.outgoing_edges(
+            node_id, channel=FLOW_EDGE_CHANNEL, source_handle=handle
+        ):
+            target_id = edge.get("target")
+            streaming_targets[target_id] = streaming_targets.get(
+                target_id, True
+            ) and _edge_streams(edge, stream_edges_default)
+        consumers = [
+            target_id
+            for target_id, streaming in streaming_targets.items()
+            if streaming
+            and target_id in node_ids
+            and target_id not in cached_outputs
+            and getattr(plan.executors_by_node.get(target_id), "accepts_streams", False)
+            and not plan.has_expressions.get(target_id, True)
+        ]
+        return handle, consumers
+
+    def _release_stream_consumers(node_id: str, consumers: list[str]) -> None:
+        """Start consumers of a streaming producer without waiting for it."""
+        for consumer_id in consumers:
+            if (node_id, consumer_id) in early_released:
+                continue
+            early_released.add((node_id, consumer_id))
+            remaining_deps[consumer_id] -= 1
+            if remaining_deps[consumer_id] == 0:
+                _enqueue_ready(consumer_id)
+
+    def _close_streams(error: BaseException) -> None:
+        for _handle, stream in streams.values():
+            stream.close(error=error)
+
+    def _discard_branch(branch: SpeculativeBranch) -> None:
+        if speculation is not None:
+            branch.discard(speculation)
+        concurrency_gate.release(branch.node_type)
+
+    def _discard_speculation(node_id: str) -> None:
+        branch = speculative.pop(node_id, None)
+        if branch is not None:
+            _discard_branch(branch)
+
     async def _cancel_running_tasks() -> None:
+        _close_streams(RuntimeError("Flow run cancelled"))
+        for speculative_id in list(speculative):
+            _discard_speculation(speculative_id)
         if not running_tasks:
             return
         for task in running_tasks.values():
             task.cancel()
         await asyncio.gather(*running_tasks.values(), return_exceptions=True)
         running_tasks.clear()
+        for node_type in running_types.values():
+            concurrency_gate.release(node_type)
+        running_types.clear()
 
     def _build_cancellation_marker() -> NodeEvent:
         target_node_id = next(iter(running_tasks), None) or next(iter(ready_set), None)
@@ -609,7 +998,12 @@ async def run_flow(
         data: dict[str, Any],
         inputs: dict[str, DataValue],
         on_error: str,
+        queue_wait_ms: float,
+        stream: tuple[str, ValueStream] | None = None,
+        sink: SpeculativeSink | None = None,
     ) -> None:
+        stream_handle, value_stream = stream if stream is not None else (None, None)
+        queue = sink if sink is not None else event_queue
         started_emitted = False
         terminal_event: str | None = None
         last_error_text: str | None = None
@@ -622,36 +1016,134 @@ async def run_flow(
             services=services,
         )
 
+        cache_key = None
+        if output_cache is not None and executor_is_cacheable(executor, data, inputs):
+            cache_key = output_cache.cache_key(node_type, data, inputs)
+        if cache_key is not None:
+            cached = await output_cache.get(cache_key)
+            if cached is not None:
+                hit: list[Any] = [
+                    NodeEvent(
+                        node_id=node_id,
+                        node_type=node_type,
+                        event_type="started",
+                        run_id=run_id,
+                        data={"queue_wait_ms": queue_wait_ms},
+                    ),
+                    NodeEvent(
+                        node_id=node_id,
+                        node_type=node_type,
+                        event_type="cache_hit",
+                        run_id=run_id,
+                        data={"cache_key": cache_key},
+                    ),
+                ]
+                # Streaming nodes replay their cached text, so chats still show it.
+                replay_handle = getattr(executor, "stream_output_handle", None)
+                replay = cached_stream_text(cached.get(replay_handle)) if replay_handle else None
+                if replay is not None:
+                    hit.append(
+                        NodeEvent(
+                            node_id=node_id,
+                            node_type=node_type,
+                            event_type="progress",
+                            run_id=run_id,
+                            data={"token": replay},
+                        )
+                    )
+                    if value_stream is not None:
+                        value_stream.push(replay)
+                hit.append(ExecutionResult(outputs=cached))
+                hit.append(
+                    NodeEvent(
+                        node_id=node_id,
+                        node_type=node_type,
+                        event_type="completed",
+                        run_id=run_id,
+                    )
+                )
+                for item in hit:
+                    await queue.put(("item", node_id, node_type, item))
+                if value_stream is not None:
+                    value_stream.close(final=cached.get(stream_handle))
+                await queue.put(("done", node_id, node_type, "completed", None, on_error))
+                return
+
+        last_result: ExecutionResult | None = None
+        first_token_ns: int | None = None
+        runner = (
+            WorkerExecutor(executor, worker_pool)
+            if worker_pool is not None and is_cpu_bound(executor)
+            else executor
+        )
         try:
-            async for item in _run_executor(
-                executor, data, inputs, node_context, run_id
-            ):
-                if isinstance(item, NodeEvent):
-                    if item.event_type == "started":
-                        started_emitted = True
-                    if item.event_type in {"completed", "error", "cancelled"}:
-                        terminal_event = item.event_type
-                    if item.event_type == "error":
-                        last_error_text = (item.data or {}).get("error", "Unknown error")
-                        if on_error == "continue":
+            with profile_span(profiler, "execute", node_id, node_type=node_type) as execute_span:
+                async for item in _run_executor(
+                    runner, data, inputs, node_context, run_id
+                ):
+                    if isinstance(item, ExecutionResult):
+                        last_result = item
+                    elif (profiler is not None or value_stream is not None) and (
+                        token := _token_text(item)
+                    ):
+                        if first_token_ns is None:
+                            first_token_ns = time.perf_counter_ns()
+                        if value_stream is not None:
+                            value_stream.push(token)
+                    if _is_forwarded_token(item):
+                        continue
+                    if isinstance(item, NodeEvent):
+                        if item.event_type == "started" and not started_emitted:
+                            started_emitted = True
                             item = NodeEvent(
                                 node_id=item.node_id,
                                 node_type=item.node_type,
                                 event_type=item.event_type,
                                 run_id=item.run_id,
-                                data={**(item.data or {}), "on_error": on_error},
+                                data={**(item.data or {}), "queue_wait_ms": queue_wait_ms},
                                 timestamp=item.timestamp,
                             )
-                await event_queue.put(("item", node_id, node_type, item))
+                        if item.event_type in {"completed", "error", "cancelled"}:
+                            terminal_event = item.event_type
+                        if item.event_type == "error":
+                            last_error_text = (item.data or {}).get("error", "Unknown error")
+                            if on_error == "continue":
+                                item = NodeEvent(
+                                    node_id=item.node_id,
+                                    node_type=item.node_type,
+                                    event_type=item.event_type,
+                                    run_id=item.run_id,
+                                    data={**(item.data or {}), "on_error": on_error},
+                                    timestamp=item.timestamp,
+                                )
+                    await queue.put(("item", node_id, node_type, item))
+
+                if profiler is not None and first_token_ns is not None:
+                    finished_ns = time.perf_counter_ns()
+                    profiler.record("ttft", node_id, execute_span.start_ns, first_token_ns)
+                    profiler.record("stream_tail", node_id, first_token_ns, finished_ns)
 
             status = terminal_event or "completed"
             error_for_done = last_error_text if status == "error" else None
-            await event_queue.put(("done", node_id, node_type, status, error_for_done, on_error))
+            if value_stream is not None:
+                if status == "completed":
+                    value_stream.close(
+                        final=last_result.outputs.get(stream_handle) if last_result else None
+                    )
+                else:
+                    value_stream.close(error=RuntimeError(error_for_done or f"Node {status}"))
+            if cache_key is not None and status == "completed" and last_result is not None:
+                await output_cache.put(cache_key, node_type, last_result.outputs)
+            await queue.put(("done", node_id, node_type, status, error_for_done, on_error))
         except asyncio.CancelledError:
+            if value_stream is not None:
+                value_stream.close(error=RuntimeError("Flow run cancelled"))
             raise
         except Exception as e:
+            if value_stream is not None:
+                value_stream.close(error=e)
             if not started_emitted:
-                await event_queue.put(
+                await queue.put(
                     (
                         "item",
                         node_id,
@@ -661,10 +1153,11 @@ async def run_flow(
                             node_type=node_type,
                             event_type="started",
                             run_id=run_id,
+                            data={"queue_wait_ms": queue_wait_ms},
                         ),
                     )
                 )
-            await event_queue.put(
+            await queue.put(
                 (
                     "item",
                     node_id,
@@ -678,16 +1171,114 @@ async def run_flow(
                     ),
                 )
             )
-            await event_queue.put(
+            await queue.put(
                 ("done", node_id, node_type, "error", str(e), on_error)
             )
 
+    def _resolve_node_data(
+        node_id: str,
+        data: dict[str, Any],
+        inputs: dict[str, DataValue],
+        outputs: dict[str, Any],
+    ) -> dict[str, Any]:
+        if not plan.has_expressions.get(node_id, True):
+            return dict(data)
+        expression_context = getattr(services, "expression_context", None)
+        if not isinstance(expression_context, dict):
+            expression_context = None
+        with profile_span(profiler, "expressions", node_id):
+            return resolve_expressions(
+                data,
+                inputs.get("input"),
+                outputs,
+                expression_context=expression_context,
+                refs=plan.expression_refs.get(node_id),
+            )
+
+    def _speculate_branches(
+        router_id: str, executor: Any, router_inputs: dict[str, DataValue], *, spare: bool
+    ) -> None:
+        """Start pure children of a router as if their port were selected.
+
+        Speculative tasks hold concurrency slots like any other node, but only
+        take spare ones: nothing starts while a ready node waits for a slot.
+        """
+        handle = routed_input_handle(executor)
+        routed = router_inputs.get(handle) if handle else None
+        if speculation is None or routed is None or isinstance(routed.value, ValueStream):
+            return
+
+        router_label = _get_node_label(nodes_by_id[router_id])
+        for child_id in sorted(downstream_by_node.get(router_id, ())):
+            child = nodes_by_id.get(child_id)
+            child_executor = plan.executors_by_node.get(child_id)
+            if (
+                child is None
+                or child_id in speculative
+                or child_id in cached_outputs
+                or child_id in streams
+                or not hasattr(child_executor, "execute")
+                or not plan.upstream_by_node[child_id] - {router_id} <= completed_nodes
+            ):
+                continue
+            ports = {
+                edge.get("sourceHandle", "output")
+                for edge in runtime.incoming_edges(child_id, channel=FLOW_EDGE_CHANNEL)
+                if edge["source"] == router_id
+            }
+            if len(ports) != 1:
+                continue
+
+            assumed = {**port_values, router_id: {ports.pop(): routed}}
+            child_inputs = _gather_inputs(child_id, runtime, assumed)
+            data = child.get("data", {})
+            if not child_inputs or not is_pure_branch(child_executor, data):
+                continue
+            child_type = child.get("type", "")
+            type_limit = node_type_limit(concurrency_limits, child_type, child_executor, data)
+            if not spare or not concurrency_gate.can_start(child_type, type_limit):
+                speculation.throttled += 1
+                continue
+            child_data = _resolve_node_data(
+                child_id,
+                data,
+                child_inputs,
+                {**upstream_outputs, router_id: routed.value, router_label: routed.value},
+            )
+            concurrency_gate.acquire(child_type)
+            sink = SpeculativeSink()
+            task = asyncio.create_task(
+                _run_node_task(
+                    child_id,
+                    child_type,
+                    child_executor,
+                    child_data,
+                    child_inputs,
+                    child_data.get("on_error", data.get("on_error", "stop")),
+                    0.0,
+                    None,
+                    sink,
+                )
+            )
+            speculative[child_id] = SpeculativeBranch(
+                node_id=child_id,
+                node_type=child_type,
+                router_id=router_id,
+                task=task,
+                sink=sink,
+                inputs=child_inputs,
+                data=child_data,
+            )
+            speculation.launched += 1
+
     async def _schedule_ready_nodes() -> bool:
+        deferred: list[str] = []
+        routers: list[tuple[str, Any, dict[str, DataValue]]] = []
         while ready:
             if _should_stop():
                 await _cancel_running_tasks()
                 return False
-            ready.sort(key=lambda node_id: order_index.get(node_id, 0))
+            ready.sort(key=_ready_sort_key)
             node_id = ready.pop(0)
             ready_set.discard(node_id)
 
@@ -700,7 +1291,7 @@ async def run_flow(
                 continue
 
             node_type = node.get("type", "")
-            executor = _get_executor(node_type, executors)
+            executor = plan.executors_by_node.get(node_id)
             if executor is None or not hasattr(executor, "execute"):
                 _mark_done(node_id)
                 continue
@@ -712,33 +1303,67 @@ async def run_flow(
             incoming_flow_edges = runtime.incoming_edges(
                 node_id, channel=FLOW_EDGE_CHANNEL
             )
-            inputs = _gather_inputs(node_id, runtime, port_values)
+            inputs = _gather_inputs(node_id, runtime, port_values, streams)
 
             # Dead branch detection: has incoming flow edges but none produced data
             if _has_incoming_edges(node_id, incoming_flow_edges) and not inputs:
+                _discard_speculation(node_id)
                 _mark_done(node_id)
                 continue
 
             data = node.get("data", {})
+            type_limit = node_type_limit(concurrency_limits, node_type, executor, data)
+            # A speculative run of this node already holds its slot.
+            if node_id not in speculative and not concurrency_gate.can_start(node_type, type_limit):
+                deferred.append(node_id)
+                continue
+
             on_error = data.get("on_error", "stop")
 
-            direct_input = inputs.get("input")
-            expression_context = getattr(services, "expression_context", None)
-            if not isinstance(expression_context, dict):
-                expression_context = None
+            enqueued_at = ready_since.pop(node_id, time.monotonic())
+            queue_wait_ms = round((time.monotonic() - enqueued_at) * 1000, 3)
+            if profiler is not None:
+                scheduled_ns = time.perf_counter_ns()
+                profiler.record(
+                    "queue_wait", node_id, scheduled_ns - int(queue_wait_ms * 1_000_000), scheduled_ns
+                )
 
-            data = resolve_expressions(
-                data,
-                direct_input,
-                upstream_outputs,
-                expression_context=expression_context,
-            )
+            data = _resolve_node_data(node_id, data, inputs, upstream_outputs)
             on_error = data.get("on_error", on_error)
 
+            branch = speculative.pop(node_id, None)
+            if branch is not None and speculation is not None:
+                if branch.matches(inputs, data):
+                    pending_messages.extend(branch.commit(speculation, event_queue))
+                    running_types[node_id] = node_type
+                    running_tasks[node_id] = branch.task
+                    continue
+                _discard_branch(branch)
+
+            stream_handle, consumers = _stream_consumers(node_id, executor)
+            stream = (stream_handle, ValueStream()) if consumers else None
+            if stream is not None:
+                streams[node_id] = stream
+
+            concurrency_gate.acquire(node_type)
+            running_types[node_id] = node_type
             task = asyncio.create_task(
-                _run_node_task(node_id, node_type, executor, data, inputs, on_error)
+                _run_node_task(
+                    node_id, node_type, executor, data, inputs, on_error, queue_wait_ms, stream
+                )
             )
             running_tasks[node_id] = task
+            if stream is not None:
+                _release_stream_consumers(node_id, consumers)
+            if speculation is not None:
+                routers.append((node_id, executor, inputs))
+
+        for router_id, router_executor, router_inputs in routers:
+            _speculate_branches(router_id, router_executor, router_inputs, spare=not deferred)
+
+        for node_id in deferred:
+            ready_set.add(node_id)
+            ready.append(node_id)
 
         return True
 
@@ -746,8 +1371,8 @@ async def run_flow(
         if cached_node_id in node_ids:
             _mark_done(cached_node_id)
 
-    for node_id, count in remaining_deps.items():
-        if count == 0 and node_id not in completed_nodes:
+    for node_id in plan.order:
+        if remaining_deps[node_id] == 0 and node_id not in completed_nodes:
             _enqueue_ready(node_id)
 
     while ready or running_tasks:
@@ -764,24 +1389,32 @@ async def run_flow(
             yield _build_cancellation_marker()
             return
 
-        message = await event_queue.get()
+        message = pending_messages.popleft() if pending_messages else await event_queue.get()
         kind = message[0]
 
         if kind == "item":
             _, node_id, node_type, item = message
             if isinstance(item, ExecutionResult):
                 yield item
+                result_data: dict[str, Any] = {
+                    "outputs": {
+                        handle: {"type": value.type, "value": value.value}
+                        for handle, value in item.outputs.items()
+                    }
+                }
+                aliases = {
+                    alias_id: handle
+                    for alias_id, handle in aliases_by_node.get(node_id, {}).items()
+                    if handle in item.outputs
+                }
+                if aliases:
+                    result_data["aliases"] = aliases
                 yield NodeEvent(
                     node_id=node_id,
                     node_type=node_type,
                     event_type="result",
                     run_id=run_id,
-                    data={
-                        "outputs": {
-                            handle: {"type": value.type, "value": value.value}
-                            for handle, value in item.outputs.items()
-                        }
-                    },
+                    data=result_data,
                 )
                 port_values[node_id] = item.outputs
                 node = nodes_by_id.get(node_id)
@@ -810,6 +1443,9 @@ async def run_flow(
         elif kind == "done":
             _, node_id, _node_type, _status, error_text, on_error = message
             running_tasks.pop(node_id, None)
+            finished_type = running_types.pop(node_id, None)
+            if finished_type is not None:
+                concurrency_gate.release(finished_type)
             if error_text is not None:
                 if on_error == "continue":
                     port_values[node_id] = {
@@ -825,8 +1461,6 @@ async def run_flow(
 
 def _get_executor(node_type: str, executors: dict[str, Any] | None) -> Any | None:
     """Look up executor from test map or auto-discovery registry."""
-    from backend.services.flows.flow_migration import migrate_node_type
-
     normalized_type = migrate_node_type(node_type)
 
     if executors:
@@ -843,6 +1477,29 @@ def _get_executor(node_type: str, executors: dict[str, Any] | None) -> Any | Non
 
     return get_executor(node_type)
 
+def _token_text(item: Any) -> str | None:
+    """Streamed text carried by a progress token or agent RunContent event."""
+    if not isinstance(item, NodeEvent):
+        return None
+    data = item.data or {}
+    if item.event_type == "progress":
+        token = data.get("token")
+    elif item.event_type == "agent_event" and data.get("event") == "RunContent":
+        token = data.get("content")
+    else:
+        return None
+    return str(token) if token else None
+
+
+def _is_forwarded_token(item: Any) -> bool:
+    """A chunk a stream consumer re-emits from its upstream producer."""
+    return (
+        isinstance(item, NodeEvent)
+        and item.event_type == "progress"
+        and bool((item.data or {}).get("forwarded"))
+    )
+
+
 def _ensure_run_id(event: NodeEvent, run_id: str) -> NodeEvent:
     if event.run_id:
         return event
@@ -0,0 +1,246 @@
+"""Compile-time simplification of flow graphs.
+
+An opt-in pass (`services.execution.fold` or `COVALT_FLOW_FOLD=1`) that runs
+before a plan is compiled:
+
+  - Reroute collapse: a node whose executor declares `passthrough_input`
+    and that has exactly one incoming flow edge and no `data.value` fallback
+    is removed, and its outgoing edges are rewired to its upstream port.
+  - Constant folding: a node whose executor declares `foldable = True`
+    (pure and local: no network, scripts, clock or randomness), without
+    `{{ }}` expressions and whose inputs are all constants, runs once at
+    compile time. Its outputs are injected like cached outputs, so the node
+    is never scheduled and emits no events. Cacheability is not enough:
+    cacheable nodes may still call models or run user code.
+  - Dead-branch elimination: nodes that can only receive data from
+    unselected ports of folded routers, or from other eliminated nodes, are
+    dropped from the graph.
+
+Nodes that take part in link-channel composition, and the run's target or
+entry nodes, are never removed. `FlowFolding.origins` maps every
+eliminated node ID to what happened to it, so traces can attribute results
+back to the original graph.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import types
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from backend.services.flows.flow_plan import contains_expression
+from nodes._coerce import coerce
+from nodes._types import DataValue, ExecutionResult, FlowContext
+
+logger = logging.getLogger(__name__)
+
+FOLD_ENV = "COVALT_FLOW_FOLD"
+FLOW_CHANNEL = "flow"
+
+
+def flow_folding_enabled(services: Any) -> bool:
+    execution = getattr(services, "execution", None)
+    flag = getattr(execution, "fold", None)
+    if isinstance(flag, bool):
+        return flag
+    return os.getenv(FOLD_ENV) == "1"
+
+
+def executor_is_foldable(executor: Any) -> bool:
+    return getattr(executor, "foldable", False) is True
+
+
+@dataclass
+class FlowFolding:
+    graph_data: dict[str, Any]
+    folded_outputs: dict[str, dict[str, DataValue]] = field(default_factory=dict)
+    origins: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.origins)
+
+
+def _is_flow_edge(edge: dict[str, Any]) -> bool:
+    return (edge.get("data") or {}).get("channel") == FLOW_CHANNEL
+
+
+def _link_node_ids(edges: list[dict[str, Any]]) -> set[str]:
+    linked: set[str] = set()
+    for edge in edges:
+        if not _is_flow_edge(edge):
+            linked.add(edge.get("source"))
+            linked.add(edge.get("target"))
+    return linked
+
+
+def _topological(node_ids: list[str], edges: list[dict[str, Any]]) -> list[str]:
+    indegree = {node_id: 0 for node_id in node_ids}
+    adjacency: dict[str, list[str]] = {node_id: [] for node_id in node_ids}
+    for edge in edges:
+        source, target = edge.get("source"), edge.get("target")
+        if source in indegree and target in indegree:
+            adjacency[source].append(target)
+            indegree[target] += 1
+    queue = sorted(node_id for node_id, degree in indegree.items() if degree == 0)
+    order: list[str] = []
+    while queue:
+        node_id = queue.pop(0)
+        order.append(node_id)
+        for target in adjacency[node_id]:
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                queue.append(target)
+    return order
+
+
+def _constant_inputs(
+    incoming: list[dict[str, Any]],
+    folded_outputs: dict[str, dict[str, DataValue]],
+) -> dict[str, DataValue]:
+    inputs: dict[str, DataValue] = {}
+    for edge in incoming:
+        value = folded_outputs[edge["source"]].get(edge.get("sourceHandle", "output"))
+        if value is None:
+            continue
+        target_type = (edge.get("data") or {}).get("targetType")
+        if target_type and target_type != "data" and value.type not in ("data", target_type):
+            value = coerce(value, target_type)
+        inputs[edge.get("targetHandle", "input")] = value
+    return inputs
+
+
+async def _evaluate(
+    executor: Any, node_id: str, data: dict[str, Any], inputs: dict[str, DataValue]
+) -> dict[str, DataValue] | None:
+    context = FlowContext(
+        node_id=node_id,
+        chat_id=None,
+        run_id="fold",
+        state=None,
+        runtime=None,
+        services=types.SimpleNamespace(),
+    )
+    result = executor.execute(data, inputs, context)
+    if hasattr(result, "__aiter__"):
+        final: ExecutionResult | None = None
+        async for item in result:
+            if isinstance(item, ExecutionResult):
+                final = item
+            elif getattr(item, "event_type", None) == "error":
+                return None
+        result = final
+    else:
+        result = await result
+    return result.outputs if isinstance(result, ExecutionResult) else None
+
+
+def _collapse_passthroughs(
+    nodes: list[dict[str, Any]],
+    edges: list[dict[str, Any]],
+    get_executor: Callable[[str], Any],
+    keep: set[str],
+    origins: dict[str, dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    linked = _link_node_ids(edges)
+    changed = True
+    while changed:
+        changed = False
+        for node in nodes:
+            node_id = node["id"]
+            handle = getattr(get_executor(node.get("type", "")), "passthrough_input", None)
+            if not handle or node_id in keep or node_id in linked:
+                continue
+            if (node.get("data") or {}).get("value") is not None:
+                # The fallback applies when the upstream produces nothing.
+                continue
+            incoming = [edge for edge in edges if edge.get("target") == node_id]
+            if len(incoming) != 1 or incoming[0].get("targetHandle", "input") != handle:
+                continue
+            source = incoming[0]["source"]
+            source_handle = incoming[0].get("sourceHandle", "output")
+            rewired = []
+            for edge in edges:
+                if edge is incoming[0]:
+                    continue
+                if edge.get("source") == node_id:
+                    edge = {**edge, "source": source, "sourceHandle": source_handle}
+                rewired.append(edge)
+            edges = rewired
+            nodes = [candidate for candidate in nodes if candidate["id"] != node_id]
+            origins[node_id] = {"kind": "collapsed", "into": source, "handle": source_handle}
+            changed = True
+            break
+    return nodes, edges
+
+
+async def fold_flow_graph(
+    graph_data: dict[str, Any],
+    get_executor: Callable[[str], Any],
+    keep: set[str] | frozenset[str] = frozenset(),
+) -> FlowFolding:
+    """Collapse pass-throughs, fold constants and drop dead branches."""
+    nodes = [node for node in graph_data.get("nodes", []) if node.get("id")]
+    edges = list(graph_data.get("edges", []))
+    keep = set(keep)
+    origins: dict[str, dict[str, Any]] = {}
+
+    nodes, edges = _collapse_passthroughs(nodes, edges, get_executor, keep, origins)
+
+    linked = _link_node_ids(edges)
+    flow_edges = [edge for edge in edges if _is_flow_edge(edge)]
+    nodes_by_id = {node["id"]: node for node in nodes}
+    folded_outputs: dict[str, dict[str, DataValue]] = {}
+    dead: set[str] = set()
+
+    for node_id in _topological(list(nodes_by_id), flow_edges):
+        node = nodes_by_id[node_id]
+        executor = get_executor(node.get("type", ""))
+        if executor is None or not hasattr(executor, "execute") or node_id in linked:
+            continue
+        incoming = [edge for edge in flow_edges if edge.get("target") == node_id]
+        if any(edge["source"] not in folded_outputs and edge["source"] not in dead for edge in incoming):
+            continue
+        inputs = _constant_inputs(
+            [edge for edge in incoming if edge["source"] in folded_outputs], folded_outputs
+        )
+        if incoming and not inputs:
+            if node_id not in keep:
+                dead.add(node_id)
+                origins[node_id] = {"kind": "pruned"}
+            continue
+
+        data = node.get("data", {})
+        if node_id in keep or contains_expression(data):
+            continue
+        if not executor_is_foldable(executor):
+            continue
+        try:
+            outputs = await _evaluate(executor, node_id, copy.deepcopy(data), inputs)
+        except Exception as exc:
+            logger.debug("[flow_folding] Could not fold %s: %s", node_id, exc)
+            continue
+        if outputs is None:
+            continue
+        folded_outputs[node_id] = outputs
+        origins[node_id] = {"kind": "folded"}
+
+    for origin in origins.values():
+        while origin["kind"] == "collapsed" and origins.get(origin["into"], {}).get("kind") == "collapsed":
+            upstream = origins[origin["into"]]
+            origin["into"], origin["handle"] = upstream["into"], upstream["handle"]
+
+    folded_graph = {
+        **graph_data,
+        "nodes": [node for node in nodes if node["id"] not in dead],
+        "edges": [
+            edge
+            for edge in edges
+            if edge.get("source") not in dead and edge.get("target") not in dead
+        ],
+    }
+    return FlowFolding(graph_data=folded_graph, folded_outputs=folded_outputs, origins=origins)
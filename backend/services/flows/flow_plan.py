@@ -0,0 +1,125 @@
+"""Compiled flow plans and their fingerprint-keyed cache.
+
+A `CompiledFlowPlan` captures everything `run_flow` derives from the graph
+alone — scoped flow nodes, flow edges, topological order, dependency sets,
+executor references, the GraphRuntime edge index and what each node's
+expressions read — so repeated runs of an unchanged graph skip straight to
+scheduling. Folded plans (see flow_folding)
+also carry compile-time constant outputs and the origin of every eliminated
+node, and are cached next to their unfolded plan.
+
+Plans are keyed by a hash of the graph JSON, the execution scope and the
+plugin registry revision. Each cached plan owns a private copy of the graph,
+so callers mutating their graph dict afterwards cannot corrupt it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+
+from backend.services.flows.graph_runtime import GraphIndex
+
+DEFAULT_PLAN_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class CompiledFlowPlan:
+    fingerprint: str | None
+    graph_data: dict[str, Any]
+    graph_index: GraphIndex
+    nodes: tuple[dict[str, Any], ...]
+    nodes_by_id: dict[str, dict[str, Any]]
+    flow_edges: tuple[dict[str, Any], ...]
+    order: tuple[str, ...]
+    order_index: dict[str, int]
+    upstream_by_node: dict[str, frozenset[str]]
+    downstream_by_node: dict[str, frozenset[str]]
+    executors_by_node: dict[str, Any]
+    has_expressions: dict[str, bool]
+    expression_refs: dict[str, Any] = field(default_factory=dict)
+    folded_outputs: dict[str, dict[str, Any]] = field(default_factory=dict)
+    origins: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.nodes
+
+
+def serialize_graph(graph_data: dict[str, Any]) -> bytes | None:
+    """Canonical JSON bytes for a graph, or None if it is not plain JSON."""
+    try:
+        return orjson.dumps(graph_data, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return None
+
+
+def plan_fingerprint(serialized_graph: bytes, scope_key: tuple[Any, ...]) -> str:
+    digest = hashlib.blake2b(serialized_graph, digest_size=20)
+    digest.update(repr(scope_key).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def contains_expression(value: Any) -> bool:
+    if isinstance(value, str):
+        return "{{" in value
+    if isinstance(value, dict):
+        return any(contains_expression(item) for item in value.values())
+    if isinstance(value, list):
+        return any(contains_expression(item) for item in value)
+    return False
+
+
+class FlowPlanCache:
+    """Small thread-safe LRU of compiled plans."""
+
+    def __init__(self, max_entries: int = DEFAULT_PLAN_CACHE_SIZE) -> None:
+        self._max_entries = max(1, max_entries)
+        self._plans: OrderedDict[str, CompiledFlowPlan] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint: str) -> CompiledFlowPlan | None:
+        with self._lock:
+            plan = self._plans.get(fingerprint)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(fingerprint)
+            self.hits += 1
+            return plan
+
+    def put(self, plan: CompiledFlowPlan) -> None:
+        if plan.fingerprint is None:
+            return
+        with self._lock:
+            self._plans[plan.fingerprint] = plan
+            self._plans.move_to_end(plan.fingerprint)
+            while len(self._plans) > self._max_entries:
+                self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+_plan_cache = FlowPlanCache()
+
+
+def get_flow_plan_cache() -> FlowPlanCache:
+    return _plan_cache
+
+
+def clear_flow_plan_cache() -> None:
+    _plan_cache.clear()
@@ -0,0 +1,242 @@
+"""Opt-in per-node profiler for run_flow.
+
+When enabled (`services.execution.profile` or `COVALT_FLOW_PROFILE=1`), the
+executor records a span per node phase:
+
+  - `queue_wait`   ready → scheduled
+  - `expressions`  `{{ }}` resolution of node data
+  - `execute`      executor run, from first call to last event
+  - `ttft` / `stream_tail`  split of `execute` at the first streamed token
+  - `materialize` / `resolve_links`  link-channel subgraph resolution
+
+Spans opened inside another span (in the same task) are nested, so the report
+carries inclusive and exclusive time for materialized subgraphs. `ttft` and
+`stream_tail` annotate `execute` and do not reduce its exclusive time.
+
+`to_chrome_trace()` produces Chrome trace-event JSON, which chrome://tracing,
+Perfetto and speedscope all open. Setting `COVALT_FLOW_PROFILE_DIR` writes one
+`<run_id>.trace.json` per profiled run.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "COVALT_FLOW_PROFILE"
+PROFILE_DIR_ENV = "COVALT_FLOW_PROFILE_DIR"
+ANNOTATION_PHASES = frozenset({"ttft", "stream_tail"})
+
+
+@dataclass
+class ProfileSpan:
+    name: str
+    node_id: str | None
+    lane: str
+    start_ns: int
+    end_ns: int | None = None
+    depth: int = 0
+    child_ns: int = 0
+    args: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def inclusive_ns(self) -> int:
+        return max(0, (self.end_ns or self.start_ns) - self.start_ns)
+
+    @property
+    def exclusive_ns(self) -> int:
+        return max(0, self.inclusive_ns - self.child_ns)
+
+
+_current_span: contextvars.ContextVar[ProfileSpan | None] = contextvars.ContextVar(
+    "covalt_flow_profile_span", default=None
+)
+
+
+def _ms(ns: int) -> float:
+    return round(ns / 1_000_000, 3)
+
+
+def flow_profiling_enabled(services: Any) -> bool:
+    execution = getattr(services, "execution", None)
+    flag = getattr(execution, "profile", None)
+    if isinstance(flag, bool):
+        return flag
+    return os.getenv(PROFILE_ENV) == "1"
+
+
+class FlowProfiler:
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.started_ns = time.perf_counter_ns()
+        self.finished_ns: int | None = None
+        self.spans: list[ProfileSpan] = []
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        node_id: str | None = None,
+        **args: Any,
+    ) -> Iterator[ProfileSpan]:
+        parent = _current_span.get()
+        current = ProfileSpan(
+            name=name,
+            node_id=node_id,
+            lane=parent.lane if parent is not None else (node_id or "run"),
+            start_ns=time.perf_counter_ns(),
+            depth=parent.depth + 1 if parent is not None else 0,
+            args=args,
+        )
+        self.spans.append(current)
+        token = _current_span.set(current)
+        try:
+            yield current
+        finally:
+            _current_span.reset(token)
+            current.end_ns = time.perf_counter_ns()
+            if parent is not None:
+                parent.child_ns += current.inclusive_ns
+
+    def record(
+        self,
+        name: str,
+        node_id: str | None,
+        start_ns: int,
+        end_ns: int,
+        **args: Any,
+    ) -> ProfileSpan:
+        """Add an already-measured span; annotations do not count as children."""
+        parent = _current_span.get()
+        recorded = ProfileSpan(
+            name=name,
+            node_id=node_id,
+            lane=parent.lane if parent is not None else (node_id or "run"),
+            start_ns=start_ns,
+            end_ns=end_ns,
+            depth=parent.depth + 1 if parent is not None else 0,
+            args=args,
+        )
+        self.spans.append(recorded)
+        if parent is not None and name not in ANNOTATION_PHASES:
+            parent.child_ns += recorded.inclusive_ns
+        return recorded
+
+    def finish(self) -> None:
+        if self.finished_ns is None:
+            self.finished_ns = time.perf_counter_ns()
+
+    def report(self) -> dict[str, Any]:
+        end_ns = self.finished_ns or time.perf_counter_ns()
+        nodes: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            if span.node_id is None or span.end_ns is None:
+                continue
+            phases = nodes.setdefault(span.lane, {})
+            if span.lane == span.node_id and span.depth == 0 or span.name in ANNOTATION_PHASES:
+                key = f"{span.name}_ms"
+                phases[key] = round(phases.get(key, 0.0) + _ms(span.inclusive_ns), 3)
+                if span.name == "execute":
+                    phases["execute_exclusive_ms"] = _ms(span.exclusive_ns)
+            elif span.depth == 1:
+                phases["links_ms"] = round(phases.get("links_ms", 0.0) + _ms(span.inclusive_ns), 3)
+
+        return {
+            "run_id": self.run_id,
+            "total_ms": _ms(end_ns - self.started_ns),
+            "nodes": nodes,
+            "spans": [
+                {
+                    "name": span.name,
+                    "node_id": span.node_id,
+                    "lane": span.lane,
+                    "depth": span.depth,
+                    "start_ms": _ms(span.start_ns - self.started_ns),
+                    "inclusive_ms": _ms(span.inclusive_ns),
+                    "exclusive_ms": _ms(span.exclusive_ns),
+                    **({"args": span.args} if span.args else {}),
+                }
+                for span in self.spans
+                if span.end_ns is not None
+            ],
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        lanes: dict[str, int] = {}
+        events: list[dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": 1,
+                "args": {"name": f"flow run {self.run_id}"},
+            }
+        ]
+        for span in sorted(self.spans, key=lambda s: (s.start_ns, s.depth)):
+            if span.end_ns is None:
+                continue
+            if span.lane not in lanes:
+                lanes[span.lane] = len(lanes) + 1
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": 1,
+                        "tid": lanes[span.lane],
+                        "args": {"name": span.lane},
+                    }
+                )
+            events.append(
+                {
+                    "name": span.name if span.node_id in (None, span.lane) else f"{span.name} {span.node_id}",
+                    "cat": "annotation" if span.name in ANNOTATION_PHASES else "phase",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": lanes[span.lane],
+                    "ts": (span.start_ns - self.started_ns) / 1000,
+                    "dur": span.inclusive_ns / 1000,
+                    "args": {
+                        "node_id": span.node_id,
+                        "exclusive_ms": _ms(span.exclusive_ns),
+                        **span.args,
+                    },
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps(self.to_chrome_trace()))
+        return path
+
+
+def profile_span(
+    profiler: FlowProfiler | None,
+    name: str,
+    node_id: str | None = None,
+    **args: Any,
+) -> AbstractContextManager[Any]:
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name, node_id, **args)
+
+
+def finish_flow_profiler(profiler: FlowProfiler) -> None:
+    profiler.finish()
+    directory = os.getenv(PROFILE_DIR_ENV)
+    if not directory:
+        return
+    try:
+        profiler.export(Path(directory) / f"{profiler.run_id}.trace.json")
+    except OSError as exc:
+        logger.warning("[flow_profiler] Failed to write trace: %s", exc)
@@ -0,0 +1,354 @@
+"""Server-side outputs of the last editor run, for incremental re-execution.
+
+The editor used to ship every cached node output back with each partial run.
+Instead, the backend keeps the outputs of the last run per agent together with
+a signature for each node. The client only sends the scope of a run: the
+nodes it wants run and the upstream nodes it may read. Which of them are
+dirty is decided here, by diffing the current graph's signatures against the
+snapshot's, so a node the editor lost track of is still served from the
+snapshot and a node it wrongly believes clean still runs.
+
+A node signature hashes the node type, its data and the signatures of every
+node feeding it (any edge channel), so editing one node changes the signature
+of its whole downstream cone. Source nodes and nodes with `{{ }}` expressions
+also hash the trigger payload. Nodes that read other nodes by label (`$(`)
+cannot be tracked through edges and never match.
+
+Snapshots live in a small in-memory LRU; evicted snapshots are spilled to disk
+by a background writer thread and loaded back on the next run of that agent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from backend.services.flows.flow_plan import contains_expression
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_ENTRIES = 8
+MEMORY_ENTRIES_ENV = "COVALT_FLOW_RUN_STATE_ENTRIES"
+
+
+@dataclass
+class FlowRunSnapshot:
+    signatures: dict[str, str] = field(default_factory=dict)
+    outputs: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def clean_outputs(self, node_id: str, signature: str | None) -> dict[str, Any] | None:
+        if signature is None or self.signatures.get(node_id) != signature:
+            return None
+        return self.outputs.get(node_id)
+
+
+def _digest(payload: Any) -> str:
+    raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _reads_by_label(value: Any) -> bool:
+    if isinstance(value, str):
+        return "$(" in value
+    if isinstance(value, dict):
+        return any(_reads_by_label(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_reads_by_label(item) for item in value)
+    return False
+
+
+def compute_node_signatures(
+    graph_data: dict[str, Any],
+    *,
+    trigger_payload: Any = None,
+    pinned_outputs: dict[str, Any] | None = None,
+) -> dict[str, str]:
+    """Signature per node; pinned nodes are identified by their outputs."""
+    nodes_by_id = {
+        node["id"]: node for node in graph_data.get("nodes", []) if node.get("id")
+    }
+    incoming: dict[str, list[dict[str, Any]]] = {}
+    for edge in graph_data.get("edges", []):
+        target = edge.get("target")
+        if target in nodes_by_id and edge.get("source") in nodes_by_id:
+            incoming.setdefault(target, []).append(edge)
+
+    trigger_digest = _digest(trigger_payload)
+    pinned = pinned_outputs or {}
+    signatures: dict[str, str] = {}
+    visiting: set[str] = set()
+
+    def visit(node_id: str) -> str:
+        known = signatures.get(node_id)
+        if known is not None:
+            return known
+        if node_id in pinned:
+            signatures[node_id] = _digest({"pinned": pinned[node_id]})
+            return signatures[node_id]
+        if node_id in visiting:
+            return "cycle"
+        visiting.add(node_id)
+
+        node = nodes_by_id[node_id]
+        data = node.get("data") or {}
+        if _reads_by_label(data):
+            signature = f"volatile:{uuid.uuid4().hex}"
+        else:
+            edges = incoming.get(node_id, [])
+            sources = sorted(
+                (
+                    edge.get("sourceHandle") or "output",
+                    edge.get("targetHandle") or "input",
+                    visit(edge["source"]),
+                    _digest(edge.get("data")),
+                )
+                for edge in edges
+            )
+            payload: dict[str, Any] = {
+                "type": node.get("type"),
+                "data": data,
+                "sources": sources,
+            }
+            if not edges or contains_expression(data):
+                payload["trigger"] = trigger_digest
+            signature = _digest(payload)
+
+        visiting.discard(node_id)
+        signatures[node_id] = signature
+        return signature
+
+    for node_id in nodes_by_id:
+        visit(node_id)
+    return signatures
+
+
+@dataclass(frozen=True)
+class IncrementalRun:
+    node_ids: list[str] | None
+    cached_outputs: dict[str, dict[str, Any]]
+    promoted: frozenset[str]
+    reused: frozenset[str] = frozenset()
+
+
+def resolve_incremental_run(
+    graph_data: dict[str, Any],
+    snapshot: FlowRunSnapshot | None,
+    signatures: dict[str, str],
+    *,
+    node_ids: list[str] | None,
+    cached_node_ids: list[str],
+    required: set[str] | None = None,
+    explicit_outputs: dict[str, dict[str, Any]] | None = None,
+) -> IncrementalRun:
+    """Split a run's scope into clean nodes served from the snapshot and dirty ones to run.
+
+    The scope is `node_ids` plus `cached_node_ids`. `required` nodes (all of
+    `node_ids` by default) always run; every other node in scope is clean
+    when its signature matches the snapshot, however the editor listed it.
+    Clean nodes the editor asked to run are `reused`; dirty nodes it offered
+    as cached are `promoted`. A running node needs its own inputs, so its
+    upstream flow neighbours are resolved the same way until every
+    dependency is either cached or running.
+    """
+    explicit = dict(explicit_outputs or {})
+    upstream: dict[str, list[str]] = {}
+    for edge in graph_data.get("edges", []):
+        if (edge.get("data") or {}).get("channel") == "flow":
+            upstream.setdefault(edge.get("target"), []).append(edge.get("source"))
+
+    requested = list(node_ids or [])
+    run = set(requested) if required is None else set(required)
+    cached: dict[str, dict[str, Any]] = {}
+    pending = [
+        node_id
+        for node_id in [*cached_node_ids, *requested]
+        if node_id in signatures and node_id not in run
+    ]
+    while pending:
+        node_id = pending.pop()
+        if node_id in run or node_id in cached or node_id in explicit:
+            continue
+        outputs = snapshot.clean_outputs(node_id, signatures.get(node_id)) if snapshot else None
+        if outputs is not None:
+            cached[node_id] = outputs
+            continue
+        run.add(node_id)
+        pending.extend(
+            source for source in upstream.get(node_id, []) if source in signatures
+        )
+
+    if node_ids is not None:
+        ordered = [node_id for node_id in requested if node_id in run]
+        ordered += sorted(run - set(requested))
+    else:
+        ordered = None
+    return IncrementalRun(
+        node_ids=ordered,
+        cached_outputs={**cached, **explicit},
+        promoted=frozenset(run - set(requested)),
+        reused=frozenset(node_id for node_id in requested if node_id in cached),
+    )
+
+
+def _memory_entries() -> int:
+    try:
+        return max(1, int(os.getenv(MEMORY_ENTRIES_ENV, DEFAULT_MEMORY_ENTRIES)))
+    except ValueError:
+        return DEFAULT_MEMORY_ENTRIES
+
+
+class FlowRunStateStore:
+    """Per-agent snapshots: in-memory LRU with spill to disk on eviction.
+
+    Evicted snapshots are written by a single background thread, so `record()`
+    never touches the disk. Until its write lands, an evicted snapshot is
+    still served from memory.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        *,
+        max_memory_entries: int | None = None,
+    ) -> None:
+        self._directory = directory
+        self._max_memory_entries = (
+            _memory_entries() if max_memory_entries is None else max(1, max_memory_entries)
+        )
+        self._snapshots: OrderedDict[str, FlowRunSnapshot] = OrderedDict()
+        self._spilling: dict[str, FlowRunSnapshot] = {}
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="flow-run-state")
+
+    def _spill_path(self, key: str) -> Path:
+        if self._directory is None:
+            from backend.config import get_db_directory  # noqa: PLC0415
+
+            self._directory = get_db_directory() / "flow_run_state"
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self._directory / f"{digest}.json"
+
+    def _encode(self, snapshot: FlowRunSnapshot) -> bytes | None:
+        try:
+            return orjson.dumps({"signatures": snapshot.signatures, "outputs": snapshot.outputs})
+        except TypeError as exc:
+            logger.warning("[flow_run_state] Failed to spill snapshot: %s", exc)
+            return None
+
+    def _write(self, path: Path, payload: bytes | None) -> None:
+        if payload is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(payload)
+        except OSError as exc:
+            logger.warning("[flow_run_state] Failed to spill snapshot: %s", exc)
+
+    def _spill_evicted(self, key: str, snapshot: FlowRunSnapshot) -> None:
+        with self._lock:
+            # Revived by a later run before this write got its turn.
+            if self._spilling.get(key) is not snapshot:
+                return
+            path, payload = self._spill_path(key), self._encode(snapshot)
+        self._write(path, payload)
+        with self._lock:
+            if self._spilling.get(key) is snapshot:
+                del self._spilling[key]
+
+    def _load(self, key: str) -> FlowRunSnapshot | None:
+        path = self._spill_path(key)
+        try:
+            payload = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as exc:
+            logger.warning("[flow_run_state] Failed to load snapshot: %s", exc)
+            return None
+        if not isinstance(payload, dict):
+            return None
+        return FlowRunSnapshot(
+            signatures=dict(payload.get("signatures") or {}),
+            outputs=dict(payload.get("outputs") or {}),
+        )
+
+    def _snapshot(self, key: str, *, create: bool) -> FlowRunSnapshot | None:
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self._spilling.pop(key, None) or self._load(key)
+            if snapshot is None and not create:
+                return None
+            snapshot = snapshot or FlowRunSnapshot()
+            self._snapshots[key] = snapshot
+            while len(self._snapshots) > self._max_memory_entries:
+                evicted_key, evicted = self._snapshots.popitem(last=False)
+                self._spilling[evicted_key] = evicted
+                self._writer.submit(self._spill_evicted, evicted_key, evicted)
+        self._snapshots.move_to_end(key)
+        return snapshot
+
+    def get(self, key: str) -> FlowRunSnapshot | None:
+        with self._lock:
+            return self._snapshot(key, create=False)
+
+    def record(
+        self,
+        key: str,
+        node_id: str,
+        signature: str,
+        outputs: dict[str, Any],
+    ) -> None:
+        with self._lock:
+            snapshot = self._snapshot(key, create=True)
+            snapshot.signatures[node_id] = signature
+            snapshot.outputs[node_id] = outputs
+
+    def forget(self, key: str, node_id: str) -> None:
+        with self._lock:
+            snapshot = self._snapshot(key, create=False)
+            if snapshot is None:
+                return
+            snapshot.signatures.pop(node_id, None)
+            snapshot.outputs.pop(node_id, None)
+
+    def wait_for_spills(self) -> None:
+        self._writer.submit(lambda: None).result()
+
+    def flush(self) -> None:
+        """Wait for pending spills and write every in-memory snapshot; blocking."""
+        self.wait_for_spills()
+        with self._lock:
+            pending = [
+                (self._spill_path(key), self._encode(snapshot))
+                for key, snapshot in self._snapshots.items()
+            ]
+        for path, payload in pending:
+            self._write(path, payload)
+
+    def in_memory(self) -> int:
+        return len(self._snapshots)
+
+
+_flow_run_state_store: FlowRunStateStore | None = None
+
+
+def get_flow_run_state_store() -> FlowRunStateStore:
+    global _flow_run_state_store
+    if _flow_run_state_store is None:
+        _flow_run_state_store = FlowRunStateStore()
+    return _flow_run_state_store
+
+
+async def shutdown_flow_run_state() -> None:
+    if _flow_run_state_store is not None:
+        await asyncio.to_thread(_flow_run_state_store.flush)
@@ -0,0 +1,131 @@
+"""Opt-in speculative execution of conditional branches.
+
+Routing executors that forward one of their inputs unchanged to the selected
+port declare it with `routes_input = "<input handle>"` (the conditional node).
+While such a router runs, its pure direct children whose other dependencies
+are already satisfied start early, as if the router had picked their port.
+
+Speculative tasks publish into a buffer instead of the run's event queue.
+When the router finishes, each child is either committed (its buffered events
+are replayed and it continues as a normal task) or discarded (cancelled, its
+events dropped). A child is only committed if the inputs and resolved data it
+would have been scheduled with match the speculative ones exactly.
+
+Pure means the node data sets `pure: true`, or the executor declares
+`foldable = True` (pure and local, see flow_folding) and the node does not
+set `pure: false`. Cacheability is not enough: a cacheable node may still
+call a model or run a user script, which speculation could then throw away.
+
+Speculative tasks go through the run's concurrency gate (flow_concurrency):
+each holds a slot of its node type from launch until it is discarded, or
+hands it over to the committed task. They only launch into spare capacity,
+after the ready nodes of the same scheduling pass, and not at all while a
+ready node is deferred for lack of a slot, so `max_concurrency` and per-type
+caps bound speculative and real work together. Children skipped for that
+reason are counted as `throttled`.
+
+Enable with `services.execution.speculative` or `COVALT_FLOW_SPECULATION=1`.
+The per-run `SpeculationReport` lands on `services.flow_speculation`. Its
+`saved_ms` is the wall time committed branches had already run when their
+router finished (latency taken off the critical path); `wasted_ms` is the
+time discarded branches ran for nothing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from backend.services.flows.flow_folding import executor_is_foldable
+from nodes._types import DataValue
+
+SPECULATION_ENV = "COVALT_FLOW_SPECULATION"
+
+
+def speculation_enabled(services: Any) -> bool:
+    execution = getattr(services, "execution", None)
+    flag = getattr(execution, "speculative", None)
+    if isinstance(flag, bool):
+        return flag
+    return os.getenv(SPECULATION_ENV) == "1"
+
+
+def routed_input_handle(executor: Any) -> str | None:
+    handle = getattr(executor, "routes_input", None)
+    return handle if isinstance(handle, str) and handle else None
+
+
+def is_pure_branch(executor: Any, data: dict[str, Any]) -> bool:
+    flag = data.get("pure")
+    if isinstance(flag, bool):
+        return flag
+    return executor_is_foldable(executor)
+
+
+@dataclass
+class SpeculationReport:
+    launched: int = 0
+    committed: int = 0
+    discarded: int = 0
+    throttled: int = 0
+    saved_ms: float = 0.0
+    wasted_ms: float = 0.0
+    nodes: dict[str, str] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SpeculativeSink:
+    """Event-queue stand-in that buffers a speculative task's messages."""
+
+    def __init__(self) -> None:
+        self.messages: list[tuple] = []
+        self.target: Any = None
+        self.finished_at: float | None = None
+
+    async def put(self, message: tuple) -> None:
+        if message[0] == "done" and self.finished_at is None:
+            self.finished_at = time.monotonic()
+        if self.target is not None:
+            await self.target.put(message)
+        else:
+            self.messages.append(message)
+
+
+@dataclass
+class SpeculativeBranch:
+    node_id: str
+    node_type: str
+    router_id: str
+    task: asyncio.Task[None]
+    sink: SpeculativeSink
+    inputs: dict[str, DataValue]
+    data: dict[str, Any]
+    started_at: float = field(default_factory=time.monotonic)
+
+    def matches(self, inputs: dict[str, DataValue], data: dict[str, Any]) -> bool:
+        return inputs == self.inputs and data == self.data
+
+    def commit(self, report: SpeculationReport, target: Any) -> list[tuple]:
+        """Hand the task over to `target`; returns the messages buffered so far."""
+        now = time.monotonic()
+        finished = self.sink.finished_at or now
+        report.committed += 1
+        report.saved_ms = round(report.saved_ms + (min(now, finished) - self.started_at) * 1000, 3)
+        report.nodes[self.node_id] = "committed"
+        buffered = self.sink.messages
+        self.sink.messages = []
+        self.sink.target = target
+        return buffered
+
+    def discard(self, report: SpeculationReport) -> None:
+        finished = self.sink.finished_at or time.monotonic()
+        if not self.task.done():
+            self.task.cancel()
+        report.discarded += 1
+        report.wasted_ms = round(report.wasted_ms + (finished - self.started_at) * 1000, 3)
+        report.nodes[self.node_id] = "discarded"
@@ -0,0 +1,297 @@
+"""Process-pool execution tier for CPU-bound flow executors.
+
+Every node normally runs on the shared asyncio loop, so a large merge or
+transform stalls token delivery for every other chat. Executors that declare
+`cpu_bound = True` can instead run in a pool of worker processes. Workers get
+no run control, so executors that poll for cancellation or manage their own
+off-loop workers (the code node's sandbox) should not declare it.
+
+A worker receives the node's data, inputs and the service attributes listed
+in the executor's `worker_services` as a single orjson payload (through
+shared memory above `SHARED_MEMORY_THRESHOLD` bytes), re-imports the executor
+class by module and name, runs `execute` with a runtime-less FlowContext and
+returns the outputs as orjson. A crashed worker fails only its node; the
+pool is rebuilt for the next call. Payloads that do not serialize, and
+executors that cannot be imported in a fresh process, run in-process.
+Resizing the pool retires the old one without blocking: its running calls
+finish and its processes exit afterwards.
+
+The pool is sized by `services.execution.worker_processes` or
+`COVALT_FLOW_WORKERS` and is off (0) by default.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any
+
+import orjson
+
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+
+logger = logging.getLogger(__name__)
+
+FLOW_WORKERS_ENV = "COVALT_FLOW_WORKERS"
+SHARED_MEMORY_THRESHOLD = 1 << 20
+
+
+class WorkerUnavailable(Exception):
+    """The executor cannot run in a worker process; run it in-process."""
+
+
+def resolve_worker_processes(services: Any) -> int:
+    execution = getattr(services, "execution", None)
+    size = getattr(execution, "worker_processes", None)
+    if not isinstance(size, int) or isinstance(size, bool):
+        try:
+            size = int(os.getenv(FLOW_WORKERS_ENV, "0"))
+        except ValueError:
+            size = 0
+    return max(0, size)
+
+
+def is_cpu_bound(executor: Any) -> bool:
+    return getattr(executor, "cpu_bound", False) is True
+
+
+# -- worker side ---------------------------------------------------------------
+
+_executor_classes: dict[tuple[str, str], Any] = {}
+
+
+def _load_executor(module_name: str, class_name: str) -> Any:
+    key = (module_name, class_name)
+    executor = _executor_classes.get(key)
+    if executor is None:
+        module = importlib.import_module(module_name)
+        executor = getattr(module, class_name)()
+        _executor_classes[key] = executor
+    return executor
+
+
+def _read_payload(payload: bytes | tuple[str, int]) -> bytes:
+    if isinstance(payload, bytes):
+        return payload
+    name, size = payload
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(block.buf[:size])
+    finally:
+        block.close()
+
+
+async def _collect(result: Any) -> ExecutionResult | str:
+    if not hasattr(result, "__aiter__"):
+        return await result
+    final: ExecutionResult | None = None
+    async for item in result:
+        if isinstance(item, ExecutionResult):
+            final = item
+        elif isinstance(item, NodeEvent) and item.event_type == "error":
+            return str((item.data or {}).get("error", "Unknown error"))
+    return final if final is not None else "Executor produced no result"
+
+
+def _run_in_worker(module_name: str, class_name: str, payload: bytes | tuple[str, int]) -> bytes:
+    try:
+        executor = _load_executor(module_name, class_name)
+    except (ImportError, AttributeError, TypeError) as exc:
+        return orjson.dumps({"unavailable": str(exc)})
+
+    request = orjson.loads(_read_payload(payload))
+    inputs = {
+        handle: DataValue(type=value["type"], value=value["value"])
+        for handle, value in request["inputs"].items()
+    }
+    context = FlowContext(
+        node_id=request["node_id"],
+        chat_id=request["chat_id"],
+        run_id=request["run_id"],
+        state=None,
+        runtime=None,
+        services=types.SimpleNamespace(**request["services"]),
+    )
+    try:
+        result = asyncio.run(_collect(executor.execute(request["data"], inputs, context)))
+    except Exception as exc:
+        return orjson.dumps({"error": str(exc) or type(exc).__name__})
+    if isinstance(result, str):
+        return orjson.dumps({"error": result})
+    return orjson.dumps(
+        {
+            "outputs": {
+                handle: {"type": value.type, "value": value.value}
+                for handle, value in result.outputs.items()
+            }
+        },
+        default=str,
+    )
+
+
+# -- parent side ---------------------------------------------------------------
+
+
+class FlowWorkerPool:
+    """A lazily started, self-healing `ProcessPoolExecutor`."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.crashes = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise WorkerUnavailable("worker pool was retired")
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self.crashes += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(
+        self,
+        executor: Any,
+        data: dict[str, Any],
+        inputs: dict[str, DataValue],
+        context: FlowContext,
+    ) -> ExecutionResult:
+        services = context.services
+        try:
+            raw = orjson.dumps(
+                {
+                    "node_id": context.node_id,
+                    "chat_id": context.chat_id,
+                    "run_id": context.run_id,
+                    "data": data,
+                    "inputs": {
+                        handle: {"type": value.type, "value": value.value}
+                        for handle, value in inputs.items()
+                    },
+                    "services": {
+                        name: getattr(services, name)
+                        for name in getattr(executor, "worker_services", ())
+                        if hasattr(services, name)
+                    },
+                }
+            )
+        except TypeError as exc:
+            raise WorkerUnavailable(f"payload is not serializable: {exc}") from exc
+
+        block: shared_memory.SharedMemory | None = None
+        payload: bytes | tuple[str, int] = raw
+        if len(raw) > SHARED_MEMORY_THRESHOLD:
+            block = shared_memory.SharedMemory(create=True, size=len(raw))
+            block.buf[: len(raw)] = raw
+            payload = (block.name, len(raw))
+
+        cls = type(executor)
+        pool = self._executor()
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(
+                pool, _run_in_worker, cls.__module__, cls.__qualname__, payload
+            )
+        except BrokenProcessPool as exc:
+            self._discard(pool)
+            raise RuntimeError(f"Worker process crashed while running {context.node_id}") from exc
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+
+        reply = orjson.loads(response)
+        if "unavailable" in reply:
+            raise WorkerUnavailable(reply["unavailable"])
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return ExecutionResult(
+            outputs={
+                handle: DataValue(type=value["type"], value=value["value"])
+                for handle, value in reply["outputs"].items()
+            }
+        )
+
+    def shutdown(self, *, drain: bool = False) -> None:
+        """Stop the pool; with `drain`, let submitted calls finish without waiting."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._closed = True
+        if pool is None:
+            return
+        if drain:
+            pool.shutdown(wait=False)
+        else:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class WorkerExecutor:
+    """Runs a CPU-bound executor in the pool, falling back to in-process."""
+
+    def __init__(self, executor: Any, pool: FlowWorkerPool) -> None:
+        self._executor = executor
+        self._pool = pool
+        self.node_type = executor.node_type
+
+    async def execute(
+        self, data: dict[str, Any], inputs: dict[str, DataValue], context: FlowContext
+    ) -> Any:
+        try:
+            return await self._pool.run(self._executor, data, inputs, context)
+        except WorkerUnavailable as exc:
+            logger.debug("[flow_worker_pool] %s runs in-process: %s", self.node_type, exc)
+        result = self._executor.execute(data, inputs, context)
+        if hasattr(result, "__aiter__"):
+            return await _collect_in_process(result)
+        return await result
+
+
+async def _collect_in_process(result: Any) -> ExecutionResult:
+    outcome = await _collect(result)
+    if isinstance(outcome, str):
+        raise RuntimeError(outcome)
+    return outcome
+
+
+_pool: FlowWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_flow_worker_pool(services: Any) -> FlowWorkerPool | None:
+    """Return the shared pool, or None when the worker tier is off."""
+    global _pool
+    size = resolve_worker_processes(services)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool.size != size:
+            if _pool is not None:
+                _pool.shutdown(drain=True)
+            _pool = FlowWorkerPool(size)
+        return _pool
+
+
+async def shutdown_flow_workers() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        await asyncio.to_thread(pool.shutdown)
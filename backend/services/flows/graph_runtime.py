@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 from collections import defaultdict
+from dataclasses import dataclass
 from typing import Any
 
+import orjson
+
+from backend.services.flows.flow_profiler import profile_span
 from nodes._types import FlowContext, RuntimeApi
 
 VALID_EDGE_CHANNELS = {"flow", "link"}
+SHARED_LINK_NAMESPACES = ("materialized_output", "resolved_links")
 
 
 def _require_channel(edge: dict[str, Any]) -> str:
@@ -29,6 +35,57 @@ def _outgoing_handle(edge: dict[str, Any]) -> str:
     return edge.get("sourceHandle") or "output"
 
 
+@dataclass(frozen=True)
+class GraphIndex:
+    """Node and edge lookups for a graph, shareable across runtimes."""
+
+    nodes_by_id: dict[str, dict[str, Any]]
+    incoming_by_node: dict[str, list[dict[str, Any]]]
+    incoming_by_node_channel: dict[tuple[str, str], list[dict[str, Any]]]
+    outgoing_by_node: dict[str, list[dict[str, Any]]]
+    outgoing_by_node_channel: dict[tuple[str, str], list[dict[str, Any]]]
+
+
+def build_graph_index(graph_data: dict[str, Any]) -> GraphIndex:
+    nodes = graph_data.get("nodes", [])
+    edges = graph_data.get("edges", [])
+
+    nodes_by_id: dict[str, dict[str, Any]] = {
+        node["id"]: node
+        for node in nodes
+        if isinstance(node, dict) and node.get("id")
+    }
+
+    incoming_by_node: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    incoming_by_node_channel: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+    outgoing_by_node: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    outgoing_by_node_channel: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+
+    for edge in edges:
+        if not isinstance(edge, dict):
+            continue
+
+        source = edge.get("source")
+        target = edge.get("target")
+        if not source or not target:
+            continue
+
+        channel = _require_channel(edge)
+
+        incoming_by_node[target].append(edge)
+        incoming_by_node_channel[(target, channel)].append(edge)
+        outgoing_by_node[source].append(edge)
+        outgoing_by_node_channel[(source, channel)].append(edge)
+
+    return GraphIndex(
+        nodes_by_id=nodes_by_id,
+        incoming_by_node=dict(incoming_by_node),
+        incoming_by_node_channel=dict(incoming_by_node_channel),
+        outgoing_by_node=dict(outgoing_by_node),
+        outgoing_by_node_channel=dict(outgoing_by_node_channel),
+    )
+
+
 class GraphRuntime(RuntimeApi):
     """Runtime graph API implementation for one execution run."""
 
@@ -41,6 +98,10 @@ class GraphRuntime(RuntimeApi):
         state: Any,
         services: Any,
         executors: dict[str, Any] | None = None,
+        index: GraphIndex | None = None,
+        profiler: Any | None = None,
+        link_cache: dict[str, dict[str, Any]] | None = None,
+        artifact_cache: Any | None = None,
     ) -> None:
         self._run_id = run_id
         self._chat_id = chat_id
@@ -48,42 +109,22 @@ class GraphRuntime(RuntimeApi):
         self._services = services
         self._executors = executors
 
-        nodes = graph_data.get("nodes", [])
-        edges = graph_data.get("edges", [])
-
-        self._nodes_by_id: dict[str, dict[str, Any]] = {
-            node["id"]: node
-            for node in nodes
-            if isinstance(node, dict) and node.get("id")
-        }
-
-        self._incoming_by_node: dict[str, list[dict[str, Any]]] = defaultdict(list)
-        self._incoming_by_node_channel: dict[tuple[str, str], list[dict[str, Any]]] = (
-            defaultdict(list)
-        )
-        self._outgoing_by_node: dict[str, list[dict[str, Any]]] = defaultdict(list)
-        self._outgoing_by_node_channel: dict[tuple[str, str], list[dict[str, Any]]] = (
-            defaultdict(list)
-        )
-
-        for edge in edges:
-            if not isinstance(edge, dict):
-                continue
-
-            source = edge.get("source")
-            target = edge.get("target")
-            if not source or not target:
-                continue
-
-            channel = _require_channel(edge)
-
-            self._incoming_by_node[target].append(edge)
-            self._incoming_by_node_channel[(target, channel)].append(edge)
-            self._outgoing_by_node[source].append(edge)
-            self._outgoing_by_node_channel[(source, channel)].append(edge)
+        index = index or build_graph_index(graph_data)
+        self._nodes_by_id = index.nodes_by_id
+        self._incoming_by_node = index.incoming_by_node
+        self._incoming_by_node_channel = index.incoming_by_node_channel
+        self._outgoing_by_node = index.outgoing_by_node
+        self._outgoing_by_node_channel = index.outgoing_by_node_channel
 
         self._cache: dict[str, dict[str, Any]] = defaultdict(dict)
+        if link_cache is not None:
+            # Link artifacts depend only on node data, so callers running the
+            # same graph many times (batch runs) can share them across runs.
+            for namespace in SHARED_LINK_NAMESPACES:
+                self._cache[namespace] = link_cache.setdefault(namespace, {})
         self._resolution_stack: list[tuple[str, str, str]] = []
+        self._profiler = profiler
+        self._artifact_cache = artifact_cache
 
     def get_node(self, node_id: str) -> dict[str, Any]:
         node = self._nodes_by_id.get(node_id)
@@ -133,20 +174,21 @@ class GraphRuntime(RuntimeApi):
 
         self._enter_resolution_scope("resolve", node_id, target_handle)
         try:
-            resolved: list[Any] = []
-            for edge in self.incoming_edges(
-                node_id,
-                channel="link",
-                target_handle=target_handle,
-            ):
-                source_id = edge.get("source")
-                if not source_id:
-                    continue
-                output_handle = _outgoing_handle(edge)
-                artifact = await self._materialize_node_output(source_id, output_handle)
-                if artifact is None:
-                    continue
-                resolved.append(artifact)
+            with profile_span(self._profiler, "resolve_links", node_id, handle=target_handle):
+                resolved: list[Any] = []
+                for edge in self.incoming_edges(
+                    node_id,
+                    channel="link",
+                    target_handle=target_handle,
+                ):
+                    source_id = edge.get("source")
+                    if not source_id:
+                        continue
+                    output_handle = _outgoing_handle(edge)
+                    artifact = await self._materialize_node_output(source_id, output_handle)
+                    if artifact is None:
+                        continue
+                    resolved.append(artifact)
 
             self.cache_set("resolved_links", cache_key, resolved)
             return list(resolved)
@@ -173,6 +215,83 @@ class GraphRuntime(RuntimeApi):
 
         return get_executor(node_type)
 
+    def _node_context(self, node_id: str) -> FlowContext:
+        return FlowContext(
+            node_id=node_id,
+            chat_id=self._chat_id,
+            run_id=self._run_id,
+            state=self._state,
+            runtime=self,
+            services=self._services,
+        )
+
+    def _link_signature(
+        self, node_id: str, visiting: frozenset[str] = frozenset()
+    ) -> tuple[str, frozenset[str]] | None:
+        """Content hash and dependency scopes of a node's upstream link closure.
+
+        None when the node, or anything it can materialize from, has not
+        opted in to cross-run caching.
+        """
+        memo = self._cache["link_signature"]
+        if node_id in memo:
+            return memo[node_id]
+        node = self._nodes_by_id.get(node_id)
+        executor = self._resolve_executor(node.get("type", "")) if node else None
+        scopes = getattr(executor, "link_cache_scopes", None)
+        if node is None or scopes is None or node_id in visiting:
+            return None
+
+        data = node.get("data", {})
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(
+            orjson.dumps(
+                [node_id, node.get("type", ""), data],
+                option=orjson.OPT_SORT_KEYS,
+                default=str,
+            )
+        )
+        if hasattr(executor, "link_cache_key"):
+            extra = executor.link_cache_key(data, self._node_context(node_id))
+            digest.update(orjson.dumps(extra, option=orjson.OPT_SORT_KEYS, default=str))
+
+        closure_scopes = set(scopes)
+        edges = sorted(
+            self._incoming_by_node.get(node_id, []),
+            key=lambda edge: (_incoming_handle(edge), edge.get("source", ""), _outgoing_handle(edge)),
+        )
+        for edge in edges:
+            source = self._nodes_by_id.get(edge.get("source", ""))
+            if source is None:
+                continue
+            source_executor = self._resolve_executor(source.get("type", ""))
+            if _require_channel(edge) == "flow" and not hasattr(source_executor, "materialize"):
+                continue
+            upstream = self._link_signature(edge["source"], visiting | {node_id})
+            if upstream is None:
+                memo[node_id] = None
+                return None
+            digest.update(
+                f"{_incoming_handle(edge)}<{upstream[0]}.{_outgoing_handle(edge)};".encode()
+            )
+            closure_scopes |= upstream[1]
+
+        memo[node_id] = (digest.hexdigest(), frozenset(closure_scopes))
+        return memo[node_id]
+
+    def _shared_artifact_key(self, node_id: str, output_handle: str) -> tuple[str, frozenset[str]] | None:
+        if self._artifact_cache is None:
+            return None
+        signature = self._link_signature(node_id)
+        if signature is None:
+            return None
+
+        from nodes import registry_revision  # noqa: PLC0415
+
+        versions = self._artifact_cache.scope_versions(signature[1])
+        key = f"{signature[0]}:{output_handle}:{self._chat_id}:{registry_revision()}:{versions}"
+        return key, signature[1]
+
     async def _materialize_node_output(self, node_id: str, output_handle: str) -> Any:
         cache_key = f"{node_id}:{output_handle}"
         cached = self.cache_get("materialized_output", cache_key)
@@ -189,20 +308,22 @@ class GraphRuntime(RuntimeApi):
                     f"Node '{node_id}' ({node_type}) cannot materialize '{output_handle}'"
                 )
 
-            node_context = FlowContext(
-                node_id=node_id,
-                chat_id=self._chat_id,
-                run_id=self._run_id,
-                state=self._state,
-                runtime=self,
-                services=self._services,
-            )
-            artifact = await executor.materialize(
-                node.get("data", {}),
-                output_handle,
-                node_context,
-            )
+            shared = self._shared_artifact_key(node_id, output_handle)
+            if shared is not None:
+                artifact = self._artifact_cache.get(shared[0])
+                if artifact is not None:
+                    self.cache_set("materialized_output", cache_key, artifact)
+                    return artifact
+
+            with profile_span(self._profiler, "materialize", node_id, handle=output_handle):
+                artifact = await executor.materialize(
+                    node.get("data", {}),
+                    output_handle,
+                    self._node_context(node_id),
+                )
             self.cache_set("materialized_output", cache_key, artifact)
+            if shared is not None:
+                self._artifact_cache.put(shared[0], artifact, shared[1])
             return artifact
         finally:
             self._exit_resolution_scope()
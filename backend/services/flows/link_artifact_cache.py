@@ -0,0 +1,144 @@
+"""Process-level cache of materialized link artifacts (tools, models, agents).
+
+`GraphRuntime` memoizes `materialize` per run; this cache carries artifacts
+across runs so a warm chat turn reuses toolsets, model selections and linked
+sub-agents that have not changed.
+
+Executors opt in with `link_cache_scopes`, the external state their artifacts
+depend on (`"tools"`, `"mcp"`, `"providers"`), and may add key material with
+`link_cache_key(data, context)`. An artifact is keyed by its node's ID, type
+and data, the keys of every upstream node it can materialize from, the chat,
+the plugin registry revision and the current version of each scope in its
+upstream closure. If any upstream node has not opted in, nothing in that
+closure is shared.
+
+`invalidate_link_artifacts(scope)` bumps a scope's version and drops its
+entries. It is called when toolsets change, when MCP server status changes
+and when provider settings or credentials change.
+
+Disable with `services.execution.link_artifact_cache = False` or
+`COVALT_LINK_ARTIFACT_CACHE=0`. Runs with an explicit executor map never
+share artifacts.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+LINK_CACHE_SCOPES = ("tools", "mcp", "providers")
+LINK_ARTIFACT_CACHE_ENV = "COVALT_LINK_ARTIFACT_CACHE"
+LINK_ARTIFACT_CACHE_ENTRIES_ENV = "COVALT_LINK_ARTIFACT_CACHE_ENTRIES"
+DEFAULT_MAX_ENTRIES = 256
+
+
+def link_artifact_cache_enabled(services: Any) -> bool:
+    execution = getattr(services, "execution", None)
+    flag = getattr(execution, "link_artifact_cache", None)
+    if isinstance(flag, bool):
+        return flag
+    return os.getenv(LINK_ARTIFACT_CACHE_ENV) != "0"
+
+
+class LinkArtifactCache:
+    """Thread-safe LRU of artifacts, invalidated per dependency scope."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[Any, frozenset[str]]] = OrderedDict()
+        self._versions: dict[str, int] = {scope: 0 for scope in LINK_CACHE_SCOPES}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def scope_versions(self, scopes: Iterable[str]) -> tuple[tuple[str, int], ...]:
+        with self._lock:
+            return tuple((scope, self._versions.get(scope, 0)) for scope in sorted(scopes))
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, artifact: Any, scopes: frozenset[str]) -> None:
+        if artifact is None:
+            return
+        with self._lock:
+            self._entries[key] = (artifact, scopes)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope: str | None = None) -> int:
+        """Drop entries depending on `scope` (all entries when None)."""
+        with self._lock:
+            scopes = [scope] if scope is not None else list(self._versions)
+            for name in scopes:
+                self._versions[name] = self._versions.get(name, 0) + 1
+            stale = [
+                key
+                for key, (_artifact, entry_scopes) in self._entries.items()
+                if scope is None or scope in entry_scopes
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _max_entries_from_env() -> int:
+    try:
+        return int(os.getenv(LINK_ARTIFACT_CACHE_ENTRIES_ENV, DEFAULT_MAX_ENTRIES))
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+_cache: LinkArtifactCache | None = None
+_cache_lock = threading.Lock()
+
+
+def _on_mcp_status_change(server_id: str, *_args: Any) -> None:
+    dropped = invalidate_link_artifacts("mcp")
+    if dropped:
+        logger.debug("[link_artifact_cache] MCP server %s changed; dropped %d", server_id, dropped)
+
+
+def get_link_artifact_cache() -> LinkArtifactCache:
+    global _cache
+    if _cache is not None:
+        return _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LinkArtifactCache(_max_entries_from_env())
+            try:
+                from backend.services.tools.mcp_manager import get_mcp_manager  # noqa: PLC0415
+
+                get_mcp_manager().add_status_callback(_on_mcp_status_change)
+            except Exception as exc:
+                logger.debug("[link_artifact_cache] MCP hook unavailable: %s", exc)
+    return _cache
+
+
+def invalidate_link_artifacts(scope: str | None = None) -> int:
+    if _cache is None:
+        return 0
+    return _cache.invalidate(scope)
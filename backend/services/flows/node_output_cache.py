@@ -0,0 +1,253 @@
+"""Persistent, content-addressed cache of deterministic node outputs.
+
+Executors opt in by declaring `cacheable = True`, or by implementing
+`is_cacheable(data, inputs) -> bool` when only some configurations are
+deterministic. Entries are keyed by node type, the expression-resolved node
+data and the input DataValues, stored in the app database and evicted
+least-recently-used once the total payload size exceeds the budget.
+
+Reads do not write: last-used times are batched in memory and flushed with
+the next write, or once enough reads have piled up. The total size is kept
+in a counter seeded from the table, so only the writes that overflow the
+budget run an eviction, which trims the cache well below the budget.
+
+Executors declaring `stream_output_handle` replay the cached text of that
+output as a progress token on a hit, so streamed chats still show it.
+
+The cache is off unless the run enables it (`services.execution.output_cache`)
+or `COVALT_NODE_OUTPUT_CACHE=1` is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+import orjson
+
+from nodes._types import DataValue
+
+from ... import db
+
+logger = logging.getLogger(__name__)
+
+NODE_OUTPUT_CACHE_VERSION = 1
+NODE_OUTPUT_CACHE_ENV = "COVALT_NODE_OUTPUT_CACHE"
+NODE_OUTPUT_CACHE_MAX_BYTES_ENV = "COVALT_NODE_OUTPUT_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+LAST_USED_FLUSH_ENTRIES = 256
+LAST_USED_FLUSH_SECONDS = 60.0
+# Eviction trims to this fraction of the budget so it does not rerun on the next write.
+EVICT_TO_FRACTION = 0.8
+
+
+class NodeOutputStore(Protocol):
+    def get(self, key: str) -> str | None: ...
+
+    def put(self, key: str, node_type: str, outputs_json: str) -> None: ...
+
+    def evict(self, max_bytes: int) -> int: ...
+
+
+class DatabaseNodeOutputStore:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_used: dict[str, str] = {}
+        self._flushed_at = time.monotonic()
+        self._total_bytes: int | None = None
+
+    def get(self, key: str) -> str | None:
+        with db.db_session() as sess:
+            raw = db.get_node_output_cache_entry(sess, key=key)
+        if raw is None:
+            return None
+        with self._lock:
+            self._last_used[key] = datetime.now(UTC).isoformat()
+            due = (
+                len(self._last_used) >= LAST_USED_FLUSH_ENTRIES
+                or time.monotonic() - self._flushed_at > LAST_USED_FLUSH_SECONDS
+            )
+        if due:
+            self.flush()
+        return raw
+
+    def put(self, key: str, node_type: str, outputs_json: str) -> None:
+        last_used = self._take_last_used()
+        with db.db_session() as sess:
+            db.touch_node_output_cache_entries(sess, last_used=last_used)
+            delta = db.put_node_output_cache_entry(
+                sess, key=key, node_type=node_type, outputs_json=outputs_json
+            )
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += delta
+
+    def evict(self, max_bytes: int) -> int:
+        with self._lock:
+            total = self._total_bytes
+        if total is None:
+            with db.db_session() as sess:
+                total = db.get_node_output_cache_size(sess)
+            with self._lock:
+                self._total_bytes = total
+        if total <= max_bytes:
+            return 0
+
+        last_used = self._take_last_used()
+        with db.db_session() as sess:
+            db.touch_node_output_cache_entries(sess, last_used=last_used)
+            evicted = db.evict_node_output_cache(
+                sess, max_bytes=int(max_bytes * EVICT_TO_FRACTION)
+            )
+            remaining = db.get_node_output_cache_size(sess)
+        with self._lock:
+            self._total_bytes = remaining
+        return evicted
+
+    def flush(self) -> None:
+        """Write batched last-used times."""
+        last_used = self._take_last_used()
+        if last_used:
+            with db.db_session() as sess:
+                db.touch_node_output_cache_entries(sess, last_used=last_used)
+
+    def _take_last_used(self) -> dict[str, str]:
+        with self._lock:
+            last_used, self._last_used = self._last_used, {}
+            self._flushed_at = time.monotonic()
+        return last_used
+
+
+def node_output_cache_enabled(services: Any) -> bool:
+    execution = getattr(services, "execution", None)
+    flag = getattr(execution, "output_cache", None)
+    if isinstance(flag, bool):
+        return flag
+    return os.getenv(NODE_OUTPUT_CACHE_ENV) == "1"
+
+
+def executor_is_cacheable(
+    executor: Any,
+    data: dict[str, Any],
+    inputs: dict[str, DataValue],
+) -> bool:
+    check = getattr(executor, "is_cacheable", None)
+    if callable(check):
+        try:
+            return bool(check(data, inputs))
+        except Exception:
+            return False
+    return getattr(executor, "cacheable", False) is True
+
+
+def _encode_outputs(outputs: dict[str, DataValue]) -> str | None:
+    try:
+        return orjson.dumps(
+            {handle: {"type": value.type, "value": value.value} for handle, value in outputs.items()}
+        ).decode()
+    except TypeError:
+        return None
+
+
+def _decode_outputs(raw: str) -> dict[str, DataValue] | None:
+    try:
+        payload = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    return {
+        handle: DataValue(type=str(value.get("type", "data")), value=value.get("value"))
+        for handle, value in payload.items()
+        if isinstance(value, dict)
+    }
+
+
+def _max_bytes() -> int:
+    try:
+        return max(0, int(os.getenv(NODE_OUTPUT_CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES)))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+class NodeOutputCache:
+    def __init__(self, store: NodeOutputStore | None = None, *, max_bytes: int | None = None) -> None:
+        self._store = store or DatabaseNodeOutputStore()
+        self._max_bytes = _max_bytes() if max_bytes is None else max_bytes
+
+    def cache_key(
+        self,
+        node_type: str,
+        data: dict[str, Any],
+        inputs: dict[str, DataValue],
+    ) -> str | None:
+        try:
+            payload = orjson.dumps(
+                {
+                    "v": NODE_OUTPUT_CACHE_VERSION,
+                    "type": node_type,
+                    "data": data,
+                    "inputs": {
+                        handle: {"type": value.type, "value": value.value}
+                        for handle, value in inputs.items()
+                    },
+                },
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            return None
+        return hashlib.sha256(payload).hexdigest()
+
+    async def get(self, key: str) -> dict[str, DataValue] | None:
+        try:
+            raw = await asyncio.to_thread(self._store.get, key)
+        except Exception as exc:
+            logger.warning("[node_output_cache] Lookup failed: %s", exc)
+            return None
+        if raw is None:
+            return None
+        return _decode_outputs(raw)
+
+    async def put(self, key: str, node_type: str, outputs: dict[str, DataValue]) -> bool:
+        encoded = _encode_outputs(outputs)
+        if encoded is None:
+            return False
+        try:
+            await asyncio.to_thread(self._put_and_evict, key, node_type, encoded)
+        except Exception as exc:
+            logger.warning("[node_output_cache] Store failed: %s", exc)
+            return False
+        return True
+
+    def _put_and_evict(self, key: str, node_type: str, outputs_json: str) -> None:
+        self._store.put(key, node_type, outputs_json)
+        self._store.evict(self._max_bytes)
+
+
+def cached_stream_text(value: DataValue | None) -> str | None:
+    """The text a streaming executor emitted for `value`, to replay on a cache hit."""
+    if value is None:
+        return None
+    text = value.value.get("text") if isinstance(value.value, dict) else value.value
+    return text if isinstance(text, str) and text else None
+
+
+_node_output_cache: NodeOutputCache | None = None
+
+
+def get_node_output_cache() -> NodeOutputCache:
+    global _node_output_cache
+    if _node_output_cache is None:
+        _node_output_cache = NodeOutputCache()
+    return _node_output_cache
+
+
+def set_node_output_cache(cache: NodeOutputCache | None) -> None:
+    global _node_output_cache
+    _node_output_cache = cache
@@ -0,0 +1,233 @@
+"""Process-wide pooled HTTP clients, one per origin.
+
+Provider calls used to open a fresh `httpx` client per request, paying a TCP
+(and TLS) handshake on every turn and every catalog fetch. Clients here are
+created once per origin and kept alive, so warm requests reuse an open
+connection and, where the server supports it, multiplex requests over
+HTTP/2 (`h2` comes with the `httpx[http2]` dependency; without it clients
+fall back to HTTP/1.1).
+
+Async clients are bound to the event loop that created them, so they are
+keyed by loop as well as origin. Each loop gets a background task that closes
+its clients when the loop shuts down (`asyncio.run` cancels it on the way
+out), so short-lived loops such as title generation threads do not leave
+open connections behind. Loops closed without cancelling their tasks are
+pruned the next time another loop asks for its first client.
+
+Callers keep passing their own per-request `timeout`.
+
+Limits and timeouts come from the environment:
+
+- `COVALT_HTTP_MAX_CONNECTIONS` (default 100)
+- `COVALT_HTTP_MAX_KEEPALIVE` (default 20)
+- `COVALT_HTTP_KEEPALIVE_EXPIRY` seconds (default 60)
+- `COVALT_HTTP_TIMEOUT` seconds for requests without their own (default 30)
+- `COVALT_HTTP_CONNECT_TIMEOUT` seconds (default 10)
+- `COVALT_HTTP2` set to `0` to disable HTTP/2
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS_ENV = "COVALT_HTTP_MAX_CONNECTIONS"
+MAX_KEEPALIVE_ENV = "COVALT_HTTP_MAX_KEEPALIVE"
+KEEPALIVE_EXPIRY_ENV = "COVALT_HTTP_KEEPALIVE_EXPIRY"
+TIMEOUT_ENV = "COVALT_HTTP_TIMEOUT"
+CONNECT_TIMEOUT_ENV = "COVALT_HTTP_CONNECT_TIMEOUT"
+HTTP2_ENV = "COVALT_HTTP2"
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+else:
+    HTTP2_AVAILABLE = True
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+@dataclass(frozen=True, slots=True)
+class HttpClientSettings:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    timeout: float = 30.0
+    connect_timeout: float = 10.0
+    http2: bool = HTTP2_AVAILABLE
+
+    @classmethod
+    def from_env(cls) -> HttpClientSettings:
+        defaults = cls()
+        return cls(
+            max_connections=int(_env_number(MAX_CONNECTIONS_ENV, defaults.max_connections)),
+            max_keepalive_connections=int(
+                _env_number(MAX_KEEPALIVE_ENV, defaults.max_keepalive_connections)
+            ),
+            keepalive_expiry=_env_number(KEEPALIVE_EXPIRY_ENV, defaults.keepalive_expiry),
+            timeout=_env_number(TIMEOUT_ENV, defaults.timeout),
+            connect_timeout=_env_number(CONNECT_TIMEOUT_ENV, defaults.connect_timeout),
+            http2=HTTP2_AVAILABLE and os.getenv(HTTP2_ENV, "1").strip().lower() not in ("0", "false", "no"),
+        )
+
+    def client_kwargs(self, http2: bool | None) -> dict:
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            "http2": self.http2 if http2 is None else http2 and HTTP2_AVAILABLE,
+        }
+
+
+def origin_of(url: str) -> str:
+    parsed = httpx.URL(url)
+    return f"{parsed.scheme}://{parsed.netloc.decode('ascii')}"
+
+
+async def _aclose_all(clients: Iterable[httpx.AsyncClient]) -> None:
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.debug("Failed to close pooled HTTP client: %s", exc)
+
+
+class HttpClientPool:
+    """Per-origin keep-alive clients shared by every caller in the process."""
+
+    def __init__(self, settings: HttpClientSettings | None = None) -> None:
+        self.settings = settings or HttpClientSettings.from_env()
+        self._lock = threading.Lock()
+        self._async: dict[
+            asyncio.AbstractEventLoop, dict[tuple[str, bool | None], httpx.AsyncClient]
+        ] = {}
+        self._closers: dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self._sync: dict[tuple[str, bool | None], httpx.Client] = {}
+
+    def async_client(self, url: str, *, http2: bool | None = None) -> httpx.AsyncClient:
+        """The shared async client for `url`'s origin on the running loop."""
+        key = (origin_of(url), http2)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async.get(loop)
+            if clients is None:
+                self._prune_closed_loops()
+                clients = self._async[loop] = {}
+                closer = loop.create_task(
+                    self._close_with_loop(loop, clients), name="http-clients-closer"
+                )
+                # A loop closed without cancelling its tasks just drops this one.
+                closer._log_destroy_pending = False  # type: ignore[attr-defined]
+                self._closers[loop] = closer
+            client = clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(**self.settings.client_kwargs(http2))
+                clients[key] = client
+            return client
+
+    def client(self, url: str, *, http2: bool | None = None) -> httpx.Client:
+        """The shared blocking client for `url`'s origin."""
+        key = (origin_of(url), http2)
+        with self._lock:
+            client = self._sync.get(key)
+            if client is None or client.is_closed:
+                client = httpx.Client(**self.settings.client_kwargs(http2))
+                self._sync[key] = client
+            return client
+
+    def _prune_closed_loops(self) -> None:
+        for loop in [loop for loop in self._async if loop.is_closed()]:
+            self._closers.pop(loop, None)
+            dropped = self._async.pop(loop)
+            logger.debug("Dropped %d HTTP clients of a closed event loop", len(dropped))
+
+    async def _close_with_loop(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        clients: dict[tuple[str, bool | None], httpx.AsyncClient],
+    ) -> None:
+        try:
+            await loop.create_future()
+        finally:
+            with self._lock:
+                if self._async.get(loop) is clients:
+                    del self._async[loop]
+                    self._closers.pop(loop, None)
+            await _aclose_all(list(clients.values()))
+
+    def origins(self) -> list[str]:
+        with self._lock:
+            keys = {key for clients in self._async.values() for key in clients} | set(self._sync)
+        return sorted({origin for origin, _ in keys})
+
+    async def aclose(self) -> None:
+        """Close every pooled client.
+
+        Async clients of other loops are closed on their own loop, which has
+        to be running to do so; the rest are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            async_clients = list(self._async.pop(loop, {}).values())
+            own_closer = self._closers.pop(loop, None)
+            other_closers = list(self._closers.items())
+            sync_clients = list(self._sync.values())
+            self._sync.clear()
+            self._async.clear()
+            self._closers.clear()
+        if own_closer is not None:
+            own_closer.cancel()
+        for other_loop, closer in other_closers:
+            if not other_loop.is_closed():
+                other_loop.call_soon_threadsafe(closer.cancel)
+        await _aclose_all(async_clients)
+        for client in sync_clients:
+            client.close()
+
+
+_pool: HttpClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_http_client_pool() -> HttpClientPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpClientPool()
+        return _pool
+
+
+def get_async_client(url: str, *, http2: bool | None = None) -> httpx.AsyncClient:
+    """Shorthand for `get_http_client_pool().async_client(url)`."""
+    return get_http_client_pool().async_client(url, http2=http2)
+
+
+def get_client(url: str, *, http2: bool | None = None) -> httpx.Client:
+    """Shorthand for `get_http_client_pool().client(url)`."""
+    return get_http_client_pool().client(url, http2=http2)
+
+
+async def shutdown_http_clients() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        await pool.aclose()
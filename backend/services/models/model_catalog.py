@@ -0,0 +1,272 @@
+"""Persistent per-provider model catalog, served stale-while-revalidate.
+
+Each provider's last successful `fetch_models` result is stored in the app
+database with its fetch time and a fingerprint of the credentials it was
+fetched with. Model listings read the catalog first so the picker renders
+immediately, then refetch providers whose entry is older than the TTL and
+report a provider again only when its list actually changed. The resolved
+option schema of each model is stored next to its catalog entry, keyed by
+schema version, so a restart does not have to rebuild every schema.
+
+Entries whose fingerprint no longer matches the provider settings (new API
+key, base URL or extra settings) are ignored; OAuth sign-in and sign-out
+call `invalidate_model_catalog` explicitly.
+
+`COVALT_MODEL_CATALOG_TTL` sets the freshness window in seconds (default 300).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+import orjson
+
+from ... import db
+
+logger = logging.getLogger(__name__)
+
+MODEL_CATALOG_VERSION = 1
+MODEL_CATALOG_TTL_ENV = "COVALT_MODEL_CATALOG_TTL"
+DEFAULT_TTL_SECONDS = 300.0
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    provider: str
+    fingerprint: str
+    models: list[dict[str, Any]]
+    fetched_at: float
+
+    def is_fresh(self, ttl: float, now: float | None = None) -> bool:
+        return ((time.time() if now is None else now) - self.fetched_at) < ttl
+
+
+class ModelCatalogStore(Protocol):
+    def load(self) -> dict[str, dict[str, Any]]: ...
+
+    def save(self, provider: str, fingerprint: str, models_json: str, fetched_at: str) -> None: ...
+
+    def delete(self, provider: str | None) -> None: ...
+
+    def load_option_schemas(self) -> dict[str, dict[str, tuple[str, str]]]: ...
+
+    def save_option_schemas(self, provider: str, schemas: dict[str, tuple[str, str]]) -> None: ...
+
+
+class DatabaseModelCatalogStore:
+    def load(self) -> dict[str, dict[str, Any]]:
+        with db.db_session() as sess:
+            return db.get_model_catalog_entries(sess)
+
+    def save(self, provider: str, fingerprint: str, models_json: str, fetched_at: str) -> None:
+        with db.db_session() as sess:
+            db.put_model_catalog_entry(
+                sess,
+                provider=provider,
+                credentials_fingerprint=fingerprint,
+                models_json=models_json,
+                fetched_at=fetched_at,
+            )
+
+    def delete(self, provider: str | None) -> None:
+        with db.db_session() as sess:
+            db.delete_model_catalog_entries(sess, provider)
+
+    def load_option_schemas(self) -> dict[str, dict[str, tuple[str, str]]]:
+        with db.db_session() as sess:
+            return db.get_model_option_schemas(sess)
+
+    def save_option_schemas(self, provider: str, schemas: dict[str, tuple[str, str]]) -> None:
+        with db.db_session() as sess:
+            db.put_model_option_schemas(sess, provider=provider, schemas=schemas)
+
+
+def credentials_fingerprint(config: dict[str, Any]) -> str:
+    payload = orjson.dumps(
+        {
+            "v": MODEL_CATALOG_VERSION,
+            "api_key": config.get("api_key"),
+            "base_url": config.get("base_url"),
+            "extra": config.get("extra"),
+        },
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=str,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _ttl_seconds() -> float:
+    try:
+        return max(0.0, float(os.getenv(MODEL_CATALOG_TTL_ENV, DEFAULT_TTL_SECONDS)))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def _decode_entry(row: dict[str, Any]) -> CatalogEntry | None:
+    try:
+        models = orjson.loads(row["models_json"])
+        fetched_at = datetime.fromisoformat(row["fetched_at"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not isinstance(models, list):
+        return None
+    return CatalogEntry(
+        provider=row["provider"],
+        fingerprint=str(row.get("credentials_fingerprint") or ""),
+        models=[model for model in models if isinstance(model, dict)],
+        fetched_at=fetched_at,
+    )
+
+
+class ModelCatalog:
+    def __init__(self, store: ModelCatalogStore | None = None, *, ttl: float | None = None) -> None:
+        self._store = store or DatabaseModelCatalogStore()
+        self.ttl = _ttl_seconds() if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._entries: dict[str, CatalogEntry] | None = None
+        self._schemas: dict[str, dict[str, tuple[str, dict[str, Any]]]] = {}
+
+    def _load(self) -> tuple[dict[str, CatalogEntry], dict[str, dict[str, tuple[str, dict[str, Any]]]]]:
+        try:
+            rows = self._store.load()
+            schema_rows = self._store.load_option_schemas()
+        except Exception as exc:
+            logger.warning("[model_catalog] Load failed: %s", exc)
+            return {}, {}
+        entries = {
+            provider: entry
+            for provider, row in rows.items()
+            if (entry := _decode_entry(row)) is not None
+        }
+        schemas: dict[str, dict[str, tuple[str, dict[str, Any]]]] = {}
+        for provider, models in schema_rows.items():
+            for model_id, (version, options_json) in models.items():
+                try:
+                    options = orjson.loads(options_json)
+                except orjson.JSONDecodeError:
+                    continue
+                if isinstance(options, dict):
+                    schemas.setdefault(provider, {})[model_id] = (version, options)
+        return entries, schemas
+
+    async def _loaded(self) -> dict[str, CatalogEntry]:
+        entries = self._entries
+        if entries is not None:
+            return entries
+        loaded, schemas = await asyncio.to_thread(self._load)
+        with self._lock:
+            if self._entries is None:
+                self._entries = loaded
+                self._schemas = schemas
+            return self._entries
+
+    async def cached(self, configured: dict[str, dict[str, Any]]) -> dict[str, CatalogEntry]:
+        """Entries for the configured providers that were fetched with their current credentials."""
+        entries = await self._loaded()
+        cached: dict[str, CatalogEntry] = {}
+        for provider, config in configured.items():
+            entry = entries.get(provider)
+            if entry is not None and entry.fingerprint == credentials_fingerprint(config):
+                cached[provider] = entry
+        return cached
+
+    async def update(
+        self,
+        provider: str,
+        config: dict[str, Any],
+        models: list[dict[str, Any]],
+    ) -> CatalogEntry:
+        """Record a successful fetch and return the stored entry."""
+        try:
+            models_json: str | None = orjson.dumps(models, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            models_json = None
+        else:
+            models = orjson.loads(models_json)
+
+        entries = await self._loaded()
+        entry = CatalogEntry(provider, credentials_fingerprint(config), models, time.time())
+        with self._lock:
+            entries[provider] = entry
+
+        if models_json is not None:
+            try:
+                await asyncio.to_thread(
+                    self._store.save,
+                    provider,
+                    entry.fingerprint,
+                    models_json,
+                    datetime.fromtimestamp(entry.fetched_at, UTC).isoformat(),
+                )
+            except Exception as exc:
+                logger.warning("[model_catalog] Store failed for %s: %s", provider, exc)
+        return entry
+
+    async def option_schemas(self, provider: str) -> dict[str, tuple[str, dict[str, Any]]]:
+        """Persisted `(schema_version, options)` pairs of `provider`'s models."""
+        await self._loaded()
+        return self._schemas.get(provider, {})
+
+    async def save_option_schemas(
+        self,
+        provider: str,
+        schemas: dict[str, tuple[str, dict[str, Any]]],
+    ) -> None:
+        if not schemas:
+            return
+        await self._loaded()
+        with self._lock:
+            self._schemas.setdefault(provider, {}).update(schemas)
+        try:
+            encoded = {
+                model_id: (version, orjson.dumps(options).decode())
+                for model_id, (version, options) in schemas.items()
+            }
+            await asyncio.to_thread(self._store.save_option_schemas, provider, encoded)
+        except Exception as exc:
+            logger.warning("[model_catalog] Storing option schemas failed for %s: %s", provider, exc)
+
+    def invalidate(self, provider: str | None = None) -> None:
+        if provider is not None:
+            provider = db.normalize_provider(provider)
+        with self._lock:
+            if provider is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(provider, None)
+            if self._entries is not None:
+                if provider is None:
+                    self._entries.clear()
+                else:
+                    self._entries.pop(provider, None)
+        try:
+            self._store.delete(provider)
+        except Exception as exc:
+            logger.warning("[model_catalog] Invalidate failed: %s", exc)
+
+
+_model_catalog: ModelCatalog | None = None
+
+
+def get_model_catalog() -> ModelCatalog:
+    global _model_catalog
+    if _model_catalog is None:
+        _model_catalog = ModelCatalog()
+    return _model_catalog
+
+
+def set_model_catalog(catalog: ModelCatalog | None) -> None:
+    global _model_catalog
+    _model_catalog = catalog
+
+
+def invalidate_model_catalog(provider: str | None = None) -> None:
+    get_model_catalog().invalidate(provider)
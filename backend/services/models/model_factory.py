@@ -7,10 +7,11 @@ from typing import Any
 import orjson
 
 from ... import db
-from ...models.chat import OptionSchema
-from ...providers import fetch_provider_models, get_provider_model_options, list_providers
+from ...providers import fetch_provider_models, list_providers
 from ...providers import get_model as get_provider_model
-from .model_schema_cache import cache_model_metadata
+from ..single_flight import SingleFlight
+from .model_catalog import CatalogEntry, credentials_fingerprint, get_model_catalog
+from .model_schema_cache import cache_model_metadata, resolve_option_schema
 from .provider_oauth_manager import get_provider_oauth_manager
 
 PROVIDER_MODELS_TIMEOUT_SECONDS = 12
@@ -40,93 +41,173 @@ def get_enabled_providers() -> list[str]:
     return list(_get_configured_providers().keys())
 
 
-async def stream_available_model_batches() -> AsyncIterator[tuple[str, list[dict[str, Any]], bool]]:
+def _build_provider_models(
+    provider: str,
+    models: list[dict[str, Any]],
+    provider_config: dict[str, Any],
+    persisted: dict[str, tuple[str, dict[str, Any]]],
+) -> tuple[list[dict[str, Any]], dict[str, tuple[str, dict[str, Any]]]]:
+    """Model listing for `provider` plus the option schemas resolved for the first time."""
+    provider_models: list[dict[str, Any]] = []
+    resolved_now: dict[str, tuple[str, dict[str, Any]]] = {}
+
+    def add(model_id: str, display_name: str, metadata: dict[str, Any] | None) -> None:
+        resolved, is_new = resolve_option_schema(
+            provider, model_id, metadata, persisted=persisted.get(model_id)
+        )
+        if is_new:
+            resolved_now[model_id] = (resolved.version, resolved.options)
+        provider_models.append(
+            {
+                "provider": provider,
+                "modelId": model_id,
+                "displayName": display_name,
+                "isDefault": False,
+                "options": resolved.schema,
+            }
+        )
+
+    for model in models:
+        model_id = str(model.get("id") or "").strip()
+        if not model_id:
+            continue
+
+        metadata = {key: value for key, value in model.items() if key not in {"id", "name"}}
+        cache_model_metadata(provider, model_id, metadata)
+        add(model_id, str(model.get("name") or model_id), metadata)
+
+    existing_ids = {m["modelId"] for m in provider_models}
+    for model_id in _get_extra_models(provider_config):
+        if model_id not in existing_ids:
+            add(model_id, model_id, None)
+
+    return provider_models, resolved_now
+
+
+async def _provider_batch(
+    provider: str,
+    models: list[dict[str, Any]],
+    provider_config: dict[str, Any],
+) -> list[dict[str, Any]]:
+    catalog = get_model_catalog()
+    batch, resolved_now = _build_provider_models(
+        provider, models, provider_config, await catalog.option_schemas(provider)
+    )
+    await catalog.save_option_schemas(provider, resolved_now)
+    return batch
+
+
+_provider_fetches = SingleFlight()
+
+
+async def _fetch_catalog(provider: str, provider_config: dict[str, Any]) -> CatalogEntry:
+    """Fetch `provider`'s models into the catalog.
+
+    Concurrent listings share one in-flight fetch per provider and
+    credentials, and a provider whose fetch failed is not retried until its
+    backoff expires.
+    """
+
+    async def fetch() -> list[dict[str, Any]]:
+        return await asyncio.wait_for(
+            fetch_provider_models(provider),
+            timeout=PROVIDER_MODELS_TIMEOUT_SECONDS,
+        )
+
+    models = await _provider_fetches.run(
+        (provider, credentials_fingerprint(provider_config)),
+        fetch,
+    )
+    return await get_model_catalog().update(
+        provider,
+        provider_config,
+        [model for model in models if isinstance(model, dict)],
+    )
+
+
+_background_refreshes: dict[str, asyncio.Task[None]] = {}
+
+
+def _refresh_in_background(provider: str, provider_config: dict[str, Any]) -> None:
+    if provider in _background_refreshes:
+        return
+
+    async def refresh() -> None:
+        try:
+            await _fetch_catalog(provider, provider_config)
+        except Exception as exc:
+            print(f"[{provider}] Error refreshing models: {exc}")
+        finally:
+            _background_refreshes.pop(provider, None)
+
+    _background_refreshes[provider] = asyncio.create_task(refresh())
+
+
+async def stream_available_model_batches(
+    *,
+    wait_for_revalidation: bool = True,
+) -> AsyncIterator[tuple[str, list[dict[str, Any]], bool]]:
+    """Yield `(provider, models, has_error)` per provider, cached catalogs first.
+
+    Each model's `options` is its memoized, already validated `OptionSchema`;
+    treat it as read-only.
+
+    Providers with a catalog entry for their current credentials are yielded
+    straight away. Entries older than the catalog TTL are then refetched and
+    yielded again only if the list changed; a failed refetch keeps serving
+    the cached list. Providers without an entry are fetched and yielded in
+    completion order. With `wait_for_revalidation=False` stale entries are
+    refreshed in the background instead of holding the stream open.
+    """
     configured = _get_configured_providers()
 
     if not configured:
         return
 
-    async def fetch_one(provider: str) -> tuple[str, list[dict[str, Any]], bool]:
+    catalog = get_model_catalog()
+    cached = await catalog.cached(configured)
+    for provider, entry in cached.items():
+        yield provider, await _provider_batch(provider, entry.models, configured[provider]), False
+
+    stale = [
+        provider
+        for provider, entry in cached.items()
+        if not entry.is_fresh(catalog.ttl)
+    ]
+    if not wait_for_revalidation:
+        for provider in stale:
+            _refresh_in_background(provider, configured[provider])
+        stale = []
+
+    async def fetch_one(provider: str) -> tuple[str, list[dict[str, Any]] | None, bool]:
+        previous = cached.get(provider)
         try:
-            models = await asyncio.wait_for(
-                fetch_provider_models(provider),
-                timeout=PROVIDER_MODELS_TIMEOUT_SECONDS,
-            )
-            provider_models: list[dict[str, Any]] = []
-            for model in models:
-                model_id = str(model.get("id") or "").strip()
-                if not model_id:
-                    continue
-
-                metadata = {
-                    key: value for key, value in model.items() if key not in {"id", "name"}
-                }
-                cache_model_metadata(provider, model_id, metadata)
-
-                try:
-                    schema_dict = get_provider_model_options(
-                        provider,
-                        model_id,
-                        metadata or None,
-                    )
-                    options = OptionSchema.model_validate(schema_dict).model_dump()
-                except Exception as exc:
-                    print(
-                        f"[{provider}] Failed generating options schema for {model_id}: {exc}"
-                    )
-                    options = OptionSchema(main=[], advanced=[]).model_dump()
-
-                provider_models.append(
-                    {
-                        "provider": provider,
-                        "modelId": model_id,
-                        "displayName": str(model.get("name") or model_id),
-                        "isDefault": False,
-                        "options": options,
-                    }
-                )
-
-            extra_models = _get_extra_models(configured.get(provider, {}))
-            existing_ids = {m["modelId"] for m in provider_models}
-            for model_id in extra_models:
-                if model_id in existing_ids:
-                    continue
-                try:
-                    schema_dict = get_provider_model_options(provider, model_id, None)
-                    options = OptionSchema.model_validate(schema_dict).model_dump()
-                except Exception:
-                    options = OptionSchema(main=[], advanced=[]).model_dump()
-                provider_models.append(
-                    {
-                        "provider": provider,
-                        "modelId": model_id,
-                        "displayName": model_id,
-                        "isDefault": False,
-                        "options": options,
-                    }
-                )
-
-            return (
-                provider,
-                provider_models,
-                False,
-            )
+            entry = await _fetch_catalog(provider, configured[provider])
         except TimeoutError:
             print(
                 f"[{provider}] Error fetching models: timed out after {PROVIDER_MODELS_TIMEOUT_SECONDS}s"
             )
-            return provider, [], True
+            return provider, None if previous else [], previous is None
         except asyncio.CancelledError:
             raise
         except Exception as e:
             print(f"[{provider}] Error fetching models: {e}")
-            return provider, [], True
+            return provider, None if previous else [], previous is None
+
+        if previous is not None and previous.models == entry.models:
+            return provider, None, False
+        return provider, await _provider_batch(provider, entry.models, configured[provider]), False
 
-    tasks = [asyncio.create_task(fetch_one(provider)) for provider in configured]
+    tasks = [
+        asyncio.create_task(fetch_one(provider))
+        for provider in configured
+        if provider not in cached or provider in stale
+    ]
     try:
         for task in asyncio.as_completed(tasks):
             provider, models, has_error = await task
-            yield provider, models, has_error
+            if models is not None:
+                yield provider, models, has_error
     finally:
         for task in tasks:
             if not task.done():
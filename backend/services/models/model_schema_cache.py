@@ -1,17 +1,37 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+from dataclasses import dataclass
 from typing import Any
 
+import orjson
+
 from ...models.chat import OptionSchema
-from ...providers import get_provider_model_options
+from ...providers import get_provider_model_options, get_provider_version
 
 logger = logging.getLogger(__name__)
 
+# Bump when the OptionSchema shape changes, so memoized and persisted schemas
+# from older builds are resolved again. Changes to a provider's own option
+# hooks are picked up through its version (see `get_provider_version`).
+OPTION_SCHEMA_VERSION = 1
+
 # Key: "provider:model_id", Value: metadata dictionary from latest model fetch.
 _model_metadata_cache: dict[str, dict[str, Any]] = {}
 
 
+@dataclass(frozen=True, slots=True)
+class ResolvedOptionSchema:
+    version: str
+    schema: OptionSchema
+    options: dict[str, Any]
+
+
+# Key: (provider, model_id, schema version). Entries are shared; treat them as read-only.
+_option_schemas: dict[tuple[str, str, str], ResolvedOptionSchema] = {}
+
+
 def cache_model_metadata(provider: str, model_id: str, metadata: dict[str, Any]) -> None:
     key = f"{provider}:{model_id}"
     _model_metadata_cache[key] = dict(metadata)
@@ -25,19 +45,46 @@ def get_cached_model_metadata(provider: str, model_id: str) -> dict[str, Any] |
     return dict(cached)
 
 
-def get_effective_option_schema(provider: str, model_id: str) -> OptionSchema:
-    """Return schema used for request-time validation, with safe fallbacks."""
-    metadata = get_cached_model_metadata(provider, model_id)
-    if metadata is None:
-        logger.warning(
-            "No cached metadata for %s:%s. Using schema without metadata.",
-            provider,
-            model_id,
+def option_schema_version(provider: str, metadata: dict[str, Any] | None) -> str:
+    """Version of a model's option schema: the schema format, the provider and the metadata."""
+    try:
+        payload = orjson.dumps(
+            metadata or None,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str,
         )
+    except TypeError:
+        payload = repr(metadata).encode()
+    digest = hashlib.sha256(get_provider_version(provider).encode() + b"\0" + payload)
+    return f"{OPTION_SCHEMA_VERSION}:{digest.hexdigest()[:16]}"
+
+
+def resolve_option_schema(
+    provider: str,
+    model_id: str,
+    metadata: dict[str, Any] | None,
+    *,
+    persisted: tuple[str, dict[str, Any]] | None = None,
+) -> tuple[ResolvedOptionSchema, bool]:
+    """Memoized option schema for a model; the flag is set when it was newly resolved.
+
+    `persisted` is a `(version, options)` pair stored by an earlier process. It
+    is used instead of calling the provider hook when its version matches.
+    Failures fall back to an empty schema and are not memoized.
+    """
+    version = option_schema_version(provider, metadata)
+    key = (provider, model_id, version)
+    resolved = _option_schemas.get(key)
+    if resolved is not None:
+        return resolved, False
 
     try:
-        schema_dict = get_provider_model_options(provider, model_id, metadata)
-        return OptionSchema.model_validate(schema_dict)
+        if persisted is not None and persisted[0] == version:
+            schema = OptionSchema.model_validate(persisted[1])
+        else:
+            schema = OptionSchema.model_validate(
+                get_provider_model_options(provider, model_id, metadata or None)
+            )
     except Exception as exc:
         logger.error(
             "Failed to get option schema for %s:%s: %s",
@@ -45,4 +92,27 @@ def get_effective_option_schema(provider: str, model_id: str) -> OptionSchema:
             model_id,
             exc,
         )
-        return OptionSchema(main=[], advanced=[])
+        empty = OptionSchema(main=[], advanced=[])
+        return ResolvedOptionSchema(version, empty, empty.model_dump()), False
+
+    resolved = ResolvedOptionSchema(version, schema, schema.model_dump())
+    _option_schemas[key] = resolved
+    return resolved, persisted is None or persisted[0] != version
+
+
+def clear_option_schemas() -> None:
+    _option_schemas.clear()
+
+
+def get_effective_option_schema(provider: str, model_id: str) -> OptionSchema:
+    """Return schema used for request-time validation, with safe fallbacks."""
+    metadata = get_cached_model_metadata(provider, model_id)
+    if metadata is None:
+        logger.warning(
+            "No cached metadata for %s:%s. Using schema without metadata.",
+            provider,
+            model_id,
+        )
+
+    resolved, _ = resolve_option_schema(provider, model_id, metadata)
+    return resolved.schema
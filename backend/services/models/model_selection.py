@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import logging
+import os
+import threading
 from typing import Any
 
 from ... import db
+from ...providers import preload_provider
+
+logger = logging.getLogger(__name__)
+
+PRELOAD_DEFAULT_PROVIDER_ENV = "COVALT_PRELOAD_DEFAULT_PROVIDER"
 
 
 def parse_model_id(model_id: str | None) -> tuple[str, str]:
@@ -34,3 +42,47 @@ def update_chat_model_selection(
     if variables is not None:
         config["variables"] = dict(variables)
     db.update_chat_agent_config(sess, chatId=chat_id, config=config)
+
+
+def get_default_provider(sess: Any) -> str:
+    """Provider of the model new chats start with, or "" when it is an agent or unset."""
+    settings = db.get_model_selection_settings(sess)
+    if settings["mode"] == "fixed":
+        model_key = settings["fixed_selection"]["model_key"]
+    else:
+        model_key = db.get_model_selection_state(sess)["model_key"]
+    if model_key.startswith("agent:"):
+        return ""
+    provider, _ = parse_model_id(model_key)
+    return provider
+
+
+def preload_default_provider() -> str | None:
+    """Import the default provider's module and SDKs; returns the provider preloaded."""
+    with db.db_session() as sess:
+        provider = get_default_provider(sess)
+    if not provider or not preload_provider(provider):
+        return None
+    return provider
+
+
+def start_default_provider_preload() -> threading.Thread | None:
+    """Preload the default provider on a daemon thread so the first run skips its imports.
+
+    Disabled with `COVALT_PRELOAD_DEFAULT_PROVIDER=0`.
+    """
+    if os.getenv(PRELOAD_DEFAULT_PROVIDER_ENV) == "0":
+        return None
+
+    def run() -> None:
+        try:
+            provider = preload_default_provider()
+        except Exception as exc:
+            logger.warning("[model_selection] Preloading default provider failed: %s", exc)
+            return
+        if provider:
+            logger.info("[model_selection] Preloaded provider %s", provider)
+
+    thread = threading.Thread(target=run, name="provider-preload", daemon=True)
+    thread.start()
+    return thread
@@ -4,13 +4,15 @@ import time
 from collections.abc import Callable
 from typing import Any
 
-import httpx
+from ..http_clients import get_async_client
+from ..single_flight import SingleFlight
 
 MODELS_DEV_URL = "https://models.dev/api.json"
 MODELS_DEV_TTL_SECONDS = 300
 
 _MODELS_DEV_CACHE: dict[str, Any] | None = None
 _MODELS_DEV_LAST_FETCH = 0.0
+_models_dev_fetches = SingleFlight()
 
 
 async def fetch_models_dev_provider(
@@ -40,24 +42,27 @@ async def fetch_models_dev_provider(
 
 
 async def _load_models_dev_data() -> dict[str, Any]:
-    global _MODELS_DEV_CACHE
-    global _MODELS_DEV_LAST_FETCH
-
     now = time.time()
     if _MODELS_DEV_CACHE and now - _MODELS_DEV_LAST_FETCH < MODELS_DEV_TTL_SECONDS:
         return _MODELS_DEV_CACHE
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(MODELS_DEV_URL)
-            if not response.is_success:
-                return {}
-            data = response.json()
-            if not isinstance(data, dict):
-                return {}
-            _MODELS_DEV_CACHE = data
-            _MODELS_DEV_LAST_FETCH = now
-            return data
+        return await _models_dev_fetches.run(MODELS_DEV_URL, _fetch_models_dev_data)
     except Exception as exc:
         print(f"[models.dev] Failed to fetch models: {exc}")
-        return {}
+        return _MODELS_DEV_CACHE or {}
+
+
+async def _fetch_models_dev_data() -> dict[str, Any]:
+    global _MODELS_DEV_CACHE
+    global _MODELS_DEV_LAST_FETCH
+
+    client = get_async_client(MODELS_DEV_URL)
+    response = await client.get(MODELS_DEV_URL, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    if not isinstance(data, dict):
+        raise ValueError("unexpected models.dev payload")
+    _MODELS_DEV_CACHE = data
+    _MODELS_DEV_LAST_FETCH = time.time()
+    return data
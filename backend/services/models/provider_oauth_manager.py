@@ -29,6 +29,7 @@ from ..oauth.oauth_shared import (
     build_localhost_redirect_uri,
     parse_oauth_code_input,
 )
+from .model_catalog import invalidate_model_catalog
 
 AUTH_TIMEOUT_S = 600
 CALLBACK_TIMEOUT_S = 600
@@ -348,6 +349,7 @@ class ProviderOAuthManager:
             flow.flow_task.cancel()
         with db_session() as sess:
             delete_provider_oauth(sess, provider)
+        invalidate_model_catalog(provider)
 
     def has_valid_tokens(self, provider: str) -> bool:
         provider = _normalize_provider(provider)
@@ -476,6 +478,7 @@ class ProviderOAuthManager:
                     token_type="Bearer",
                     expires_at=expires_at,
                 )
+            invalidate_model_catalog(flow.provider)
             flow.status = "authenticated"
         except Exception as e:
             flow.status = "error"
@@ -566,6 +569,7 @@ class ProviderOAuthManager:
                     expires_at=expires_at,
                     extra={"accountId": account_id},
                 )
+            invalidate_model_catalog(flow.provider)
             flow.status = "authenticated"
         except Exception as e:
             flow.status = "error"
@@ -628,6 +632,7 @@ class ProviderOAuthManager:
                         "baseUrl": base_url,
                     },
                 )
+            invalidate_model_catalog(flow.provider)
             flow.status = "authenticated"
         except Exception as e:
             flow.status = "error"
@@ -716,6 +721,7 @@ class ProviderOAuthManager:
                     expires_at=expires_at,
                     extra={"projectId": project_id, "email": email},
                 )
+            invalidate_model_catalog(flow.provider)
             flow.status = "authenticated"
         except Exception as e:
             flow.status = "error"
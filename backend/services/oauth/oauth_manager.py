@@ -6,12 +6,10 @@ import re
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 from urllib.parse import urlparse
 
 import httpx
-from mcp.client.auth import OAuthClientProvider, TokenStorage
-from mcp.shared.auth import OAuthClientInformationFull, OAuthClientMetadata, OAuthToken
 from pydantic import AnyUrl
 
 from ...crypto import decrypt, encrypt
@@ -24,6 +22,10 @@ from .oauth_shared import (
     extract_state_from_auth_url,
 )
 
+if TYPE_CHECKING:
+    from mcp.client.auth import OAuthClientProvider
+    from mcp.shared.auth import OAuthClientInformationFull, OAuthToken
+
 logger = logging.getLogger(__name__)
 
 AuthHint = Literal["oauth", "token"]
@@ -57,12 +59,16 @@ class OAuthFlowState:
     callback_future: asyncio.Future[tuple[str, str | None]] | None = None
 
 
-class DatabaseTokenStorage(TokenStorage):
+class DatabaseTokenStorage:
+    """`mcp.client.auth.TokenStorage` backed by the app database."""
+
     def __init__(self, server_id: str, toolset_id: str) -> None:
         self.server_id = server_id
         self.toolset_id = toolset_id
 
     async def get_tokens(self) -> OAuthToken | None:
+        from mcp.shared.auth import OAuthToken  # noqa: PLC0415
+
         with db_session() as sess:
             row = (
                 sess.query(OAuthTokenModel)
@@ -140,6 +146,8 @@ class DatabaseTokenStorage(TokenStorage):
             sess.commit()
 
     async def get_client_info(self) -> OAuthClientInformationFull | None:
+        from mcp.shared.auth import OAuthClientInformationFull  # noqa: PLC0415
+
         with db_session() as sess:
             row = (
                 sess.query(OAuthTokenModel)
@@ -304,6 +312,9 @@ class OAuthManager:
         server_url: str,
         callback_port: int = OAUTH_CALLBACK_PORT,
     ) -> dict[str, Any]:
+        from mcp.client.auth import OAuthClientProvider  # noqa: PLC0415
+        from mcp.shared.auth import OAuthClientMetadata  # noqa: PLC0415
+
         flow = OAuthFlowState(
             server_id=server_id,
             toolset_id=toolset_id,
@@ -422,6 +433,9 @@ class OAuthManager:
     def create_oauth_provider(
         self, server_id: str, toolset_id: str, server_url: str
     ) -> OAuthClientProvider:
+        from mcp.client.auth import OAuthClientProvider  # noqa: PLC0415
+        from mcp.shared.auth import OAuthClientMetadata  # noqa: PLC0415
+
         storage = DatabaseTokenStorage(server_id, toolset_id)
 
         async def noop_redirect_handler(_: str) -> None:
@@ -40,6 +40,12 @@ class PluginRegistry:
         self._executor_by_type: dict[str, Any] = {}
         self._executor_owner: dict[str, str] = {}
         self._plugin_renderers: dict[str, tuple[RendererDescriptor, ...]] = {}
+        self._revision = 0
+
+    @property
+    def revision(self) -> int:
+        """Counter bumped whenever the set of registered executors changes."""
+        return self._revision
 
     def register_plugin(
         self,
@@ -80,6 +86,8 @@ class PluginRegistry:
         for (source_type, target_type), converter in (coercions or {}).items():
             register_runtime_coercion(source_type, target_type, converter)
 
+        self._revision += 1
+
     def register_plugins(
         self,
         registrations: list[PluginRegistrationInput],
@@ -110,6 +118,7 @@ class PluginRegistry:
         self._plugin_metadata.pop(normalized_id, None)
         self._plugin_renderers.pop(normalized_id, None)
         self._plugin_order = [pid for pid in self._plugin_order if pid != normalized_id]
+        self._revision += 1
         return True
 
     def get_executor(self, node_type: str) -> Any | None:
@@ -153,6 +162,7 @@ class PluginRegistry:
         self._executor_owner.clear()
         self._plugin_renderers.clear()
         self._hooks.clear()
+        self._revision += 1
 
     def _validate_executors(self, plugin_id: str, executors: dict[str, Any]) -> None:
         for node_type in executors.keys():
@@ -0,0 +1,131 @@
+"""Keyed single-flight calls with per-key error backoff.
+
+Concurrent callers asking for the same key share one in-flight call instead
+of each starting their own. The shared call is only cancelled once every
+caller waiting on it has gone away, so one caller giving up does not fail
+the others.
+
+A failed call is remembered per key: until its backoff expires, callers get
+a `BackoffError` chained to the original failure straight away instead of
+retrying a dead endpoint. The backoff doubles with each consecutive failure
+up to a ceiling and is reset by the next success.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_BACKOFF_SECONDS = 5.0
+DEFAULT_MAX_BACKOFF_SECONDS = 300.0
+
+
+class BackoffError(RuntimeError):
+    """A call for `key` is not retried yet because its last attempt failed."""
+
+    def __init__(self, key: Hashable, retry_in: float, error: BaseException) -> None:
+        super().__init__(f"{error or type(error).__name__} (retrying in {retry_in:.0f}s)")
+        self.key = key
+        self.retry_in = retry_in
+
+
+@dataclass(slots=True)
+class _Flight:
+    task: asyncio.Task[Any]
+    waiters: int = 0
+
+
+@dataclass(slots=True)
+class _Failure:
+    error: BaseException
+    count: int
+    retry_at: float
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        *,
+        backoff: float = DEFAULT_BACKOFF_SECONDS,
+        max_backoff: float = DEFAULT_MAX_BACKOFF_SECONDS,
+    ) -> None:
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._flights: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[Hashable, _Flight]
+        ] = weakref.WeakKeyDictionary()
+        self._failures: dict[Hashable, _Failure] = {}
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Await `call()` for `key`, joining a call already in flight for it."""
+        with self._lock:
+            failure = self._failures.get(key)
+            now = time.monotonic()
+            if failure is not None and now < failure.retry_at:
+                # A fresh error per caller; re-raising the stored one would
+                # grow its traceback with every rejected call.
+                raise BackoffError(key, failure.retry_at - now, failure.error) from failure.error
+            flights = self._flights.setdefault(asyncio.get_running_loop(), {})
+            flight = flights.get(key)
+            if flight is None:
+                flight = _Flight(asyncio.ensure_future(self._call(key, call)))
+                flights[key] = flight
+                flight.task.add_done_callback(lambda _task: self._land(flights, key, flight))
+            flight.waiters += 1
+
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0
+            if abandoned:
+                flight.task.cancel()
+            raise
+        else:
+            with self._lock:
+                flight.waiters -= 1
+
+    async def _call(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            with self._lock:
+                previous = self._failures.get(key)
+                count = previous.count + 1 if previous is not None else 1
+                delay = min(self.max_backoff, self.backoff * 2 ** (count - 1))
+                self._failures[key] = _Failure(exc, count, time.monotonic() + delay)
+            raise
+        with self._lock:
+            self._failures.pop(key, None)
+        return result
+
+    def _land(self, flights: dict[Hashable, _Flight], key: Hashable, flight: _Flight) -> None:
+        with self._lock:
+            if flights.get(key) is flight:
+                del flights[key]
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def backing_off(self, key: Hashable) -> bool:
+        with self._lock:
+            failure = self._failures.get(key)
+            return failure is not None and time.monotonic() < failure.retry_at
+
+    def forget(self, key: Hashable | None = None) -> None:
+        """Drop the remembered failure for `key`, or for every key."""
+        with self._lock:
+            if key is None:
+                self._failures.clear()
+            else:
+                self._failures.pop(key, None)
@@ -8,14 +8,9 @@ import re
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 import httpx
-from mcp import ClientSession
-from mcp.client.sse import sse_client
-from mcp.client.stdio import StdioServerParameters, stdio_client
-from mcp.client.streamable_http import streamable_http_client
-from mcp.types import Tool as MCPTool
 
 from ...db import db_session
 from ...db.models import ToolOverride, Toolset, ToolsetMcpServer
@@ -23,6 +18,10 @@ from ...models import format_mcp_tool_id, normalize_renderer_alias
 from ...runtime import RuntimeAdapter, get_adapter
 from ..oauth.oauth_manager import get_oauth_manager
 
+if TYPE_CHECKING:
+    from mcp import ClientSession
+    from mcp.types import Tool as MCPTool
+
 logger = logging.getLogger(__name__)
 _RUNTIME_ADAPTER: RuntimeAdapter = get_adapter()
 
@@ -455,6 +454,9 @@ class MCPManager:
         state._connection_event.clear()
         server_label = self._format_server_label(state)
 
+        from mcp import ClientSession  # noqa: PLC0415
+        from mcp.client.stdio import StdioServerParameters, stdio_client  # noqa: PLC0415
+
         params = StdioServerParameters(
             command=state.command or "",
             args=state.args or [],
@@ -549,6 +551,9 @@ class MCPManager:
             logger.warning(f"MCP server {server_label} connection timeout")
 
     async def _connect_sse(self, server_key: str) -> None:
+        from mcp import ClientSession  # noqa: PLC0415
+        from mcp.client.sse import sse_client  # noqa: PLC0415
+
         state = self._servers[server_key]
         state._connection_event.clear()
         server_label = self._format_server_label(state)
@@ -599,6 +604,8 @@ class MCPManager:
             logger.warning(f"MCP server {server_label} connection timeout")
 
     async def _connect_streamable_http(self, server_key: str) -> None:
+        from mcp.client.streamable_http import streamable_http_client  # noqa: PLC0415
+
         state = self._servers[server_key]
         state._connection_event.clear()
         server_label = self._format_server_label(state)
@@ -670,6 +677,8 @@ class MCPManager:
     async def _run_mcp_session(
         self, server_key: str, state: MCPServerState, read: Any, write: Any
     ) -> None:
+        from mcp import ClientSession  # noqa: PLC0415
+
         async with ClientSession(read, write) as session:
             await session.initialize()
             state.session = session
@@ -15,7 +15,9 @@ logger = logging.getLogger(__name__)
 
 async def _list_models(_params: dict[str, Any]) -> list[dict[str, Any]]:
     options: list[dict[str, Any]] = []
-    async for provider, models, _is_final in stream_available_model_batches():
+    async for provider, models, _is_final in stream_available_model_batches(
+        wait_for_revalidation=False
+    ):
         for model in models:
             model_id = str(model.get("modelId") or "")
             if not model_id:
@@ -1,4 +1,8 @@
+import multiprocessing
+
 from backend.main import main
 
 if __name__ == "__main__":
+    # Flow worker processes are spawned from the frozen executable.
+    multiprocessing.freeze_support()
     main()
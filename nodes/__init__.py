@@ -13,6 +13,7 @@ from nodes._registry import (
     get_executor,
     list_node_plugin_metadata,
     list_node_types,
+    registry_revision,
 )
 from nodes.plugin import register_builtin_plugin
 
@@ -38,4 +39,5 @@ __all__ = [
     "init",
     "list_node_plugin_metadata",
     "list_node_types",
+    "registry_revision",
 ]
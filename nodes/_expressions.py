@@ -9,6 +9,19 @@ Examples:
 Priority chain: Wire > Expression > Inline value.
 Wires are already resolved by _gather_inputs. This module handles the
 Expression > Inline step.
+
+Templates are parsed once per template string. Pure member/index paths are
+read straight from the Python values; anything else is compiled once into a
+function on a long-lived QuickJS context (one per thread, memory- and
+time-limited). `$input` and `$trigger` are marshalled once per
+`resolve_expressions` call and passed to the compiled functions.
+Expressions run in strict mode on a locked-down context (see
+`nodes._js_lockdown`), and the globals they add are dropped when the
+`resolve_expressions` call ends, so nothing carries over to other flows.
+
+`analyze_expressions` records which paths of `$input`, `$trigger` and
+`$(name)` a node's JavaScript expressions read; given those `ExpressionRefs`,
+only the referenced sub-objects are marshalled.
 """
 
 from __future__ import annotations
@@ -16,6 +29,9 @@ from __future__ import annotations
 import json
 import logging
 import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
 try:
@@ -23,6 +39,7 @@ try:
 except ImportError:  # pragma: no cover - optional for tests
     quickjs = None
 
+from nodes._js_lockdown import lock_down
 from nodes._types import DataValue
 
 logger = logging.getLogger(__name__)
@@ -31,6 +48,444 @@ _EXPR_PATTERN = re.compile(r"\{\{(.*?)\}\}", re.DOTALL)
 _FULL_EXPR_PATTERN = re.compile(r"^\s*\{\{(.*)\}\}\s*$", re.DOTALL)
 _SIMPLE_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
+_TEMPLATE_CACHE_SIZE = 4096
+_COMPILED_CACHE_SIZE = 4096
+_JS_MEMORY_LIMIT = 64 * 1024 * 1024
+_JS_TIME_LIMIT_SECONDS = 5
+_JS_PARAMS = "input, $input, trigger, $trigger, $"
+_JS_NODE_ACCESSOR = """
+(outputs) => (name) => {
+  const node = outputs[String(name)];
+  return { item: { json: (node === null || node === undefined) ? {} : node } };
+}
+"""
+_NODE_ACCESSOR_PATTERN = re.compile(r"\$(?!input\b|trigger\b)")
+
+
+_PATH_ROOT_PATTERN = re.compile(
+    r"""^(?:\$?(?P<root>input|trigger)\b|\$\(\s*(?P<q>['"])(?P<node>[^'"\\]*)(?P=q)\s*\)\.item\.json\b)"""
+)
+_PATH_SEGMENT_PATTERN = re.compile(
+    r"""\.(?P<name>[A-Za-z_$][\w$]*)|\[\s*(?P<index>\d+)\s*\]|\[\s*(?P<q>['"])(?P<key>[^'"\\]*)(?P=q)\s*\]"""
+)
+# Keys JavaScript resolves through the prototype chain rather than the data.
+_PROTOTYPE_KEYS = frozenset(
+    {
+        "__proto__",
+        "constructor",
+        "hasOwnProperty",
+        "isPrototypeOf",
+        "propertyIsEnumerable",
+        "toLocaleString",
+        "toString",
+        "valueOf",
+    }
+)
+# A root reference, not a member access (`a.input`); spreads (`...$input`) count.
+_REF_PATTERN = re.compile(r"(?<![\w$])(?:(?<=\.\.\.)|(?<!\.))(?:\$?(?P<root>input|trigger)(?![\w$])|\$(?![\w$]))")
+_REF_SEGMENT_PATTERN = re.compile(
+    r"""\??\.(?P<name>[A-Za-z_$][\w$]*)|(?:\?\.)?\[\s*(?P<index>\d+)\s*\]|(?:\?\.)?\[\s*(?P<q>['"])(?P<key>[^'"\\]*)(?P=q)\s*\]"""
+)
+_REF_NODE_PATTERN = re.compile(
+    r"""\(\s*(?P<q>['"])(?P<node>[^'"\\]*)(?P=q)\s*\)(?:\?\.)?\.?item(?:\?\.|\.)json(?![\w$])"""
+)
+_MISSING = object()
+
+
+class _UndefinedAccess(Exception):
+    """A path read a property of undefined or null (a TypeError in JavaScript)."""
+
+
+@dataclass(frozen=True, slots=True)
+class _Placeholder:
+    expression: str
+    # Pure member/index paths (`$input.a[0]`, `$('Node').item.json.b`) are
+    # evaluated natively: ("input" | "trigger" | "node", node name, segments).
+    path: tuple[str, str | None, tuple[str | int, ...]] | None = None
+
+
+def _placeholder(expression: str) -> _Placeholder:
+    return _Placeholder(expression, _parse_path(expression))
+
+
+def _parse_path(expression: str) -> tuple[str, str | None, tuple[str | int, ...]] | None:
+    root = _PATH_ROOT_PATTERN.match(expression)
+    if root is None:
+        return None
+    segments: list[str | int] = []
+    position = root.end()
+    while position < len(expression):
+        match = _PATH_SEGMENT_PATTERN.match(expression, position)
+        if match is None:
+            return None
+        if match.group("name") is not None:
+            segment: str | int = match.group("name")
+        elif match.group("index") is not None:
+            segment = int(match.group("index"))
+        else:
+            segment = match.group("key")
+        if segment in _PROTOTYPE_KEYS:
+            return None
+        segments.append(segment)
+        position = match.end()
+    if root.group("node") is not None:
+        return ("node", root.group("node"), tuple(segments))
+    return (root.group("root"), None, tuple(segments))
+
+
+def _member(value: Any, segment: str | int) -> Any:
+    """JavaScript property access on JSON data; `_MISSING` is undefined."""
+    if isinstance(value, dict):
+        return value.get(str(segment), _MISSING)
+    if isinstance(value, (list, str)):
+        if segment == "length":
+            return len(value)
+        if isinstance(segment, str) and segment.isdigit():
+            segment = int(segment)
+        if isinstance(segment, int) and segment < len(value):
+            return value[segment]
+    return _MISSING
+
+
+@lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def _parse_template(template: str) -> _Placeholder | tuple[str | _Placeholder, ...] | None:
+    """Split a template into literal text and placeholders.
+
+    A whole-value expression parses to a single `_Placeholder` (its result
+    keeps its type); None means there is nothing to evaluate.
+    """
+    full_match = _FULL_EXPR_PATTERN.match(template)
+    if full_match and "{{" not in full_match.group(1):
+        expression = full_match.group(1).strip()
+        return None if _should_skip_expression(expression) else _placeholder(expression)
+
+    parts: list[str | _Placeholder] = []
+    position = 0
+    for match in _EXPR_PATTERN.finditer(template):
+        expression = match.group(1).strip()
+        if _should_skip_expression(expression):
+            continue
+        if match.start() > position:
+            parts.append(template[position : match.start()])
+        parts.append(_placeholder(expression))
+        position = match.end()
+    if not parts:
+        return None
+    if position < len(template):
+        parts.append(template[position:])
+    return tuple(parts)
+
+
+Segments = tuple[str | int, ...]
+# Paths read from one root; None means the whole value is needed.
+RootRefs = tuple[Segments, ...] | None
+
+
+@dataclass(frozen=True, slots=True)
+class ExpressionRefs:
+    """What a node's JavaScript expressions read from each root.
+
+    `nodes` maps `$(name)` names to their refs; None means any node may be
+    read (e.g. `$(someVariable)`).
+    """
+
+    input: RootRefs = ()
+    trigger: RootRefs = ()
+    nodes: dict[str, RootRefs] | None = field(default_factory=dict)
+
+
+def _merge_refs(current: RootRefs, paths: RootRefs) -> RootRefs:
+    if current is None or paths is None:
+        return None
+    return tuple(dict.fromkeys(current + paths))
+
+
+def _read_segments(expression: str, position: int) -> tuple[Segments, int]:
+    segments: list[str | int] = []
+    while True:
+        match = _REF_SEGMENT_PATTERN.match(expression, position)
+        if match is None:
+            return tuple(segments), position
+        if match.group("name") is not None:
+            segments.append(match.group("name"))
+        elif match.group("index") is not None:
+            segments.append(int(match.group("index")))
+        else:
+            segments.append(match.group("key"))
+        position = match.end()
+
+
+def _expression_refs(expression: str) -> ExpressionRefs:
+    found: dict[str, RootRefs] = {"input": (), "trigger": ()}
+    nodes: dict[str, RootRefs] | None = {}
+    for match in _REF_PATTERN.finditer(expression):
+        root = match.group("root")
+        if root is not None:
+            segments, _ = _read_segments(expression, match.end())
+            found[root] = _merge_refs(found[root], (segments,) if segments else None)
+            continue
+        node = _REF_NODE_PATTERN.match(expression, match.end())
+        if node is None:
+            nodes = None
+        elif nodes is not None:
+            segments, _ = _read_segments(expression, node.end())
+            name = node.group("node")
+            nodes[name] = _merge_refs(nodes.get(name, ()), (segments,) if segments else None)
+    return ExpressionRefs(input=found["input"], trigger=found["trigger"], nodes=nodes)
+
+
+def _collect_refs(value: Any, refs: list[ExpressionRefs]) -> None:
+    if isinstance(value, dict):
+        for item in value.values():
+            _collect_refs(item, refs)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_refs(item, refs)
+    elif isinstance(value, str) and "{{" in value:
+        parsed = _parse_template(value)
+        if parsed is None:
+            return
+        for part in (parsed,) if isinstance(parsed, _Placeholder) else parsed:
+            if isinstance(part, _Placeholder) and part.path is None:
+                refs.append(_expression_refs(part.expression))
+
+
+def analyze_expressions(data: Any) -> ExpressionRefs:
+    """Record the roots and paths read by the JavaScript expressions in `data`.
+
+    Path expressions are evaluated natively and need nothing marshalled, so
+    data whose expressions are all paths yields empty refs.
+    """
+    collected: list[ExpressionRefs] = []
+    _collect_refs(data, collected)
+    input_refs: RootRefs = ()
+    trigger_refs: RootRefs = ()
+    nodes: dict[str, RootRefs] | None = {}
+    for refs in collected:
+        input_refs = _merge_refs(input_refs, refs.input)
+        trigger_refs = _merge_refs(trigger_refs, refs.trigger)
+        if nodes is None or refs.nodes is None:
+            nodes = None
+            continue
+        for name, paths in refs.nodes.items():
+            nodes[name] = _merge_refs(nodes.get(name, ()), paths)
+    return ExpressionRefs(input=input_refs, trigger=trigger_refs, nodes=nodes)
+
+
+def _prune(value: Any, paths: RootRefs) -> Any:
+    """Copy of `value` holding only what `paths` can read (None: all of it)."""
+    if paths is None:
+        return value
+    if not paths:
+        return None
+    trie: dict[Any, Any] = {}
+    for segments in paths:
+        node = trie
+        for segment in segments:
+            if node.get(_WHOLE):
+                break
+            node = node.setdefault(segment, {})
+        else:
+            node.clear()
+            node[_WHOLE] = True
+    return _prune_tree(value, trie)
+
+
+_WHOLE = object()
+
+
+def _prune_tree(value: Any, trie: dict[Any, Any]) -> Any:
+    if trie.get(_WHOLE):
+        return value
+    if isinstance(value, dict):
+        pruned: dict[str, Any] = {}
+        for segment, child in trie.items():
+            key = str(segment)
+            if key not in value:
+                # A method call or a missing key: keep the object as it is.
+                return value
+            pruned[key] = _prune_tree(value[key], child)
+        return pruned
+    if isinstance(value, list) and all(
+        isinstance(segment, int) and segment < len(value) for segment in trie
+    ):
+        # Unread slots keep their position but not their contents.
+        pruned_list: list[Any] = [None] * len(value)
+        for segment, child in trie.items():
+            pruned_list[segment] = _prune_tree(value[segment], child)
+        return pruned_list
+    return value
+
+
+class _JsRuntime:
+    """A long-lived QuickJS context holding compiled expression functions."""
+
+    def __init__(self) -> None:
+        self.context = quickjs.Context()
+        self.context.set_memory_limit(_JS_MEMORY_LIMIT)
+        self.context.set_time_limit(_JS_TIME_LIMIT_SECONDS)
+        self._reset = lock_down(self.context)
+        self.node_accessor = self.context.eval(_JS_NODE_ACCESSOR)
+        self.no_nodes = self.node_accessor(self.context.parse_json("{}"))
+        self._compiled: dict[str, Any] = {}
+
+    def compile(self, expression: str) -> Any:
+        compiled = self._compiled.get(expression)
+        if compiled is not None:
+            return compiled
+        try:
+            compiled = self.context.eval(
+                f'(function ({_JS_PARAMS}) {{ "use strict"; return ({expression}\n); }})'
+            )
+        except quickjs.JSException:
+            # Not a single expression (e.g. "let a = 1; a + 1"): evaluate as a script.
+            compiled = self.context.eval(
+                f'(function ({_JS_PARAMS}) {{ "use strict"; return eval({json.dumps(expression)}); }})'
+            )
+        if len(self._compiled) >= _COMPILED_CACHE_SIZE:
+            self._compiled.clear()
+        self._compiled[expression] = compiled
+        return compiled
+
+    def reset_globals(self) -> bool:
+        """Drop globals added since the last reset; False if the context is tainted."""
+        try:
+            return bool(self._reset())
+        except quickjs.JSException:
+            return False
+
+    def parse(self, value: Any) -> Any:
+        return self.context.parse_json(_json_dumps_safe(value) or "{}")
+
+    def nodes(self, upstream_outputs: dict[str, Any]) -> Any:
+        # QuickJS cannot call back into Python under a time limit, so `$(name)`
+        # reads from a copy of the upstream outputs.
+        entries = ",".join(
+            f"{json.dumps(str(name))}:{_json_dumps_safe(value) or 'null'}"
+            for name, value in upstream_outputs.items()
+        )
+        return self.node_accessor(self.context.parse_json("{" + entries + "}"))
+
+
+_runtimes = threading.local()
+
+
+def _get_runtime() -> _JsRuntime:
+    runtime = getattr(_runtimes, "runtime", None)
+    if runtime is None:
+        runtime = _JsRuntime()
+        _runtimes.runtime = runtime
+    return runtime
+
+
+class _Scope:
+    """The values one node's expressions see, marshalled into QuickJS once."""
+
+    def __init__(
+        self,
+        direct_input: DataValue | None,
+        upstream_outputs: dict[str, Any],
+        expression_context: dict[str, Any] | None,
+        refs: ExpressionRefs | None = None,
+    ) -> None:
+        self.direct_input = direct_input
+        self.upstream_outputs = upstream_outputs
+        self.expression_context = expression_context
+        self.refs = refs
+        self._runtime: _JsRuntime | None = None
+        self._values: tuple[Any, ...] = ()
+        self._nodes: Any = None
+
+    def _args(self, expression: str) -> tuple[_JsRuntime, tuple[Any, ...]]:
+        runtime = _get_runtime()
+        if self._runtime is not runtime:
+            input_value = self.direct_input.value if self.direct_input is not None else None
+            trigger_value = None
+            if isinstance(self.expression_context, dict):
+                trigger_value = self.expression_context.get("trigger")
+            if self.refs is not None:
+                input_value = _prune(input_value, self.refs.input)
+                trigger_value = _prune(trigger_value, self.refs.trigger)
+            input_obj = runtime.parse(input_value)
+            trigger_obj = runtime.parse(trigger_value)
+            self._values = (input_obj, input_obj, trigger_obj, trigger_obj)
+            self._runtime = runtime
+            self._nodes = None
+        nodes = runtime.no_nodes
+        if _NODE_ACCESSOR_PATTERN.search(expression):
+            if self._nodes is None:
+                outputs = self.upstream_outputs
+                if self.refs is not None and self.refs.nodes is not None:
+                    outputs = {
+                        name: _prune(outputs[name], paths)
+                        for name, paths in self.refs.nodes.items()
+                        if name in outputs
+                    }
+                self._nodes = runtime.nodes(outputs)
+            nodes = self._nodes
+        return runtime, (*self._values, nodes)
+
+    def close(self) -> None:
+        """Reset the globals this scope's expressions may have added."""
+        runtime, self._runtime = self._runtime, None
+        self._values = ()
+        self._nodes = None
+        if runtime is not None and not runtime.reset_globals():
+            if getattr(_runtimes, "runtime", None) is runtime:
+                _runtimes.runtime = None
+
+    def _path_value(self, path: tuple[str, str | None, tuple[str | int, ...]]) -> Any:
+        root, node_name, segments = path
+        if root == "input":
+            value = self.direct_input.value if self.direct_input is not None else None
+        elif root == "trigger":
+            context = self.expression_context
+            value = context.get("trigger") if isinstance(context, dict) else None
+        else:
+            value = self.upstream_outputs.get(node_name)
+        if value is None:
+            value = {}
+        for segment in segments:
+            if value is _MISSING or value is None:
+                raise _UndefinedAccess(f"cannot read properties of undefined (reading '{segment}')")
+            value = _member(value, segment)
+        if value is _MISSING:
+            return None
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, (dict, list)):
+            # Same copy semantics as a value returned from QuickJS.
+            return json.loads(json.dumps(value))
+        return value
+
+    def evaluate(self, placeholder: _Placeholder) -> Any:
+        expression = placeholder.expression
+        if not expression:
+            return ""
+
+        if placeholder.path is not None:
+            try:
+                return self._path_value(placeholder.path)
+            except _UndefinedAccess as exc:
+                logger.warning("Expression eval failed (%s): %s", expression, exc)
+                return None
+            except TypeError:
+                pass  # Values that are not plain JSON take the JavaScript path.
+
+        if quickjs is None:
+            logger.warning("quickjs not available; expression '%s' skipped", expression)
+            return None
+
+        try:
+            runtime, args = self._args(expression)
+            return _convert_js_result(runtime.compile(expression)(*args))
+        except Exception as exc:
+            if "interrupted" in str(exc) or "out of memory" in str(exc):
+                # A context that hit its limits is not reused.
+                _runtimes.runtime = None
+            logger.warning("Expression eval failed (%s): %s", expression, exc)
+            return None
+
 
 def resolve_expressions(
     data: dict[str, Any],
@@ -38,63 +493,41 @@ def resolve_expressions(
     upstream_outputs: dict[str, Any],
     *,
     expression_context: dict[str, Any] | None = None,
+    refs: ExpressionRefs | None = None,
 ) -> dict[str, Any]:
-    return _resolve_value(data, direct_input, upstream_outputs, expression_context)
+    """Resolve `{{ }}` expressions in `data`.
 
+    `refs` (from `analyze_expressions(data)`) limits what is marshalled into
+    QuickJS to the sub-objects the expressions read.
+    """
+    scope = _Scope(direct_input, upstream_outputs, expression_context, refs)
+    try:
+        return _resolve_value(data, scope)
+    finally:
+        scope.close()
 
-def _resolve_value(
-    value: Any,
-    direct_input: DataValue | None,
-    upstream_outputs: dict[str, Any],
-    expression_context: dict[str, Any] | None,
-) -> Any:
+
+def _resolve_value(value: Any, scope: _Scope) -> Any:
     if isinstance(value, dict):
-        return {
-            key: _resolve_value(val, direct_input, upstream_outputs, expression_context)
-            for key, val in value.items()
-        }
+        return {key: _resolve_value(val, scope) for key, val in value.items()}
     if isinstance(value, list):
-        return [
-            _resolve_value(item, direct_input, upstream_outputs, expression_context)
-            for item in value
-        ]
+        return [_resolve_value(item, scope) for item in value]
     if isinstance(value, str) and "{{" in value:
-        return _resolve_string(value, direct_input, upstream_outputs, expression_context)
+        return _resolve_string(value, scope)
     return value
 
 
-def _resolve_string(
-    template: str,
-    direct_input: DataValue | None,
-    upstream_outputs: dict[str, Any],
-    expression_context: dict[str, Any] | None,
-) -> Any:
-    full_match = _FULL_EXPR_PATTERN.match(template)
-    if full_match:
-        expression = full_match.group(1).strip()
-        if _should_skip_expression(expression):
-            return template
-        result = _eval_js_expression(
-            expression,
-            direct_input,
-            upstream_outputs,
-            expression_context,
-        )
+def _resolve_string(template: str, scope: _Scope) -> Any:
+    parsed = _parse_template(template)
+    if parsed is None:
+        return template
+    if isinstance(parsed, _Placeholder):
+        result = scope.evaluate(parsed)
         return "" if result is None else result
-
-    def _replace(match: re.Match) -> str:
-        expr = match.group(1).strip()
-        if _should_skip_expression(expr):
-            return match.group(0)
-        result = _eval_js_expression(
-            expr,
-            direct_input,
-            upstream_outputs,
-            expression_context,
-        )
-        return _stringify(result)
-
-    return _EXPR_PATTERN.sub(_replace, template)
+    return "".join(
+        part if isinstance(part, str) else _stringify(scope.evaluate(part))
+        for part in parsed
+    )
 
 
 def _stringify(value: Any) -> str:
@@ -108,56 +541,6 @@ def _stringify(value: Any) -> str:
         return str(value)
 
 
-def _eval_js_expression(
-    expression: str,
-    direct_input: DataValue | None,
-    upstream_outputs: dict[str, Any],
-    expression_context: dict[str, Any] | None,
-) -> Any:
-    if not expression:
-        return ""
-
-    if quickjs is None:
-        logger.warning("quickjs not available; expression '%s' skipped", expression)
-        return None
-
-    try:
-        ctx = quickjs.Context()
-        input_value = direct_input.value if direct_input is not None else None
-        trigger_value = None
-        if isinstance(expression_context, dict):
-            trigger_value = expression_context.get("trigger")
-
-        input_json = _json_dumps_safe(input_value)
-        trigger_json = _json_dumps_safe(trigger_value)
-
-        ctx.add_callable("__get_input_json", lambda: input_json)
-        ctx.add_callable("__get_trigger_json", lambda: trigger_json)
-        ctx.add_callable(
-            "__get_node_json",
-            lambda name: _json_dumps_safe(upstream_outputs.get(str(name))),
-        )
-        ctx.eval(
-            """
-            const __raw_input = __get_input_json();
-            const input = __raw_input ? JSON.parse(__raw_input) : {};
-            const $input = input;
-            const __raw_trigger = __get_trigger_json();
-            const trigger = __raw_trigger ? JSON.parse(__raw_trigger) : {};
-            const $trigger = trigger;
-            const $ = (name) => {
-              const raw = __get_node_json(String(name));
-              const node = raw ? JSON.parse(raw) : null;
-              return { item: { json: (node === null || node === undefined) ? {} : node } };
-            };
-            """
-        )
-        return _convert_js_result(ctx.eval(expression))
-    except Exception as exc:
-        logger.warning("Expression eval failed (%s): %s", expression, exc)
-        return None
-
-
 def _convert_js_result(value: Any) -> Any:
     if quickjs is None:
         return value
@@ -0,0 +1,127 @@
+"""Isolation for long-lived QuickJS contexts shared by unrelated runs.
+
+Expression and code node contexts live for the life of their thread so that
+compiled functions can be reused, which means anything a script leaves in
+the realm would be visible to the next flow or user that lands on the same
+thread. `lock_down()` prevents that, once per context:
+
+- Every intrinsic reachable from `globalThis` (constructors, prototypes,
+  namespaces such as `Math` and `JSON`, and the hidden iterator and
+  generator prototypes) is frozen, so `Array.prototype.map = ...` fails.
+- The properties scripts commonly shadow on instances (`constructor`,
+  `toString`, `valueOf`, `toLocaleString`, `toJSON`, `name`, `message`)
+  become accessors on frozen prototypes. Assigning to them on an instance
+  still defines an own property, so freezing does not break `err.message = ...`.
+- The existing globals become read-only.
+
+The returned `reset()` deletes globals a script added (`globalThis.leak = x`
+or an implicit global in sloppy code). It returns false when the realm can
+no longer be cleaned, e.g. after a script made `globalThis` non-extensible
+or added a non-configurable global. The caller then replaces the context.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+_LOCKDOWN = r"""
+(() => {
+  "use strict";
+  const { defineProperty, freeze, getOwnPropertyDescriptor, getPrototypeOf, isExtensible } = Object;
+  const { deleteProperty, ownKeys } = Reflect;
+  const OVERRIDABLE = ["constructor", "toString", "toLocaleString", "valueOf", "toJSON", "name", "message"];
+
+  const intrinsics = [];
+  const seen = new Set([globalThis]);
+  const visit = (value) => {
+    if ((typeof value !== "object" && typeof value !== "function") || value === null || seen.has(value)) {
+      return;
+    }
+    seen.add(value);
+    intrinsics.push(value);
+    visit(getPrototypeOf(value));
+    for (const key of ownKeys(value)) {
+      const descriptor = getOwnPropertyDescriptor(value, key);
+      visit(descriptor.value);
+      visit(descriptor.get);
+      visit(descriptor.set);
+    }
+  };
+  visit(getPrototypeOf(globalThis));
+  for (const key of ownKeys(globalThis)) {
+    visit(getOwnPropertyDescriptor(globalThis, key).value);
+  }
+  for (const hidden of [
+    function* () {},
+    async function () {},
+    async function* () {},
+    [][Symbol.iterator](),
+    new Map()[Symbol.iterator](),
+    new Set()[Symbol.iterator](),
+    ""[Symbol.iterator](),
+    "".matchAll(/(?:)/g),
+  ]) {
+    visit(getPrototypeOf(hidden));
+  }
+
+  const accessors = [];
+  const tame = (prototype) => {
+    for (const key of OVERRIDABLE) {
+      const descriptor = getOwnPropertyDescriptor(prototype, key);
+      if (descriptor === undefined || !("value" in descriptor) || !descriptor.configurable) {
+        continue;
+      }
+      const value = descriptor.value;
+      const get = function () {
+        return value;
+      };
+      const set = function (next) {
+        if (this === prototype) {
+          throw new TypeError(`Cannot assign to read only property '${key}'`);
+        }
+        defineProperty(this, key, { value: next, writable: true, enumerable: true, configurable: true });
+      };
+      accessors.push(get, set);
+      defineProperty(prototype, key, { get, set, enumerable: descriptor.enumerable, configurable: false });
+    }
+  };
+  for (const intrinsic of intrinsics) {
+    if (typeof intrinsic === "object" && getOwnPropertyDescriptor(intrinsic, "constructor")) {
+      tame(intrinsic);
+    }
+  }
+  for (const value of [...intrinsics, ...accessors]) {
+    freeze(value);
+    if (typeof value === "function" && value.prototype !== undefined) {
+      freeze(value.prototype);
+    }
+  }
+
+  for (const key of ownKeys(globalThis)) {
+    const descriptor = getOwnPropertyDescriptor(globalThis, key);
+    if (descriptor.configurable) {
+      defineProperty(globalThis, key, "value" in descriptor
+        ? { value: descriptor.value, writable: false, enumerable: descriptor.enumerable, configurable: false }
+        : { get: descriptor.get, set: descriptor.set, enumerable: descriptor.enumerable, configurable: false });
+    }
+  }
+
+  const baseline = new Set(ownKeys(globalThis));
+  return freeze(() => {
+    const keys = ownKeys(globalThis);
+    if (keys.length !== baseline.size) {
+      for (const key of keys) {
+        if (!baseline.has(key) && !deleteProperty(globalThis, key)) {
+          return false;
+        }
+      }
+    }
+    return isExtensible(globalThis);
+  });
+})()
+"""
+
+
+def lock_down(context: Any) -> Any:
+    """Freeze `context`'s intrinsics and globals and return its `reset()` function."""
+    return context.eval(_LOCKDOWN)
@@ -36,6 +36,13 @@ def get_executor(node_type: str) -> Any | None:
     return None
 
 
+def registry_revision() -> int:
+    """Revision of the bound plugin registry; changes when executors change."""
+    if _plugin_registry is None:
+        return 0
+    return int(getattr(_plugin_registry, "revision", 0))
+
+
 def list_node_types() -> list[str]:
     types = {
         *BUILTIN_EXECUTOR_MODULES.keys(),
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
@@ -89,6 +90,88 @@ class DataValue:
     value: Any
 
 
+STREAM_SOCKET_TYPE = "stream"
+
+
+class ValueStream:
+    """Chunks of an upstream output, readable while the upstream still runs.
+
+    Stream-aware executors (`accepts_streams = True`) may receive
+    `DataValue("stream", ValueStream)` for inputs whose producer declares
+    `stream_output_handle`. Every reader sees every chunk from the start;
+    iteration ends when the producer finishes and raises if it failed.
+    `result()` waits for the producer's final DataValue.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[Any] = []
+        self._closed = False
+        self._error: BaseException | None = None
+        self._final: DataValue | None = None
+        self._signal = asyncio.Event()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def push(self, chunk: Any) -> None:
+        if self._closed:
+            return
+        self._chunks.append(chunk)
+        self._wake()
+
+    def close(self, final: DataValue | None = None, error: BaseException | None = None) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._final = final
+        self._error = error
+        self._wake()
+
+    def _wake(self) -> None:
+        signal = self._signal
+        self._signal = asyncio.Event()
+        signal.set()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        index = 0
+        while True:
+            while index < len(self._chunks):
+                yield self._chunks[index]
+                index += 1
+            if self._closed:
+                if self._error is not None:
+                    raise self._error
+                return
+            await self._signal.wait()
+
+    async def result(self) -> DataValue | None:
+        async for _ in self:
+            pass
+        return self._final
+
+    async def text(self) -> str:
+        return "".join([str(chunk) async for chunk in self])
+
+
+async def iter_chunks(value: DataValue | None) -> AsyncIterator[Any]:
+    """Yield chunks of a streamed input, or a settled input as one chunk."""
+    if value is None:
+        return
+    if isinstance(value.value, ValueStream):
+        async for chunk in value.value:
+            yield chunk
+        return
+    yield value.value
+
+
+async def settle_input(value: DataValue | None) -> DataValue | None:
+    """Wait for a streamed input to finish and return its final DataValue."""
+    if value is None or not isinstance(value.value, ValueStream):
+        return value
+    return await value.value.result()
+
+
 @dataclass
 class BinaryRef:
     ref: str
@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import Any
 
 from backend.services.models.model_factory import get_model
-from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent, settle_input
 
 
 def resolve_model(model_str: str) -> Any:
@@ -31,14 +31,32 @@ def _extract_prompt(value: Any) -> str:
 
 class LlmCompletionExecutor:
     node_type = "llm-completion"
+    max_concurrency = 4
+    stream_output_handle = "output"
+    accepts_streams = True
+
+    def is_cacheable(self, data: dict[str, Any], inputs: dict[str, DataValue]) -> bool:
+        """Only greedy (temperature 0) completions are reproducible."""
+        temperature_input = inputs.get("temperature")
+        temperature = (
+            temperature_input.value
+            if temperature_input is not None and temperature_input.value is not None
+            else data.get("temperature")
+        )
+        try:
+            return temperature is not None and float(temperature) == 0
+        except (TypeError, ValueError):
+            return False
 
     async def execute(
         self, data: dict[str, Any], inputs: dict[str, DataValue], context: FlowContext
     ):
         prompt_input = inputs.get("prompt") or inputs.get("input")
-        prompt = _extract_prompt(
-            prompt_input.value if prompt_input is not None else data.get("prompt", "")
-        )
+        inputs = {
+            handle: await settle_input(value)
+            for handle, value in inputs.items()
+            if value is not prompt_input
+        }
 
         model_input = inputs.get("model")
         model_str = (
@@ -71,6 +89,12 @@ class LlmCompletionExecutor:
             data={"model": model_str},
         )
 
+        # A streamed prompt settles here, after the model is resolved.
+        prompt_input = await settle_input(prompt_input)
+        prompt = _extract_prompt(
+            prompt_input.value if prompt_input is not None else data.get("prompt", "")
+        )
+
         full_response = ""
         kwargs: dict[str, Any] = {}
         if temperature is not None:
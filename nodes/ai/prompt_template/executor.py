@@ -41,6 +41,8 @@ def _render_template(template: str, payload: dict[str, Any]) -> str:
 
 class PromptTemplateExecutor:
     node_type = "prompt-template"
+    cacheable = True
+    foldable = True
 
     async def execute(
         self, data: dict[str, Any], inputs: dict[str, DataValue], context: FlowContext
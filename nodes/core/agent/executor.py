@@ -79,6 +79,13 @@ class _StreamError:
 
 class AgentExecutor:
     node_type = "agent"
+    max_concurrency = 4
+    link_cache_scopes = ("tools", "mcp", "providers")
+
+    def link_cache_key(self, data: dict[str, Any], context: FlowContext) -> str:
+        """Run-level model variables can retarget a linked agent's model."""
+        del data
+        return _resolve_variable_model(context, None)
 
     def declare_variables(
         self,
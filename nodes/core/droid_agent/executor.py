@@ -138,6 +138,7 @@ class _DroidAttachment:
 
 class DroidAgentExecutor:
     node_type = "droid-agent"
+    max_concurrency = 4
 
     default_renderers = {
         re.compile(r"^execute$", re.IGNORECASE): "terminal",
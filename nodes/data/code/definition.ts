@@ -26,6 +26,14 @@ export const code = {
       rows: 8,
       language: 'javascript',
     },
+    {
+      id: 'cacheOutput',
+      type: 'boolean',
+      label: 'Cache Output',
+      mode: 'constant',
+      default: false,
+      renderScope: 'inspector',
+    },
     {
       id: 'input',
       type: 'data',
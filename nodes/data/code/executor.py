@@ -1,91 +1,28 @@
-"""Code node — execute custom JavaScript and return its result."""
+"""Code node — execute custom JavaScript and return its result.
+
+Scripts run in the shared code sandbox (see sandbox.py), off the event loop
+and under time, memory and output limits.
+"""
 
 from __future__ import annotations
 
-import json
 from typing import Any
 
-try:
-    import quickjs
-except ImportError:  # pragma: no cover - optional for tests
-    quickjs = None
-
 from nodes._types import DataValue, ExecutionResult, FlowContext
-
-
-def _json_dumps_safe(value: Any) -> str:
-    if value is None:
-        return ""
-    try:
-        return json.dumps(value)
-    except TypeError:
-        return json.dumps(str(value))
-
-
-def _convert_js_result(value: Any) -> Any:
-    if quickjs is None:
-        return value
-    if isinstance(value, quickjs.Object):
-        try:
-            return json.loads(value.json())
-        except (TypeError, json.JSONDecodeError):
-            return str(value)
-    return value
-
-
-def _ensure_json_safe(value: Any) -> Any:
-    try:
-        json.dumps(value)
-        return value
-    except TypeError:
-        return json.loads(_json_dumps_safe(value))
-
-
-def _eval_js(
-    code: str,
-    *,
-    input_value: Any,
-    trigger_value: Any,
-    upstream_outputs: dict[str, Any],
-) -> Any:
-    if quickjs is None:
-        raise RuntimeError("quickjs is not available; cannot execute JavaScript")
-
-    ctx = quickjs.Context()
-
-    input_json = _json_dumps_safe(input_value)
-    trigger_json = _json_dumps_safe(trigger_value)
-
-    ctx.add_callable("__get_input_json", lambda: input_json)
-    ctx.add_callable("__get_trigger_json", lambda: trigger_json)
-    ctx.add_callable(
-        "__get_node_json",
-        lambda name: _json_dumps_safe(upstream_outputs.get(str(name))),
-    )
-
-    ctx.eval(
-        """
-        const __raw_input = __get_input_json();
-        const input = __raw_input ? JSON.parse(__raw_input) : {};
-        const $input = input;
-        const __raw_trigger = __get_trigger_json();
-        const trigger = __raw_trigger ? JSON.parse(__raw_trigger) : {};
-        const $trigger = trigger;
-        const $ = (name) => {
-          const raw = __get_node_json(String(name));
-          const node = raw ? JSON.parse(raw) : null;
-          return { item: { json: (node === null || node === undefined) ? {} : node } };
-        };
-        """
-    )
-
-    wrapped = f"(function() {{\n{code}\n}})()"
-    return _ensure_json_safe(_convert_js_result(ctx.eval(wrapped)))
+from nodes.data.code.sandbox import get_code_sandbox
 
 
 class CodeExecutor:
     node_type = "code"
 
+    def is_cacheable(self, data: dict[str, Any], inputs: dict[str, DataValue]) -> bool:
+        """Only when the node opts in (`cacheOutput`).
+
+        The cache key covers the script and its wired input, not `$trigger`,
+        `$(name)`, the clock or randomness, so purity is the author's call.
+        """
+        return data.get("cacheOutput") is True
+
     async def execute(
         self, data: dict[str, Any], inputs: dict[str, DataValue], context: FlowContext
     ) -> ExecutionResult:
@@ -109,11 +46,13 @@ class CodeExecutor:
             if isinstance(maybe_outputs, dict):
                 upstream_outputs = maybe_outputs
 
-        result = _eval_js(
+        execution = getattr(services, "execution", None)
+        result = await get_code_sandbox().run(
             code,
             input_value=input_value,
             trigger_value=trigger_value,
             upstream_outputs=upstream_outputs,
+            is_cancelled=lambda: getattr(execution, "stop_run", False) is True,
         )
 
         return ExecutionResult(outputs={"output": DataValue(type="data", value=result)})
@@ -0,0 +1,459 @@
+"""Sandboxed evaluation of code node scripts.
+
+Scripts run on a small, pre-started pool of worker threads, off the event
+loop (QuickJS releases the GIL while it evaluates). Each thread keeps one
+QuickJS context with a CPU time limit and a heap limit enforced by QuickJS
+itself; a context that breaches a limit is replaced. Contexts are shared by
+every flow that lands on the thread, so their intrinsics are frozen and the
+globals a script adds are deleted after each run (see `nodes._js_lockdown`).
+Results are rejected when their JSON exceeds the output limit. Callers poll a cancellation
+callback while they wait; a cancelled script is abandoned and its thread is
+reclaimed once QuickJS interrupts it.
+
+Each script is compiled once per thread into a function, keyed by a hash of
+its source, so repeated executions only pay the call. The binding cannot
+serialize QuickJS bytecode, so `ScriptCache` persists the hot scripts'
+sources instead and new worker threads precompile them at start-up.
+
+Limits and pool size come from the environment:
+
+  COVALT_CODE_WORKERS             worker threads (default 2)
+  COVALT_CODE_TIME_LIMIT          seconds of script time (default 10)
+  COVALT_CODE_MEMORY_LIMIT_MB     QuickJS heap limit (default 128)
+  COVALT_CODE_OUTPUT_LIMIT_BYTES  serialized result limit (default 8 MiB)
+  COVALT_CODE_CACHE_DIR           script cache directory (default <db>/code_cache)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+try:
+    import quickjs
+except ImportError:  # pragma: no cover - optional for tests
+    quickjs = None
+
+from nodes._js_lockdown import lock_down
+
+logger = logging.getLogger(__name__)
+
+WORKERS_ENV = "COVALT_CODE_WORKERS"
+TIME_LIMIT_ENV = "COVALT_CODE_TIME_LIMIT"
+MEMORY_LIMIT_ENV = "COVALT_CODE_MEMORY_LIMIT_MB"
+OUTPUT_LIMIT_ENV = "COVALT_CODE_OUTPUT_LIMIT_BYTES"
+CACHE_DIR_ENV = "COVALT_CODE_CACHE_DIR"
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIME_LIMIT_SECONDS = 10.0
+DEFAULT_MEMORY_LIMIT_MB = 128
+DEFAULT_OUTPUT_LIMIT_BYTES = 8 * 1024 * 1024
+COMPILED_SCRIPTS_PER_THREAD = 256
+PERSISTED_SCRIPTS = 128
+SCRIPT_CACHE_VERSION = 1
+
+# How long past its time limit a script may run before the caller gives up.
+_DEADLINE_GRACE_SECONDS = 1.0
+_CANCEL_POLL_SECONDS = 0.05
+
+_SCRIPT_PARAMS = "input, $input, trigger, $trigger, $"
+# Frozen so a script cannot keep state on its own function (`arguments.callee`).
+_SCRIPT_FUNCTION = """
+(() => {{
+  const script = function ({params}) {{
+{code}
+  }};
+  Object.freeze(script.prototype);
+  return Object.freeze(script);
+}})()
+"""
+_NODE_ACCESSOR = """
+(nodes) => (name) => {
+  const node = nodes[String(name)];
+  return { item: { json: (node === null || node === undefined) ? {} : node } };
+}
+"""
+_SAVE_INTERVAL_SECONDS = 30.0
+
+
+class CodeLimitError(RuntimeError):
+    """A script exceeded its time, memory or output limit."""
+
+
+class CodeCancelled(RuntimeError):
+    """The run was cancelled while the script was executing."""
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+@dataclass(frozen=True, slots=True)
+class CodeLimits:
+    time_limit_s: float = DEFAULT_TIME_LIMIT_SECONDS
+    memory_limit_bytes: int = DEFAULT_MEMORY_LIMIT_MB * 1024 * 1024
+    output_limit_bytes: int = DEFAULT_OUTPUT_LIMIT_BYTES
+
+    @classmethod
+    def from_env(cls) -> CodeLimits:
+        return cls(
+            time_limit_s=_env_number(TIME_LIMIT_ENV, DEFAULT_TIME_LIMIT_SECONDS),
+            memory_limit_bytes=int(_env_number(MEMORY_LIMIT_ENV, DEFAULT_MEMORY_LIMIT_MB))
+            * 1024
+            * 1024,
+            output_limit_bytes=int(_env_number(OUTPUT_LIMIT_ENV, DEFAULT_OUTPUT_LIMIT_BYTES)),
+        )
+
+
+def _json_dumps_safe(value: Any) -> str:
+    if value is None:
+        return ""
+    try:
+        return json.dumps(value)
+    except TypeError:
+        return json.dumps(str(value))
+
+
+def _nodes_json(code: str, upstream_outputs: dict[str, Any]) -> str:
+    # QuickJS cannot call back into Python under a time limit, so `$(name)`
+    # reads from a copy of the upstream outputs, built only when used.
+    if "$(" not in code:
+        return "{}"
+    entries = ",".join(
+        f"{json.dumps(str(name))}:{_json_dumps_safe(value) or 'null'}"
+        for name, value in upstream_outputs.items()
+    )
+    return "{" + entries + "}"
+
+
+def _result_json(value: Any) -> str:
+    if quickjs is not None and isinstance(value, quickjs.Object):
+        try:
+            return value.json()
+        except Exception:
+            return json.dumps(str(value))
+    return _json_dumps_safe(value) or "null"
+
+
+def script_digest(code: str) -> str:
+    return hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ScriptCache:
+    """Usage counts of compiled scripts, with hot sources persisted to disk."""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory
+        self._sources: OrderedDict[str, str] = OrderedDict()
+        self._uses: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.warmed = 0
+
+    def _path(self) -> Path:
+        if self._directory is None:
+            configured = os.getenv(CACHE_DIR_ENV)
+            if configured:
+                self._directory = Path(configured)
+            else:
+                from backend.config import get_db_directory  # noqa: PLC0415
+
+                self._directory = get_db_directory() / "code_cache"
+        return self._directory / "scripts.json"
+
+    def load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                payload = json.loads(self._path().read_text("utf-8"))
+            except FileNotFoundError:
+                return
+            except (OSError, ValueError) as exc:
+                logger.warning("[code_sandbox] Failed to load script cache: %s", exc)
+                return
+            if not isinstance(payload, dict) or payload.get("version") != SCRIPT_CACHE_VERSION:
+                return
+            for entry in payload.get("scripts") or []:
+                source = entry.get("source") if isinstance(entry, dict) else None
+                if isinstance(source, str):
+                    digest = script_digest(source)
+                    self._sources[digest] = source
+                    self._uses[digest] = int(entry.get("uses") or 0)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            hot = sorted(self._sources, key=lambda digest: -self._uses.get(digest, 0))
+            payload = {
+                "version": SCRIPT_CACHE_VERSION,
+                "scripts": [
+                    {"source": self._sources[digest], "uses": self._uses.get(digest, 0)}
+                    for digest in hot[:PERSISTED_SCRIPTS]
+                ],
+            }
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        path = self._path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(payload), "utf-8")
+        except OSError as exc:
+            logger.warning("[code_sandbox] Failed to save script cache: %s", exc)
+
+    def hot_scripts(self) -> list[str]:
+        self.load()
+        with self._lock:
+            hot = sorted(self._sources, key=lambda digest: -self._uses.get(digest, 0))
+            return [self._sources[digest] for digest in hot[:PERSISTED_SCRIPTS]]
+
+    def record(self, digest: str, code: str, *, compiled: bool) -> None:
+        with self._lock:
+            if compiled:
+                self.misses += 1
+            else:
+                self.hits += 1
+            if digest not in self._sources:
+                self._sources[digest] = code
+                self._dirty = True
+            self._uses[digest] = self._uses.get(digest, 0) + 1
+            due = self._dirty and time.monotonic() - self._saved_at > _SAVE_INTERVAL_SECONDS
+        if due:
+            self.save()
+
+    def record_warmed(self, count: int) -> None:
+        with self._lock:
+            self.warmed += count
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "warmed": self.warmed,
+                "scripts": len(self._sources),
+            }
+
+
+class _ScriptRuntime:
+    """One thread's long-lived QuickJS context and its compiled scripts."""
+
+    def __init__(self, limits: CodeLimits) -> None:
+        self.limits = limits
+        self.context = quickjs.Context()
+        self.context.set_memory_limit(limits.memory_limit_bytes)
+        self.context.set_time_limit(limits.time_limit_s)
+        self._reset = lock_down(self.context)
+        self.node_accessor = self.context.eval(_NODE_ACCESSOR)
+        self._functions: OrderedDict[str, Any] = OrderedDict()
+
+    def reset_globals(self) -> bool:
+        """Drop globals the last script added; False if the context is tainted."""
+        try:
+            return bool(self._reset())
+        except quickjs.JSException:
+            return False
+
+    def function(self, digest: str, code: str) -> tuple[Any, bool]:
+        """Return the compiled script and whether it was compiled just now."""
+        function = self._functions.get(digest)
+        if function is not None:
+            self._functions.move_to_end(digest)
+            return function, False
+        function = self.context.eval(_SCRIPT_FUNCTION.format(params=_SCRIPT_PARAMS, code=code))
+        self._functions[digest] = function
+        while len(self._functions) > COMPILED_SCRIPTS_PER_THREAD:
+            self._functions.popitem(last=False)
+        return function, True
+
+
+_runtimes = threading.local()
+
+
+def _get_runtime(limits: CodeLimits) -> _ScriptRuntime:
+    runtime = getattr(_runtimes, "runtime", None)
+    if runtime is None or runtime.limits != limits:
+        runtime = _ScriptRuntime(limits)
+        _runtimes.runtime = runtime
+    return runtime
+
+
+def evaluate_script(
+    code: str,
+    *,
+    input_json: str,
+    trigger_json: str,
+    nodes_json: str,
+    limits: CodeLimits,
+    cache: ScriptCache | None = None,
+) -> Any:
+    """Run `code` as a function body on this thread's limited QuickJS context."""
+    if quickjs is None:
+        raise RuntimeError("quickjs is not available; cannot execute JavaScript")
+
+    runtime = _get_runtime(limits)
+    ctx = runtime.context
+    try:
+        digest = script_digest(code)
+        function, compiled = runtime.function(digest, code)
+        if cache is not None:
+            cache.record(digest, code, compiled=compiled)
+        input_obj = ctx.parse_json(input_json or "{}")
+        trigger_obj = ctx.parse_json(trigger_json or "{}")
+        nodes = runtime.node_accessor(ctx.parse_json(nodes_json))
+        result = _result_json(function(input_obj, input_obj, trigger_obj, trigger_obj, nodes))
+    except quickjs.JSException as exc:
+        message = str(exc).strip()
+        if "interrupted" in message:
+            _runtimes.runtime = None
+            raise CodeLimitError(
+                f"Code exceeded its {limits.time_limit_s:g}s time limit"
+            ) from None
+        # QuickJS may be unable to allocate the error itself when out of memory,
+        # leaving "null" or no readable message at all.
+        if (
+            "out of memory" in message
+            or message in ("", "null")
+            or message.startswith("(Failed obtaining QuickJS error string")
+        ):
+            _runtimes.runtime = None
+            raise CodeLimitError(
+                f"Code exceeded its {limits.memory_limit_bytes // (1024 * 1024)} MB memory limit"
+            ) from None
+        raise
+    finally:
+        if getattr(_runtimes, "runtime", None) is runtime and not runtime.reset_globals():
+            _runtimes.runtime = None
+    if len(result) > limits.output_limit_bytes:
+        raise CodeLimitError(
+            f"Code output is {len(result)} bytes; the limit is {limits.output_limit_bytes}"
+        )
+    try:
+        return json.loads(result)
+    except (TypeError, json.JSONDecodeError):
+        return str(result)
+
+
+def _warm_thread(limits: CodeLimits, cache: ScriptCache | None) -> None:
+    if quickjs is None or cache is None:
+        return
+    runtime = _get_runtime(limits)
+    warmed = 0
+    for source in cache.hot_scripts():
+        try:
+            runtime.function(script_digest(source), source)
+            warmed += 1
+        except Exception:
+            continue
+    if not runtime.reset_globals():
+        _runtimes.runtime = None
+    cache.record_warmed(warmed)
+
+
+class CodeSandbox:
+    """A reusable pool of script worker threads shared by all runs."""
+
+    def __init__(
+        self, workers: int, limits: CodeLimits, script_cache: ScriptCache | None = None
+    ) -> None:
+        self.workers = max(1, workers)
+        self.limits = limits
+        self.script_cache = script_cache
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="code-sandbox",
+            initializer=_warm_thread,
+            initargs=(limits, script_cache),
+        )
+        for _ in range(self.workers):
+            self._pool.submit(lambda: None)
+
+    async def run(
+        self,
+        code: str,
+        *,
+        input_value: Any,
+        trigger_value: Any,
+        upstream_outputs: dict[str, Any],
+        is_cancelled: Callable[[], bool] = lambda: False,
+    ) -> Any:
+        started_at: list[float] = []
+        upstream_outputs = dict(upstream_outputs)
+
+        def _evaluate() -> Any:
+            started_at.append(time.monotonic())
+            return evaluate_script(
+                code,
+                input_json=_json_dumps_safe(input_value),
+                trigger_json=_json_dumps_safe(trigger_value),
+                nodes_json=_nodes_json(code, upstream_outputs),
+                limits=self.limits,
+                cache=self.script_cache,
+            )
+
+        future = asyncio.get_running_loop().run_in_executor(self._pool, _evaluate)
+        budget = self.limits.time_limit_s + _DEADLINE_GRACE_SECONDS
+        while True:
+            done, _ = await asyncio.wait({future}, timeout=_CANCEL_POLL_SECONDS)
+            if done:
+                return future.result()
+            if is_cancelled():
+                future.cancel()
+                raise CodeCancelled("Code execution cancelled")
+            if started_at and time.monotonic() - started_at[0] > budget:
+                future.cancel()
+                raise CodeLimitError(
+                    f"Code exceeded its {self.limits.time_limit_s:g}s time limit"
+                )
+
+    def stats(self) -> dict[str, int]:
+        return self.script_cache.stats() if self.script_cache is not None else {}
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self.script_cache is not None:
+            self.script_cache.save()
+
+
+_sandbox: CodeSandbox | None = None
+_sandbox_lock = threading.Lock()
+
+
+def get_code_sandbox() -> CodeSandbox:
+    global _sandbox
+    if _sandbox is not None:
+        return _sandbox
+    with _sandbox_lock:
+        if _sandbox is None:
+            workers = int(_env_number(WORKERS_ENV, DEFAULT_WORKERS))
+            _sandbox = CodeSandbox(workers, CodeLimits.from_env(), ScriptCache())
+    return _sandbox
+
+
+def shutdown_code_sandbox() -> None:
+    global _sandbox
+    with _sandbox_lock:
+        sandbox, _sandbox = _sandbox, None
+    if sandbox is not None:
+        sandbox.shutdown()
@@ -0,0 +1 @@
+"""Transform node package."""
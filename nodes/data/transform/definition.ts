@@ -0,0 +1,41 @@
+/**
+ * Transform Node
+ * Reshape incoming data with a JMESPath-style query.
+ */
+
+import type { NodeDefinition } from '../../_types';
+
+export const transform = {
+  id: 'transform',
+  name: 'Transform',
+  description: 'Map, filter and reshape data with a query',
+  category: 'data',
+  icon: 'Shuffle',
+  executionMode: 'flow',
+
+  parameters: [
+    {
+      id: 'query',
+      type: 'text-area',
+      label: 'Query',
+      mode: 'constant',
+      default: '@',
+      placeholder: 'items[?price > `10`].{id: id, total: price}',
+      rows: 4,
+    },
+    {
+      id: 'input',
+      type: 'data',
+      label: 'Input',
+      mode: 'input',
+      socket: { type: 'data' },
+    },
+    {
+      id: 'output',
+      type: 'data',
+      label: 'Output',
+      mode: 'output',
+      socket: { type: 'data' },
+    },
+  ],
+} as const satisfies NodeDefinition;
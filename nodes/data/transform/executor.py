@@ -0,0 +1,36 @@
+"""Transform node — reshape JSON with a JMESPath-style query.
+
+Queries are compiled once to Python closures (see query.py) and evaluated
+natively, so mapping or filtering large arrays never pays for a JS runtime
+or a JSON round trip.
+
+The node does not take part in streaming edges. Flow streams carry text
+tokens that also surface as chat progress, while a query needs the whole
+JSON document. Large arrays are instead handled by single-pass projection:
+each element runs through the full right-hand side of `[*]`/`[?...]` once,
+without building intermediate lists.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from nodes._types import DataValue, ExecutionResult, FlowContext
+from nodes.data.transform.query import compile_query
+
+
+class TransformExecutor:
+    node_type = "transform"
+    cacheable = True
+    foldable = True
+    cpu_bound = True
+
+    async def execute(
+        self, data: dict[str, Any], inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        query = compile_query(str(data.get("query") or ""))
+        input_value = inputs.get("input", DataValue("data", {})).value
+        return ExecutionResult(outputs={"output": DataValue(type="data", value=query(input_value))})
+
+
+executor = TransformExecutor()
@@ -0,0 +1,919 @@
+"""JMESPath-style queries compiled to Python closures.
+
+A query is parsed once into a tree of small closures, so evaluating it is a
+handful of dict lookups per element with no interpreter loop or JS runtime.
+Projections (`[*]`, `[]`, `[?filter]`, `.*`) run their whole right-hand side
+per element in a single pass, so a filter followed by a field selection walks
+a large array once without building intermediate lists.
+
+Supported: field paths, quoted identifiers, indexes and slices, wildcard,
+flatten and filter projections, multi-select lists and hashes, comparisons,
+`&&`/`||`/`!`, pipes, literals (`` `json` `` and `'raw'`), `@`, `&expr`
+references and the JMESPath builtin functions.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+import orjson
+
+Query = Callable[[Any], Any]
+
+
+class QueryError(ValueError):
+    """Raised for malformed queries and invalid function arguments."""
+
+
+class _ExpRef:
+    __slots__ = ("query",)
+
+    def __init__(self, query: Query) -> None:
+        self.query = query
+
+
+# ── Tokenizer ────────────────────────────────────────────────────────
+
+_SIMPLE_TOKENS = {
+    ".": "dot",
+    "*": "star",
+    ",": "comma",
+    ":": "colon",
+    "{": "lbrace",
+    "}": "rbrace",
+    "]": "rbracket",
+    "(": "lparen",
+    ")": "rparen",
+    "@": "current",
+}
+_IDENTIFIER_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+_IDENTIFIER_CHARS = _IDENTIFIER_START | frozenset("0123456789")
+_DIGITS = frozenset("0123456789")
+
+Token = tuple[str, Any, int]
+
+
+def _tokenize(source: str) -> list[Token]:
+    tokens: list[Token] = []
+    position = 0
+    length = len(source)
+    while position < length:
+        char = source[position]
+        start = position
+        if char in " \t\n\r":
+            position += 1
+        elif char in _SIMPLE_TOKENS:
+            tokens.append((_SIMPLE_TOKENS[char], char, start))
+            position += 1
+        elif char in _IDENTIFIER_START:
+            while position < length and source[position] in _IDENTIFIER_CHARS:
+                position += 1
+            tokens.append(("identifier", source[start:position], start))
+        elif char in _DIGITS or (char == "-" and source[position + 1 : position + 2] in _DIGITS):
+            position += 1
+            while position < length and source[position] in _DIGITS:
+                position += 1
+            tokens.append(("number", int(source[start:position]), start))
+        elif char == "[":
+            following = source[position + 1 : position + 2]
+            if following == "]":
+                tokens.append(("flatten", "[]", start))
+                position += 2
+            elif following == "?":
+                tokens.append(("filter", "[?", start))
+                position += 2
+            else:
+                tokens.append(("lbracket", "[", start))
+                position += 1
+        elif char in "\"'`":
+            position = _scan_quoted(source, position, char, tokens)
+        elif char == "|":
+            kind = "or" if source[position + 1 : position + 2] == "|" else "pipe"
+            tokens.append((kind, kind, start))
+            position += 2 if kind == "or" else 1
+        elif char == "&":
+            kind = "and" if source[position + 1 : position + 2] == "&" else "expref"
+            tokens.append((kind, kind, start))
+            position += 2 if kind == "and" else 1
+        elif char in "<>=!":
+            pair = source[position : position + 2]
+            if pair in ("<=", ">=", "==", "!="):
+                tokens.append((pair, pair, start))
+                position += 2
+            elif char in "<>":
+                tokens.append((char, char, start))
+                position += 1
+            elif char == "!":
+                tokens.append(("not", char, start))
+                position += 1
+            else:
+                raise QueryError(f"Unexpected '=' at position {start}; use '==' to compare")
+        else:
+            raise QueryError(f"Unexpected character {char!r} at position {start}")
+    tokens.append(("eof", None, length))
+    return tokens
+
+
+def _scan_quoted(source: str, position: int, quote: str, tokens: list[Token]) -> int:
+    start = position
+    position += 1
+    while position < len(source) and source[position] != quote:
+        position += 2 if source[position] == "\\" else 1
+    if position >= len(source):
+        raise QueryError(f"Unterminated {quote} at position {start}")
+    body = source[start + 1 : position]
+    try:
+        if quote == '"':
+            tokens.append(("quoted", orjson.loads(f'"{body}"'), start))
+        elif quote == "'":
+            tokens.append(("literal", body.replace("\\'", "'"), start))
+        else:
+            tokens.append(("literal", orjson.loads(body.replace("\\`", "`")), start))
+    except orjson.JSONDecodeError as exc:
+        raise QueryError(f"Invalid literal at position {start}: {exc}") from exc
+    return position + 1
+
+
+# ── Runtime semantics ────────────────────────────────────────────────
+
+
+def _truthy(value: Any) -> bool:
+    """JMESPath truthiness: only null, false and empty strings/arrays/objects are false."""
+    if value is None or value is False:
+        return False
+    if value is True or type(value) in (int, float):
+        return True
+    return bool(value)
+
+
+def _json_equal(left: Any, right: Any) -> bool:
+    if type(left) is bool or type(right) is bool:
+        return type(left) is type(right) and left == right
+    return left == right
+
+
+def _orderable(left: Any, right: Any) -> bool:
+    if type(left) in (int, float) and type(right) in (int, float):
+        return True
+    return type(left) is str and type(right) is str
+
+
+def _field(name: str) -> Query:
+    def field(value: Any) -> Any:
+        return value.get(name) if type(value) is dict else None
+
+    return field
+
+
+def _path(names: tuple[str, ...]) -> Query:
+    def path(value: Any) -> Any:
+        for name in names:
+            if type(value) is not dict:
+                return None
+            value = value.get(name)
+        return value
+
+    return path
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _subexpression(left: Query, right: Query) -> Query:
+    left_names = getattr(left, "names", None)
+    right_names = getattr(right, "names", None)
+    if left_names is not None and right_names is not None:
+        return _named_path(left_names + right_names)
+
+    def subexpression(value: Any) -> Any:
+        return right(left(value))
+
+    return subexpression
+
+
+def _named_path(names: tuple[str, ...]) -> Query:
+    query = _field(names[0]) if len(names) == 1 else _path(names)
+    query.names = names  # type: ignore[attr-defined]
+    return query
+
+
+def _index(position: int) -> Query:
+    def index(value: Any) -> Any:
+        if type(value) is not list:
+            return None
+        try:
+            return value[position]
+        except IndexError:
+            return None
+
+    return index
+
+
+def _slice(start: int | None, stop: int | None, step: int | None) -> Query:
+    if step == 0:
+        raise QueryError("Slice step cannot be 0")
+    bounds = slice(start, stop, step)
+
+    def sliced(value: Any) -> Any:
+        if type(value) is list or type(value) is str:
+            return value[bounds]
+        return None
+
+    return sliced
+
+
+def _projection(left: Query, right: Query) -> Query:
+    if right is _identity:
+
+        def project_all(value: Any) -> Any:
+            base = left(value)
+            if type(base) is not list:
+                return None
+            return [item for item in base if item is not None]
+
+        return project_all
+
+    def projection(value: Any) -> Any:
+        base = left(value)
+        if type(base) is not list:
+            return None
+        return [result for item in base if (result := right(item)) is not None]
+
+    return projection
+
+
+def _value_projection(left: Query, right: Query) -> Query:
+    def value_projection(value: Any) -> Any:
+        base = left(value)
+        if type(base) is not dict:
+            return None
+        return [result for item in base.values() if (result := right(item)) is not None]
+
+    return value_projection
+
+
+def _filter_projection(left: Query, condition: Query, right: Query) -> Query:
+    # Comparisons and negations already return True/False/None, which Python
+    # truthiness handles; anything else needs the JMESPath rules.
+    test = condition if getattr(condition, "boolean", False) else lambda item: _truthy(condition(item))
+
+    def filter_projection(value: Any) -> Any:
+        base = left(value)
+        if type(base) is not list:
+            return None
+        if right is _identity:
+            return [item for item in base if test(item) and item is not None]
+        return [result for item in base if test(item) and (result := right(item)) is not None]
+
+    return filter_projection
+
+
+def _flatten(left: Query) -> Query:
+    def flatten(value: Any) -> Any:
+        base = left(value)
+        if type(base) is not list:
+            return None
+        flat: list[Any] = []
+        for item in base:
+            if type(item) is list:
+                flat.extend(item)
+            else:
+                flat.append(item)
+        return flat
+
+    return flatten
+
+
+def _comparator(comparison: str, left: Query, right: Query) -> Query:
+    constant = getattr(right, "constant", _identity)
+    if comparison in ("==", "!="):
+        negate = comparison == "!="
+        if constant is not _identity and type(constant) is not bool:
+
+            def equals_constant(value: Any) -> bool:
+                found = left(value)
+                return (type(found) is not bool and found == constant) is not negate
+
+            equals_constant.boolean = True  # type: ignore[attr-defined]
+            return equals_constant
+
+        def equals(value: Any) -> bool:
+            return _json_equal(left(value), right(value)) is not negate
+
+        equals.boolean = True  # type: ignore[attr-defined]
+        return equals
+
+    compare = _ORDERING[comparison]
+    if constant is not _identity and _type_name(constant) in ("number", "string"):
+        kinds = (int, float) if type(constant) in (int, float) else (str,)
+        names = getattr(left, "names", None)
+        if names is not None and len(names) == 1:
+            name = names[0]
+
+            def field_ordering_constant(value: Any) -> bool | None:
+                found = value.get(name) if type(value) is dict else None
+                if type(found) in kinds:
+                    return compare(found, constant)
+                return None
+
+            field_ordering_constant.boolean = True  # type: ignore[attr-defined]
+            return field_ordering_constant
+
+        def ordering_constant(value: Any) -> bool | None:
+            found = left(value)
+            if type(found) in kinds:
+                return compare(found, constant)
+            return None
+
+        ordering_constant.boolean = True  # type: ignore[attr-defined]
+        return ordering_constant
+
+    def ordering(value: Any) -> bool | None:
+        found = left(value)
+        other = right(value)
+        if _orderable(found, other):
+            return compare(found, other)
+        return None
+
+    ordering.boolean = True  # type: ignore[attr-defined]
+    return ordering
+
+
+_ORDERING: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _literal(constant: Any) -> Query:
+    def literal(value: Any) -> Any:
+        return constant
+
+    literal.constant = constant  # type: ignore[attr-defined]
+    return literal
+
+
+def _multi_select_list(items: list[Query]) -> Query:
+    def multi_select_list(value: Any) -> Any:
+        if value is None:
+            return None
+        return [item(value) for item in items]
+
+    return multi_select_list
+
+
+def _multi_select_hash(pairs: list[tuple[str, Query]]) -> Query:
+    names = [getattr(query, "names", None) for _, query in pairs]
+    if all(path is not None and len(path) == 1 for path in names):
+        fields = [(key, path[0]) for (key, _), path in zip(pairs, names)]  # type: ignore[index]
+
+        def select_fields(value: Any) -> Any:
+            if value is None:
+                return None
+            if type(value) is not dict:
+                return dict.fromkeys(key for key, _ in fields)
+            get = value.get
+            selected = {}
+            for key, name in fields:
+                selected[key] = get(name)
+            return selected
+
+        return select_fields
+
+    def multi_select_hash(value: Any) -> Any:
+        if value is None:
+            return None
+        selected = {}
+        for key, query in pairs:
+            selected[key] = query(value)
+        return selected
+
+    return multi_select_hash
+
+
+def _or(left: Query, right: Query) -> Query:
+    def either(value: Any) -> Any:
+        found = left(value)
+        return found if _truthy(found) else right(value)
+
+    return either
+
+
+def _and(left: Query, right: Query) -> Query:
+    def both(value: Any) -> Any:
+        found = left(value)
+        return right(value) if _truthy(found) else found
+
+    return both
+
+
+def _not(operand: Query) -> Query:
+    def negated(value: Any) -> bool:
+        return not _truthy(operand(value))
+
+    negated.boolean = True  # type: ignore[attr-defined]
+    return negated
+
+
+def _pipe(left: Query, right: Query) -> Query:
+    def pipe(value: Any) -> Any:
+        return right(left(value))
+
+    return pipe
+
+
+def _expref(query: Query) -> Query:
+    reference = _ExpRef(query)
+
+    def expref(value: Any) -> _ExpRef:
+        return reference
+
+    return expref
+
+
+# ── Functions ────────────────────────────────────────────────────────
+
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    if type(value) is bool:
+        return "boolean"
+    if type(value) in (int, float):
+        return "number"
+    if type(value) is str:
+        return "string"
+    if type(value) is list:
+        return "array"
+    if type(value) is dict:
+        return "object"
+    if type(value) is _ExpRef:
+        return "expref"
+    return type(value).__name__
+
+
+def _expect(name: str, value: Any, *types: str) -> Any:
+    if _type_name(value) not in types:
+        raise QueryError(f"{name}() expected {' or '.join(types)}, got {_type_name(value)}")
+    return value
+
+
+def _numbers(name: str, values: Any) -> list[Any]:
+    _expect(name, values, "array")
+    for item in values:
+        _expect(name, item, "number")
+    return values
+
+
+def _keyed(name: str, values: Any, reference: Any) -> list[tuple[Any, Any]]:
+    _expect(name, values, "array")
+    _expect(name, reference, "expref")
+    keyed = [(reference.query(item), item) for item in values]
+    kinds = {_type_name(key) for key, _ in keyed}
+    if len(kinds) > 1 or kinds - {"number", "string"}:
+        raise QueryError(f"{name}() keys must all be numbers or all be strings")
+    return keyed
+
+
+def _fn_max_by(values: Any, reference: Any) -> Any:
+    keyed = _keyed("max_by", values, reference)
+    return max(keyed, key=lambda pair: pair[0])[1] if keyed else None
+
+
+def _fn_min_by(values: Any, reference: Any) -> Any:
+    keyed = _keyed("min_by", values, reference)
+    return min(keyed, key=lambda pair: pair[0])[1] if keyed else None
+
+
+def _fn_sort_by(values: Any, reference: Any) -> Any:
+    return [item for _, item in sorted(_keyed("sort_by", values, reference), key=lambda pair: pair[0])]
+
+
+def _fn_sort(values: Any) -> Any:
+    _expect("sort", values, "array")
+    kinds = {_type_name(item) for item in values}
+    if len(kinds) > 1 or kinds - {"number", "string"}:
+        raise QueryError("sort() expects an array of numbers or an array of strings")
+    return sorted(values)
+
+
+def _fn_max(values: Any) -> Any:
+    return max(_fn_sort(values), default=None)
+
+
+def _fn_min(values: Any) -> Any:
+    return min(_fn_sort(values), default=None)
+
+
+def _fn_length(value: Any) -> int:
+    return len(_expect("length", value, "string", "array", "object"))
+
+
+def _fn_map(reference: Any, values: Any) -> list[Any]:
+    _expect("map", reference, "expref")
+    return [reference.query(item) for item in _expect("map", values, "array")]
+
+
+def _fn_merge(*objects: Any) -> dict[str, Any]:
+    merged: dict[str, Any] = {}
+    for item in objects:
+        merged.update(_expect("merge", item, "object"))
+    return merged
+
+
+def _fn_contains(subject: Any, search: Any) -> bool:
+    _expect("contains", subject, "string", "array")
+    if type(subject) is str:
+        return type(search) is str and search in subject
+    return any(_json_equal(item, search) for item in subject)
+
+
+def _fn_join(glue: Any, values: Any) -> str:
+    _expect("join", glue, "string")
+    for item in _expect("join", values, "array"):
+        _expect("join", item, "string")
+    return glue.join(values)
+
+
+def _fn_to_number(value: Any) -> Any:
+    if type(value) in (int, float):
+        return value
+    if type(value) is str:
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                number = float(value)
+            except ValueError:
+                return None
+            return number if math.isfinite(number) else None
+    return None
+
+
+def _fn_to_string(value: Any) -> str:
+    if type(value) is str:
+        return value
+    return orjson.dumps(value).decode()
+
+
+def _fn_reverse(value: Any) -> Any:
+    return _expect("reverse", value, "string", "array")[::-1]
+
+
+def _fn_ceil(value: Any) -> int:
+    return math.ceil(_expect("ceil", value, "number"))
+
+
+def _fn_floor(value: Any) -> int:
+    return math.floor(_expect("floor", value, "number"))
+
+
+def _fn_abs(value: Any) -> Any:
+    return abs(_expect("abs", value, "number"))
+
+
+def _fn_avg(values: Any) -> Any:
+    numbers = _numbers("avg", values)
+    return sum(numbers) / len(numbers) if numbers else None
+
+
+def _fn_sum(values: Any) -> Any:
+    return sum(_numbers("sum", values))
+
+
+def _fn_keys(value: Any) -> list[str]:
+    return list(_expect("keys", value, "object"))
+
+
+def _fn_values(value: Any) -> list[Any]:
+    return list(_expect("values", value, "object").values())
+
+
+def _fn_starts_with(subject: Any, prefix: Any) -> bool:
+    return _expect("starts_with", subject, "string").startswith(_expect("starts_with", prefix, "string"))
+
+
+def _fn_ends_with(subject: Any, suffix: Any) -> bool:
+    return _expect("ends_with", subject, "string").endswith(_expect("ends_with", suffix, "string"))
+
+
+def _fn_not_null(*values: Any) -> Any:
+    return next((value for value in values if value is not None), None)
+
+
+def _fn_to_array(value: Any) -> list[Any]:
+    return value if type(value) is list else [value]
+
+
+_FUNCTIONS: dict[str, tuple[Callable[..., Any], int, bool]] = {
+    "abs": (_fn_abs, 1, False),
+    "avg": (_fn_avg, 1, False),
+    "ceil": (_fn_ceil, 1, False),
+    "contains": (_fn_contains, 2, False),
+    "ends_with": (_fn_ends_with, 2, False),
+    "floor": (_fn_floor, 1, False),
+    "join": (_fn_join, 2, False),
+    "keys": (_fn_keys, 1, False),
+    "length": (_fn_length, 1, False),
+    "map": (_fn_map, 2, False),
+    "max": (_fn_max, 1, False),
+    "max_by": (_fn_max_by, 2, False),
+    "merge": (_fn_merge, 1, True),
+    "min": (_fn_min, 1, False),
+    "min_by": (_fn_min_by, 2, False),
+    "not_null": (_fn_not_null, 1, True),
+    "reverse": (_fn_reverse, 1, False),
+    "sort": (_fn_sort, 1, False),
+    "sort_by": (_fn_sort_by, 2, False),
+    "starts_with": (_fn_starts_with, 2, False),
+    "sum": (_fn_sum, 1, False),
+    "to_array": (_fn_to_array, 1, False),
+    "to_number": (_fn_to_number, 1, False),
+    "to_string": (_fn_to_string, 1, False),
+    "type": (_type_name, 1, False),
+    "values": (_fn_values, 1, False),
+}
+
+
+def _function(name: str, arguments: list[Query]) -> Query:
+    spec = _FUNCTIONS.get(name)
+    if spec is None:
+        raise QueryError(f"Unknown function: {name}()")
+    function, arity, variadic = spec
+    if len(arguments) < arity or (not variadic and len(arguments) > arity):
+        expected = f"at least {arity}" if variadic else str(arity)
+        raise QueryError(f"{name}() takes {expected} argument(s), got {len(arguments)}")
+
+    def call(value: Any) -> Any:
+        return function(*(argument(value) for argument in arguments))
+
+    return call
+
+
+# ── Parser ───────────────────────────────────────────────────────────
+
+_BINDING_POWER = {
+    "eof": 0,
+    "identifier": 0,
+    "quoted": 0,
+    "literal": 0,
+    "rbracket": 0,
+    "rparen": 0,
+    "comma": 0,
+    "rbrace": 0,
+    "number": 0,
+    "current": 0,
+    "expref": 0,
+    "colon": 0,
+    "pipe": 1,
+    "or": 2,
+    "and": 3,
+    "==": 5,
+    "!=": 5,
+    "<": 5,
+    "<=": 5,
+    ">": 5,
+    ">=": 5,
+    "flatten": 9,
+    "star": 20,
+    "filter": 21,
+    "dot": 40,
+    "not": 45,
+    "lbrace": 50,
+    "lbracket": 55,
+    "lparen": 60,
+}
+_PROJECTION_STOP = 10
+
+
+class _Parser:
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens = _tokenize(source)
+        self.position = 0
+
+    def parse(self) -> Query:
+        query = self._expression(0)
+        if self._kind() != "eof":
+            self._unexpected()
+        return query
+
+    # token helpers
+
+    def _kind(self, offset: int = 0) -> str:
+        return self.tokens[min(self.position + offset, len(self.tokens) - 1)][0]
+
+    def _advance(self) -> Token:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _match(self, kind: str) -> Token:
+        if self._kind() != kind:
+            self._unexpected(kind)
+        return self._advance()
+
+    def _unexpected(self, expected: str | None = None) -> None:
+        kind, value, position = self.tokens[self.position]
+        found = "end of query" if kind == "eof" else repr(value)
+        hint = f", expected {expected}" if expected else ""
+        raise QueryError(f"Unexpected {found} at position {position}{hint}")
+
+    # Pratt loop
+
+    def _expression(self, binding_power: int) -> Query:
+        left = self._nud(self._advance())
+        while binding_power < _BINDING_POWER[self._kind()]:
+            left = self._led(self._advance(), left)
+        return left
+
+    def _nud(self, token: Token) -> Query:
+        kind, value, _ = token
+        if kind == "identifier":
+            return _named_path((value,))
+        if kind == "quoted":
+            if self._kind() == "lparen":
+                raise QueryError("Quoted identifiers cannot be used as function names")
+            return _named_path((value,))
+        if kind == "literal":
+            return _literal(value)
+        if kind == "current":
+            return _identity
+        if kind == "star":
+            return _value_projection(_identity, self._projection_rhs(_BINDING_POWER["star"]))
+        if kind == "filter":
+            return self._filter(_identity)
+        if kind == "flatten":
+            return _projection(
+                _flatten(_identity), self._projection_rhs(_BINDING_POWER["flatten"])
+            )
+        if kind == "lbrace":
+            return self._multi_select_hash()
+        if kind == "lparen":
+            query = self._expression(0)
+            self._match("rparen")
+            return query
+        if kind == "not":
+            return _not(self._expression(_BINDING_POWER["not"]))
+        if kind == "expref":
+            return _expref(self._expression(_BINDING_POWER["expref"]))
+        if kind == "lbracket":
+            if self._kind() in ("number", "colon"):
+                return self._project_if_slice(_identity, self._index_expression())
+            if self._kind() == "star" and self._kind(1) == "rbracket":
+                self._advance()
+                self._advance()
+                return _projection(_identity, self._projection_rhs(_BINDING_POWER["star"]))
+            return self._multi_select_list()
+        self.position -= 1
+        self._unexpected()
+        raise AssertionError("unreachable")
+
+    def _led(self, token: Token, left: Query) -> Query:
+        kind = token[0]
+        if kind == "dot":
+            if self._kind() == "star":
+                self._advance()
+                return _value_projection(left, self._projection_rhs(_BINDING_POWER["dot"]))
+            return _subexpression(left, self._dot_rhs(_BINDING_POWER["dot"]))
+        if kind == "pipe":
+            return _pipe(left, self._expression(_BINDING_POWER["pipe"]))
+        if kind == "or":
+            return _or(left, self._expression(_BINDING_POWER["or"]))
+        if kind == "and":
+            return _and(left, self._expression(_BINDING_POWER["and"]))
+        if kind in _ORDERING or kind in ("==", "!="):
+            return _comparator(kind, left, self._expression(_BINDING_POWER[kind]))
+        if kind == "flatten":
+            return _projection(_flatten(left), self._projection_rhs(_BINDING_POWER["flatten"]))
+        if kind == "filter":
+            return self._filter(left)
+        if kind == "lparen":
+            names = getattr(left, "names", None)
+            if names is None or len(names) != 1:
+                raise QueryError("Function calls must start with a function name")
+            return _function(names[0], self._arguments())
+        if kind == "lbracket":
+            if self._kind() in ("number", "colon"):
+                return self._project_if_slice(left, self._index_expression())
+            self._match("star")
+            self._match("rbracket")
+            return _projection(left, self._projection_rhs(_BINDING_POWER["star"]))
+        self.position -= 1
+        self._unexpected()
+        raise AssertionError("unreachable")
+
+    # grammar pieces
+
+    def _filter(self, left: Query) -> Query:
+        condition = self._expression(0)
+        self._match("rbracket")
+        if self._kind() == "flatten":
+            right = _identity
+        else:
+            right = self._projection_rhs(_BINDING_POWER["filter"])
+        return _filter_projection(left, condition, right)
+
+    def _index_expression(self) -> tuple[str, Query]:
+        if self._kind() == "number" and self._kind(1) == "rbracket":
+            position = self._advance()[1]
+            self._match("rbracket")
+            return "index", _index(position)
+        parts: list[int | None] = [None, None, None]
+        slot = 0
+        while self._kind() != "rbracket" and slot < 3:
+            if self._kind() == "colon":
+                slot += 1
+                self._advance()
+            elif self._kind() == "number":
+                parts[slot] = self._advance()[1]
+            else:
+                self._unexpected("number or ':'")
+        self._match("rbracket")
+        return "slice", _slice(*parts)
+
+    def _project_if_slice(self, left: Query, index: tuple[str, Query]) -> Query:
+        kind, query = index
+        if kind == "index":
+            return _subexpression(left, query)
+        return _projection(
+            _subexpression(left, query), self._projection_rhs(_BINDING_POWER["star"])
+        )
+
+    def _projection_rhs(self, binding_power: int) -> Query:
+        kind = self._kind()
+        if _BINDING_POWER[kind] < _PROJECTION_STOP:
+            return _identity
+        if kind in ("lbracket", "filter"):
+            return self._expression(binding_power)
+        if kind == "dot":
+            self._advance()
+            return self._dot_rhs(binding_power)
+        self._unexpected()
+        raise AssertionError("unreachable")
+
+    def _dot_rhs(self, binding_power: int) -> Query:
+        kind = self._kind()
+        if kind in ("identifier", "quoted", "star"):
+            return self._expression(binding_power)
+        if kind == "lbracket":
+            self._advance()
+            return self._multi_select_list()
+        if kind == "lbrace":
+            self._advance()
+            return self._multi_select_hash()
+        self._unexpected("identifier, '[' or '{'")
+        raise AssertionError("unreachable")
+
+    def _multi_select_list(self) -> Query:
+        items = [self._expression(0)]
+        while self._kind() == "comma":
+            self._advance()
+            items.append(self._expression(0))
+        self._match("rbracket")
+        return _multi_select_list(items)
+
+    def _multi_select_hash(self) -> Query:
+        pairs: list[tuple[str, Query]] = []
+        while True:
+            if self._kind() not in ("identifier", "quoted"):
+                self._unexpected("key name")
+            key = self._advance()[1]
+            self._match("colon")
+            pairs.append((key, self._expression(0)))
+            if self._kind() != "comma":
+                break
+            self._advance()
+        self._match("rbrace")
+        return _multi_select_hash(pairs)
+
+    def _arguments(self) -> list[Query]:
+        arguments: list[Query] = []
+        while self._kind() != "rparen":
+            arguments.append(self._expression(0))
+            if self._kind() == "comma":
+                self._advance()
+            elif self._kind() != "rparen":
+                self._unexpected("',' or ')'")
+        self._advance()
+        return arguments
+
+
+@lru_cache(maxsize=512)
+def compile_query(source: str) -> Query:
+    """Parse a query into a reusable callable. Compiled queries are cached by source."""
+    if not source.strip():
+        return _identity
+    return _Parser(source).parse()
+
+
+def search(source: str, value: Any) -> Any:
+    """Evaluate `source` against `value`."""
+    return compile_query(source)(value)
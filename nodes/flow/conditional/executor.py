@@ -82,6 +82,9 @@ def _evaluate(
 
 class ConditionalExecutor:
     node_type = "conditional"
+    cacheable = True
+    foldable = True
+    routes_input = "input"
 
     async def execute(
         self, data: dict[str, Any], inputs: dict[str, DataValue], context: FlowContext
@@ -24,6 +24,9 @@ def _parse_index(handle_id: str) -> int | None:
 
 class MergeExecutor:
     node_type = "merge"
+    cacheable = True
+    foldable = True
+    cpu_bound = True
 
     async def execute(
         self, data: dict[str, Any], inputs: dict[str, DataValue], context: FlowContext
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from nodes._types import DataValue, ExecutionResult, FlowContext
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent, ValueStream
 
 
 def _infer_socket_type(data: dict[str, Any]) -> str:
@@ -16,11 +16,39 @@ def _infer_socket_type(data: dict[str, Any]) -> str:
 
 class RerouteExecutor:
     node_type = "reroute"
+    passthrough_input = "input"
+    link_cache_scopes = ()
+    stream_output_handle = "output"
+    accepts_streams = True
 
-    async def execute(
+    def execute(
         self, data: dict[str, Any], inputs: dict[str, DataValue], context: FlowContext
-    ) -> ExecutionResult:
+    ):
         value = inputs.get("input")
+        if value is not None and isinstance(value.value, ValueStream):
+            return self._forward_stream(value.value, context)
+        return self._pass_through(data, value)
+
+    async def _forward_stream(self, stream: ValueStream, context: FlowContext):
+        """Forward upstream chunks to our own consumers, then the settled value.
+
+        Chunks are tagged `forwarded` so the run does not surface them a second
+        time; the producer's own progress events already reached the caller.
+        """
+        async for chunk in stream:
+            yield NodeEvent(
+                node_id=context.node_id,
+                node_type=self.node_type,
+                event_type="progress",
+                run_id=context.run_id,
+                data={"token": chunk, "forwarded": True},
+            )
+        final = await stream.result()
+        yield ExecutionResult(outputs={"output": final} if final is not None else {})
+
+    async def _pass_through(
+        self, data: dict[str, Any], value: DataValue | None
+    ) -> ExecutionResult:
         if value is not None:
             return ExecutionResult(outputs={"output": value})
 
@@ -16,6 +16,7 @@ import { conditional } from './flow/conditional/definition';
 import { merge } from './flow/merge/definition';
 import { reroute } from './flow/reroute/definition';
 import { code } from './data/code/definition';
+import { transform } from './data/transform/definition';
 import { modelSelector } from './utility/model_selector/definition';
 
 function createHookId(): string {
@@ -111,6 +112,11 @@ const BUILTIN_NODE_ENTRIES: readonly NodeEntry[] = [
     definitionPath: 'nodes/data/code/definition.ts',
     executorPath: 'nodes/data/code/executor.py',
   },
+  {
+    type: 'transform',
+    definitionPath: 'nodes/data/transform/definition.ts',
+    executorPath: 'nodes/data/transform/executor.py',
+  },
   {
     type: 'model-selector',
     definitionPath: 'nodes/utility/model_selector/definition.ts',
@@ -132,6 +138,7 @@ const BUILTIN_DEFINITIONS: readonly NodeDefinition[] = [
   mcpServer,
   toolset,
   code,
+  transform,
   modelSelector,
 ];
 
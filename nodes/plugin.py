@@ -16,6 +16,7 @@ from nodes.core.droid_agent.executor import executor as droid_agent_executor
 from nodes.core.webhook_end.executor import executor as webhook_end_executor
 from nodes.core.webhook_trigger.executor import executor as webhook_trigger_executor
 from nodes.data.code.executor import executor as code_executor
+from nodes.data.transform.executor import executor as transform_executor
 from nodes.flow.conditional.executor import executor as conditional_executor
 from nodes.flow.merge.executor import executor as merge_executor
 from nodes.flow.reroute.executor import executor as reroute_executor
@@ -37,6 +38,7 @@ BUILTIN_EXECUTOR_MODULES: dict[str, str] = {
     "mcp-server": "nodes.tools.mcp_server.executor",
     "toolset": "nodes.tools.toolset.executor",
     "code": "nodes.data.code.executor",
+    "transform": "nodes.data.transform.executor",
     "model-selector": "nodes.utility.model_selector.executor",
 }
 
@@ -54,6 +56,7 @@ BUILTIN_EXECUTORS = {
     mcp_server_executor.node_type: mcp_server_executor,
     toolset_executor.node_type: toolset_executor,
     code_executor.node_type: code_executor,
+    transform_executor.node_type: transform_executor,
     model_selector_executor.node_type: model_selector_executor,
 }
 
@@ -9,6 +9,7 @@ from nodes._types import FlowContext
 
 class ToolsetExecutor:
     node_type = "toolset"
+    link_cache_scopes = ("tools", "mcp")
 
     def _tag_tools(self, tools: list[Any], context: FlowContext) -> list[Any]:
         tagged: list[Any] = []
@@ -9,6 +9,8 @@ from nodes._types import DataValue, ExecutionResult, FlowContext
 
 class ModelSelectorExecutor:
     node_type = "model-selector"
+    cacheable = True
+    link_cache_scopes = ()
 
     async def materialize(
         self,
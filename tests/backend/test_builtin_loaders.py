@@ -25,7 +25,7 @@ def _isolate_loaders() -> Iterator[None]:
     options_registry._loaders.update(saved)
 
 
-async def _empty_batches() -> AsyncIterator[tuple[str, list[dict[str, Any]], bool]]:
+async def _empty_batches(**_kwargs: Any) -> AsyncIterator[tuple[str, list[dict[str, Any]], bool]]:
     if False:
         yield ("", [], True)
 
@@ -56,7 +56,7 @@ class TestListModels:
             ], True),
         ]
 
-        async def stream() -> AsyncIterator[tuple[str, list[dict[str, Any]], bool]]:
+        async def stream(**_kwargs: Any) -> AsyncIterator[tuple[str, list[dict[str, Any]], bool]]:
             async for item in _fixed_batches(payload):
                 yield item
 
@@ -80,7 +80,7 @@ class TestListModels:
             True,
         )]
 
-        async def stream() -> AsyncIterator[tuple[str, list[dict[str, Any]], bool]]:
+        async def stream(**_kwargs: Any) -> AsyncIterator[tuple[str, list[dict[str, Any]], bool]]:
             async for item in _fixed_batches(payload):
                 yield item
 
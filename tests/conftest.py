@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 import uuid
 from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass, field
@@ -13,6 +14,8 @@ from agno.models.base import Model
 from agno.models.response import ModelResponse
 
 import nodes
+from backend.services.flows.flow_plan import clear_flow_plan_cache
+from backend.services.flows.link_artifact_cache import invalidate_link_artifacts
 from backend.services.plugins.plugin_registry import _DEFAULT_PLUGIN_REGISTRY
 from backend.services.renderers.registry import register_builtin_renderers
 from backend.services.streaming import run_control
@@ -20,6 +23,23 @@ from backend.services.streaming import run_control
 nodes.init(_DEFAULT_PLUGIN_REGISTRY)
 register_builtin_renderers()
 
+BENCHMARKS_ENV = "COVALT_RUN_BENCHMARKS"
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", f"benchmark: wall-clock comparison, only run when {BENCHMARKS_ENV}=1"
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if os.environ.get(BENCHMARKS_ENV) == "1":
+        return
+    skip = pytest.mark.skip(reason=f"benchmark; set {BENCHMARKS_ENV}=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
 
 @dataclass
 class MockModel(Model):
@@ -125,6 +145,15 @@ def _reset_run_control_state() -> Iterator[None]:
     run_control.reset_state()
 
 
+@pytest.fixture(autouse=True)
+def _reset_flow_plan_cache() -> Iterator[None]:
+    clear_flow_plan_cache()
+    invalidate_link_artifacts()
+    yield
+    clear_flow_plan_cache()
+    invalidate_link_artifacts()
+
+
 
 async def collect_events(async_gen: AsyncIterator[Any]) -> tuple[list[Any], Any | None]:
     """Drain an async generator, separating intermediate events from a final result.
@@ -69,7 +69,7 @@ async def test_fetch_models_uses_anthropic_headers() -> None:
             return_value=("sk-test", None),
         ),
         patch(
-            "backend.providers.adapters.anthropic_compatible.httpx.AsyncClient",
+            "backend.services.http_clients.httpx.AsyncClient",
             return_value=mock_client,
         ),
     ):
@@ -119,7 +119,7 @@ async def test_test_connection_success() -> None:
             return_value=("sk-test", None),
         ),
         patch(
-            "backend.providers.adapters.anthropic_compatible.httpx.AsyncClient",
+            "backend.services.http_clients.httpx.AsyncClient",
             return_value=mock_client,
         ),
     ):
@@ -13,7 +13,7 @@ from backend.runtime.types import ContentDelta, RunCompleted, ToolCallStarted
 from backend.services.flows.graph_runtime import GraphRuntime
 from nodes import get_executor
 from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
-from nodes.data.code import executor as code_executor_module
+from nodes.data.code import sandbox as code_sandbox
 from tests.conftest import collect_events, make_edge, make_graph, make_node
 
 TARGET_NODE_MANIFEST_PATHS: dict[str, tuple[str, str]] = {
@@ -29,6 +29,10 @@ TARGET_NODE_MANIFEST_PATHS: dict[str, tuple[str, str]] = {
         "nodes/data/code/definition.ts",
         "nodes/data/code/executor.py",
     ),
+    "transform": (
+        "nodes/data/transform/definition.ts",
+        "nodes/data/transform/executor.py",
+    ),
     "model-selector": (
         "nodes/utility/model_selector/definition.ts",
         "nodes/utility/model_selector/executor.py",
@@ -255,7 +259,7 @@ async def test_code_node_blank_code_returns_input_unchanged() -> None:
 
 
 @pytest.mark.asyncio
-@pytest.mark.skipif(code_executor_module.quickjs is None, reason="quickjs is not installed")
+@pytest.mark.skipif(code_sandbox.quickjs is None, reason="quickjs is not installed")
 async def test_code_node_executes_javascript_with_input_trigger_and_node_helpers() -> None:
     executor = get_executor("code")
     assert executor is not None
@@ -291,7 +295,7 @@ async def test_code_node_executes_javascript_with_input_trigger_and_node_helpers
 
 
 @pytest.mark.asyncio
-@pytest.mark.skipif(code_executor_module.quickjs is None, reason="quickjs is not installed")
+@pytest.mark.skipif(code_sandbox.quickjs is None, reason="quickjs is not installed")
 async def test_code_node_returns_json_safe_output() -> None:
     executor = get_executor("code")
     assert executor is not None
@@ -0,0 +1,199 @@
+"""Sandboxed code node execution: limits, cancellation, loop latency and script caching."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from nodes._types import DataValue, FlowContext
+from nodes.data.code import sandbox
+from nodes.data.code.executor import CodeExecutor
+from nodes.data.code.sandbox import (
+    CodeCancelled,
+    CodeLimitError,
+    CodeLimits,
+    CodeSandbox,
+    ScriptCache,
+)
+
+pytestmark = pytest.mark.skipif(sandbox.quickjs is None, reason="quickjs is not installed")
+
+SPIN = "while (true) {}"
+
+
+def _sandbox(**limits) -> CodeSandbox:
+    return CodeSandbox(2, CodeLimits(**limits))
+
+
+async def _run(box: CodeSandbox, code: str, **kwargs) -> object:
+    return await box.run(
+        code,
+        input_value=kwargs.pop("input_value", {"n": 2}),
+        trigger_value=None,
+        upstream_outputs=kwargs.pop("upstream_outputs", {}),
+        **kwargs,
+    )
+
+
+async def test_scripts_read_input_and_upstream_nodes_and_workers_are_reused():
+    box = _sandbox()
+    try:
+        assert await _run(box, "return $input.n * 21") == 42
+        assert await _run(
+            box, "return $('Fetch').item.json.rows.length", upstream_outputs={"Fetch": {"rows": [1, 2]}}
+        ) == 2
+        results = await asyncio.gather(*(_run(box, f"return {i}") for i in range(10)))
+        assert results == list(range(10))
+        assert len({thread.name for thread in box._pool._threads}) == 2
+    finally:
+        box.shutdown()
+
+
+@pytest.mark.parametrize(
+    ("code", "limits", "message"),
+    [
+        (SPIN, {"time_limit_s": 0.1}, "0.1s time limit"),
+        ("const a = []; while (true) a.push('x'.repeat(1024));", {"memory_limit_bytes": 8 << 20}, "8 MB memory limit"),
+        ("return 'x'.repeat(2048)", {"output_limit_bytes": 1024}, "the limit is 1024"),
+    ],
+)
+async def test_limit_breaches_are_clean_errors_and_the_worker_survives(code, limits, message):
+    box = _sandbox(**limits)
+    try:
+        with pytest.raises(CodeLimitError, match=message):
+            await _run(box, code)
+        assert await _run(box, "return 'still alive'") == "still alive"
+    finally:
+        box.shutdown()
+
+
+async def test_runaway_script_is_cancelled_without_blocking_the_loop():
+    box = _sandbox(time_limit_s=5)
+    ticks = 0
+
+    def cancelled() -> bool:
+        return ticks >= 5
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while ticks < 5:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    try:
+        ticking = asyncio.create_task(ticker())
+        with pytest.raises(CodeCancelled):
+            await _run(box, SPIN, is_cancelled=cancelled)
+        assert ticking.done()
+    finally:
+        box.shutdown()
+
+
+@pytest.mark.benchmark
+async def test_runaway_script_does_not_stall_the_loop_and_can_be_cancelled():
+    box = _sandbox(time_limit_s=1)
+    cancelled = False
+    gaps: list[float] = []
+
+    async def ticker() -> None:
+        nonlocal cancelled
+        last = time.perf_counter()
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+        cancelled = True
+
+    try:
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        with pytest.raises(CodeCancelled):
+            await _run(box, SPIN, is_cancelled=lambda: cancelled)
+        await ticking
+        assert time.perf_counter() - started < 0.8
+        assert max(gaps) < 0.1
+    finally:
+        box.shutdown()
+
+
+async def test_code_node_stops_when_the_run_is_cancelled(monkeypatch):
+    box = _sandbox(time_limit_s=2)
+    monkeypatch.setattr(sandbox, "_sandbox", box)
+    execution = SimpleNamespace(stop_run=False)
+    context = FlowContext(
+        node_id="code",
+        chat_id=None,
+        run_id="run",
+        state=None,
+        runtime=None,
+        services=SimpleNamespace(execution=execution),
+    )
+    asyncio.get_running_loop().call_later(0.1, setattr, execution, "stop_run", True)
+
+    try:
+        with pytest.raises(CodeCancelled):
+            await CodeExecutor().execute({"code": SPIN}, {"input": DataValue("data", {})}, context)
+    finally:
+        box.shutdown()
+
+
+async def test_scripts_compile_once_and_hot_scripts_are_precompiled_after_restart(tmp_path):
+    script = "let total = 0; for (const item of $input.items) total += item; return total"
+    cache = ScriptCache(tmp_path)
+    box = CodeSandbox(1, CodeLimits(), cache)
+    try:
+        for _ in range(20):
+            assert await _run(box, script, input_value={"items": [1, 2, 3]}) == 6
+    finally:
+        box.shutdown()
+
+    assert cache.stats() == {"hits": 19, "misses": 1, "warmed": 0, "scripts": 1}
+    assert (tmp_path / "scripts.json").exists()
+
+    restarted_cache = ScriptCache(tmp_path)
+    restarted = CodeSandbox(1, CodeLimits(), restarted_cache)
+    try:
+        assert await _run(restarted, script, input_value={"items": [4]}) == 4
+    finally:
+        restarted.shutdown()
+
+    assert restarted_cache.stats() == {"hits": 1, "misses": 0, "warmed": 1, "scripts": 1}
+
+
+
+async def test_scripts_cannot_leave_state_for_later_runs():
+    box = CodeSandbox(1, CodeLimits())
+    try:
+        leaks = [
+            "globalThis.leak = $input.token; return 1",
+            "implicitLeak = $input.token; return 1",
+            "Array.prototype.map = () => $input.token; return 1",
+            "Object.prototype.polluted = $input.token; return 1",
+            "const seen = arguments.callee.leak; arguments.callee.leak = $input.token; return seen ?? 1",
+        ]
+        for code in leaks:
+            await _run(box, code, input_value={"token": "secret"})
+
+        assert await _run(
+            box,
+            "return [typeof leak, typeof implicitLeak, [1, 2].map(x => x * 2), ({}).polluted]",
+        ) == ["undefined", "undefined", [2, 4], None]
+        assert await _run(box, leaks[-1], input_value={"token": "again"}) == 1
+
+        error = "const e = new Error('a'); e.message = 'b'; e.name = 'Custom'; return String(e)"
+        assert await _run(box, error) == "Custom: b"
+    finally:
+        box.shutdown()
+
+
+async def test_a_context_whose_globals_cannot_be_reset_is_replaced():
+    box = CodeSandbox(1, CodeLimits())
+    try:
+        await _run(box, "Object.defineProperty(globalThis, 'pinned', { value: 1 }); return 1")
+        assert await _run(box, "return typeof pinned") == "undefined"
+    finally:
+        box.shutdown()
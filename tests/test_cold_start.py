@@ -0,0 +1,130 @@
+"""Backend cold start: lazy provider loading, import-time budget and time-to-ready.
+
+Each check runs in a fresh interpreter, since the test session itself has
+long since imported litellm and every provider module.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_BUDGET_SECONDS = 5.0
+READY_BUDGET_SECONDS = 6.0
+DEFERRED_MODULES = ("litellm", "openai", "mcp", "agno.models.litellm", "agno.models.openai")
+
+COLD_START = """
+import sys, time
+
+started = time.perf_counter()
+import nodes
+from backend.services.plugins.plugin_registry import _DEFAULT_PLUGIN_REGISTRY
+nodes.init(_DEFAULT_PLUGIN_REGISTRY)
+import backend.commands
+from backend.db import init_database
+from backend.services.node_providers.node_provider_registry import reload_node_provider_registry
+from backend.services.node_providers.node_route_index import rebuild_node_route_index
+from backend.services.renderers.registry import register_builtin_renderers
+from backend.services.variables.builtin_loaders import register_builtin_loaders
+imported = time.perf_counter()
+
+init_database()
+rebuild_node_route_index()
+reload_node_provider_registry()
+register_builtin_loaders()
+register_builtin_renderers()
+ready = time.perf_counter()
+
+from backend import providers
+loaded_at_ready = [name for name in DEFERRED_MODULES if name in sys.modules]
+provider_modules_at_ready = sorted(
+    name for name in sys.modules if name.startswith("backend.providers.") and not name.startswith("backend.providers._")
+)
+providers.preload_provider("openai")
+print(json.dumps({
+    "import_seconds": imported - started,
+    "ready_seconds": ready - started,
+    "loaded_at_ready": loaded_at_ready,
+    "provider_modules_at_ready": provider_modules_at_ready,
+    "provider_count": len(providers.PROVIDERS),
+    "litellm_after_use": "litellm" in sys.modules,
+    "openai_provider_after_use": "backend.providers.openai" in sys.modules,
+}))
+"""
+
+DEFAULT_PROVIDER_PRELOAD = """
+import sys
+
+from backend import db
+from backend.services.models.model_selection import preload_default_provider
+
+db.init_database()
+with db.db_session() as sess:
+    db.set_model_selection_state(sess, {"model_key": "claude:claude-sonnet-4"})
+    sess.commit()
+
+print(json.dumps({
+    "before": "backend.providers.anthropic" in sys.modules,
+    "preloaded": preload_default_provider(),
+    "after": "backend.providers.anthropic" in sys.modules,
+    "litellm": "litellm" in sys.modules,
+}))
+"""
+
+
+def _run(script: str, tmp_path: Path) -> dict:
+    env = {
+        **os.environ,
+        "USER_DATA_DIR": str(tmp_path),
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+        "PYTHONPATH": str(REPO_ROOT),
+    }
+    prelude = f"import json\nDEFERRED_MODULES = {DEFERRED_MODULES!r}\n"
+    result = subprocess.run(
+        [sys.executable, "-c", prelude + script],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+    return orjson.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_backend_starts_without_loading_provider_sdks(tmp_path):
+    report = _run(COLD_START, tmp_path)
+
+    assert report["loaded_at_ready"] == []
+    assert report["provider_modules_at_ready"] == [
+        "backend.providers.adapters",
+        "backend.providers.adapters.anthropic_compatible",
+        "backend.providers.adapters.openai_compatible",
+        "backend.providers.openai_like",
+        "backend.providers.options",
+    ]
+    assert report["provider_count"] > 50
+
+    assert report["openai_provider_after_use"]
+    assert report["litellm_after_use"]
+
+
+@pytest.mark.benchmark
+def test_backend_starts_within_budget(tmp_path):
+    report = _run(COLD_START, tmp_path)
+
+    assert report["import_seconds"] < IMPORT_BUDGET_SECONDS
+    assert report["ready_seconds"] < READY_BUDGET_SECONDS
+
+
+def test_default_provider_preload_imports_only_that_provider(tmp_path):
+    report = _run(DEFAULT_PROVIDER_PRELOAD, tmp_path)
+
+    assert report == {"before": False, "preloaded": "claude", "after": True, "litellm": True}
@@ -0,0 +1,247 @@
+"""Cached template parsing, compiled expressions and the pooled QuickJS context."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from nodes import _expressions
+from nodes._expressions import (
+    ExpressionRefs,
+    _parse_template,
+    _Placeholder,
+    _Scope,
+    analyze_expressions,
+    resolve_expressions,
+)
+from nodes._types import DataValue
+
+pytestmark = pytest.mark.skipif(_expressions.quickjs is None, reason="quickjs is not installed")
+
+PLACEHOLDERS = 20
+
+
+def _resolve(data: dict, value: dict | None = None, outputs: dict | None = None) -> dict:
+    return resolve_expressions(
+        data,
+        DataValue("data", value) if value is not None else None,
+        outputs or {},
+        expression_context={"trigger": {"message": "hi", "user": {"id": 7}}},
+    )
+
+
+def _template() -> dict:
+    return {
+        "prompt": " ".join(f"{{{{ $input.items[{i}].name }}}}" for i in range(PLACEHOLDERS)),
+    }
+
+
+def _items() -> dict:
+    return {"items": [{"name": f"n{i}"} for i in range(PLACEHOLDERS)]}
+
+
+def _fresh_context_eval(expression: str, value: dict) -> object:
+    """The previous evaluator: a new context and JSON round trip per expression."""
+    ctx = _expressions.quickjs.Context()
+    input_json = json.dumps(value)
+    trigger_json = json.dumps({"message": "hi"})
+    ctx.add_callable("__get_input_json", lambda: input_json)
+    ctx.add_callable("__get_trigger_json", lambda: trigger_json)
+    ctx.eval(
+        "const $input = JSON.parse(__get_input_json());"
+        "const input = $input;"
+        "const $trigger = JSON.parse(__get_trigger_json());"
+    )
+    return ctx.eval(expression)
+
+
+def test_expressions_resolve_with_their_previous_semantics():
+    resolved = _resolve(
+        {
+            "whole": "{{ $input.count + 1 }}",
+            "text": "Hi {{ $trigger.message }} #{{ $trigger.user.id }} {{ name }}",
+            "list": "{{ $input.tags.map(t => t.toUpperCase()) }}",
+            "node": "{{ $('Fetch').item.json.status }}",
+            "missing": "{{ $('Nope').item.json.status }}",
+            "script": "{{ const n = 2; n * $input.count }}",
+            "broken": "{{ $input.nope.deeper }}",
+            "nested": [{"deep": "{{ input.count }}"}],
+        },
+        {"count": 3, "tags": ["a", "b"]},
+        {"Fetch": {"status": 200}},
+    )
+
+    assert resolved == {
+        "whole": 4,
+        "text": "Hi hi #7 {{ name }}",
+        "list": ["A", "B"],
+        "node": 200,
+        "missing": "",
+        "script": 6,
+        "broken": "",
+        "nested": [{"deep": 3}],
+    }
+
+
+def test_templates_are_parsed_once_and_runaway_expressions_are_interrupted(monkeypatch):
+    monkeypatch.setattr(_expressions, "_JS_TIME_LIMIT_SECONDS", 0.05)
+    monkeypatch.setattr(_expressions._runtimes, "runtime", None, raising=False)
+    _parse_template.cache_clear()
+
+    for _ in range(3):
+        _resolve(_template(), _items())
+    assert _parse_template.cache_info().misses == 1
+
+    assert _resolve({"spin": "{{ (() => { while (true) {} })() }}"}, {}) == {"spin": ""}
+    assert _resolve({"ok": "{{ $input.n }}"}, {"n": 1}) == {"ok": 1}
+
+
+def test_expressions_cannot_leave_state_for_other_flows():
+    leaked = _resolve(
+        {
+            "implicit": "{{ secret = $input.token; 1 }}",
+            "explicit": "{{ globalThis.secret = $input.token; 1 }}",
+            "prototype": "{{ Array.prototype.map = () => $input.token; 1 }}",
+        },
+        {"token": "s3cret"},
+    )
+    assert leaked == {"implicit": "", "explicit": 1, "prototype": ""}
+
+    assert _resolve(
+        {"global": "{{ typeof secret }}", "map": "{{ [1, 2].map(x => x * 2) }}"},
+        {},
+    ) == {"global": "undefined", "map": [2, 4]}
+
+
+def test_one_context_and_compiled_function_serve_every_resolve(monkeypatch):
+    monkeypatch.setattr(_expressions._runtimes, "runtime", None, raising=False)
+    data = {"sum": "{{ $input.n + 1 }}"}
+
+    assert _resolve(data, {"n": 1}) == {"sum": 2}
+    runtime = _expressions._get_runtime()
+    compiled = runtime.compile("$input.n + 1")
+
+    assert _resolve(data, {"n": 2}) == {"sum": 3}
+    assert _expressions._get_runtime() is runtime
+    assert runtime.compile("$input.n + 1") is compiled
+    assert list(runtime._compiled) == ["$input.n + 1"]
+
+
+@pytest.mark.benchmark
+def test_per_expression_cost_beats_a_fresh_context_per_expression():
+    expected = " ".join(f"n{i}" for i in range(PLACEHOLDERS))
+    assert _resolve(_template(), _items())["prompt"] == expected
+
+    rounds = 10
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for i in range(PLACEHOLDERS):
+            _fresh_context_eval(f"$input.items[{i}].name", _items())
+    before = (time.perf_counter() - started) / (rounds * PLACEHOLDERS)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        _resolve(_template(), _items())
+    after = (time.perf_counter() - started) / (rounds * PLACEHOLDERS)
+
+    assert after * 5 < before
+
+
+PATHS = [
+    "$input.message",
+    "input.items[0].name",
+    "$input.items[1]",
+    "$input.items[5]",
+    "$input.items.length",
+    "$input.message[1]",
+    "$input['odd key']",
+    "$input.ratio",
+    "$input.missing",
+    "$input.missing.deeper",
+    "$input.nothing.deeper",
+    "$trigger.body.user.id",
+    "$trigger",
+    "$('Fetch').item.json.rows[0]",
+    "$(\"Nope\").item.json",
+]
+
+
+@pytest.mark.parametrize("expression", PATHS)
+def test_path_expressions_match_the_javascript_result(expression):
+    scope = _Scope(
+        DataValue(
+            "data",
+            {
+                "message": "hello",
+                "items": [{"name": "a"}, {"name": "b"}],
+                "odd key": 1,
+                "ratio": 2.0,
+                "nothing": None,
+            },
+        ),
+        {"Fetch": {"rows": [{"id": 1}]}},
+        {"trigger": {"body": {"user": {"id": 42}}}},
+    )
+    placeholder = _parse_template(f"{{{{ {expression} }}}}")
+
+    assert placeholder.path is not None
+    assert scope.evaluate(placeholder) == scope.evaluate(_Placeholder(expression))
+
+
+def test_only_real_logic_reaches_quickjs(monkeypatch):
+    def _no_js():
+        raise AssertionError("QuickJS used for a path expression")
+
+    monkeypatch.setattr(_expressions, "_get_runtime", _no_js)
+
+    assert _resolve({"a": "{{ $trigger.user.id }}: {{ $input.items[0].name }}"}, _items()) == {
+        "a": "7: n0"
+    }
+    for expression in ("$input.items.map(i => i.name)", "$input.a || 'x'", "$input.toString"):
+        assert _parse_template(f"{{{{ {expression} }}}}").path is None
+
+
+def test_analysis_records_the_paths_javascript_expressions_read():
+    refs = analyze_expressions(
+        {
+            "a": "{{ $trigger.body.user.id + 1 }} {{ $input.items.map(i => i.name) }}",
+            "b": ["{{ $('Fetch').item.json.rows[0].id * 2 }}", "{{ $input.plain }}"],
+        }
+    )
+
+    assert refs == ExpressionRefs(
+        input=(("items", "map"),),
+        trigger=(("body", "user", "id"),),
+        nodes={"Fetch": (("rows", 0, "id"),)},
+    )
+    assert analyze_expressions({"a": "{{ $input.a }}", "b": "plain"}) == ExpressionRefs()
+    whole = analyze_expressions({"a": "{{ JSON.stringify({...$input}) }}", "b": "{{ $(name).item }}"})
+    assert whole.input is None and whole.nodes is None
+
+
+def test_only_referenced_sub_objects_are_marshalled(monkeypatch):
+    marshalled: list[int] = []
+    dumps = _expressions._json_dumps_safe
+
+    def _recording_dumps(value):
+        raw = dumps(value)
+        marshalled.append(len(raw))
+        return raw
+
+    monkeypatch.setattr(_expressions, "_json_dumps_safe", _recording_dumps)
+    trigger = {"body": {"user": {"id": 41}, "blob": "x" * 1_000_000}}
+    data = {"id": "{{ $trigger.body.user.id + 1 }}", "rows": "{{ $('Fetch').item.json.rows.length }}"}
+    outputs = {"Fetch": {"rows": [1, 2, 3]}, "Huge": {"blob": "y" * 1_000_000}}
+
+    resolved = resolve_expressions(
+        data, None, outputs, expression_context={"trigger": trigger}, refs=analyze_expressions(data)
+    )
+
+    assert resolved == {"id": 42, "rows": 3}
+    assert max(marshalled) < 100
+
+    marshalled.clear()
+    assert resolve_expressions(data, None, outputs, expression_context={"trigger": trigger}) == resolved
+    assert max(marshalled) > 1_000_000
@@ -0,0 +1,185 @@
+"""Batch flow execution over NDJSON/CSV datasets."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+
+import orjson
+import pytest
+
+from backend.services.flows.flow_batch import (
+    BatchRunHandle,
+    load_completed_indexes,
+    read_batch_items,
+    run_flow_batch,
+)
+from backend.services.flows.flow_executor import run_flow
+from nodes._types import DataValue, ExecutionResult, FlowContext
+from tests.conftest import make_edge, make_graph, make_node
+
+
+class TriggerExecutor:
+    node_type = "webhook-trigger"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", context.services.webhook["body"])})
+
+
+class ModelExecutor:
+    node_type = "model"
+
+    def __init__(self) -> None:
+        self.materialized = 0
+
+    async def materialize(self, data: dict, output_handle: str, context: FlowContext):
+        self.materialized += 1
+        return "shared-model"
+
+
+class ScoreExecutor:
+    node_type = "score"
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.001)
+            row = inputs["input"].value
+            if row.get("fail"):
+                raise RuntimeError(f"bad row {row['n']}")
+            models = await context.runtime.resolve_links(context.node_id, "model")
+            return ExecutionResult(
+                outputs={"output": DataValue("data", {"n": int(row["n"]) * 2, "model": models[0]})}
+            )
+        finally:
+            self.running -= 1
+
+
+def _graph() -> dict:
+    link = make_edge("model", "score", "output", "model")
+    link["data"]["channel"] = "link"
+    return make_graph(
+        nodes=[make_node("trigger", "webhook-trigger"), make_node("model", "model"), make_node("score", "score")],
+        edges=[make_edge("trigger", "score"), link],
+    )
+
+
+def _records(path) -> list[dict]:
+    return [orjson.loads(line) for line in path.read_bytes().splitlines()]
+
+
+@pytest.fixture
+def executors():
+    return {"webhook-trigger": TriggerExecutor(), "model": ModelExecutor(), "score": ScoreExecutor()}
+
+
+def test_read_batch_items_supports_csv_and_isolates_bad_ndjson(tmp_path):
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text("n,name\n1,a\n2,b\n")
+    ndjson_path = tmp_path / "rows.ndjson"
+    ndjson_path.write_text('{"n": 1}\n\nnot json\n{"n": 3}\n')
+
+    assert list(read_batch_items(csv_path)) == [(0, {"n": "1", "name": "a"}), (1, {"n": "2", "name": "b"})]
+    items = list(read_batch_items(ndjson_path))
+    assert [index for index, _ in items] == [0, 1, 2]
+    assert isinstance(items[1][1], ValueError)
+
+
+def test_load_completed_indexes_drops_torn_tail(tmp_path):
+    output = tmp_path / "out.ndjson"
+    output.write_bytes(b'{"index": 0, "status": "completed"}\n{"index": 1, "sta')
+
+    assert load_completed_indexes(output) == {0}
+    assert output.read_bytes().endswith(b"}\n")
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_rows_with_bounded_concurrency_and_isolated_errors(tmp_path, executors):
+    input_path = tmp_path / "rows.ndjson"
+    rows = [{"n": n, "fail": n == 3} for n in range(20)]
+    input_path.write_bytes(b"".join(orjson.dumps(row) + b"\n" for row in rows))
+    output_path = tmp_path / "out.ndjson"
+
+    summary = await run_flow_batch(
+        _graph(),
+        input_path,
+        output_path,
+        run_flow=functools.partial(run_flow, executors=executors),
+        concurrency=3,
+    )
+
+    assert (summary.total, summary.completed, summary.failed) == (20, 19, 1)
+    records = {record["index"]: record for record in _records(output_path)}
+    assert records[5] == {"index": 5, "status": "completed", "outputs": {"score": {"n": 10, "model": "shared-model"}}}
+    assert records[3]["status"] == "error" and "bad row 3" in records[3]["error"]
+    assert executors["score"].peak <= 3
+    assert executors["model"].materialized <= 3
+    assert orjson.loads((tmp_path / "out.ndjson.checkpoint.json").read_bytes())["completed"] == 19
+
+
+@pytest.mark.asyncio
+async def test_batch_resumes_from_existing_output(tmp_path, executors):
+    input_path = tmp_path / "rows.csv"
+    input_path.write_text("n\n1\n2\n3\n")
+    output_path = tmp_path / "out.ndjson"
+    output_path.write_bytes(b'{"index": 0, "status": "completed", "outputs": {}}\n')
+
+    summary = await run_flow_batch(
+        _graph(),
+        input_path,
+        output_path,
+        run_flow=functools.partial(run_flow, executors=executors),
+    )
+
+    assert (summary.skipped, summary.completed) == (1, 2)
+    assert sorted(record["index"] for record in _records(output_path)) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_each_row_and_stops_on_cancel(tmp_path, executors):
+    input_path = tmp_path / "rows.ndjson"
+    input_path.write_bytes(b"".join(orjson.dumps({"n": n}) + b"\n" for n in range(50)))
+    output_path = tmp_path / "out.ndjson"
+    handle = BatchRunHandle()
+    progress: list[tuple[int, str, int]] = []
+
+    def on_progress(summary, record):
+        progress.append((record["index"], record["status"], summary.completed))
+        if len(progress) == 5:
+            handle.request_cancel()
+
+    summary = await run_flow_batch(
+        _graph(),
+        input_path,
+        output_path,
+        run_flow=functools.partial(run_flow, executors=executors),
+        concurrency=3,
+        handle=handle,
+        on_progress=on_progress,
+    )
+
+    assert summary.cancelled
+    assert [completed for _, _, completed in progress] == list(range(1, 6))
+    written = sorted(record["index"] for record in _records(output_path))
+    assert written == sorted(index for index, _, _ in progress)
+    assert summary.completed == len(written) == 5
+    assert summary.total < 50
+
+    resumed = await run_flow_batch(
+        _graph(),
+        input_path,
+        output_path,
+        run_flow=functools.partial(run_flow, executors=executors),
+    )
+    assert not resumed.cancelled
+    assert (resumed.skipped, resumed.completed) == (5, 45)
+    assert sorted(record["index"] for record in _records(output_path)) == list(range(50))
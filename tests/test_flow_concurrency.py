@@ -0,0 +1,196 @@
+"""Concurrency caps and priority ordering for run_flow scheduling."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from backend.services.flows.flow_concurrency import (
+    FlowConcurrencyGate,
+    FlowConcurrencyLimits,
+    node_priority,
+    node_type_limit,
+    resolve_concurrency_limits,
+)
+from backend.services.flows.flow_executor import run_flow
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from tests.conftest import make_edge, make_graph, make_node
+
+
+class SourceExecutor:
+    node_type = "source"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", "go")})
+
+
+class TrackingExecutor:
+    def __init__(self, node_type: str, *, max_concurrency: int | None = None) -> None:
+        self.node_type = node_type
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        self.active = 0
+        self.peak = 0
+        self.started: list[str] = []
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.started.append(context.node_id)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        return ExecutionResult(outputs={"output": DataValue("data", context.node_id)})
+
+
+def _fan_out_graph(count: int, node_type: str, **extra: Any) -> dict[str, Any]:
+    nodes = [make_node("src", "source")]
+    edges = []
+    for index in range(count):
+        node_id = f"w{index}"
+        nodes.append(make_node(node_id, node_type, **extra))
+        edges.append(make_edge("src", node_id))
+    return make_graph(nodes=nodes, edges=edges)
+
+
+def _context(**execution: Any) -> SimpleNamespace:
+    return SimpleNamespace(
+        run_id="run-1",
+        chat_id=None,
+        state=SimpleNamespace(user_message=""),
+        services=SimpleNamespace(execution=SimpleNamespace(stop_run=False, **execution)),
+    )
+
+
+async def _drain(graph: dict[str, Any], context: Any, executors: dict[str, Any]) -> list[Any]:
+    return [item async for item in run_flow(graph, context, executors=executors)]
+
+
+def test_resolve_concurrency_limits_reads_execution_context():
+    services = SimpleNamespace(
+        execution=SimpleNamespace(
+            max_concurrency="3",
+            concurrency_limits={"agent": 2, "merge": 0, "": 5},
+        )
+    )
+
+    limits = resolve_concurrency_limits(services)
+
+    assert limits.max_concurrency == 3
+    assert limits.per_type == {"agent": 2}
+
+
+def test_node_type_limit_precedence():
+    limits = FlowConcurrencyLimits(per_type={"agent": 2})
+    executor = SimpleNamespace(max_concurrency=4)
+
+    assert node_type_limit(limits, "agent", executor, {"max_concurrency": 1}) == 1
+    assert node_type_limit(limits, "agent", executor, {}) == 2
+    assert node_type_limit(limits, "llm-completion", executor, {}) == 4
+    assert node_type_limit(limits, "merge", object(), {}) is None
+
+
+def test_node_priority_ignores_invalid_values():
+    assert node_priority({"priority": 5}) == 5
+    assert node_priority({"priority": "2"}) == 2
+    assert node_priority({"priority": True}) == 0
+    assert node_priority({"priority": "high"}) == 0
+    assert node_priority(None) == 0
+
+
+def test_gate_enforces_total_and_type_caps():
+    gate = FlowConcurrencyGate(FlowConcurrencyLimits(max_concurrency=2))
+
+    assert gate.can_start("agent", 1)
+    gate.acquire("agent")
+    assert not gate.can_start("agent", 1)
+    assert gate.can_start("merge", None)
+    gate.acquire("merge")
+    assert not gate.can_start("merge", None)
+
+    gate.release("agent")
+    assert gate.can_start("agent", 1)
+    assert gate.running_total == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_default_cap_limits_fan_out():
+    worker = TrackingExecutor("agent", max_concurrency=2)
+    executors = {"source": SourceExecutor(), "agent": worker}
+
+    await _drain(_fan_out_graph(6, "agent"), _context(), executors)
+
+    assert len(worker.started) == 6
+    assert worker.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_run_level_type_limit_overrides_executor_default():
+    worker = TrackingExecutor("agent", max_concurrency=4)
+    executors = {"source": SourceExecutor(), "agent": worker}
+
+    await _drain(
+        _fan_out_graph(5, "agent"),
+        _context(concurrency_limits={"agent": 1}),
+        executors,
+    )
+
+    assert worker.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_uncapped_types_run_fully_parallel():
+    worker = TrackingExecutor("merge")
+    executors = {"source": SourceExecutor(), "merge": worker}
+
+    await _drain(_fan_out_graph(5, "merge"), _context(), executors)
+
+    assert worker.peak == 5
+
+
+@pytest.mark.asyncio
+async def test_run_max_concurrency_caps_all_types():
+    worker = TrackingExecutor("merge")
+    executors = {"source": SourceExecutor(), "merge": worker}
+
+    await _drain(_fan_out_graph(5, "merge"), _context(max_concurrency=2), executors)
+
+    assert worker.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_nodes_start_first():
+    worker = TrackingExecutor("agent", max_concurrency=1)
+    executors = {"source": SourceExecutor(), "agent": worker}
+    graph = _fan_out_graph(3, "agent")
+    graph["nodes"][3]["data"]["priority"] = 10
+
+    await _drain(graph, _context(), executors)
+
+    assert worker.started[0] == "w2"
+    assert worker.started[1:] == ["w0", "w1"]
+
+
+@pytest.mark.asyncio
+async def test_started_events_report_queue_wait():
+    worker = TrackingExecutor("agent", max_concurrency=1)
+    executors = {"source": SourceExecutor(), "agent": worker}
+
+    items = await _drain(_fan_out_graph(3, "agent"), _context(), executors)
+
+    waits = {
+        item.node_id: item.data["queue_wait_ms"]
+        for item in items
+        if isinstance(item, NodeEvent) and item.event_type == "started"
+    }
+    assert set(waits) == {"src", "w0", "w1", "w2"}
+    assert waits["w2"] > waits["w0"]
+    assert waits["w2"] >= 10
@@ -0,0 +1,221 @@
+"""Bounded run_flow event queue: backpressure, coalescing and memory stress."""
+
+from __future__ import annotations
+
+import asyncio
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.flows.flow_event_queue import (
+    DEFAULT_EVENT_QUEUE_SIZE,
+    FlowEventQueue,
+    resolve_event_queue_size,
+)
+from backend.services.flows.flow_executor import run_flow
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from tests.conftest import make_edge, make_graph, make_node
+
+
+def _token(node_id: str, token: str) -> tuple:
+    return ("item", node_id, "llm", NodeEvent(node_id, "llm", "progress", data={"token": token}))
+
+
+def _agent_event(node_id: str, index: int) -> tuple:
+    return (
+        "item",
+        node_id,
+        "droid",
+        NodeEvent(node_id, "droid", "agent_event", data={"event": "Progress", "index": index}),
+    )
+
+
+def _lifecycle(node_id: str, event_type: str) -> tuple:
+    return ("item", node_id, "llm", NodeEvent(node_id, "llm", event_type))
+
+
+def test_resolve_event_queue_size_prefers_execution_context(monkeypatch):
+    monkeypatch.setenv("COVALT_FLOW_EVENT_QUEUE_SIZE", "64")
+    services = SimpleNamespace(execution=SimpleNamespace(event_queue_size=8))
+
+    assert resolve_event_queue_size(services) == 8
+    assert resolve_event_queue_size(SimpleNamespace()) == 64
+
+    monkeypatch.delenv("COVALT_FLOW_EVENT_QUEUE_SIZE")
+    assert resolve_event_queue_size(SimpleNamespace()) == DEFAULT_EVENT_QUEUE_SIZE
+
+
+@pytest.mark.asyncio
+async def test_tokens_queue_individually_until_full():
+    queue = FlowEventQueue(maxsize=4)
+
+    await queue.put(_token("a", "Hel"))
+    await queue.put(_token("a", "lo"))
+
+    assert queue.qsize() == 2
+    assert queue.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_coalesces_tokens_into_same_node_tail():
+    queue = FlowEventQueue(maxsize=2)
+
+    await queue.put(_token("b", "!"))
+    await queue.put(_token("a", "Hel"))
+    await queue.put(_token("a", "lo"))
+    await queue.put(_token("a", " world"))
+
+    assert queue.qsize() == 2
+    assert queue.coalesced == 2
+    await queue.get()
+    tail = await queue.get()
+    assert tail[3].data == {"token": "Hello world"}
+
+
+@pytest.mark.asyncio
+async def test_full_queue_blocks_tokens_from_other_nodes():
+    queue = FlowEventQueue(maxsize=1)
+    await queue.put(_token("a", "x"))
+
+    blocked = asyncio.create_task(queue.put(_token("b", "y")))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    await queue.get()
+    await asyncio.wait_for(blocked, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_data_events_block_when_full_and_resume_after_get():
+    queue = FlowEventQueue(maxsize=2)
+    await queue.put(_agent_event("a", 0))
+    await queue.put(_agent_event("a", 1))
+
+    blocked = asyncio.create_task(queue.put(_agent_event("a", 2)))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    await queue.get()
+    await asyncio.wait_for(blocked, timeout=1)
+    assert queue.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_control_events_never_wait_for_space():
+    queue = FlowEventQueue(maxsize=1)
+    await queue.put(_agent_event("a", 0))
+
+    await asyncio.wait_for(queue.put(_lifecycle("b", "completed")), timeout=1)
+    await asyncio.wait_for(queue.put(("done", "b", "llm", "completed", None, "stop")), timeout=1)
+
+    assert queue.qsize() == 3
+    kinds = [(await queue.get())[0] for _ in range(3)]
+    assert kinds == ["item", "item", "done"]
+
+
+@pytest.mark.asyncio
+async def test_token_never_merges_across_a_control_event():
+    queue = FlowEventQueue(maxsize=2)
+    await queue.put(_token("a", "x"))
+    await queue.put(_lifecycle("a", "completed"))
+
+    blocked = asyncio.create_task(queue.put(_token("a", "y")))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    assert queue.coalesced == 0
+    blocked.cancel()
+
+
+@pytest.mark.asyncio
+async def test_memory_stays_flat_under_slow_consumer():
+    queue = FlowEventQueue(maxsize=32)
+    total = 20_000
+    payload = "x" * 512
+
+    async def producer() -> None:
+        for index in range(total):
+            await queue.put(
+                (
+                    "item",
+                    "droid",
+                    "droid",
+                    NodeEvent("droid", "droid", "agent_event", data={"index": index, "blob": payload}),
+                )
+            )
+        await queue.put(("done", "droid", "droid", "completed", None, "stop"))
+
+    tracemalloc.start()
+    try:
+        task = asyncio.create_task(producer())
+        received = 0
+        while True:
+            message = await queue.get()
+            if message[0] == "done":
+                break
+            received += 1
+            if received % 64 == 0:
+                await asyncio.sleep(0)
+        await task
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert received == total
+    # Only the trailing control message may exceed the bound.
+    assert queue.max_depth <= 33
+    # Buffering every event would hold ~10 MB of payloads.
+    assert peak < 2 * 1024 * 1024
+
+
+class SourceExecutor:
+    node_type = "source"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", "go")})
+
+
+class TokenFloodExecutor:
+    node_type = "flood"
+
+    async def execute(self, data: dict, inputs: dict[str, DataValue], context: FlowContext):
+        for index in range(5_000):
+            yield NodeEvent(
+                node_id=context.node_id,
+                node_type=self.node_type,
+                event_type="progress",
+                run_id=context.run_id,
+                data={"token": f"{index % 10}"},
+            )
+        yield ExecutionResult(outputs={"output": DataValue("data", "done")})
+
+
+@pytest.mark.asyncio
+async def test_run_flow_token_flood_preserves_text_and_lifecycle_order():
+    graph = make_graph(
+        nodes=[make_node("src", "source"), make_node("llm", "flood")],
+        edges=[make_edge("src", "llm")],
+    )
+    context = SimpleNamespace(
+        run_id="run-1",
+        chat_id=None,
+        state=SimpleNamespace(user_message=""),
+        services=SimpleNamespace(execution=SimpleNamespace(stop_run=False, event_queue_size=4)),
+    )
+
+    text = ""
+    lifecycle: list[str] = []
+    async for item in run_flow(
+        graph, context, executors={"source": SourceExecutor(), "flood": TokenFloodExecutor()}
+    ):
+        await asyncio.sleep(0)
+        if isinstance(item, NodeEvent) and item.node_id == "llm":
+            if item.event_type == "progress":
+                text += item.data["token"]
+            else:
+                lifecycle.append(item.event_type)
+
+    assert text == "0123456789" * 500
+    assert lifecycle == ["started", "result", "completed"]
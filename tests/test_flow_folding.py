@@ -0,0 +1,195 @@
+"""Compile-time constant folding, reroute collapse and dead-branch elimination."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.flows.flow_executor import run_flow
+from backend.services.flows.flow_folding import fold_flow_graph
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from nodes.ai.prompt_template.executor import PromptTemplateExecutor
+from nodes.flow.conditional.executor import ConditionalExecutor
+from nodes.flow.reroute.executor import RerouteExecutor
+from tests.conftest import make_edge, make_graph, make_node
+
+
+class StaticExecutor:
+    node_type = "static"
+    cacheable = True
+    foldable = True
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", data["value"])})
+
+
+class TriggerExecutor:
+    node_type = "trigger"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", {"message": "hi"})})
+
+
+class SinkExecutor:
+    node_type = "sink"
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        received = {handle: value.value for handle, value in inputs.items()}
+        self.calls.append((context.node_id, received))
+        return ExecutionResult(outputs={"output": DataValue("data", received)})
+
+
+def _executors(sink: SinkExecutor) -> dict:
+    return {
+        "static": StaticExecutor(),
+        "trigger": TriggerExecutor(),
+        "conditional": ConditionalExecutor(),
+        "reroute": RerouteExecutor(),
+        "prompt-template": PromptTemplateExecutor(),
+        "sink": sink,
+    }
+
+
+def _graph() -> dict:
+    return make_graph(
+        nodes=[
+            make_node("mode", "static", value={"mode": "fast"}),
+            make_node("route", "conditional", field="mode", operator="equals", value="fast"),
+            make_node("fast", "sink"),
+            make_node("slow", "sink"),
+            make_node("after_slow", "sink"),
+            make_node("system", "prompt-template", template="You are terse."),
+            make_node("trigger", "trigger"),
+            make_node("r1", "reroute"),
+            make_node("r2", "reroute"),
+            make_node("agent", "sink"),
+        ],
+        edges=[
+            make_edge("mode", "route"),
+            make_edge("route", "fast", "true", "input"),
+            make_edge("route", "slow", "false", "input"),
+            make_edge("slow", "after_slow"),
+            make_edge("trigger", "r1"),
+            make_edge("r1", "r2"),
+            make_edge("r2", "agent"),
+            make_edge("system", "agent", "output", "system"),
+            make_edge("fast", "agent", "output", "mode"),
+        ],
+    )
+
+
+def _context(**execution) -> SimpleNamespace:
+    return SimpleNamespace(
+        run_id="run-fold",
+        chat_id=None,
+        state=None,
+        services=SimpleNamespace(execution=SimpleNamespace(stop_run=False, **execution)),
+    )
+
+
+async def _events(context: SimpleNamespace, sink: SinkExecutor) -> list:
+    return [event async for event in run_flow(_graph(), context, executors=_executors(sink))]
+
+
+@pytest.mark.asyncio
+async def test_fold_pass_records_the_origin_of_every_eliminated_node():
+    folding = await fold_flow_graph(_graph(), _executors(SinkExecutor()).get)
+
+    assert folding.origins == {
+        "r1": {"kind": "collapsed", "into": "trigger", "handle": "output"},
+        "r2": {"kind": "collapsed", "into": "trigger", "handle": "output"},
+        "mode": {"kind": "folded"},
+        "route": {"kind": "folded"},
+        "system": {"kind": "folded"},
+        "slow": {"kind": "pruned"},
+        "after_slow": {"kind": "pruned"},
+    }
+    assert folding.folded_outputs["system"]["output"].value["text"] == "You are terse."
+    remaining = {node["id"] for node in folding.graph_data["nodes"]}
+    assert remaining == {"mode", "route", "fast", "system", "trigger", "agent"}
+    assert {(e["source"], e["target"]) for e in folding.graph_data["edges"]} >= {("trigger", "agent")}
+
+
+@pytest.mark.asyncio
+async def test_folded_run_matches_unfolded_results_with_fewer_events():
+    plain_sink, folded_sink = SinkExecutor(), SinkExecutor()
+
+    plain = await _events(_context(), plain_sink)
+    folded = await _events(_context(fold=True), folded_sink)
+
+    assert sorted(folded_sink.calls) == sorted(plain_sink.calls)
+    assert len(folded) < len(plain) / 2
+
+    started = {e.node_id for e in folded if isinstance(e, NodeEvent) and e.event_type == "started"}
+    assert started == {"trigger", "fast", "agent"}
+
+    trigger_result = next(
+        e for e in folded if isinstance(e, NodeEvent) and e.event_type == "result" and e.node_id == "trigger"
+    )
+    assert trigger_result.data["aliases"] == {"r1": "output", "r2": "output"}
+    summary = next(e for e in folded if isinstance(e, NodeEvent) and e.event_type == "folded")
+    assert summary.data["origins"]["slow"] == {"kind": "pruned"}
+    assert summary.data["outputs"]["route"]["true"]["value"] == {"mode": "fast"}
+
+
+@pytest.mark.asyncio
+async def test_scope_targets_are_never_folded_away():
+    sink = SinkExecutor()
+    context = _context(fold=True, scope={"mode": "execute", "target_node_ids": ["r2"]})
+
+    events = [event async for event in run_flow(_graph(), context, executors=_executors(sink))]
+
+    results = {e.node_id for e in events if isinstance(e, NodeEvent) and e.event_type == "result"}
+    assert "r2" in results
+
+
+class CountingCacheableExecutor:
+    """Cacheable but not foldable, like a temperature-0 LLM call."""
+
+    node_type = "counting"
+    cacheable = True
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        self.calls += 1
+        return ExecutionResult(outputs={"output": DataValue("data", {"n": self.calls})})
+
+
+@pytest.mark.asyncio
+async def test_only_foldable_nodes_run_at_compile_time_and_fallback_reroutes_stay():
+    counting = CountingCacheableExecutor()
+    executors = {**_executors(SinkExecutor()), "counting": counting}
+    graph = make_graph(
+        nodes=[
+            make_node("llm", "counting"),
+            make_node("mode", "static", value={"mode": "fast"}),
+            make_node("trigger", "trigger"),
+            make_node("fallback", "reroute", value={"message": "default"}),
+            make_node("agent", "sink"),
+        ],
+        edges=[
+            make_edge("mode", "llm"),
+            make_edge("trigger", "fallback"),
+            make_edge("fallback", "agent"),
+        ],
+    )
+
+    folding = await fold_flow_graph(graph, executors.get)
+
+    assert counting.calls == 0
+    assert folding.origins == {"mode": {"kind": "folded"}}
+    assert {node["id"] for node in folding.graph_data["nodes"]} >= {"llm", "fallback"}
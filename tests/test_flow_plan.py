@@ -0,0 +1,153 @@
+"""Compiled flow plans and the fingerprint-keyed plan cache."""
+
+from __future__ import annotations
+
+import copy
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from backend.services.flows.flow_executor import compile_flow_plan, get_flow_plan, run_flow
+from backend.services.flows.flow_plan import get_flow_plan_cache
+from backend.services.plugins.plugin_registry import _DEFAULT_PLUGIN_REGISTRY
+from nodes._types import ExecutionResult
+from tests.conftest import make_edge, make_graph, make_node
+
+
+def _services(**execution: Any) -> SimpleNamespace:
+    return SimpleNamespace(execution=SimpleNamespace(stop_run=False, **execution))
+
+
+def _merge_chain(length: int) -> dict[str, Any]:
+    nodes = [make_node("n0", "reroute", value="seed")]
+    edges = []
+    for index in range(1, length):
+        nodes.append(make_node(f"n{index}", "merge"))
+        edges.append(make_edge(f"n{index - 1}", f"n{index}"))
+    return make_graph(nodes=nodes, edges=edges)
+
+
+def test_compile_flow_plan_captures_order_and_dependencies():
+    graph = make_graph(
+        nodes=[
+            make_node("a", "reroute", value="x"),
+            make_node("b", "merge", label="{{ $input }}"),
+            make_node("c", "merge"),
+        ],
+        edges=[make_edge("a", "b"), make_edge("a", "c"), make_edge("b", "c", "output", "input_2")],
+    )
+
+    plan = compile_flow_plan(graph, _services())
+
+    assert plan.order == ("a", "b", "c")
+    assert plan.upstream_by_node["c"] == frozenset({"a", "b"})
+    assert plan.downstream_by_node["a"] == frozenset({"b", "c"})
+    assert plan.has_expressions == {"a": False, "b": True, "c": False}
+    assert set(plan.expression_refs) == {"b"}
+    assert plan.executors_by_node["b"].node_type == "merge"
+    assert len(plan.graph_index.incoming_by_node["c"]) == 2
+
+
+def test_warm_plan_is_reused_for_equal_graph_content():
+    graph = _merge_chain(5)
+
+    first = get_flow_plan(graph, _services())
+    second = get_flow_plan(copy.deepcopy(graph), _services())
+
+    assert first is second
+    assert get_flow_plan_cache().hits == 1
+
+
+def test_plan_is_isolated_from_caller_mutation():
+    graph = _merge_chain(3)
+    plan = get_flow_plan(graph, _services())
+
+    graph["nodes"][0]["data"]["value"] = "changed"
+
+    assert plan.nodes_by_id["n0"]["data"]["value"] == "seed"
+    assert get_flow_plan(graph, _services()) is not plan
+
+
+def test_scope_is_part_of_the_cache_key():
+    graph = _merge_chain(4)
+
+    full = get_flow_plan(graph, _services())
+    scoped = get_flow_plan(graph, _services(scope={"mode": "runFrom", "target_node_ids": ["n2"]}))
+
+    assert full is not scoped
+    assert scoped.order == ("n2", "n3")
+
+
+def test_registry_changes_invalidate_cached_plans():
+    graph = _merge_chain(3)
+    first = get_flow_plan(graph, _services())
+
+    _DEFAULT_PLUGIN_REGISTRY.register_plugin("plan-cache-probe", executors={})
+    try:
+        second = get_flow_plan(graph, _services())
+    finally:
+        _DEFAULT_PLUGIN_REGISTRY.deregister_plugin("plan-cache-probe")
+
+    assert first is not second
+
+
+def test_explicit_executor_maps_are_not_cached():
+    graph = _merge_chain(2)
+    executors = {"reroute": object(), "merge": object()}
+
+    get_flow_plan(graph, _services(), executors)
+
+    assert len(get_flow_plan_cache()) == 0
+
+
+def test_invalid_graphs_are_not_cached():
+    graph = make_graph(
+        nodes=[make_node("a", "merge"), make_node("b", "merge")],
+        edges=[make_edge("a", "b"), make_edge("b", "a")],
+    )
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cycle"):
+            get_flow_plan(graph, _services())
+    assert len(get_flow_plan(_merge_chain(1), _services()).order) == 1
+    assert len(get_flow_plan_cache()) == 1
+
+
+def test_warm_plan_lookup_for_200_node_flow_hits_the_cache():
+    graph = _merge_chain(200)
+    cache = get_flow_plan_cache()
+    plan = get_flow_plan(graph, _services())
+
+    for _ in range(3):
+        assert get_flow_plan(copy.deepcopy(graph), _services()) is plan
+    assert (cache.misses, cache.hits) == (1, 3)
+
+
+@pytest.mark.benchmark
+def test_warm_plan_lookup_for_200_node_flow_is_fast():
+    graph = _merge_chain(200)
+    cold_started = time.perf_counter()
+    get_flow_plan(graph, _services())
+    cold = time.perf_counter() - cold_started
+
+    warm_started = time.perf_counter()
+    for _ in range(50):
+        get_flow_plan(graph, _services())
+    warm = (time.perf_counter() - warm_started) / 50
+
+    assert warm < cold
+    assert warm < 0.005
+
+
+@pytest.mark.asyncio
+async def test_run_flow_executes_from_cached_plan():
+    graph = _merge_chain(3)
+    context = SimpleNamespace(run_id="r", chat_id=None, state=None, services=_services())
+
+    for _ in range(2):
+        results = [item async for item in run_flow(graph, context) if isinstance(item, ExecutionResult)]
+        assert results[-1].outputs["output"].value == [["seed"]]
+
+    assert get_flow_plan_cache().hits == 1
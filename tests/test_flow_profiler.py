@@ -0,0 +1,141 @@
+"""Opt-in flow profiler: phase spans, nesting and Chrome-trace export."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from backend.services.flows.flow_executor import run_flow
+from backend.services.flows.flow_profiler import FlowProfiler, flow_profiling_enabled
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from tests.conftest import make_edge, make_graph, make_node
+
+
+def _link_edge(source: str, target: str, target_handle: str = "tools") -> dict:
+    edge = make_edge(source, target, "output", target_handle)
+    edge["data"]["channel"] = "link"
+    return edge
+
+
+class SourceExecutor:
+    node_type = "source"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", data.get("value"))})
+
+
+class ToolExecutor:
+    node_type = "tool"
+
+    async def materialize(self, data: dict, output_handle: str, context: FlowContext):
+        await asyncio.sleep(0.01)
+        return data.get("name")
+
+
+class StreamingExecutor:
+    node_type = "streamer"
+
+    async def execute(self, data: dict, inputs: dict[str, DataValue], context: FlowContext):
+        tools = await context.runtime.resolve_links(context.node_id, "tools")
+        await asyncio.sleep(0.01)
+        for token in ("a", "b"):
+            yield NodeEvent(
+                node_id=context.node_id,
+                node_type=self.node_type,
+                event_type="progress",
+                run_id=context.run_id,
+                data={"token": token},
+            )
+            await asyncio.sleep(0.005)
+        yield ExecutionResult(outputs={"output": DataValue("data", {"tools": tools})})
+
+
+EXECUTORS = {"source": SourceExecutor(), "tool": ToolExecutor(), "streamer": StreamingExecutor()}
+
+
+def _graph() -> dict:
+    return make_graph(
+        nodes=[
+            make_node("src", "source", value="{{ $trigger.message }}"),
+            make_node("tool", "tool", name="search"),
+            make_node("llm", "streamer"),
+        ],
+        edges=[make_edge("src", "llm"), _link_edge("tool", "llm")],
+    )
+
+
+def _context(**execution) -> SimpleNamespace:
+    return SimpleNamespace(
+        run_id="run-prof",
+        chat_id=None,
+        state=None,
+        services=SimpleNamespace(
+            execution=SimpleNamespace(stop_run=False, **execution),
+            expression_context={"trigger": {"message": "hi"}},
+        ),
+    )
+
+
+def test_profiling_is_opt_in(monkeypatch):
+    monkeypatch.delenv("COVALT_FLOW_PROFILE", raising=False)
+    assert flow_profiling_enabled(SimpleNamespace()) is False
+    monkeypatch.setenv("COVALT_FLOW_PROFILE", "1")
+    assert flow_profiling_enabled(SimpleNamespace()) is True
+    assert flow_profiling_enabled(SimpleNamespace(execution=SimpleNamespace(profile=False))) is False
+
+
+def test_nested_spans_split_inclusive_and_exclusive_time():
+    profiler = FlowProfiler("r")
+    with profiler.span("execute", "agent") as outer:
+        with profiler.span("materialize", "tool") as inner:
+            pass
+
+    assert inner.depth == 1 and inner.lane == "agent"
+    assert outer.exclusive_ns == outer.inclusive_ns - inner.inclusive_ns
+
+
+@pytest.mark.asyncio
+async def test_profiled_run_reports_phases_per_node(tmp_path, monkeypatch):
+    monkeypatch.setenv("COVALT_FLOW_PROFILE_DIR", str(tmp_path))
+    context = _context(profile=True)
+
+    async for _ in run_flow(_graph(), context, executors=EXECUTORS):
+        pass
+
+    report = context.services.flow_profiler.report()
+    llm = report["nodes"]["llm"]
+    assert {
+        "queue_wait_ms",
+        "execute_ms",
+        "execute_exclusive_ms",
+        "links_ms",
+        "ttft_ms",
+        "stream_tail_ms",
+    } <= llm.keys()
+    assert llm["links_ms"] >= 10
+    assert llm["execute_exclusive_ms"] <= llm["execute_ms"] - llm["links_ms"] + 0.01
+    assert llm["ttft_ms"] >= llm["links_ms"]
+    assert "expressions_ms" in report["nodes"]["src"]
+
+    nested = [span for span in report["spans"] if span["name"] == "materialize"]
+    assert nested and nested[0]["lane"] == "llm" and nested[0]["depth"] == 2
+
+    trace = orjson.loads((tmp_path / "run-prof.trace.json").read_bytes())
+    phases = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert {event["name"] for event in phases} >= {"execute", "queue_wait", "materialize tool"}
+    assert all(event["dur"] >= 0 for event in phases)
+
+
+@pytest.mark.asyncio
+async def test_unprofiled_run_attaches_no_profiler():
+    context = _context()
+
+    async for _ in run_flow(_graph(), context, executors=EXECUTORS):
+        pass
+
+    assert not hasattr(context.services, "flow_profiler")
@@ -0,0 +1,271 @@
+"""Server-side incremental flow runs: signatures, dirty cones and spill to disk."""
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.application.conversation.stream_flow_run import (
+    StreamFlowRunDependencies,
+    StreamFlowRunInput,
+    execute_stream_flow_run,
+)
+from backend.services.flows.flow_executor import run_flow
+from backend.services.flows.flow_run_state import (
+    FlowRunSnapshot,
+    FlowRunStateStore,
+    compute_node_signatures,
+    resolve_incremental_run,
+)
+from nodes._types import DataValue, ExecutionResult, FlowContext
+from tests.conftest import CapturingChannel, make_edge, make_graph, make_node
+
+
+def _chain(length: int) -> dict[str, Any]:
+    nodes = [make_node("n0", "source", value=0)]
+    edges = []
+    for index in range(1, length):
+        nodes.append(make_node(f"n{index}", "step", offset=1))
+        edges.append(make_edge(f"n{index - 1}", f"n{index}"))
+    return make_graph(nodes=nodes, edges=edges)
+
+
+def test_editing_a_node_changes_only_its_downstream_signatures():
+    graph = _chain(5)
+    before = compute_node_signatures(graph)
+
+    edited = copy.deepcopy(graph)
+    edited["nodes"][2]["data"]["offset"] = 5
+    after = compute_node_signatures(edited)
+
+    assert [before[n] == after[n] for n in ("n0", "n1", "n2", "n3", "n4")] == [
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+
+
+def test_trigger_payload_dirties_sources_and_expression_nodes():
+    graph = make_graph(
+        nodes=[make_node("src", "source"), make_node("expr", "step", text="{{ $trigger.message }}")],
+        edges=[make_edge("src", "expr")],
+    )
+    first = compute_node_signatures(graph, trigger_payload={"message": "a"})
+    second = compute_node_signatures(graph, trigger_payload={"message": "b"})
+
+    assert first["src"] != second["src"]
+    assert first["expr"] != second["expr"]
+
+
+def test_label_references_never_match():
+    graph = make_graph(nodes=[make_node("code", "code", code="return $('Other').item.json")], edges=[])
+
+    assert compute_node_signatures(graph)["code"] != compute_node_signatures(graph)["code"]
+
+
+def test_resolve_promotes_dirty_cached_nodes_and_their_missing_upstream():
+    graph = _chain(4)
+    signatures = compute_node_signatures(graph)
+    snapshot = FlowRunSnapshot(
+        signatures={"n0": signatures["n0"], "n1": "stale", "n2": signatures["n2"]},
+        outputs={node_id: {"output": {"type": "data", "value": 1}} for node_id in ("n0", "n1", "n2")},
+    )
+
+    result = resolve_incremental_run(
+        graph,
+        snapshot,
+        signatures,
+        node_ids=["n3"],
+        cached_node_ids=["n2", "n1"],
+    )
+
+    assert result.promoted == frozenset({"n1"})
+    assert result.node_ids == ["n3", "n1"]
+    assert set(result.cached_outputs) == {"n0", "n2"}
+
+
+def test_explicit_outputs_are_never_promoted():
+    graph = _chain(2)
+    pinned = {"n0": {"output": {"type": "data", "value": 9}}}
+    signatures = compute_node_signatures(graph, pinned_outputs=pinned)
+
+    result = resolve_incremental_run(
+        graph, None, signatures, node_ids=["n1"], cached_node_ids=["n0"], explicit_outputs=pinned
+    )
+
+    assert result.promoted == frozenset()
+    assert result.cached_outputs == pinned
+
+
+def test_store_spills_evicted_snapshots_and_reloads_them(tmp_path):
+    store = FlowRunStateStore(tmp_path, max_memory_entries=1)
+    store.record("agent-a", "n0", "sig", {"output": {"type": "data", "value": "a"}})
+    store.record("agent-b", "n0", "sig", {"output": {"type": "data", "value": "b"}})
+
+    assert store.in_memory() == 1
+    store.wait_for_spills()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    reloaded = store.get("agent-a")
+    assert reloaded is not None
+    assert reloaded.clean_outputs("n0", "sig") == {"output": {"type": "data", "value": "a"}}
+    store.wait_for_spills()
+    assert FlowRunStateStore(tmp_path).get("agent-b") is not None
+
+
+def test_evicted_snapshots_are_written_off_the_calling_thread(tmp_path, monkeypatch):
+    store = FlowRunStateStore(tmp_path, max_memory_entries=1)
+    release = threading.Event()
+    writers: list[str] = []
+    write = store._write
+
+    def slow_write(path, payload):
+        writers.append(threading.current_thread().name)
+        release.wait(5)
+        write(path, payload)
+
+    monkeypatch.setattr(store, "_write", slow_write)
+    store.record("agent-a", "n0", "sig", {"output": {"type": "data", "value": "a"}})
+    store.record("agent-b", "n0", "sig", {"output": {"type": "data", "value": "b"}})
+    store.record("agent-c", "n0", "sig", {"output": {"type": "data", "value": "c"}})
+
+    revived = store.get("agent-b")
+    assert revived is not None
+    assert revived.clean_outputs("n0", "sig") == {"output": {"type": "data", "value": "b"}}
+
+    release.set()
+    store.wait_for_spills()
+    assert writers and threading.current_thread().name not in writers
+    assert {path.name for path in tmp_path.iterdir()} == {
+        store._spill_path("agent-a").name,
+        store._spill_path("agent-c").name,
+    }
+
+
+def test_the_snapshot_decides_what_is_dirty_not_the_editor():
+    graph = _chain(4)
+    signatures = compute_node_signatures(graph)
+    snapshot = FlowRunSnapshot(
+        signatures={"n0": signatures["n0"], "n1": signatures["n1"], "n2": "stale"},
+        outputs={node_id: {"output": {"type": "data", "value": 1}} for node_id in ("n0", "n1", "n2")},
+    )
+
+    result = resolve_incremental_run(
+        graph,
+        snapshot,
+        signatures,
+        node_ids=["n3", "n1"],
+        cached_node_ids=["n2", "n0"],
+        required={"n3"},
+    )
+
+    assert result.reused == frozenset({"n1"})
+    assert result.promoted == frozenset({"n2"})
+    assert result.node_ids == ["n3", "n2"]
+    assert set(result.cached_outputs) == {"n0", "n1"}
+
+
+class SourceExecutor:
+    node_type = "source"
+
+    def __init__(self, calls: list[str]) -> None:
+        self.calls = calls
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        self.calls.append(context.node_id)
+        return ExecutionResult(outputs={"output": DataValue("data", data.get("value", 0))})
+
+
+class StepExecutor(SourceExecutor):
+    node_type = "step"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        self.calls.append(context.node_id)
+        value = inputs["input"].value + data.get("offset", 0)
+        return ExecutionResult(outputs={"output": DataValue("data", value)})
+
+
+@pytest.mark.asyncio
+async def test_editing_one_node_reruns_only_its_cone(tmp_path):
+    length = 100
+    calls: list[str] = []
+    executors = {"source": SourceExecutor(calls), "step": StepExecutor(calls)}
+    agent = {"graph_data": _chain(length)}
+    store = FlowRunStateStore(tmp_path)
+    channel = MagicMock()
+
+    deps = StreamFlowRunDependencies(
+        get_agent_data=lambda _agent_id: agent,
+        build_trigger_payload=lambda message, _messages, _attachments: {"message": message},
+        create_run_handle=MagicMock,
+        get_tool_registry=MagicMock,
+        register_active_run=lambda _run_id, _handle: None,
+        consume_early_cancel=lambda _run_id: False,
+        remove_active_run=lambda _run_id: None,
+        clear_early_cancel=lambda _run_id: None,
+        run_flow=lambda graph, context: run_flow(graph, context, executors=executors),
+        emit_run_error=lambda _channel, _content: None,
+        logger=logging.getLogger(__name__),
+        flow_run_state=store,
+    )
+
+    last = f"n{length - 1}"
+    await execute_stream_flow_run(
+        StreamFlowRunInput(channel=channel, agent_id="agent", mode="execute", target_node_id=last),
+        deps,
+    )
+    assert len(calls) == length
+
+    agent["graph_data"]["nodes"][60]["data"]["offset"] = 2
+    calls.clear()
+    await execute_stream_flow_run(
+        StreamFlowRunInput(
+            channel=channel,
+            agent_id="agent",
+            mode="execute",
+            target_node_id=last,
+            node_ids=[last],
+            cached_node_ids=[f"n{index}" for index in range(length - 1)],
+        ),
+        deps,
+    )
+
+    assert sorted(calls, key=lambda node_id: int(node_id[1:])) == [
+        f"n{index}" for index in range(60, length)
+    ]
+    snapshot = store.get("agent")
+    assert snapshot is not None
+    assert snapshot.outputs[last]["output"]["value"] == length
+
+    calls.clear()
+    capturing = CapturingChannel()
+    await execute_stream_flow_run(
+        StreamFlowRunInput(
+            channel=capturing,
+            agent_id="agent",
+            mode="execute",
+            target_node_id=last,
+            node_ids=[last, "n5"],
+            cached_node_ids=[f"n{index}" for index in range(length - 1) if index != 5],
+        ),
+        deps,
+    )
+
+    assert calls == [last]
+    reused = [
+        event
+        for event in capturing.events
+        if event.get("event") == "FlowNodeResult" and event.get("nodeId") == "n5"
+    ]
+    assert reused and reused[0]["outputs"]["output"]["value"] == 5
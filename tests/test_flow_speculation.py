@@ -0,0 +1,191 @@
+"""Opt-in speculative execution of pure conditional branches."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.flows.flow_executor import run_flow
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from nodes.flow.conditional.executor import ConditionalExecutor
+from tests.conftest import make_edge, make_graph, make_node
+
+DELAY = 0.05
+
+
+class SourceExecutor:
+    node_type = "source"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", data["value"])})
+
+
+class SlowConditionalExecutor(ConditionalExecutor):
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        await asyncio.sleep(DELAY)
+        return await super().execute(data, inputs, context)
+
+
+class BranchExecutor:
+    node_type = "branch"
+    cacheable = True
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        self.calls.append(context.node_id)
+        await asyncio.sleep(DELAY)
+        return ExecutionResult(
+            outputs={"output": DataValue("data", {"branch": context.node_id, **inputs["input"].value})}
+        )
+
+
+def _graph(**branch_data) -> dict:
+    return make_graph(
+        nodes=[
+            make_node("src", "source", value={"score": 9}),
+            make_node("cond", "conditional", field="score", operator="greaterThan", value=5),
+            make_node("yes", "branch", **branch_data),
+            make_node("no", "branch", **branch_data),
+        ],
+        edges=[
+            make_edge("src", "cond"),
+            make_edge("cond", "yes", "true", "input"),
+            make_edge("cond", "no", "false", "input"),
+        ],
+    )
+
+
+def _context(**execution) -> SimpleNamespace:
+    return SimpleNamespace(
+        run_id="run-spec",
+        chat_id=None,
+        state=None,
+        services=SimpleNamespace(execution=SimpleNamespace(stop_run=False, **execution)),
+    )
+
+
+async def _run(graph: dict, context: SimpleNamespace, branch: BranchExecutor) -> tuple[float, list]:
+    executors = {"source": SourceExecutor(), "conditional": SlowConditionalExecutor(), "branch": branch}
+    started = time.perf_counter()
+    events = [event async for event in run_flow(graph, context, executors=executors)]
+    return time.perf_counter() - started, events
+
+
+def _event_nodes(events: list, event_type: str) -> set[str]:
+    return {e.node_id for e in events if isinstance(e, NodeEvent) and e.event_type == event_type}
+
+
+@pytest.mark.asyncio
+async def test_speculative_branches_overlap_the_condition_and_discard_the_loser():
+    branch = BranchExecutor()
+    context = _context(speculative=True)
+
+    elapsed, events = await _run(_graph(pure=True), context, branch)
+
+    assert elapsed < DELAY * 1.8
+    assert sorted(branch.calls) == ["no", "yes"]
+    assert _event_nodes(events, "result") == {"src", "cond", "yes"}
+    assert "no" not in _event_nodes(events, "started")
+    results = [e for e in events if isinstance(e, ExecutionResult)]
+    assert results[-1].outputs["output"].value == {"branch": "yes", "score": 9}
+
+    report = context.services.flow_speculation
+    assert (report.launched, report.committed, report.discarded) == (2, 1, 1)
+    assert report.nodes == {"yes": "committed", "no": "discarded"}
+    assert report.saved_ms > 0 and report.wasted_ms > 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("branch_data", [{}, {"pure": False}])
+async def test_branches_not_marked_pure_wait_for_the_condition(branch_data):
+    branch = BranchExecutor()
+    context = _context(speculative=True)
+
+    elapsed, _ = await _run(_graph(**branch_data), context, branch)
+
+    assert branch.calls == ["yes"]
+    assert elapsed >= DELAY * 2
+    assert context.services.flow_speculation.launched == 0
+
+
+@pytest.mark.asyncio
+async def test_foldable_branches_are_pure_unless_marked_otherwise():
+    class FoldableBranch(BranchExecutor):
+        cacheable = False
+        foldable = True
+
+    branch = FoldableBranch()
+    context = _context(speculative=True)
+    await _run(_graph(), context, branch)
+    assert sorted(branch.calls) == ["no", "yes"]
+
+    branch = FoldableBranch()
+    context = _context(speculative=True)
+    await _run(_graph(pure=False), context, branch)
+    assert branch.calls == ["yes"]
+
+
+@pytest.mark.asyncio
+async def test_speculation_is_opt_in(monkeypatch):
+    monkeypatch.delenv("COVALT_FLOW_SPECULATION", raising=False)
+    branch = BranchExecutor()
+    context = _context()
+
+    await _run(_graph(pure=True), context, branch)
+
+    assert branch.calls == ["yes"]
+    assert not hasattr(context.services, "flow_speculation")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("max_concurrency", "launched", "throttled"),
+    [(1, 0, 2), (2, 1, 1), (3, 2, 0)],
+)
+async def test_speculative_branches_only_take_spare_concurrency_slots(
+    max_concurrency, launched, throttled
+):
+    running = 0
+    peak = 0
+
+    class CountingConditional(SlowConditionalExecutor):
+        async def execute(self, data, inputs, context):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                return await super().execute(data, inputs, context)
+            finally:
+                running -= 1
+
+    class CountingBranch(BranchExecutor):
+        async def execute(self, data, inputs, context):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                return await super().execute(data, inputs, context)
+            finally:
+                running -= 1
+
+    branch = CountingBranch()
+    context = _context(speculative=True, max_concurrency=max_concurrency)
+    executors = {"source": SourceExecutor(), "conditional": CountingConditional(), "branch": branch}
+
+    events = [event async for event in run_flow(_graph(pure=True), context, executors=executors)]
+
+    assert peak <= max_concurrency
+    assert _event_nodes(events, "result") == {"src", "cond", "yes"}
+    report = context.services.flow_speculation
+    assert (report.launched, report.throttled) == (launched, throttled)
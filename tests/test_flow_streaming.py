@@ -18,6 +18,7 @@ import pytest
 
 from backend.commands import streaming
 from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from nodes.flow.reroute.executor import RerouteExecutor
 from tests.conftest import make_edge, make_graph, make_node
 
 
@@ -95,6 +96,13 @@ class StreamingStub:
         )
 
 
+class StreamingSourceStub(StreamingStub):
+    """StreamingStub that publishes its tokens to streaming edges."""
+
+    node_type = "streaming-source"
+    stream_output_handle = "output"
+
+
 class FailingStub:
     """Always raises an exception."""
 
@@ -113,9 +121,11 @@ STUBS = {
         EchoStub,
         ZeroResponseStub,
         StreamingStub,
+        StreamingSourceStub,
         FailingStub,
     ]
 }
+STUBS["reroute"] = RerouteExecutor()
 
 
 
@@ -289,6 +299,45 @@ class TestFlowStreamingTokens:
         assert "RunCompleted" in events
 
 
+class TestFlowStreamingReroute:
+    """Streaming node -> reroute: the text reaches the chat exactly once."""
+
+    def _build_graph(self, *, stream: bool):
+        edge = make_edge("stream", "relay", "output", "input")
+        edge["data"]["stream"] = stream
+        return make_graph(
+            nodes=[
+                make_node("cs", "chat-start"),
+                make_node("stream", "streaming-source"),
+                make_node("relay", "reroute"),
+            ],
+            edges=[make_edge("cs", "stream", "output", "input"), edge],
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stream", [True, False])
+    async def test_rerouted_tokens_are_not_duplicated(self, stream):
+        from backend.services.streaming.chat_stream import handle_flow_stream
+
+        with _patched_env():
+            channel = _make_channel()
+            await handle_flow_stream(
+                self._build_graph(stream=stream),
+                None,
+                [_make_chat_message("hello world")],
+                "asst-1",
+                channel,
+            )
+
+        content = "".join(
+            e.get("content", "")
+            for e in _collect_events(channel)
+            if e.get("event") == "RunContent"
+        )
+        assert content == "hello world "
+        assert "RunCompleted" in _event_names(channel)
+
+
 class TestFlowStreamingError:
     """Flow with a failing node: ChatStart -> FailingStub."""
 
@@ -0,0 +1,183 @@
+"""Streaming data edges: consumers start while the producer is still streaming."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.flows.flow_executor import run_flow
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent, ValueStream
+from nodes.flow.reroute.executor import RerouteExecutor
+from tests.conftest import make_edge, make_graph, make_node
+
+TOKENS = ("a", "b", "c", "d", "e")
+TOKEN_DELAY = 0.02
+
+
+class StreamerExecutor:
+    node_type = "streamer"
+    stream_output_handle = "output"
+
+    async def execute(self, data: dict, inputs: dict[str, DataValue], context: FlowContext):
+        for token in TOKENS:
+            await asyncio.sleep(TOKEN_DELAY)
+            if data.get("fail_after") == token:
+                raise RuntimeError("provider dropped")
+            yield NodeEvent(
+                node_id=context.node_id,
+                node_type=self.node_type,
+                event_type="progress",
+                run_id=context.run_id,
+                data={"token": token},
+            )
+        yield ExecutionResult(outputs={"output": DataValue("data", {"text": "".join(TOKENS)})})
+
+
+class CollectExecutor:
+    """Stream-aware sink recording when its first chunk arrived."""
+
+    node_type = "collect"
+    accepts_streams = True
+
+    def __init__(self) -> None:
+        self.received: list[DataValue] = []
+        self.first_chunk_at: float | None = None
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        value = inputs["input"]
+        if isinstance(value.value, ValueStream):
+            async for _ in value.value:
+                if self.first_chunk_at is None:
+                    self.first_chunk_at = time.perf_counter()
+            value = await value.value.result()
+        elif self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+        self.received.append(value)
+        return ExecutionResult(outputs={"output": value})
+
+
+def _context(stream_edges: bool | None = True) -> SimpleNamespace:
+    return SimpleNamespace(
+        run_id="run-stream",
+        chat_id=None,
+        state=None,
+        services=SimpleNamespace(
+            execution=SimpleNamespace(stop_run=False, stream_edges=stream_edges)
+        ),
+    )
+
+
+def _pipeline(stages: int, **streamer_data) -> dict:
+    nodes = [make_node("llm", "streamer", **streamer_data)]
+    edges = []
+    previous = "llm"
+    for index in range(stages):
+        node_id = f"relay{index}"
+        nodes.append(make_node(node_id, "reroute"))
+        edges.append(make_edge(previous, node_id))
+        previous = node_id
+    nodes.append(make_node("sink", "collect"))
+    edges.append(make_edge(previous, "sink"))
+    return make_graph(nodes=nodes, edges=edges)
+
+
+async def _first_token_times(
+    graph: dict, executors: dict, stream_edges: bool | None = True
+) -> tuple[dict[str, float], list]:
+    started = time.perf_counter()
+    first_token: dict[str, float] = {}
+    events = []
+    async for event in run_flow(graph, _context(stream_edges), executors=executors):
+        events.append(event)
+        if isinstance(event, NodeEvent) and event.event_type == "progress":
+            first_token.setdefault(event.node_id, time.perf_counter() - started)
+    collect = executors["collect"]
+    if collect.first_chunk_at is not None:
+        first_token["sink"] = collect.first_chunk_at - started
+    return first_token, events
+
+
+@pytest.mark.asyncio
+async def test_value_stream_replays_chunks_to_every_reader():
+    stream = ValueStream()
+    stream.push("a")
+    early = asyncio.create_task(stream.text())
+    await asyncio.sleep(0)
+    stream.push("b")
+    stream.close(final=DataValue("data", "ab"))
+
+    assert await early == "ab"
+    assert await stream.text() == "ab"
+    assert (await stream.result()).value == "ab"
+
+    failed = ValueStream()
+    failed.close(error=RuntimeError("boom"))
+    with pytest.raises(RuntimeError, match="boom"):
+        await failed.result()
+
+
+@pytest.mark.asyncio
+async def test_pipelined_stages_see_first_token_at_single_stage_latency():
+    collect = CollectExecutor()
+    executors = {"streamer": StreamerExecutor(), "reroute": RerouteExecutor(), "collect": collect}
+
+    first_token, events = await _first_token_times(_pipeline(4), executors)
+
+    stream_duration = TOKEN_DELAY * len(TOKENS)
+    assert first_token["sink"] - first_token["llm"] < stream_duration / 2
+    assert {
+        event.node_id
+        for event in events
+        if isinstance(event, NodeEvent) and event.event_type == "progress"
+    } == {"llm"}
+    assert collect.received[0].value == {"text": "abcde"}
+    relay_results = [
+        event
+        for event in events
+        if isinstance(event, NodeEvent) and event.event_type == "result" and event.node_id == "relay3"
+    ]
+    assert relay_results[0].data["outputs"]["output"]["value"] == {"text": "abcde"}
+
+
+@pytest.mark.asyncio
+async def test_producer_failure_propagates_to_streaming_consumers():
+    executors = {"streamer": StreamerExecutor(), "reroute": RerouteExecutor(), "collect": CollectExecutor()}
+    graph = _pipeline(1, fail_after="c", on_error="continue")
+
+    _, events = await _first_token_times(graph, executors)
+
+    errors = {
+        event.node_id: event.data["error"]
+        for event in events
+        if isinstance(event, NodeEvent) and event.event_type == "error"
+    }
+    assert errors["llm"] == "provider dropped"
+    assert errors["relay0"] == "provider dropped"
+
+
+@pytest.mark.asyncio
+async def test_streaming_edges_are_opt_in():
+    stream_duration = TOKEN_DELAY * len(TOKENS)
+    executors = {"streamer": StreamerExecutor(), "reroute": RerouteExecutor(), "collect": CollectExecutor()}
+
+    first_token, _ = await _first_token_times(_pipeline(1), executors, stream_edges=None)
+
+    assert first_token["sink"] - first_token["llm"] >= stream_duration * 0.6
+    assert executors["collect"].received[0].value == {"text": "abcde"}
+
+
+@pytest.mark.asyncio
+async def test_edge_flag_overrides_the_run_default():
+    stream_duration = TOKEN_DELAY * len(TOKENS)
+    graph = _pipeline(0)
+    graph["edges"][0]["data"]["stream"] = True
+    executors = {"streamer": StreamerExecutor(), "collect": CollectExecutor()}
+
+    first_token, _ = await _first_token_times(graph, executors, stream_edges=False)
+
+    assert first_token["sink"] - first_token["llm"] < stream_duration / 2
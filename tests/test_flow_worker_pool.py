@@ -0,0 +1,155 @@
+"""Process-pool execution of CPU-bound flow executors."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.flows.flow_executor import run_flow
+from backend.services.flows.flow_worker_pool import (
+    get_flow_worker_pool,
+    shutdown_flow_workers,
+)
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from tests.conftest import make_edge, make_graph, make_node
+
+BUSY_SECONDS = 0.4
+
+
+class SourceExecutor:
+    node_type = "source"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", {"n": 3})})
+
+
+class BusyExecutor:
+    node_type = "busy"
+    cpu_bound = True
+    worker_services = ("label",)
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        if data.get("crash"):
+            os._exit(1)
+        deadline = time.perf_counter() + data.get("seconds", 0)
+        while time.perf_counter() < deadline:
+            pass
+        return ExecutionResult(
+            outputs={
+                "output": DataValue(
+                    "data",
+                    {
+                        "pid": os.getpid(),
+                        "n": inputs["input"].value["n"] * 2,
+                        "label": getattr(context.services, "label", None),
+                        "finished_at": time.time(),
+                    },
+                )
+            }
+        )
+
+
+def _graph(**busy_data) -> dict:
+    return make_graph(
+        nodes=[make_node("src", "source"), make_node("busy", "busy", **busy_data)],
+        edges=[make_edge("src", "busy")],
+    )
+
+
+def _context(**execution) -> SimpleNamespace:
+    return SimpleNamespace(
+        run_id="run-workers",
+        chat_id=None,
+        state=None,
+        services=SimpleNamespace(
+            label="shipped",
+            unshipped=object(),
+            execution=SimpleNamespace(stop_run=False, **execution),
+        ),
+    )
+
+
+async def _run(graph: dict, context: SimpleNamespace) -> list:
+    executors = {"source": SourceExecutor(), "busy": BusyExecutor()}
+    return [event async for event in run_flow(graph, context, executors=executors)]
+
+
+def _busy_output(events: list) -> dict:
+    return [e for e in events if isinstance(e, ExecutionResult)][-1].outputs["output"].value
+
+
+@pytest.fixture
+async def workers():
+    yield
+    await shutdown_flow_workers()
+
+
+async def test_cpu_bound_nodes_run_in_worker_processes_without_stalling_the_loop(workers):
+    gaps: list[float] = []
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        events = await _run(_graph(seconds=BUSY_SECONDS), _context(worker_processes=1))
+    finally:
+        ticking.cancel()
+
+    output = _busy_output(events)
+    assert output["pid"] != os.getpid()
+    assert output["n"] == 6
+    assert output["label"] == "shipped"
+    assert max(gaps) < BUSY_SECONDS / 2
+
+
+async def test_a_crashed_worker_fails_only_its_node_and_the_pool_recovers(workers):
+    context = _context(worker_processes=1)
+
+    crashed = await _run(_graph(crash=True), context)
+
+    errors = [e for e in crashed if isinstance(e, NodeEvent) and e.event_type == "error"]
+    assert [e.node_id for e in errors] == ["busy"]
+    assert "crashed" in errors[0].data["error"]
+    assert get_flow_worker_pool(context.services).crashes == 1
+
+    recovered = await _run(_graph(), context)
+    assert _busy_output(recovered)["n"] == 6
+
+
+async def test_worker_tier_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("COVALT_FLOW_WORKERS", raising=False)
+    context = _context()
+
+    events = await _run(_graph(), context)
+
+    assert get_flow_worker_pool(context.services) is None
+    assert _busy_output(events)["pid"] == os.getpid()
+
+
+async def test_resizing_retires_the_old_pool_without_blocking_its_calls(workers):
+    running = asyncio.create_task(_run(_graph(seconds=BUSY_SECONDS), _context(worker_processes=1)))
+    await asyncio.sleep(BUSY_SECONDS / 2)
+    old_pool = get_flow_worker_pool(_context(worker_processes=1).services)
+
+    new_pool = get_flow_worker_pool(_context(worker_processes=2).services)
+    resized_at = time.time()
+
+    assert new_pool is not old_pool
+    output = _busy_output(await running)
+    assert output["n"] == 6
+    assert resized_at < output["finished_at"]
+    assert _busy_output(await _run(_graph(), _context(worker_processes=1)))["pid"] != os.getpid()
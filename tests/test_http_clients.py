@@ -0,0 +1,164 @@
+"""Shared per-origin HTTP clients: connection reuse, warm TTFT and shutdown."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.services.http_clients import (
+    HttpClientPool,
+    HttpClientSettings,
+    origin_of,
+)
+
+HANDSHAKE_SECONDS = 0.05
+BODY = b"data: hello\n\n"
+
+
+class StubServer:
+    """Keep-alive HTTP/1.1 server that charges a fixed cost per new connection."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> StubServer:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        assert self._server is not None
+        self._server.close()
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1/stream"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(HANDSHAKE_SECONDS)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                    + f"Content-Length: {len(BODY)}\r\n\r\n".encode()
+                    + BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _time_to_first_byte(client: httpx.AsyncClient, url: str) -> float:
+    started = time.perf_counter()
+    first_byte: float | None = None
+    async with client.stream("POST", url, json={"prompt": "hi"}, timeout=5) as response:
+        async for _ in response.aiter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+    assert first_byte is not None
+    return first_byte
+
+
+def _pool() -> HttpClientPool:
+    return HttpClientPool(HttpClientSettings(http2=False))
+
+
+async def test_warm_requests_reuse_one_connection():
+    pool = _pool()
+    async with StubServer() as server:
+        for _ in range(3):
+            async with httpx.AsyncClient() as client:
+                await _time_to_first_byte(client, server.url)
+        assert server.connections == 3
+
+        server.connections = 0
+        for _ in range(3):
+            await _time_to_first_byte(pool.async_client(server.url), server.url)
+        await pool.aclose()
+
+    assert server.connections == 1
+
+
+@pytest.mark.benchmark
+async def test_warm_requests_skip_the_handshake():
+    pool = _pool()
+    async with StubServer() as server:
+        fresh: list[float] = []
+        for _ in range(5):
+            async with httpx.AsyncClient() as client:
+                fresh.append(await _time_to_first_byte(client, server.url))
+
+        pooled = [await _time_to_first_byte(pool.async_client(server.url), server.url) for _ in range(5)]
+        await pool.aclose()
+
+    assert min(fresh) >= HANDSHAKE_SECONDS
+    assert max(pooled[1:]) < HANDSHAKE_SECONDS
+
+
+async def test_clients_are_shared_per_origin_and_closed_on_shutdown():
+    pool = _pool()
+    first = pool.async_client("https://api.example.com/v1/models")
+
+    assert pool.async_client("https://api.example.com/v1/chat?x=1") is first
+    assert pool.async_client("https://other.example.com/v1/models") is not first
+    assert pool.client("https://api.example.com/v1/models") is pool.client("https://api.example.com/")
+    assert pool.origins() == ["https://api.example.com", "https://other.example.com"]
+
+    await pool.aclose()
+
+    assert first.is_closed
+    assert pool.origins() == []
+    assert pool.async_client("https://api.example.com/v1/models") is not first
+    await pool.aclose()
+
+
+async def test_clients_of_a_short_lived_loop_are_closed_when_it_ends():
+    pool = _pool()
+    main_client = pool.async_client("https://api.example.com/v1/models")
+
+    async def use_pool() -> httpx.AsyncClient:
+        return pool.async_client("https://api.example.com/v1/models")
+
+    thread_client = await asyncio.to_thread(asyncio.run, use_pool())
+
+    assert thread_client is not main_client
+    assert thread_client.is_closed
+    assert not main_client.is_closed
+    assert list(pool._async) == [asyncio.get_running_loop()]
+
+    def run_and_close_without_cancelling() -> None:
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(use_pool())
+        loop.close()
+
+    await asyncio.to_thread(run_and_close_without_cancelling)
+    assert len(pool._async) == 2
+    await asyncio.to_thread(asyncio.run, use_pool())
+    assert list(pool._async) == [asyncio.get_running_loop()]
+    await pool.aclose()
+
+
+@pytest.mark.parametrize(
+    ("url", "origin"),
+    [
+        ("https://api.example.com/v1/models?key=x", "https://api.example.com"),
+        ("http://127.0.0.1:1234/v1", "http://127.0.0.1:1234"),
+    ],
+)
+def test_origin_of(url, origin):
+    assert origin_of(url) == origin
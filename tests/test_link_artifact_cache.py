@@ -0,0 +1,138 @@
+"""Process-level cache of materialized link artifacts across runs."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.flows.graph_runtime import GraphRuntime
+from backend.services.flows.link_artifact_cache import (
+    LinkArtifactCache,
+    link_artifact_cache_enabled,
+)
+from nodes._types import FlowContext
+from tests.conftest import make_edge, make_graph, make_node
+
+
+class ToolsExecutor:
+    node_type = "tools"
+    link_cache_scopes = ("tools",)
+
+    def __init__(self) -> None:
+        self.builds = 0
+
+    async def materialize(self, data: dict, output_handle: str, context: FlowContext):
+        self.builds += 1
+        return [f"tool:{data['name']}"]
+
+
+class AgentExecutor:
+    node_type = "agent"
+    link_cache_scopes = ("providers",)
+
+    def __init__(self) -> None:
+        self.builds = 0
+
+    def link_cache_key(self, data: dict, context: FlowContext) -> str:
+        return context.services.variables.get("model", "")
+
+    async def materialize(self, data: dict, output_handle: str, context: FlowContext):
+        self.builds += 1
+        tools = await context.runtime.resolve_links(context.node_id, "tools")
+        return {"name": data["name"], "tools": tools, "model": context.services.variables.get("model")}
+
+
+class EphemeralExecutor(ToolsExecutor):
+    node_type = "ephemeral"
+    link_cache_scopes = None
+
+
+def _link(source: str, target: str) -> dict:
+    edge = make_edge(source, target, "output", "tools")
+    edge["data"]["channel"] = "link"
+    return edge
+
+
+def _graph(tool_name: str = "search", tool_type: str = "tools") -> dict:
+    return make_graph(
+        nodes=[
+            make_node("tool", tool_type, name=tool_name),
+            make_node("sub", "agent", name="researcher"),
+            make_node("root", "agent", name="lead"),
+        ],
+        edges=[_link("tool", "sub"), _link("sub", "root")],
+    )
+
+
+@pytest.fixture
+def executors() -> dict:
+    return {"tools": ToolsExecutor(), "agent": AgentExecutor(), "ephemeral": EphemeralExecutor()}
+
+
+async def _turn(graph: dict, executors: dict, cache: LinkArtifactCache, model: str = "a:1") -> list:
+    runtime = GraphRuntime(
+        graph,
+        run_id="run",
+        chat_id="chat",
+        state=None,
+        services=SimpleNamespace(variables={"model": model}),
+        executors=executors,
+        artifact_cache=cache,
+    )
+    return await runtime.resolve_links("root", "tools")
+
+
+@pytest.mark.asyncio
+async def test_warm_turn_rematerializes_nothing(executors):
+    cache = LinkArtifactCache()
+    first = await _turn(_graph(), executors, cache)
+    second = await _turn(_graph(), executors, cache)
+
+    assert first == second
+    assert (executors["tools"].builds, executors["agent"].builds) == (1, 1)
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_upstream_change_rebuilds_only_the_dependent_chain(executors):
+    cache = LinkArtifactCache()
+    await _turn(_graph(), executors, cache)
+    await _turn(_graph(tool_name="browse"), executors, cache)
+    assert (executors["tools"].builds, executors["agent"].builds) == (2, 2)
+
+    await _turn(_graph(tool_name="browse"), executors, cache, model="b:2")
+    assert (executors["tools"].builds, executors["agent"].builds) == (2, 3)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_only_dependent_scopes(executors):
+    cache = LinkArtifactCache()
+    await _turn(_graph(), executors, cache)
+
+    assert cache.invalidate("providers") == 1
+    await _turn(_graph(), executors, cache)
+    assert (executors["tools"].builds, executors["agent"].builds) == (1, 2)
+
+    cache.invalidate("tools")
+    await _turn(_graph(), executors, cache)
+    assert (executors["tools"].builds, executors["agent"].builds) == (2, 3)
+
+
+@pytest.mark.asyncio
+async def test_nodes_that_did_not_opt_in_are_never_shared(executors):
+    cache = LinkArtifactCache()
+    await _turn(_graph(tool_type="ephemeral"), executors, cache)
+    await _turn(_graph(tool_type="ephemeral"), executors, cache)
+
+    assert (executors["ephemeral"].builds, executors["agent"].builds) == (2, 2)
+    assert len(cache) == 0
+
+
+def test_cache_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("COVALT_LINK_ARTIFACT_CACHE", "0")
+    assert link_artifact_cache_enabled(SimpleNamespace()) is False
+    monkeypatch.delenv("COVALT_LINK_ARTIFACT_CACHE")
+    assert link_artifact_cache_enabled(SimpleNamespace()) is True
+    execution = SimpleNamespace(link_artifact_cache=False)
+    assert link_artifact_cache_enabled(SimpleNamespace(execution=execution)) is False
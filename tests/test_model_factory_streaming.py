@@ -1,11 +1,63 @@
 from __future__ import annotations
 
 import asyncio
+import uuid
+from collections.abc import Iterator
 from typing import Any
 
 import pytest
 
-from backend.services.models import model_factory
+from backend.models.chat import OptionSchema
+from backend.services.models import model_factory, model_schema_cache
+from backend.services.models.model_catalog import (
+    DatabaseModelCatalogStore,
+    ModelCatalog,
+    invalidate_model_catalog,
+    set_model_catalog,
+)
+
+
+class DictCatalogStore:
+    def __init__(self) -> None:
+        self.rows: dict[str, dict[str, Any]] = {}
+        self.schemas: dict[str, dict[str, tuple[str, str]]] = {}
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        return dict(self.rows)
+
+    def save(self, provider: str, fingerprint: str, models_json: str, fetched_at: str) -> None:
+        self.rows[provider] = {
+            "provider": provider,
+            "credentials_fingerprint": fingerprint,
+            "models_json": models_json,
+            "fetched_at": fetched_at,
+        }
+
+    def delete(self, provider: str | None) -> None:
+        if provider is None:
+            self.rows.clear()
+            self.schemas.clear()
+        else:
+            self.rows.pop(provider, None)
+            self.schemas.pop(provider, None)
+
+    def load_option_schemas(self) -> dict[str, dict[str, tuple[str, str]]]:
+        return {provider: dict(models) for provider, models in self.schemas.items()}
+
+    def save_option_schemas(self, provider: str, schemas: dict[str, tuple[str, str]]) -> None:
+        self.schemas.setdefault(provider, {}).update(schemas)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_catalog() -> Iterator[DictCatalogStore]:
+    store = DictCatalogStore()
+    set_model_catalog(ModelCatalog(store))
+    model_factory._provider_fetches.forget()
+    model_schema_cache.clear_option_schemas()
+    yield store
+    set_model_catalog(None)
+    model_factory._provider_fetches.forget()
+    model_schema_cache.clear_option_schemas()
 
 
 @pytest.mark.asyncio
@@ -111,3 +163,228 @@ async def test_stream_available_model_batches_cancels_pending_tasks_on_close(
 
     await stream.aclose()
     await asyncio.wait_for(slow_cancelled.wait(), timeout=0.5)
+
+
+def _configure(monkeypatch: pytest.MonkeyPatch, configured: dict[str, dict[str, Any]]) -> None:
+    monkeypatch.setattr(model_factory, "_get_configured_providers", lambda: configured)
+
+
+async def _collect(**kwargs: Any) -> list[tuple[str, list[dict[str, Any]], bool]]:
+    return [item async for item in model_factory.stream_available_model_batches(**kwargs)]
+
+
+def _ids(batch: tuple[str, list[dict[str, Any]], bool]) -> list[str]:
+    return [model["modelId"] for model in batch[1]]
+
+
+@pytest.mark.asyncio
+async def test_cached_catalog_is_served_before_the_offline_provider_answers(
+    monkeypatch: pytest.MonkeyPatch,
+    _isolated_catalog: DictCatalogStore,
+) -> None:
+    online = True
+    release = asyncio.Event()
+    offline_fetches: list[str] = []
+
+    async def fake_fetch_provider_models(provider: str) -> list[dict[str, Any]]:
+        if online:
+            return [{"id": "m1", "name": "Model 1", "context": 8192}]
+        try:
+            await release.wait()
+            raise RuntimeError("offline")
+        finally:
+            offline_fetches.append(provider)
+
+    _configure(monkeypatch, {"slow": {"api_key": "k"}})
+    monkeypatch.setattr(model_factory, "fetch_provider_models", fake_fetch_provider_models)
+    assert [_ids(batch) for batch in await _collect()] == [["m1"]]
+
+    online = False
+    set_model_catalog(ModelCatalog(_isolated_catalog, ttl=0))
+    monkeypatch.setattr(model_factory, "PROVIDER_MODELS_TIMEOUT_SECONDS", 1)
+
+    stream = model_factory.stream_available_model_batches()
+    first = await anext(stream)
+
+    assert offline_fetches == []
+    assert first[0] == "slow" and first[2] is False and _ids(first) == ["m1"]
+    release.set()
+    assert [item async for item in stream] == []
+    assert offline_fetches == ["slow"]
+
+
+@pytest.mark.asyncio
+async def test_revalidation_emits_a_batch_only_when_the_catalog_changed(
+    monkeypatch: pytest.MonkeyPatch,
+    _isolated_catalog: DictCatalogStore,
+) -> None:
+    listings = [
+        [{"id": "a"}],
+        [{"id": "a"}],
+        [{"id": "a"}, {"id": "b"}],
+    ]
+    calls = 0
+
+    async def fake_fetch_provider_models(_provider: str) -> list[dict[str, Any]]:
+        nonlocal calls
+        calls += 1
+        return listings[calls - 1]
+
+    _configure(monkeypatch, {"p": {}})
+    monkeypatch.setattr(model_factory, "fetch_provider_models", fake_fetch_provider_models)
+
+    assert [_ids(batch) for batch in await _collect()] == [["a"]]
+    assert [_ids(batch) for batch in await _collect()] == [["a"]]
+    assert calls == 1
+
+    set_model_catalog(ModelCatalog(_isolated_catalog, ttl=0))
+    assert [_ids(batch) for batch in await _collect()] == [["a"]]
+    assert [_ids(batch) for batch in await _collect()] == [["a"], ["a", "b"]]
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_credential_changes_and_invalidation_bypass_the_catalog(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[str] = []
+
+    async def fake_fetch_provider_models(provider: str) -> list[dict[str, Any]]:
+        calls.append(provider)
+        return [{"id": f"model-{len(calls)}"}]
+
+    monkeypatch.setattr(model_factory, "fetch_provider_models", fake_fetch_provider_models)
+    _configure(monkeypatch, {"openai": {"api_key": "one"}})
+    assert [_ids(batch) for batch in await _collect()] == [["model-1"]]
+
+    _configure(monkeypatch, {"openai": {"api_key": "two"}})
+    assert [_ids(batch) for batch in await _collect()] == [["model-2"]]
+    assert [_ids(batch) for batch in await _collect()] == [["model-2"]]
+
+    invalidate_model_catalog("OpenAI")
+    assert [_ids(batch) for batch in await _collect()] == [["model-3"]]
+    assert calls == ["openai"] * 3
+
+
+@pytest.mark.asyncio
+async def test_catalog_survives_restart_and_refreshes_stale_entries_in_the_background(
+    monkeypatch: pytest.MonkeyPatch,
+    _isolated_catalog: DictCatalogStore,
+) -> None:
+    release = asyncio.Event()
+
+    async def fake_fetch_provider_models(_provider: str) -> list[dict[str, Any]]:
+        if release.is_set():
+            return [{"id": "new"}]
+        return [{"id": "old"}]
+
+    _configure(monkeypatch, {"p": {}})
+    monkeypatch.setattr(model_factory, "fetch_provider_models", fake_fetch_provider_models)
+    await _collect()
+
+    set_model_catalog(ModelCatalog(_isolated_catalog, ttl=0))
+    release.set()
+    assert [_ids(batch) for batch in await _collect(wait_for_revalidation=False)] == [["old"]]
+
+    await asyncio.gather(*model_factory._background_refreshes.values())
+    assert "new" in _isolated_catalog.rows["p"]["models_json"]
+
+
+def test_database_catalog_store_round_trips_entries() -> None:
+    store = DatabaseModelCatalogStore()
+    provider = f"test_{uuid.uuid4().hex}"
+
+    store.save(provider, "fp", '[{"id": "m"}]', "2026-01-01T00:00:00+00:00")
+    assert store.load()[provider]["models_json"] == '[{"id": "m"}]'
+
+    store.save(provider, "fp2", "[]", "2026-01-02T00:00:00+00:00")
+    assert store.load()[provider]["credentials_fingerprint"] == "fp2"
+
+    store.delete(provider)
+    assert provider not in store.load()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_listings_share_one_fetch_and_dead_providers_back_off(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[str] = []
+
+    async def fake_fetch_provider_models(provider: str) -> list[dict[str, Any]]:
+        calls.append(provider)
+        await asyncio.sleep(0.02)
+        if provider == "dead":
+            raise RuntimeError("connection refused")
+        return [{"id": "m"}]
+
+    _configure(monkeypatch, {"live": {}, "dead": {}})
+    monkeypatch.setattr(model_factory, "fetch_provider_models", fake_fetch_provider_models)
+
+    picker, options = await asyncio.gather(_collect(), _collect())
+
+    assert sorted(calls) == ["dead", "live"]
+    for results in (picker, options):
+        assert sorted((provider, has_error) for provider, _, has_error in results) == [
+            ("dead", True),
+            ("live", False),
+        ]
+
+    assert [(provider, has_error) for provider, _, has_error in await _collect()] == [
+        ("live", False),
+        ("dead", True),
+    ]
+    assert sorted(calls) == ["dead", "live"]
+
+
+@pytest.mark.asyncio
+async def test_warm_catalog_streams_without_resolving_or_validating_option_schemas(
+    monkeypatch: pytest.MonkeyPatch,
+    _isolated_catalog: DictCatalogStore,
+) -> None:
+    models = [{"id": f"model-{i}", "name": f"Model {i}", "context": i} for i in range(300)]
+    hook_calls = 0
+    validations = 0
+
+    def fake_options(_provider: str, model_id: str, metadata: dict | None) -> dict[str, Any]:
+        nonlocal hook_calls
+        hook_calls += 1
+        return {
+            "main": [
+                {"key": "temperature", "label": "Temperature", "type": "slider", "default": 1},
+            ],
+            "advanced": [],
+        }
+
+    validate = OptionSchema.model_validate.__func__
+
+    def counting_validate(cls: type[OptionSchema], value: Any, *args: Any, **kwargs: Any) -> OptionSchema:
+        nonlocal validations
+        validations += 1
+        return validate(cls, value, *args, **kwargs)
+
+    async def fake_fetch_provider_models(_provider: str) -> list[dict[str, Any]]:
+        return models
+
+    _configure(monkeypatch, {"openrouter": {}})
+    monkeypatch.setattr(model_factory, "fetch_provider_models", fake_fetch_provider_models)
+    monkeypatch.setattr(model_schema_cache, "get_provider_model_options", fake_options)
+    monkeypatch.setattr(OptionSchema, "model_validate", classmethod(counting_validate))
+
+    cold = await _collect()
+    assert (hook_calls, validations) == (300, 300)
+    assert len(_isolated_catalog.schemas["openrouter"]) == 300
+
+    warm = await _collect()
+    assert (hook_calls, validations) == (300, 300)
+    assert warm[0][1][0]["options"] is cold[0][1][0]["options"]
+    assert warm[0][1][0]["options"].main[0].key == "temperature"
+
+    model_schema_cache.clear_option_schemas()
+    set_model_catalog(ModelCatalog(_isolated_catalog))
+    await _collect()
+    assert hook_calls == 300
+
+    models[0] = {"id": "model-0", "name": "Model 0", "context": 999}
+    set_model_catalog(ModelCatalog(_isolated_catalog, ttl=0))
+    await _collect()
+    assert hook_calls == 301
@@ -0,0 +1,143 @@
+"""Pooled provider models: reuse, keying, opt-outs and invalidation."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from backend import providers
+from backend.providers import _model_pool, get_model, invalidate_model_pool
+from backend.providers._model_pool import ModelPool
+
+
+class FakeModel:
+    def __init__(self, model_id: str, options: dict[str, Any]) -> None:
+        self.id = model_id
+        self.options = options
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(_model_pool, "_model_pool", ModelPool(max_size=64))
+    yield
+
+
+def _register(monkeypatch: pytest.MonkeyPatch, provider: str, **entry: Any) -> list[str]:
+    built: list[str] = []
+
+    def build(model_id: str, provider_options: dict[str, Any]) -> FakeModel:
+        built.append(model_id)
+        provider_options.pop("max_tokens", None)
+        return FakeModel(model_id, provider_options)
+
+    monkeypatch.setitem(
+        providers.PROVIDERS,
+        provider,
+        {"get_model": build, "fetch_models": None, **entry},
+    )
+    return built
+
+
+def test_warm_lookups_reuse_one_model_per_provider_model_and_options(monkeypatch):
+    built = _register(monkeypatch, "fake")
+    options = {"temperature": 0.2, "max_tokens": 100}
+
+    first = get_model("fake", "m1", provider_options=options)
+    assert get_model("fake", "m1", provider_options={"max_tokens": 100, "temperature": 0.2}) is first
+    assert get_model("FAKE", "m1", provider_options=dict(options)) is first
+    assert options == {"temperature": 0.2, "max_tokens": 100}
+
+    assert get_model("fake", "m1", provider_options={"temperature": 0.7}) is not first
+    assert get_model("fake", "m2", provider_options=options) is not first
+    assert built == ["m1", "m1", "m2"]
+
+
+def test_invalidation_rebuilds_models(monkeypatch):
+    built = _register(monkeypatch, "fake")
+    first = get_model("fake", "m")
+
+    invalidate_model_pool()
+
+    assert get_model("fake", "m") is not first
+    assert get_model("fake", "m") is get_model("fake", "m")
+    assert built == ["m", "m"]
+
+
+def test_models_built_across_an_invalidation_are_not_pooled():
+    pool = ModelPool(max_size=4)
+
+    def build_while_settings_change() -> object:
+        pool.invalidate()
+        return object()
+
+    stale = pool.get(("p", "m"), build_while_settings_change)
+    assert pool.get(("p", "m"), object) is not stale
+    assert len(pool) == 1
+
+
+def test_opted_out_providers_overrides_and_opaque_options_are_not_pooled(monkeypatch):
+    built = _register(monkeypatch, "oauth_backed", pool_models=False)
+    get_model("oauth_backed", "m")
+    get_model("oauth_backed", "m")
+    assert len(built) == 2
+
+    built = _register(monkeypatch, "fake")
+    get_model("fake", "m", provider_options={"client": object()})
+    get_model("fake", "m", provider_options={"client": object()})
+    token = providers._credential_override.set(("key", "https://example.test"))
+    try:
+        get_model("fake", "m")
+        get_model("fake", "m")
+    finally:
+        providers._credential_override.reset(token)
+    assert len(built) == 4
+
+
+def test_pool_evicts_least_recently_used_models():
+    pool = ModelPool(max_size=2)
+    a = pool.get(("a",), object)
+    pool.get(("b",), object)
+    assert pool.get(("a",), object) is a
+    pool.get(("c",), object)
+
+    assert len(pool) == 2
+    assert pool.get(("a",), object) is a
+    assert pool.hits == 2 and pool.misses == 3
+    pool.get(("b",), object)
+    assert pool.misses == 4
+
+
+def test_models_are_not_shared_across_event_loops(monkeypatch):
+    built = _register(monkeypatch, "fake")
+
+    async def lookup() -> tuple[Any, Any]:
+        return get_model("fake", "m"), get_model("fake", "m")
+
+    first, again = asyncio.run(lookup())
+    second, _ = asyncio.run(lookup())
+
+    assert first is again
+    assert second is not first
+    assert built == ["m", "m"]
+    assert len(_model_pool.get_model_pool()) == 1
+
+
+@pytest.mark.benchmark
+def test_warm_turns_skip_model_construction():
+    rounds = 50
+    started = time.perf_counter()
+    for _ in range(rounds):
+        providers.PROVIDERS["deepseek"]["get_model"]("deepseek-chat", provider_options={})
+    cold = (time.perf_counter() - started) / rounds
+
+    get_model("deepseek", "deepseek-chat")
+    started = time.perf_counter()
+    for _ in range(rounds):
+        get_model("deepseek", "deepseek-chat")
+    warm = (time.perf_counter() - started) / rounds
+
+    assert warm * 10 < cold
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 import pytest
 
+from backend import providers
 from backend.services.models import model_schema_cache
 
 
+@pytest.fixture(autouse=True)
+def _clear_option_schemas() -> Iterator[None]:
+    model_schema_cache.clear_option_schemas()
+    yield
+    model_schema_cache.clear_option_schemas()
+
+
 def test_cache_model_metadata_round_trips_copy() -> None:
     model_schema_cache._model_metadata_cache.clear()
 
@@ -74,3 +84,61 @@ def test_get_effective_option_schema_falls_back_to_empty_on_error(
     schema = model_schema_cache.get_effective_option_schema("openai", "gpt-4o")
     assert schema.main == []
     assert schema.advanced == []
+
+
+def test_option_schemas_are_memoized_per_schema_version(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    model_schema_cache._model_metadata_cache.clear()
+    calls: list[dict | None] = []
+
+    def fake_options(provider: str, model_id: str, model_metadata: dict | None):
+        calls.append(model_metadata)
+        return {"main": [], "advanced": []}
+
+    monkeypatch.setattr(model_schema_cache, "get_provider_model_options", fake_options)
+    model_schema_cache.cache_model_metadata("openai", "gpt-4o", {"reasoning": False})
+
+    first = model_schema_cache.get_effective_option_schema("openai", "gpt-4o")
+    assert model_schema_cache.get_effective_option_schema("openai", "gpt-4o") is first
+
+    model_schema_cache.cache_model_metadata("openai", "gpt-4o", {"reasoning": True})
+    assert model_schema_cache.get_effective_option_schema("openai", "gpt-4o") is not first
+    assert calls == [{"reasoning": False}, {"reasoning": True}]
+
+    monkeypatch.setattr(model_schema_cache, "OPTION_SCHEMA_VERSION", 2)
+    model_schema_cache.get_effective_option_schema("openai", "gpt-4o")
+    assert len(calls) == 3
+
+
+def test_providers_are_versioned_by_their_source() -> None:
+    assert providers.get_provider_version("openai")
+    assert providers.get_provider_version("openai") != providers.get_provider_version("anthropic")
+    assert providers.get_provider_version("no-such-provider") == ""
+
+
+def test_option_schemas_follow_the_provider_version_and_registry_reloads(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    model_schema_cache._model_metadata_cache.clear()
+    calls: list[str] = []
+    versions = {"openai": "a"}
+
+    def fake_options(provider: str, model_id: str, model_metadata: dict | None):
+        calls.append(provider)
+        return {"main": [], "advanced": []}
+
+    monkeypatch.setattr(model_schema_cache, "get_provider_model_options", fake_options)
+    monkeypatch.setattr(model_schema_cache, "get_provider_version", versions.get)
+
+    first = model_schema_cache.get_effective_option_schema("openai", "gpt-4o")
+    assert model_schema_cache.get_effective_option_schema("openai", "gpt-4o") is first
+
+    versions["openai"] = "b"
+    second = model_schema_cache.get_effective_option_schema("openai", "gpt-4o")
+    assert second is not first
+    assert len(calls) == 2
+
+    providers.reload_provider_registry()
+    model_schema_cache.get_effective_option_schema("openai", "gpt-4o")
+    assert len(calls) == 3
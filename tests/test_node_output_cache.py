@@ -0,0 +1,252 @@
+"""Persistent node output cache: keys, cacheability, eviction and run_flow hits."""
+
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from backend import db
+from backend.services.flows.flow_executor import run_flow
+from backend.services.flows.node_output_cache import (
+    DatabaseNodeOutputStore,
+    NodeOutputCache,
+    executor_is_cacheable,
+    node_output_cache_enabled,
+    set_node_output_cache,
+)
+from nodes._types import DataValue, ExecutionResult, FlowContext, NodeEvent
+from nodes.ai.llm_completion.executor import LlmCompletionExecutor
+from nodes.data.code.executor import CodeExecutor
+from tests.conftest import make_edge, make_graph, make_node
+
+
+class DictStore:
+    def __init__(self) -> None:
+        self.entries: dict[str, str] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.entries.get(key)
+
+    def put(self, key: str, node_type: str, outputs_json: str) -> None:
+        self.entries[key] = outputs_json
+
+    def evict(self, max_bytes: int) -> int:
+        return 0
+
+
+class SourceExecutor:
+    node_type = "source"
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        return ExecutionResult(outputs={"output": DataValue("data", data.get("value"))})
+
+
+class CountingExecutor:
+    node_type = "double"
+    cacheable = True
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def execute(
+        self, data: dict, inputs: dict[str, DataValue], context: FlowContext
+    ) -> ExecutionResult:
+        self.calls += 1
+        return ExecutionResult(outputs={"output": DataValue("data", inputs["input"].value * 2)})
+
+
+@pytest.fixture
+def memory_cache():
+    cache = NodeOutputCache(DictStore())
+    set_node_output_cache(cache)
+    yield cache
+    set_node_output_cache(None)
+
+
+def _context(**execution: Any) -> SimpleNamespace:
+    return SimpleNamespace(
+        run_id="run-1",
+        chat_id=None,
+        state=None,
+        services=SimpleNamespace(execution=SimpleNamespace(stop_run=False, **execution)),
+    )
+
+
+def _graph(value: int) -> dict[str, Any]:
+    return make_graph(
+        nodes=[make_node("src", "source", value=value), make_node("dbl", "double")],
+        edges=[make_edge("src", "dbl")],
+    )
+
+
+async def _run(graph: dict, executors: dict, **execution: Any) -> list:
+    return [item async for item in run_flow(graph, _context(**execution), executors=executors)]
+
+
+def test_cache_key_depends_on_type_data_and_inputs():
+    cache = NodeOutputCache(DictStore())
+    inputs = {"input": DataValue("data", {"a": 1, "b": 2})}
+
+    key = cache.cache_key("merge", {"x": 1}, inputs)
+
+    assert key == cache.cache_key("merge", {"x": 1}, {"input": DataValue("data", {"b": 2, "a": 1})})
+    assert key != cache.cache_key("merge", {"x": 2}, inputs)
+    assert key != cache.cache_key("code", {"x": 1}, inputs)
+    assert key != cache.cache_key("merge", {"x": 1}, {"input": DataValue("text", {"a": 1, "b": 2})})
+    assert cache.cache_key("merge", {"x": object()}, inputs) is None
+
+
+def test_enablement_prefers_execution_flag(monkeypatch):
+    monkeypatch.setenv("COVALT_NODE_OUTPUT_CACHE", "1")
+
+    assert node_output_cache_enabled(SimpleNamespace()) is True
+    assert node_output_cache_enabled(SimpleNamespace(execution=SimpleNamespace(output_cache=False))) is False
+
+    monkeypatch.delenv("COVALT_NODE_OUTPUT_CACHE")
+    assert node_output_cache_enabled(SimpleNamespace()) is False
+
+
+def test_executor_cacheability_declarations():
+    code = CodeExecutor()
+    llm = LlmCompletionExecutor()
+
+    assert not executor_is_cacheable(code, {"code": "return input.x + 1"}, {})
+    assert executor_is_cacheable(code, {"code": "return input.x + 1", "cacheOutput": True}, {})
+    assert executor_is_cacheable(llm, {"temperature": 0}, {})
+    assert not executor_is_cacheable(llm, {"temperature": 0.7}, {})
+    assert not executor_is_cacheable(llm, {}, {})
+    assert not executor_is_cacheable(SourceExecutor(), {}, {})
+
+
+@pytest.mark.asyncio
+async def test_run_flow_serves_unchanged_nodes_from_cache(memory_cache):
+    counting = CountingExecutor()
+    executors = {"source": SourceExecutor(), "double": counting}
+
+    first = await _run(_graph(21), executors, output_cache=True)
+    second = await _run(_graph(21), executors, output_cache=True)
+
+    assert counting.calls == 1
+    assert [r.outputs["output"].value for r in first if isinstance(r, ExecutionResult)][-1] == 42
+    assert [r.outputs["output"].value for r in second if isinstance(r, ExecutionResult)][-1] == 42
+    events = [e.event_type for e in second if isinstance(e, NodeEvent) and e.node_id == "dbl"]
+    assert events == ["started", "cache_hit", "result", "completed"]
+
+
+@pytest.mark.asyncio
+async def test_changed_inputs_recompute(memory_cache):
+    counting = CountingExecutor()
+    executors = {"source": SourceExecutor(), "double": counting}
+
+    await _run(_graph(1), executors, output_cache=True)
+    await _run(_graph(2), executors, output_cache=True)
+
+    assert counting.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bypassed_when_disabled(memory_cache):
+    counting = CountingExecutor()
+    executors = {"source": SourceExecutor(), "double": counting}
+
+    await _run(_graph(3), executors, output_cache=False)
+    await _run(_graph(3), executors, output_cache=False)
+
+    assert counting.calls == 2
+    assert memory_cache._store.entries == {}
+
+
+class StreamingLlmExecutor:
+    node_type = "llm"
+    cacheable = True
+    stream_output_handle = "output"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def execute(self, data: dict, inputs: dict[str, DataValue], context: FlowContext):
+        self.calls += 1
+        for token in ("Hello", " there"):
+            yield NodeEvent(
+                node_id=context.node_id,
+                node_type=self.node_type,
+                event_type="progress",
+                run_id=context.run_id,
+                data={"token": token},
+            )
+        yield ExecutionResult(outputs={"output": DataValue("data", {"text": "Hello there"})})
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_replay_streamed_text(memory_cache):
+    llm = StreamingLlmExecutor()
+    graph = make_graph(nodes=[make_node("llm", "llm")])
+
+    await _run(graph, {"llm": llm}, output_cache=True)
+    second = await _run(graph, {"llm": llm}, output_cache=True)
+
+    assert llm.calls == 1
+    tokens = [
+        e.data["token"] for e in second if isinstance(e, NodeEvent) and e.event_type == "progress"
+    ]
+    assert tokens == ["Hello there"]
+
+
+def test_db_store_round_trip_and_lru_eviction():
+    prefix = f"test-{uuid.uuid4().hex}"
+    keys = [f"{prefix}-{index}" for index in range(3)]
+
+    with db.db_session() as sess:
+        for key in keys:
+            db.put_node_output_cache_entry(sess, key=key, node_type="merge", outputs_json="x" * 100)
+        assert db.get_node_output_cache_entry(sess, key=keys[0]) == "x" * 100
+        db.touch_node_output_cache_entries(sess, last_used={keys[0]: "9999-01-01T00:00:00+00:00"})
+
+        total = sum(entry.size for entry in sess.query(db.NodeOutputCacheEntry).all())
+        evicted = db.evict_node_output_cache(sess, max_bytes=total - 150)
+
+        assert evicted == 2
+        assert db.get_node_output_cache_entry(sess, key=keys[0]) == "x" * 100
+        assert db.get_node_output_cache_entry(sess, key=keys[1]) is None
+        db.clear_node_output_cache(sess)
+        assert db.get_node_output_cache_entry(sess, key=keys[0]) is None
+
+
+def test_db_store_batches_last_used_and_evicts_from_a_size_counter(monkeypatch):
+    store = DatabaseNodeOutputStore()
+    prefix = f"test-{uuid.uuid4().hex}"
+    keys = [f"{prefix}-{index}" for index in range(4)]
+    sums: list[int] = []
+    real_size = db.get_node_output_cache_size
+
+    def counting_size(sess):
+        sums.append(1)
+        return real_size(sess)
+
+    monkeypatch.setattr(db, "get_node_output_cache_size", counting_size)
+    with db.db_session() as sess:
+        db.clear_node_output_cache(sess)
+    try:
+        for key in keys[:3]:
+            store.put(key, "merge", "x" * 100)
+            assert store.evict(1000) == 0
+        assert len(sums) == 1
+
+        assert store.get(keys[0]) == "x" * 100
+        with db.db_session() as sess:
+            touched = sess.get(db.NodeOutputCacheEntry, keys[0]).last_used_at
+            assert touched == sess.get(db.NodeOutputCacheEntry, keys[0]).created_at
+
+        store.put(keys[3], "merge", "x" * 100)
+        assert store.evict(350) == 2
+        assert store.get(keys[0]) == "x" * 100
+        assert store.get(keys[1]) is None
+        assert store.get(keys[2]) is None
+    finally:
+        with db.db_session() as sess:
+            db.clear_node_output_cache(sess)
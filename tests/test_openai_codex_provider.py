@@ -9,6 +9,7 @@ from agno.models.openai.responses import OpenAIResponses
 from agno.tools.function import Function
 
 import backend.providers.openai_codex as openai_codex_provider
+from backend.services import http_clients
 
 
 def test_fetch_codex_models_uses_codex_endpoint_and_parses_reasoning_levels(
@@ -44,12 +45,12 @@ def test_fetch_codex_models_uses_codex_endpoint_and_parses_reasoning_levels(
 
     transport = httpx.MockTransport(handler)
 
-    real_async_client = openai_codex_provider.httpx.AsyncClient
+    real_async_client = http_clients.httpx.AsyncClient
 
     def fake_async_client(*args, **kwargs):
         return real_async_client(transport=transport, timeout=kwargs.get("timeout"))
 
-    monkeypatch.setattr(openai_codex_provider.httpx, "AsyncClient", fake_async_client)
+    monkeypatch.setattr(http_clients.httpx, "AsyncClient", fake_async_client)
     monkeypatch.setattr(openai_codex_provider, "_get_codex_client_version", lambda: "0.1.0")
 
     models = asyncio.run(
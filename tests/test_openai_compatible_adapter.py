@@ -96,7 +96,7 @@ async def test_test_connection_success():
             "backend.providers.adapters.openai_compatible.get_credentials",
             return_value=("sk-test", None),
         ),
-        patch("backend.providers.adapters.openai_compatible.httpx.AsyncClient", return_value=mock_client),
+        patch("backend.services.http_clients.httpx.AsyncClient", return_value=mock_client),
     ):
         ok, err = await entry["test_connection"]()
 
@@ -130,7 +130,7 @@ async def test_test_connection_401():
             "backend.providers.adapters.openai_compatible.get_credentials",
             return_value=("sk-test", None),
         ),
-        patch("backend.providers.adapters.openai_compatible.httpx.AsyncClient", return_value=mock_client),
+        patch("backend.services.http_clients.httpx.AsyncClient", return_value=mock_client),
     ):
         ok, err = await entry["test_connection"]()
 
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import types
 
+import pytest
+
 import backend.providers as providers
 
 
@@ -77,3 +79,52 @@ def test_load_python_module_providers_skips_manifest_ids(monkeypatch) -> None:
         providers.ALIASES.clear()
         providers.ALIASES.update(original_aliases)
         providers._PLUGIN_STORE_PROVIDER_IDS = original_plugin_store_ids
+
+
+def test_lazy_providers_that_cannot_import_are_unregistered(monkeypatch) -> None:
+    original_providers = dict(providers.PROVIDERS)
+    original_aliases = dict(providers.ALIASES)
+
+    providers.PROVIDERS.clear()
+    providers.ALIASES.clear()
+    monkeypatch.setattr(providers, "_MANIFEST_PROVIDER_IDS", set())
+    monkeypatch.setattr(providers, "_PLUGIN_STORE_PROVIDER_IDS", set())
+    monkeypatch.setattr(
+        providers.pkgutil,
+        "iter_modules",
+        lambda _path: [(None, "broken", False), (None, "uninstalled", False)],
+    )
+    names = {"get_broken_model", "get_uninstalled_model", "fetch_models"}
+    requires = {"broken": {"agno"}, "uninstalled": {"covalt_missing_sdk"}}
+    monkeypatch.setattr(
+        providers,
+        "_read_module_declarations",
+        lambda name: (names, {"ALIASES": [f"{name}-alias"], "requires": requires[name]}),
+    )
+
+    imported: list[str] = []
+
+    def fake_import_module(name: str, package: str | None = None):
+        imported.append(name)
+        raise ModuleNotFoundError("No module named 'agno.models.metrics'")
+
+    monkeypatch.setattr(providers.importlib, "import_module", fake_import_module)
+
+    try:
+        providers._load_python_module_providers()
+        assert list(providers.PROVIDERS) == ["broken"]
+        assert imported == []
+        get_model = providers.PROVIDERS["broken"]["get_model"]
+
+        assert providers.preload_provider("broken") is False
+        assert "broken" not in providers.PROVIDERS
+        assert "broken_alias" not in providers.ALIASES
+
+        with pytest.raises(providers.ProviderUnavailableError, match="agno.models.metrics"):
+            get_model("model", {})
+        assert imported == [".broken"]
+    finally:
+        providers.PROVIDERS.clear()
+        providers.PROVIDERS.update(original_providers)
+        providers.ALIASES.clear()
+        providers.ALIASES.update(original_aliases)
@@ -0,0 +1,135 @@
+"""Keyed single-flight calls: sharing, cancellation and error backoff."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.services.models import models_dev
+from backend.services.single_flight import BackoffError, SingleFlight
+
+
+async def test_concurrent_callers_share_one_call_per_key():
+    flight = SingleFlight()
+    calls: list[str] = []
+
+    async def fetch(key: str) -> str:
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    results = await asyncio.gather(
+        *(flight.run(key, lambda key=key: fetch(key)) for key in ["a", "a", "a", "b"])
+    )
+
+    assert results == ["A", "A", "A", "B"]
+    assert calls == ["a", "b"]
+    assert await flight.run("a", lambda: fetch("a")) == "A"
+    assert calls == ["a", "b", "a"]
+
+
+async def test_shared_call_is_cancelled_only_when_every_caller_leaves():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+    release = asyncio.Event()
+
+    async def fetch() -> str:
+        started.set()
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    first = asyncio.create_task(flight.run("k", fetch))
+    second = asyncio.create_task(flight.run("k", fetch))
+    await started.wait()
+
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+    release.set()
+    assert await second == "done"
+
+    release.clear()
+    started.clear()
+    third = asyncio.create_task(flight.run("k", fetch))
+    await started.wait()
+    third.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=0.5)
+
+
+async def test_failures_are_cached_per_key_with_growing_backoff(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("backend.services.single_flight.time.monotonic", lambda: clock[0])
+    flight = SingleFlight(backoff=1, max_backoff=3)
+    calls = 0
+
+    async def dead() -> str:
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("refused")
+
+    async def alive() -> str:
+        return "ok"
+
+    for expected_calls, wait in [(1, 1), (2, 2), (3, 3), (4, 3)]:
+        with pytest.raises(ConnectionError) as failed:
+            await flight.run("dead", dead)
+        rejected = []
+        for _ in range(2):
+            with pytest.raises(BackoffError, match=f"refused \\(retrying in {wait}s\\)") as backoff:
+                await flight.run("dead", dead)
+            rejected.append(backoff.value)
+        assert calls == expected_calls
+        assert rejected[0] is not rejected[1]
+        assert all(error.__cause__ is failed.value for error in rejected)
+        assert flight.backing_off("dead")
+        assert await flight.run("other", alive) == "ok"
+        clock[0] += wait
+
+    assert await flight.run("dead", alive) == "ok"
+    assert not flight.backing_off("dead")
+
+    with pytest.raises(ConnectionError):
+        await flight.run("dead", dead)
+    with pytest.raises(BackoffError):
+        await flight.run("dead", dead)
+    flight.forget("dead")
+    assert await flight.run("dead", alive) == "ok"
+
+
+class _Response:
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return {"openai": {"models": {"gpt-x": {"name": "GPT X"}}}}
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.requests = 0
+
+    async def get(self, url: str, timeout: float) -> _Response:
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        return _Response()
+
+
+async def test_concurrent_cold_models_dev_callers_make_one_request(monkeypatch):
+    client = _Client()
+    monkeypatch.setattr(models_dev, "get_async_client", lambda _url: client)
+    monkeypatch.setattr(models_dev, "_MODELS_DEV_CACHE", None)
+    monkeypatch.setattr(models_dev, "_MODELS_DEV_LAST_FETCH", 0.0)
+    monkeypatch.setattr(models_dev, "_models_dev_fetches", SingleFlight())
+
+    results = await asyncio.gather(
+        *(models_dev.fetch_models_dev_provider("openai") for _ in range(5))
+    )
+
+    assert results == [[{"id": "gpt-x", "name": "GPT X"}]] * 5
+    assert client.requests == 1
@@ -0,0 +1,153 @@
+"""Shared SSE decoder: event framing, chunk boundaries and replay throughput."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from backend.providers._sse import (
+    SSEDecoder,
+    SSEEvent,
+    aiter_sse_json,
+    iter_sse_events,
+    iter_sse_json,
+)
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "sse"
+CHUNK_SIZE = 1024
+REPLAYS = 50
+
+
+def _chunks(payload: bytes, size: int) -> list[bytes]:
+    return [payload[i : i + size] for i in range(0, len(payload), size)]
+
+
+class _ChunkStream(httpx.SyncByteStream):
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = chunks
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._chunks
+
+
+def _line_reader_payloads(chunks: list[bytes]) -> list[dict]:
+    """What the providers did before: `iter_lines()` plus `json.loads` per `data:` line."""
+    payloads = []
+    for line in httpx.Response(200, stream=_ChunkStream(chunks)).iter_lines():
+        if not line or not line.startswith("data:"):
+            continue
+        payload = line[5:].strip()
+        if not payload or payload == "[DONE]":
+            continue
+        try:
+            payloads.append(json.loads(payload))
+        except Exception:
+            continue
+    return payloads
+
+
+def _decoder_payloads(chunks: list[bytes]) -> list[dict]:
+    return list(iter_sse_json(httpx.Response(200, stream=_ChunkStream(chunks)).iter_bytes()))
+
+
+def test_events_carry_name_id_and_multi_line_data():
+    stream = (
+        b": keep-alive\n"
+        b"retry: 3000\n"
+        b"event: content_block_delta\n"
+        b"id: 7\n"
+        b'data: {"a":\n'
+        b"data: 1}\n"
+        b"\n"
+        b"data:[DONE]\n"
+        b"\n"
+        b"event: ignored-without-data\n"
+        b"\n"
+    )
+
+    assert list(iter_sse_events([stream])) == [
+        SSEEvent(data=b'{"a":\n1}', event="content_block_delta", id="7", retry=3000),
+        SSEEvent(data=b"[DONE]", id="7"),
+    ]
+
+
+@pytest.mark.parametrize("line_break", [b"\n", b"\r\n", b"\r"])
+def test_events_are_identical_at_every_chunk_boundary(line_break):
+    stream = line_break.join(
+        [b"event: a", b'data: {"n": 1}', b"", b": comment", b"data: x", b"data: y", b"", b""]
+    )
+    expected = [SSEEvent(data=b'{"n": 1}', event="a"), SSEEvent(data=b"x\ny")]
+
+    for split in range(len(stream) + 1):
+        assert list(iter_sse_events([stream[:split], stream[split:]])) == expected
+    assert list(iter_sse_events(_chunks(stream, 1))) == expected
+
+
+def test_fields_without_values():
+    stream = b"data:\n\nevent:\ndata\n\nevent: named\n\ndata: after\n\n"
+
+    assert list(iter_sse_events([stream])) == [
+        SSEEvent(data=b""),
+        SSEEvent(data=b""),
+        SSEEvent(data=b"after"),
+    ]
+
+
+def test_pending_event_is_dispatched_when_the_stream_ends():
+    decoder = SSEDecoder()
+
+    assert decoder.feed(b'data: {"done": true}') == []
+    assert decoder.flush() == [SSEEvent(data=b'{"done": true}')]
+    assert decoder.flush() == []
+
+
+def test_json_skips_done_and_malformed_payloads():
+    assert SSEEvent(data=b"[DONE]").json() is None
+    assert SSEEvent(data=b"[DONE]").done
+    assert SSEEvent(data=b"{oops").json() is None
+    assert SSEEvent(data=b'{"text":"hi"}').json() == {"text": "hi"}
+
+
+async def test_async_json_stream_matches_sync():
+    payload = (FIXTURES / "copilot_anthropic_messages.sse").read_bytes()
+    chunks = _chunks(payload, 333)
+
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    assert [item async for item in aiter_sse_json(source())] == list(iter_sse_json(chunks))
+
+
+FIXTURE_NAMES = ["copilot_anthropic_messages.sse", "google_code_assist_stream.sse"]
+
+
+@pytest.mark.parametrize("fixture", FIXTURE_NAMES)
+def test_replayed_fixture_payloads_match_the_line_reader(fixture):
+    chunks = _chunks((FIXTURES / fixture).read_bytes(), CHUNK_SIZE)
+
+    expected = _line_reader_payloads(chunks)
+    assert _decoder_payloads(chunks) == expected
+    assert len(expected) > 300
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("fixture", FIXTURE_NAMES)
+def test_replayed_fixture_throughput(fixture):
+    chunks = _chunks((FIXTURES / fixture).read_bytes(), CHUNK_SIZE)
+
+    line_reader = decoder = float("inf")
+    for _ in range(REPLAYS):
+        started = time.perf_counter()
+        _line_reader_payloads(chunks)
+        line_reader = min(line_reader, time.perf_counter() - started)
+        started = time.perf_counter()
+        _decoder_payloads(chunks)
+        decoder = min(decoder, time.perf_counter() - started)
+
+    assert decoder < line_reader
@@ -0,0 +1,163 @@
+"""Native JSON transform node: query semantics, compile caching and throughput."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from nodes._types import DataValue, FlowContext
+from nodes.data.code import sandbox
+from nodes.data.code.sandbox import CodeLimits, CodeSandbox
+from nodes.data.transform.executor import TransformExecutor
+from nodes.data.transform.query import QueryError, compile_query, search
+
+DATA = {
+    "items": [
+        {"id": 1, "price": 5, "tags": ["a", "b"], "meta": {"ok": True}},
+        {"id": 2, "price": 15, "tags": ["c"], "meta": {"ok": False}},
+        {"id": 3, "price": None, "tags": [], "meta": None},
+    ],
+    "people": {"ann": {"age": 30}, "bob": {"age": 20}},
+    "nested": [[1, 2], [3, [4]], 5],
+    "text": "hello",
+    "zero": 0,
+}
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("items[*].id", [1, 2, 3]),
+        ("items[0].meta.ok", True),
+        ("items[-1].id", 3),
+        ("items[5]", None),
+        ("items[0:2].id", [1, 2]),
+        ("items[::-1].id", [3, 2, 1]),
+        ("text[1:3]", None),
+        ("items[?price > `10`].id", [2]),
+        ("items[?price > `1` && price < `10`].id", [1]),
+        ("items[?price == null || price > `10`].id", [2, 3]),
+        ("items[?!(meta.ok)].id", [2, 3]),
+        ("items[?meta.ok == `true`].id", [1]),
+        ("items[?contains(tags, 'a')].id", [1]),
+        ("items[?price > `10`] | [0].id", 2),
+        ("items[*].meta.ok", [True, False]),
+        ("items[*].tags[0]", ["a", "c"]),
+        ("items[].tags[]", ["a", "b", "c"]),
+        ("nested[]", [1, 2, 3, [4], 5]),
+        ("people.*.age", [30, 20]),
+        ("items[?meta.ok].{id: id, price: price}", [{"id": 1, "price": 5}]),
+        ("items[*].[id, price]", [[1, 5], [2, 15], [3, None]]),
+        ("{name: text, count: length(items)}", {"name": "hello", "count": 3}),
+        ("zero || 'fallback'", 0),
+        ("missing || 'fallback'", "fallback"),
+        ("\"text\"", "hello"),
+        ("`[1, 2]`[1]", 2),
+        ("sort_by(items[?price != null], &price)[*].id", [1, 2]),
+        ("max_by(items[?price != null], &price).id", 2),
+        ("sum(items[*].price)", 20),
+        ("map(&id, items)", [1, 2, 3]),
+        ("join(', ', keys(people))", "ann, bob"),
+        ("merge(people.ann, {name: text})", {"age": 30, "name": "hello"}),
+        ("not_null(missing, zero)", 0),
+        ("to_number('3.5')", 3.5),
+        ("", DATA),
+    ],
+)
+def test_queries_follow_jmespath_semantics(query, expected):
+    assert search(query, DATA) == expected
+
+
+@pytest.mark.parametrize(
+    ("query", "message"),
+    [
+        ("items[?price > ]", "Unexpected"),
+        ("items.", "Unexpected end of query"),
+        ("a = b", "use '=='"),
+        ("nope(items)", "Unknown function"),
+        ("length(items, text)", "takes 1 argument"),
+        ("sum(text)", "expected array"),
+    ],
+)
+def test_invalid_queries_raise_query_errors(query, message):
+    with pytest.raises(QueryError, match=message):
+        search(query, DATA)
+
+
+async def test_node_reshapes_its_input_and_compiles_each_query_once():
+    compile_query.cache_clear()
+    executor = TransformExecutor()
+    context = FlowContext(
+        node_id="transform", chat_id=None, run_id="run", state=None, runtime=None, services=None
+    )
+
+    for _ in range(3):
+        result = await executor.execute(
+            {"query": "items[?price > `10`].id"}, {"input": DataValue("data", DATA)}, context
+        )
+        assert result.outputs["output"].value == [2]
+
+    assert compile_query.cache_info().misses == 1
+    assert compile_query.cache_info().hits == 2
+
+
+LARGE_CASES = [
+    (
+        "return $input.items.map(i => ({ id: i.id, total: i.price }))",
+        "items[*].{id: id, total: price}",
+    ),
+    (
+        "return $input.items.filter(i => i.price > 50).map(i => i.name)",
+        "items[?price > `50`].name",
+    ),
+]
+
+
+def _large_value(size: int) -> dict:
+    return {"items": [{"id": i, "price": i % 100, "name": f"item {i}"} for i in range(size)]}
+
+
+def _large_sandbox() -> CodeSandbox:
+    return CodeSandbox(1, CodeLimits(time_limit_s=30, memory_limit_bytes=1 << 30, output_limit_bytes=1 << 30))
+
+
+@pytest.mark.skipif(sandbox.quickjs is None, reason="quickjs is not installed")
+async def test_mapping_and_filtering_large_arrays_matches_the_code_node():
+    value = _large_value(10_000)
+    box = _large_sandbox()
+
+    try:
+        for code, query in LARGE_CASES:
+            expected = await box.run(code, input_value=value, trigger_value=None, upstream_outputs={})
+            assert search(query, value) == expected
+    finally:
+        box.shutdown()
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(sandbox.quickjs is None, reason="quickjs is not installed")
+async def test_mapping_and_filtering_large_arrays_beats_the_code_node_tenfold():
+    value = _large_value(100_000)
+    box = _large_sandbox()
+
+    try:
+        code_seconds = 0.0
+        transform_seconds = 0.0
+        for code, query in LARGE_CASES:
+            started = time.perf_counter()
+            expected = await box.run(code, input_value=value, trigger_value=None, upstream_outputs={})
+            code_seconds += time.perf_counter() - started
+
+            compiled = compile_query(query)
+            timings = []
+            for _ in range(3):
+                started = time.perf_counter()
+                result = compiled(value)
+                timings.append(time.perf_counter() - started)
+            transform_seconds += min(timings)
+            assert result == expected
+    finally:
+        box.shutdown()
+
+    assert transform_seconds * 10 < code_seconds